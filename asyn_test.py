@@ -23,6 +23,9 @@ parser.add_argument('--upper_bound', '-ub', help='Upper Bound (ML model)', type=
 parser.add_argument('--domain_upper_bound', '-dub', help='Domain Upper Bound', type=float, default=None)
 parser.add_argument('--lower_bound', '-lb', help='Lower Bound (ML model)', type=float, default=None)
 parser.add_argument('--nascent_minima', '-nm', help='Nascent Minima term (ML model)', type=bool, default=False)
+parser.add_argument('--result_backend', help='Format of the result files', choices=['csv', 'npz', 'parquet'], default='csv')
+parser.add_argument('--result_flush_every', help='Rows of a result file buffered before writing them', type=int, default=1)
+parser.add_argument('--result_fsync_every', help='Writes between two fsync of the result files (0 never)', type=int, default=0)
 params = parser.parse_args()
 
 objective_func_name = params.problem
@@ -42,22 +45,24 @@ dub = params.domain_upper_bound
 num_processors = multiprocessing.cpu_count()
 print("Maximum number of available process", num_processors)
 
-Baop = PM(n_initial_points=n_initial_points, 
-           n_iterations=n_iterations, 
-           batch_size=n_points_per_iteration, 
-           m_domain_discretization=m_domain_discretization_sample_size,
-           objective_func=objective_func,
-           domain=objective_func,
-           objective_func_name=objective_func_name, 
-           lb=lb, 
-           ub=ub,
-           dub=dub, 
-           nm=nm,
-           uniform_sample=True,
-           save=True)
-
-# 60 for LiGen (in teoria per 5)
-# 36 for StereoMatch (in teoria per 250)
-# 33 for StereoMatch10 (in teoria per 3)
-Baop.async_optimization(10, n_points_per_iteration) # Cambia il time
-#Baop.sync_optimization()
+with PM(n_initial_points=n_initial_points, 
+        n_iterations=n_iterations, 
+        batch_size=n_points_per_iteration, 
+        m_domain_discretization=m_domain_discretization_sample_size,
+        objective_func=objective_func,
+        domain=objective_func,
+        objective_func_name=objective_func_name, 
+        lb=lb, 
+        ub=ub,
+        dub=dub, 
+        nm=nm,
+        uniform_sample=True,
+        save=True,
+        result_backend=params.result_backend,
+        result_flush_every=params.result_flush_every,
+        result_fsync_every=params.result_fsync_every) as Baop:
+    # 60 for LiGen (in teoria per 5)
+    # 36 for StereoMatch (in teoria per 250)
+    # 33 for StereoMatch10 (in teoria per 3)
+    Baop.async_optimization(10, n_points_per_iteration) # Cambia il time
+    #Baop.sync_optimization()
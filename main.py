@@ -1,3 +1,4 @@
+import atexit
 from flask import Flask, request, jsonify, render_template, send_file
 from qaliboo.parallel_maliboo import ParallelMaliboo as PM
 from qaliboo.aux import stringa_per_stringa
@@ -14,7 +15,12 @@ Baop = PM(n_initial_points=10,
            ub=2.1, 
            nm=False,
            uniform_sample=True,
-           save=False)
+           save=False,
+           result_backend='csv',
+           result_flush_every=1,
+           result_fsync_every=0)
+# Release the worker pools when the server stops
+atexit.register(Baop.close)
 
 @app.route("/")
 def home():
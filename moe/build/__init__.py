@@ -0,0 +1 @@
+r"""Built\ C++\ files."""
@@ -422,6 +422,28 @@ boost::python::list FiniteDomain::SamplePointsInDomain(int sample_size,
   return output;
 }
 
+boost::python::list FiniteDomain::GetSelectedMask() const {
+  boost::python::list output;
+  for (size_t i = 0 ; i < n_points_ ; i++) {
+    output.append(static_cast<bool>(is_point_selected_[i]));
+  }
+  return output;
+}
+
+void FiniteDomain::SetSelectedMask(const boost::python::list& selected) {
+  const int n_selected = boost::python::len(selected);
+  if (n_selected != n_points_) {
+    OL_THROW_EXCEPTION(BoundsException<int>, "Invalid size of the selected mask.", n_selected, n_points_, n_points_);
+  }
+  n_available_points_ = n_points_;
+  for (size_t i = 0 ; i < n_points_ ; i++) {
+    is_point_selected_[i] = boost::python::extract<bool>(selected[i]);
+    if (is_point_selected_[i]) {
+      n_available_points_--;
+    }
+  }
+}
+
 // ======================== Python/Boost binding boilerplate ========================
 void ExportFiniteDomain() {
   boost::python::class_<FiniteDomain>(
@@ -433,6 +455,8 @@ void ExportFiniteDomain() {
       .def("get_data", &FiniteDomain::GetData)
       .def("find_distances_and_indexes_from_point", &FiniteDomain::FindDistancesAndIndexesFromPoint)
       .def("sample_points_in_domain", &FiniteDomain::SamplePointsInDomain)
+      .def("get_selected_mask", &FiniteDomain::GetSelectedMask)
+      .def("set_selected_mask", &FiniteDomain::SetSelectedMask)
       .def("print", &FiniteDomain::Print)
       ;
 }
@@ -436,6 +436,22 @@ class FiniteDomain {
   \endrst*/
   boost::python::list SamplePointsInDomain(int sample_size, bool allow_multiple_selection = false);
 
+  /*!\rst
+    Get which points were already returned by SamplePointsInDomain (without multiple selection).
+
+    \output
+      :list[n_points]: python list of bool, true if the same-index point was already returned
+  \endrst*/
+  boost::python::list GetSelectedMask() const;
+
+  /*!\rst
+    Set which points were already returned by SamplePointsInDomain, e.g. to restore a saved domain.
+
+    \param
+      :selected[n_points]: python list of bool, true if the same-index point was already returned
+  \endrst*/
+  void SetSelectedMask(const boost::python::list& selected);
+
   /*!\rst
 
     Return the distances and ordered indexes from the given point
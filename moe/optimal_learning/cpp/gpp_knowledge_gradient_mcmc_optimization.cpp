@@ -48,6 +48,44 @@ GaussianProcessMCMC::GaussianProcessMCMC(double const * restrict hypers_mcmc,
   }
 }
 
+void GaussianProcessMCMC::AddPointsToGP(double const * restrict new_points,
+                                        double const * restrict new_points_value,
+                                        int num_new_points,
+                                        bool incremental_cholesky) {
+  num_sampled_ += num_new_points;
+  points_sampled_.insert(points_sampled_.end(), new_points, new_points + num_new_points*dim_);
+  points_sampled_value_.insert(points_sampled_value_.end(), new_points_value,
+                               new_points_value + num_new_points*(num_derivatives_+1));
+  for (auto& gaussian_process : gaussian_process_lst) {
+    gaussian_process.AddPointsToGP(new_points, new_points_value, num_new_points, true, incremental_cholesky);
+  }
+}
+
+void GaussianProcessMCMC::SetHyperparameters(double const * restrict hypers_mcmc,
+                                             double const * restrict noises_mcmc,
+                                             int const * restrict reuse_index,
+                                             int number_mcmc) {
+  std::vector<GaussianProcess> new_gaussian_process_lst;
+  new_gaussian_process_lst.reserve(number_mcmc);
+  const double * hypers = hypers_mcmc;
+  const double * noises = noises_mcmc;
+  for (int i=0; i<number_mcmc; ++i) {
+    if (reuse_index[i] >= 0) {
+      new_gaussian_process_lst.emplace_back(gaussian_process_lst[reuse_index[i]]);
+    } else {
+      MaternNu2p5 sqexp(dim_, hypers[0], hypers+1);
+      new_gaussian_process_lst.emplace_back(sqexp, points_sampled_.data(), points_sampled_value_.data(),
+                                            noises, derivatives_.data(), num_derivatives_,
+                                            dim_, num_sampled_);
+      new_gaussian_process_lst.back().SetRandomizedSeed(0);
+    }
+    hypers += dim_+1;
+    noises += num_derivatives_+1;
+  }
+  gaussian_process_lst.swap(new_gaussian_process_lst);
+  num_mcmc_ = number_mcmc;
+}
+
 template <typename DomainType>
 KnowledgeGradientMCMCEvaluator<DomainType>::KnowledgeGradientMCMCEvaluator(const GaussianProcessMCMC& gaussian_process_mcmc, const int num_fidelity,
                                                                            double const * discrete_pts_lst,
@@ -186,7 +224,7 @@ template <typename DomainType>
 void KnowledgeGradientMCMCState<DomainType>::SetCurrentPoint(const EvaluatorType& kg_evaluator,
                                                              double const * restrict points_to_sample_in) {
   // update current point in union_of_points
-  std::copy(points_to_sample_in, points_to_sample_in + dim, union_of_points.data());
+  std::copy(points_to_sample_in, points_to_sample_in + num_to_sample*dim, union_of_points.data());
 
   // evaluate derived quantities for the GP
   for (int i=0; i<kg_evaluator.num_mcmc();++i){
@@ -116,8 +116,10 @@
 #define MOE_OPTIMAL_LEARNING_CPP_GPP_KNOWLEDGE_GRADIENT_MCMC_OPTIMIZATION_HPP_
 
 #include <algorithm>
+#include <exception>
 #include <limits>
 #include <memory>
+#include <mutex>
 #include <vector>
 
 #include <stdlib.h>
@@ -174,6 +176,38 @@ struct GaussianProcessMCMC final {
       return derivatives_;
     }
 
+    /*!\rst
+      Add the specified (point, fcn value) historical data to every GP of ``gaussian_process_lst``.
+
+      With ``incremental_cholesky``, the cholesky factor of each GP is extended with the rows of the new points
+      instead of being recomputed; see GaussianProcess::AddPointsToGP().
+
+      \param
+        :new_points[dim][num_new_points]: coordinates of each new point to add
+        :new_points_value[num_derivatives+1][num_new_points]: function value (and derivatives) at each new point
+        :num_new_points: number of new points to add to the GPs
+        :incremental_cholesky: whether to extend the current cholesky factors instead of recomputing them
+    \endrst*/
+    void AddPointsToGP(double const * restrict new_points,
+                       double const * restrict new_points_value,
+                       int num_new_points,
+                       bool incremental_cholesky);
+
+    /*!\rst
+      Replace the hyperparameter samples. The GPs of the samples with ``reuse_index[i] >= 0`` are copied from
+      ``gaussian_process_lst[reuse_index[i]]`` (same hyperparameters, no factorization); the others are built again.
+
+      \param
+        :hypers_mcmc[dim+1][num_mcmc]: covariance hyperparameters of each sample
+        :noises_mcmc[num_derivatives+1][num_mcmc]: noise variance of each sample
+        :reuse_index[num_mcmc]: index of the current GP with the same hyperparameters, or -1
+        :num_mcmc: number of hyperparameter samples
+    \endrst*/
+    void SetHyperparameters(double const * restrict hypers_mcmc,
+                            double const * restrict noises_mcmc,
+                            int const * restrict reuse_index,
+                            int num_mcmc) OL_NONNULL_POINTERS;
+
     std::vector<GaussianProcess> gaussian_process_lst;
 
  private:
@@ -838,6 +872,93 @@ void EvaluateKGMCMCAtPointList(GaussianProcessMCMC& gaussian_process_mcmc, const
     std::copy(io_container.best_point.begin(), io_container.best_point.end(), best_next_point);
 }
 
+/*!\rst
+  Function to evaluate the gradient of Knowledge Gradient (q,p-KG) wrt the points to sample over a specified list of
+  ``num_multistarts`` sets of points, e.g. all the restarts of a gradient ascent run in lockstep.
+
+  Equivalent to calling ComputeGradKnowledgeGradient() on each set, but the evaluator is built once and the sets are
+  distributed over the threads of ``thread_schedule``.
+
+  \param
+    :gaussian_process_mcmc: GaussianProcessMCMC object (holds the GPs of the hyperparameter samples)
+    :thread_schedule: struct instructing OpenMP on how to schedule threads; i.e., (suggestions in parens)
+      max_num_threads (num cpu cores), schedule type (omp_sched_static), chunk_size (0).
+    :points_to_sample[dim][num_to_sample][num_multistarts]: sets of points at which to compute the gradient of KG
+    :points_being_sampled[dim][num_being_sampled]: points that are being sampled in concurrent experiments
+    :discrete_pts[dim][num_pts]: points to approximate KG
+    :num_multistarts: number of sets of points
+    :num_to_sample: number of potential future samples; gradients are evaluated wrt these points (i.e., the "q" in q,p-KG)
+    :num_being_sampled: number of points being sampled concurrently (i.e., the "p" in q,p-KG)
+    :num_pts: number of points in discrete_pts
+    :best_so_far: value of the best mean value so far in discrete_pts
+    :max_int_steps: maximum number of MC iterations
+    :normal_rng[thread_schedule.max_num_threads]: a vector of NormalRNG objects that provide
+      the (pesudo)random source for MC integration
+  \output
+    :normal_rng[thread_schedule.max_num_threads]: NormalRNG objects will have their state changed due to random draws
+    :grad_kg[dim][num_to_sample][num_multistarts]: gradient of KG at each set of ``points_to_sample``, in the same order
+\endrst*/
+template <typename DomainType>
+void EvaluateGradKGMCMCAtPointList(GaussianProcessMCMC& gaussian_process_mcmc, const int num_fidelity,
+                                   const GradientDescentParameters& optimizer_parameters_inner,
+                                   const DomainType& inner_domain, const ThreadSchedule& thread_schedule,
+                                   double const * restrict points_to_sample,
+                                   double const * restrict points_being_sampled,
+                                   double const * discrete_pts,
+                                   int num_multistarts, int num_to_sample,
+                                   int num_being_sampled, int num_pts, double const * best_so_far,
+                                   int max_int_steps, NormalRNG * normal_rng,
+                                   double * restrict grad_kg) {
+    if (unlikely(num_multistarts <= 0)) {
+      OL_THROW_EXCEPTION(LowerBoundException<int>, "num_multistarts must be > 1", num_multistarts, 1);
+    }
+
+    bool configure_for_gradients = true;
+    std::vector<typename KnowledgeGradientState<DomainType>::EvaluatorType> kg_evaluator_lst;
+
+    KnowledgeGradientMCMCEvaluator<DomainType> kg_evaluator(gaussian_process_mcmc, num_fidelity, discrete_pts, num_pts, max_int_steps,
+                                                            inner_domain, optimizer_parameters_inner, best_so_far, &kg_evaluator_lst);
+
+    int num_derivatives = (*kg_evaluator.knowledge_gradient_evaluator_list())[0].gaussian_process()->num_derivatives();
+    std::vector<int> derivatives((*kg_evaluator.knowledge_gradient_evaluator_list())[0].gaussian_process()->derivatives());
+
+    std::vector<typename KnowledgeGradientMCMCEvaluator<DomainType>::StateType> state_vector;
+    std::vector<std::vector<typename KnowledgeGradientEvaluator<DomainType>::StateType>> kg_state_vector(thread_schedule.max_num_threads);
+    SetupKnowledgeGradientMCMCState(kg_evaluator, points_to_sample, points_being_sampled,
+                                    num_to_sample, num_being_sampled, num_pts, derivatives.data(), num_derivatives,
+                                    thread_schedule.max_num_threads, configure_for_gradients,
+                                    normal_rng, kg_state_vector.data(), &state_vector);
+    const int problem_size = state_vector[0].GetProblemSize();
+
+    // Exceptions cannot leave the parallel region: capture the first one and rethrow it afterwards
+    // (see MultistartOptimizer<...>::MultistartOptimize in gpp_optimization.hpp)
+    std::once_flag exception_capture_flag;
+    std::exception_ptr captured_exception;
+
+    omp_set_schedule(thread_schedule.schedule, thread_schedule.chunk_size);
+#pragma omp parallel num_threads(thread_schedule.max_num_threads)
+    {
+      int thread_id = omp_get_thread_num();
+
+#pragma omp for schedule(runtime)
+      for (int i = 0; i < num_multistarts; ++i) {
+        try {
+          state_vector[thread_id].SetCurrentPoint(kg_evaluator, points_to_sample + i*problem_size);
+          kg_evaluator.ComputeGradKnowledgeGradient(&state_vector[thread_id], grad_kg + i*problem_size);
+        } catch (const std::exception& except) {
+          OL_ERROR_PRINTF("Thread %d of %d failed on iteration %d of %d. Message:\n%s\n", thread_id, thread_schedule.max_num_threads, i, num_multistarts, except.what());
+          std::call_once(exception_capture_flag, [&captured_exception]() {
+              captured_exception = std::current_exception();
+            });
+        }
+      }
+    }  // end omp parallel region
+
+    if (captured_exception != nullptr) {
+      std::rethrow_exception(captured_exception);
+    }
+}
+
 /*!\rst
   Perform multistart gradient descent (MGD) to solve the q,p-KG problem (see ComputeKGOptimalPointsToSample and/or
   header docs), starting from ``num_multistarts`` points selected randomly from the within the domain.
@@ -234,6 +234,9 @@ void KnowledgeGradientState<DomainType>::SetCurrentPoint(const EvaluatorType& kg
                                                          double const * restrict points_to_sample) {
   // update points_to_sample in union_of_points
   std::copy(points_to_sample, points_to_sample + num_to_sample*dim, union_of_points.data());
+  // and in the discretized set, which starts with the union of points (without the fidelity dimensions)
+  subset_union_of_points = SubsetData(union_of_points.data(), num_union, kg_evaluator.num_fidelity());
+  std::copy(subset_union_of_points.begin(), subset_union_of_points.end(), discretized_set.begin());
 
   // evaluate derived quantities for the GP
   points_to_sample_state.SetupState(*kg_evaluator.gaussian_process(), union_of_points.data(),
@@ -528,6 +528,90 @@ void GaussianProcess::RecomputeCholeskyVariables() {
   }
 }
 
+bool GaussianProcess::AppendCholeskyVariables(int num_new_points) {
+  // smallest diagonal entry allowed in the appended block, relative to the largest one of the old factor
+  constexpr double kMinRelativeCholeskyDiagonal = 1.0e-8;
+
+  const int block_size = num_derivatives_ + 1;
+  const int num_old_points = num_sampled_ - num_new_points;
+  const int old_size = num_old_points*block_size;
+  const int new_size = num_sampled_*block_size;
+  const int num_new_rows = new_size - old_size;
+  if (unlikely(num_old_points <= 0 || static_cast<int>(K_chol_.size()) != Square(old_size))) {
+    return false;
+  }
+
+  // copy the lower triangle of the old factor, now with leading dimension new_size
+  std::vector<double> chol(Square(new_size), 0.0);
+  double max_old_diagonal = 0.0;
+  for (int col = 0; col < old_size; ++col) {
+    std::copy(K_chol_.data() + col*old_size + col, K_chol_.data() + (col + 1)*old_size,
+              chol.data() + col*new_size + col);
+    max_old_diagonal = std::fmax(max_old_diagonal, K_chol_[col*old_size + col]);
+  }
+
+  // cross[old_size][num_new_rows]: covariance between old and new points (B)
+  // schur[num_new_rows][num_new_rows]: lower triangle of the covariance of the new points, with noise (C)
+  std::vector<double> cross(old_size*num_new_rows);
+  std::vector<double> schur(Square(num_new_rows), 0.0);
+  std::vector<double> cov_temp(Square(block_size));
+  for (int i = num_old_points; i < num_sampled_; ++i) {  // col
+    for (int j = 0; j < num_sampled_; ++j) {  // row
+      if (j >= num_old_points && j < i) {
+        continue;  // upper triangle of C
+      }
+      covariance_ptr_->Covariance(points_sampled_.data() + j*dim_, derivatives_.data(), num_derivatives_,
+                                  points_sampled_.data() + i*dim_, derivatives_.data(), num_derivatives_,
+                                  cov_temp.data());
+      for (int m = 0; m < block_size; ++m) {
+        for (int n = 0; n < block_size; ++n) {
+          int row = j*block_size + m;
+          int col = i*block_size + n - old_size;
+          if (row < old_size) {
+            cross[row + col*old_size] = cov_temp[m + n*block_size];
+          } else if (row - old_size >= col) {
+            schur[(row - old_size) + col*num_new_rows] = cov_temp[m + n*block_size];
+            if (row - old_size == col) {
+              schur[(row - old_size) + col*num_new_rows] += noise_variance_[m];
+            }
+          }
+        }
+      }
+    }
+  }
+
+  // S^T = L \ B, then C - S * S^T (lower triangle only)
+  TriangularMatrixMatrixSolve(chol.data(), 'N', old_size, num_new_rows, new_size, cross.data());
+  for (int col = 0; col < num_new_rows; ++col) {
+    for (int row = col; row < num_new_rows; ++row) {
+      schur[row + col*num_new_rows] -= DotProduct(cross.data() + row*old_size, cross.data() + col*old_size, old_size);
+    }
+  }
+
+  if (ComputeCholeskyFactorL(num_new_rows, schur.data()) != 0) {
+    return false;
+  }
+  for (int col = 0; col < num_new_rows; ++col) {
+    if (!(schur[col + col*num_new_rows] > kMinRelativeCholeskyDiagonal*max_old_diagonal)) {
+      return false;
+    }
+  }
+
+  // assemble the new factor: S in the lower-left block, Lc in the lower-right one
+  for (int col = 0; col < num_new_rows; ++col) {
+    for (int k = 0; k < old_size; ++k) {
+      chol[(old_size + col) + k*new_size] = cross[k + col*old_size];
+    }
+    for (int row = col; row < num_new_rows; ++row) {
+      chol[(old_size + row) + (old_size + col)*new_size] = schur[row + col*num_new_rows];
+    }
+  }
+
+  K_chol_.swap(chol);
+  K_inv_y_.resize(new_size);
+  return true;
+}
+
 void GaussianProcess::RecomputeMeanVariables(bool mean_change /* = true*/) {
   // resize if needed
   if (unlikely(static_cast<int>(K_inv_y_.size()) != num_sampled_*(num_derivatives_+1))) {
@@ -1700,7 +1784,8 @@ void GaussianProcess::AddPointsToGP(double const * restrict new_points,
                                     double const * restrict new_points_value,
 //                                    double const * restrict new_points_noise_variance,
                                     int num_new_points,
-                                    bool mean_change /* = true*/) {
+                                    bool mean_change /* = true*/,
+                                    bool incremental_cholesky /* = false*/) {
   // update sizes
   num_sampled_ += num_new_points;
 
@@ -1711,15 +1796,18 @@ void GaussianProcess::AddPointsToGP(double const * restrict new_points,
   points_sampled_value_.resize(num_sampled_*(num_derivatives_+1));
   std::copy_backward(new_points_value, new_points_value + num_new_points*(num_derivatives_+1), points_sampled_value_.end());
 
-  // recompute derived quantities
-  // TODO(GH-192): Insert the new covariance (and cholesky covariance) rows into the current matrix  (O(N^2))
-  // instead of recomputing everything (O(N^3)).
-  RecomputeDerivedVariables(mean_change);
+  // recompute derived quantities, extending the cholesky factor (O(N^2)) instead of recomputing it (O(N^3)) if possible
+  if (incremental_cholesky && AppendCholeskyVariables(num_new_points)) {
+    RecomputeMeanVariables(mean_change);
+  } else {
+    RecomputeDerivedVariables(mean_change);
+  }
 }
 
 void GaussianProcess::AddSampledPointsToGP(double const * restrict new_points,
                                            double const * restrict new_points_value,
-                                           int num_new_points) {
+                                           int num_new_points,
+                                           bool incremental_cholesky /* = false*/) {
   // update sizes
   num_sampled_ += num_new_points;
 
@@ -1730,10 +1818,10 @@ void GaussianProcess::AddSampledPointsToGP(double const * restrict new_points,
   points_sampled_value_.resize(num_sampled_*(num_derivatives_+1));
   std::copy_backward(new_points_value, new_points_value + num_new_points*(num_derivatives_+1), points_sampled_value_.end());
 
-  // recompute derived quantities
-  // TODO(GH-192): Insert the new covariance (and cholesky covariance) rows into the current matrix  (O(N^2))
-  // instead of recomputing everything (O(N^3)).
-  RecomputeCholeskyVariables();
+  // recompute derived quantities, extending the cholesky factor (O(N^2)) instead of recomputing it (O(N^3)) if possible
+  if (!(incremental_cholesky && AppendCholeskyVariables(num_new_points))) {
+    RecomputeCholeskyVariables();
+  }
 }
 
 void GaussianProcess::NewSampledValue(double const * restrict new_points_value,
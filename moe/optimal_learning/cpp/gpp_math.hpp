@@ -384,21 +384,29 @@ class GaussianProcess final {
 
     Forces recomputation of all derived quantities for GP to remain consistent.
 
+    With ``incremental_cholesky``, the cholesky factor of the covariance is extended with the rows of the new points
+    (block cholesky append, ``O(N^2 * num_new_points)``) instead of being recomputed from scratch (``O(N^3)``).
+    The full factorization is still used if the appended block is not (numerically) positive definite.
+
     \param
       :new_points[dim][num_new_points]: coordinates of each new point to add
       :new_points_value[num_new_points]: function value at each new point
       :new_points_noise_variance[num_new_points]: \sigma_n^2 corresponding to the signal noise in measuring new_points_value
       :num_new_points: number of new points to add to the GP
+      :mean_change: whether to recompute the prior mean
+      :incremental_cholesky: whether to extend the current cholesky factor instead of recomputing it
   \endrst*/
   void AddPointsToGP(double const * restrict new_points,
                      double const * restrict new_points_value,
                      //double const * restrict new_points_noise_variance,
                      int num_new_points,
-                     bool mean_change = true);
+                     bool mean_change = true,
+                     bool incremental_cholesky = false);
 
   void AddSampledPointsToGP(double const * restrict new_points,
                             double const * restrict new_points_value,
-                            int num_new_points);
+                            int num_new_points,
+                            bool incremental_cholesky = false);
 
   void NewSampledValue(double const * restrict new_points_value,
                        int num_new_points,
@@ -833,6 +841,27 @@ class GaussianProcess final {
 
   void RecomputeCholeskyVariables();
 
+  /*!\rst
+    Extends ``K_chol_`` after the last ``num_new_points`` points of ``points_sampled_`` were appended, assuming
+    the covariance hyperparameters and the noise did not change.
+
+    With ``K = L * L^T`` the old covariance, ``B`` the covariance between old and new points and ``C`` the covariance
+    (with noise) of the new points, the new factor is::
+
+      [ L  0  ]
+      [ S  Lc ],  S^T = L \ B,  Lc = chol(C - S * S^T)
+
+    which costs ``O(N^2 * q)`` for ``q`` new rows instead of ``O((N + q)^3)``.
+
+    \param
+      :num_new_points: number of points appended at the end of ``points_sampled_``
+    \return
+      true if successful. false if there are no old points, or if the Schur complement ``C - S * S^T`` is not
+      positive definite or badly conditioned w.r.t. ``L``; then ``K_chol_`` is NOT modified and
+      the caller must recompute it from scratch.
+  \endrst*/
+  bool AppendCholeskyVariables(int num_new_points);
+
   void RecomputeMeanVariables(bool mean_change = true);
 
   // size information
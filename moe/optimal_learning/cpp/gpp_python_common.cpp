@@ -15,7 +15,9 @@
 #include "gpp_python_common.hpp"
 
 // NOLINT-ing the C, C++ header includes as well; otherwise cpplint gets confused
+#include <cstdint>  // NOLINT(build/include_order)
 #include <cstdio>  // NOLINT(build/include_order)
+#include <cstring>  // NOLINT(build/include_order)
 
 #include <vector>  // NOLINT(build/include_order)
 
@@ -23,6 +25,7 @@
 #include <boost/python/class.hpp>  // NOLINT(build/include_order)
 #include <boost/python/enum.hpp>  // NOLINT(build/include_order)
 #include <boost/python/extract.hpp>  // NOLINT(build/include_order)
+#include <boost/python/import.hpp>  // NOLINT(build/include_order)
 #include <boost/python/list.hpp>  // NOLINT(build/include_order)
 
 #include "gpp_common.hpp"
@@ -34,22 +37,114 @@
 
 namespace optimal_learning {
 
-void CopyPylistToVector(const boost::python::list& input, int size, std::vector<double>& output) {
+namespace {
+
+/*!\rst
+  RAII holder of a C-contiguous ``Py_buffer`` view of a python object.
+  ``valid()`` is false (and no python error is set) if the object does not expose such a buffer.
+\endrst*/
+class ContiguousBufferView {
+ public:
+  explicit ContiguousBufferView(PyObject * object) : valid_(false) {
+    if (PyObject_CheckBuffer(object)) {
+      if (PyObject_GetBuffer(object, &view_, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) == 0) {
+        valid_ = true;
+      } else {
+        PyErr_Clear();
+      }
+    }
+  }
+
+  ~ContiguousBufferView() {
+    if (valid_) {
+      PyBuffer_Release(&view_);
+    }
+  }
+
+  bool valid() const noexcept {
+    return valid_;
+  }
+
+  //! struct-module type code of the items (ignoring native/little endian byte order markers), 0 if non-native
+  char type_code() const noexcept {
+    const char * format = view_.format == nullptr ? "B" : view_.format;
+    if (*format == '@' || *format == '=' || *format == '<') {
+      ++format;
+    }
+    return format[1] == '\0' ? format[0] : 0;
+  }
+
+  Py_ssize_t itemsize() const noexcept {
+    return view_.itemsize;
+  }
+
+  Py_ssize_t num_items() const noexcept {
+    return view_.itemsize > 0 ? view_.len / view_.itemsize : 0;
+  }
+
+  void const * data() const noexcept {
+    return view_.buf;
+  }
+
+ private:
+  bool valid_;
+  Py_buffer view_;
+
+  OL_DISALLOW_DEFAULT_AND_COPY_AND_ASSIGN(ContiguousBufferView);
+};
+
+/*!\rst
+  Copies the first size integers of a buffer with items of type ``IntType`` into output.
+\endrst*/
+template <typename IntType>
+void CopyIntBufferToVector(void const * buffer, int size, std::vector<int>& output) {
+  IntType const * input = static_cast<IntType const *>(buffer);
+  for (int i = 0; i < size; ++i) {
+    output[i] = static_cast<int>(input[i]);
+  }
+}
+
+}  // end unnamed namespace
+
+void CopyPylistToVector(const boost::python::object& input, int size, std::vector<double>& output) {
   output.resize(size);
+  if (size == 0) {
+    return;
+  }
+  ContiguousBufferView view(input.ptr());
+  if (view.valid() && view.type_code() == 'd' && view.num_items() >= size) {
+    std::memcpy(output.data(), view.data(), size*sizeof(double));
+    return;
+  }
   for (int i = 0; i < size; ++i) {
     output[i] = boost::python::extract<double>(input[i]);
   }
 }
 
 
-void CopyPylistToIntVector(const boost::python::list& input, int size, std::vector<int>& output) {
+void CopyPylistToIntVector(const boost::python::object& input, int size, std::vector<int>& output) {
   output.resize(size);
+  if (size == 0) {
+    return;
+  }
+  ContiguousBufferView view(input.ptr());
+  if (view.valid() && view.num_items() >= size) {
+    const char type_code = view.type_code();
+    if ((type_code == 'l' || type_code == 'q') && view.itemsize() == sizeof(std::int64_t)) {
+      CopyIntBufferToVector<std::int64_t>(view.data(), size, output);
+      return;
+    }
+    if ((type_code == 'i' || type_code == 'l') && view.itemsize() == sizeof(std::int32_t)) {
+      CopyIntBufferToVector<std::int32_t>(view.data(), size, output);
+      return;
+    }
+  }
   for (int i = 0; i < size; ++i) {
     output[i] = boost::python::extract<int>(input[i]);
   }
 }
 
-void CopyPylistToClosedIntervalVector(const boost::python::list& input, int size, std::vector<ClosedInterval>& output) {
+void CopyPylistToClosedIntervalVector(const boost::python::object& input, int size, std::vector<ClosedInterval>& output) {
   output.resize(size);
   for (int i = 0; i < size; ++i) {
     output[i].min = boost::python::extract<double>(input[2*i + 0]);
@@ -75,8 +170,19 @@ boost::python::list IntVectorToPylist(const std::vector<int>& input) {
   return result;
 }
 
+boost::python::object VectorToNumpyArray(const std::vector<double>& input) {
+  // never destroyed: python objects must not outlive the interpreter as static C++ objects
+  static const boost::python::object * const numpy_frombuffer =
+      new boost::python::object(boost::python::import("numpy").attr("frombuffer"));
+
+  // a bytearray (unlike bytes) gives a writeable array, which owns (a reference to) its data
+  boost::python::object data(boost::python::handle<>(PyByteArray_FromStringAndSize(
+      reinterpret_cast<const char *>(input.data()), input.size()*sizeof(double))));
+  return (*numpy_frombuffer)(data, "float64");
+}
+
 
-PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::list& points_to_sample_in, const boost::python::list& derivatives_in,
+PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::object& points_to_sample_in, const boost::python::object& derivatives_in,
                                                              int dim_in, int num_to_sample_in, int num_derivatives_in)
     : dim(dim_in),
       num_to_sample(num_to_sample_in),
@@ -87,9 +193,9 @@ PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python
   CopyPylistToIntVector(derivatives_in, num_derivatives, derivatives);
 }
 
-PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::list& points_to_sample_in,
-                                                             const boost::python::list& points_being_sampled_in,
-                                                             const boost::python::list& derivatives_in,
+PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::object& points_to_sample_in,
+                                                             const boost::python::object& points_being_sampled_in,
+                                                             const boost::python::object& derivatives_in,
                                                              int dim_in, int num_to_sample_in, int num_being_sampled_in, int num_derivatives_in)
     : dim(dim_in),
       num_to_sample(num_to_sample_in),
@@ -104,9 +210,9 @@ PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python
 
 }
 
-PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::list& hyperparameters_in, const boost::python::list& points_sampled_in,
-                              const boost::python::list& points_sampled_value_in, const boost::python::list& noise_variance_in,
-                              const boost::python::list& points_to_sample_in, const boost::python::list& derivatives_in,
+PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python::object& hyperparameters_in, const boost::python::object& points_sampled_in,
+                              const boost::python::object& points_sampled_value_in, const boost::python::object& noise_variance_in,
+                              const boost::python::object& points_to_sample_in, const boost::python::object& derivatives_in,
                               int num_derivatives_in, int dim_in, int num_sampled_in, int num_to_sample_in)
     : dim(dim_in),
       num_sampled(num_sampled_in),
@@ -119,7 +225,7 @@ PythonInterfaceInputContainer::PythonInterfaceInputContainer(const boost::python
       noise_variance(1+num_derivatives_in),
       points_to_sample(dim*num_to_sample),
       derivatives(num_derivatives) {
-  const boost::python::list& lengths_in = boost::python::extract<boost::python::list>(hyperparameters_in[1]);
+  const boost::python::object lengths_in = hyperparameters_in[1];
   CopyPylistToVector(lengths_in, dim, lengths);
   CopyPylistToVector(points_sampled_in, dim*num_sampled, points_sampled);
   CopyPylistToVector(points_sampled_value_in, num_sampled*(1+num_derivatives_in), points_sampled_value);
@@ -159,7 +265,7 @@ void RandomnessSourceContainer::SetRandomizedNormalRNGSeed(NormalRNG::EngineType
   }
 }
 
-bool RandomnessSourceContainer::SetNormalRNGSeedPythonList(const boost::python::list& seed_list, const boost::python::list& seed_flag_list) {
+bool RandomnessSourceContainer::SetNormalRNGSeedPythonList(const boost::python::object& seed_list, const boost::python::object& seed_flag_list) {
   auto seed_list_len = boost::python::len(seed_list);
   auto seed_flag_list_len = boost::python::len(seed_flag_list);
   IdentifyType<decltype(seed_flag_list_len)>::type num_threads = normal_rng_vec.size();
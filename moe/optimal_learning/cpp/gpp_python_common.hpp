@@ -74,7 +74,7 @@ struct PythonInterfaceInputContainer {
       :dim: number of spatial dimension (independent parameters)
       :num_to_sample: number of points being sampled from the GP
   \endrst*/
-  PythonInterfaceInputContainer(const boost::python::list& points_to_sample_in, const boost::python::list& derivatives_in,
+  PythonInterfaceInputContainer(const boost::python::object& points_to_sample_in, const boost::python::object& derivatives_in,
                                 int dim_in, int num_to_sample_in, int num_derivatives_in);
 
   /*!\rst
@@ -88,9 +88,9 @@ struct PythonInterfaceInputContainer {
       :num_to_sample: number of potential future samples; gradients are evaluated wrt these points (i.e., the "q" in q,p-EI)
       :num_being_sampled: number of points being sampled concurrently (i.e., the "p" in q,p-EI)
   \endrst*/
-  PythonInterfaceInputContainer(const boost::python::list& points_to_sample_in,
-                                const boost::python::list& points_being_sampled_in,
-                                const boost::python::list& derivatives_in,
+  PythonInterfaceInputContainer(const boost::python::object& points_to_sample_in,
+                                const boost::python::object& points_being_sampled_in,
+                                const boost::python::object& derivatives_in,
                                 int dim_in, int num_to_sample_in, int num_being_sampled_in, int num_derivatives_in);
 
   /*!\rst
@@ -108,9 +108,9 @@ struct PythonInterfaceInputContainer {
       :num_sampled: number of already-sampled points
       :num_to_sample: number of points being sampled from the GP
   \endrst*/
-  PythonInterfaceInputContainer(const boost::python::list& hyperparameters_in, const boost::python::list& points_sampled_in,
-                                const boost::python::list& points_sampled_value_in, const boost::python::list& noise_variance_in,
-                                const boost::python::list& points_to_sample_in, const boost::python::list& derivatives_in,
+  PythonInterfaceInputContainer(const boost::python::object& hyperparameters_in, const boost::python::object& points_sampled_in,
+                                const boost::python::object& points_sampled_value_in, const boost::python::object& noise_variance_in,
+                                const boost::python::object& points_to_sample_in, const boost::python::object& derivatives_in,
                                 int num_derivatives_in, int dim_in, int num_sampled_in, int num_to_sample_in);
 
   int dim;
@@ -215,7 +215,7 @@ class RandomnessSourceContainer {
     \return
       true if successful, false otherwise (due to invalid sizes)
   \endrst*/
-  bool SetNormalRNGSeedPythonList(const boost::python::list& seed_list, const boost::python::list& seed_flag_list);
+  bool SetNormalRNGSeedPythonList(const boost::python::object& seed_list, const boost::python::object& seed_flag_list);
 
   /*!\rst
     Resets all threads' RNGs to the seed values they were initialized with.  Useful for testing.
@@ -240,17 +240,20 @@ class RandomnessSourceContainer {
   Copies the first doubles elements of a python list (input) into a std::vector (output)
   Resizes output if needed.
 
+  ``input`` may also be any object exposing a C-contiguous buffer (e.g., a numpy array, see ``cpp_utils.cppify``):
+  float64 buffers are copied with a single ``memcpy``, other types element by element.
+
   .. WARNING:: undefined behavior if the python list contains anything except type ``double``!
 
   \param
-    :input: python list to copy from
+    :input: python list (or buffer) to copy from
     :size: number of elements to copy
   \output
     :output: std::vector with copies of the first size items of input
 \endrst*/
-void CopyPylistToVector(const boost::python::list& input, int size, std::vector<double>& output);
+void CopyPylistToVector(const boost::python::object& input, int size, std::vector<double>& output);
 
-void CopyPylistToIntVector(const boost::python::list& input, int size, std::vector<int>& output);
+void CopyPylistToIntVector(const boost::python::object& input, int size, std::vector<int>& output);
 
 /*!\rst
   Copies the first size [min, max] pairs from input to output.
@@ -264,7 +267,7 @@ void CopyPylistToIntVector(const boost::python::list& input, int size, std::vect
   \output
     :output: std::vector with copies of the first size items of input
 \endrst*/
-void CopyPylistToClosedIntervalVector(const boost::python::list& input, int size, std::vector<ClosedInterval>& output);
+void CopyPylistToClosedIntervalVector(const boost::python::object& input, int size, std::vector<ClosedInterval>& output);
 
 /*!\rst
   Produces a PyList with the same size as the input vector and that is
@@ -279,6 +282,17 @@ boost::python::list VectorToPylist(const std::vector<double>& input);
 
 boost::python::list IntVectorToPylist(const std::vector<int>& input);
 
+/*!\rst
+  Produces a 1D float64 numpy array with the same size as the input vector and that is
+  element-wise equal to the input vector. The data is copied once, in bulk.
+
+  \param
+    :input: std::vector to be copied
+  \return
+    numpy array (writeable, owning its data) that is element-wise equivalent to input
+\endrst*/
+boost::python::object VectorToNumpyArray(const std::vector<double>& input);
+
 /*!\rst
   Export C++'s enum classes to Python; e.g., DomainTypes, OptimizerTypes, etc. Includes docstrings.
 \endrst*/
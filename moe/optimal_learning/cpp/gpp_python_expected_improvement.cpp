@@ -42,8 +42,8 @@ namespace optimal_learning {
 
 namespace {
 double ComputeExpectedImprovementWrapper(const GaussianProcess& gaussian_process,
-                                         const boost::python::list& points_to_sample,
-                                         const boost::python::list& points_being_sampled,
+                                         const boost::python::object& points_to_sample,
+                                         const boost::python::object& points_being_sampled,
                                          int num_to_sample, int num_being_sampled,
                                          int max_int_steps, double best_so_far,
                                          bool force_monte_carlo,
@@ -73,13 +73,13 @@ double ComputeExpectedImprovementWrapper(const GaussianProcess& gaussian_process
 //  }
 }
 
-boost::python::list ComputeGradExpectedImprovementWrapper(const GaussianProcess& gaussian_process,
-                                                          const boost::python::list& points_to_sample,
-                                                          const boost::python::list& points_being_sampled,
-                                                          int num_to_sample, int num_being_sampled,
-                                                          int max_int_steps, double best_so_far,
-                                                          bool force_monte_carlo,
-                                                          RandomnessSourceContainer& randomness_source) {
+boost::python::object ComputeGradExpectedImprovementWrapper(const GaussianProcess& gaussian_process,
+                                                            const boost::python::object& points_to_sample,
+                                                            const boost::python::object& points_being_sampled,
+                                                            int num_to_sample, int num_being_sampled,
+                                                            int max_int_steps, double best_so_far,
+                                                            bool force_monte_carlo,
+                                                            RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -105,7 +105,7 @@ boost::python::list ComputeGradExpectedImprovementWrapper(const GaussianProcess&
     ei_evaluator.ComputeGradExpectedImprovement(&ei_state, grad_EI.data());
 //  }
 
-  return VectorToPylist(grad_EI);
+  return VectorToNumpyArray(grad_EI);
 }
 
 /*!\rst
@@ -218,15 +218,15 @@ void DispatchExpectedImprovementOptimization(const boost::python::object& optimi
   }  // end switch over optimizer_type
 }
 
-boost::python::list MultistartExpectedImprovementOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                     const GaussianProcess& gaussian_process,
-                                                                     const boost::python::list& domain_bounds,
-                                                                     const boost::python::list& points_being_sampled,
-                                                                     int num_to_sample, int num_being_sampled,
-                                                                     double best_so_far, int max_int_steps,
-                                                                     int max_num_threads, bool use_gpu, int which_gpu,
-                                                                     RandomnessSourceContainer& randomness_source,
-                                                                     boost::python::dict& status) {
+boost::python::object MultistartExpectedImprovementOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                       const GaussianProcess& gaussian_process,
+                                                                       const boost::python::object& domain_bounds,
+                                                                       const boost::python::object& points_being_sampled,
+                                                                       int num_to_sample, int num_being_sampled,
+                                                                       double best_so_far, int max_int_steps,
+                                                                       int max_num_threads, bool use_gpu, int which_gpu,
+                                                                       RandomnessSourceContainer& randomness_source,
+                                                                       boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
 
@@ -272,7 +272,7 @@ boost::python::list MultistartExpectedImprovementOptimizationWrapper(const boost
     }
   }  // end switch over domain_type
 
-  return VectorToPylist(best_points_to_sample_C);
+  return VectorToNumpyArray(best_points_to_sample_C);
 }
 
 /*!\rst
@@ -352,13 +352,13 @@ void DispatchHeuristicExpectedImprovementOptimization(const boost::python::objec
   }  // end switch over optimizer_type
 }
 
-boost::python::list HeuristicExpectedImprovementOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                    const GaussianProcess& gaussian_process,
-                                                                    const boost::python::list& domain_bounds,
-                                                                    const ObjectiveEstimationPolicyInterface& estimation_policy,
-                                                                    int num_to_sample, double best_so_far, int max_num_threads,
-                                                                    RandomnessSourceContainer& randomness_source,
-                                                                    boost::python::dict& status) {
+boost::python::object HeuristicExpectedImprovementOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                      const GaussianProcess& gaussian_process,
+                                                                      const boost::python::object& domain_bounds,
+                                                                      const ObjectiveEstimationPolicyInterface& estimation_policy,
+                                                                      int num_to_sample, double best_so_far, int max_num_threads,
+                                                                      RandomnessSourceContainer& randomness_source,
+                                                                      boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
   int dim = gaussian_process.dim();
@@ -395,17 +395,17 @@ boost::python::list HeuristicExpectedImprovementOptimizationWrapper(const boost:
     }
   }  // end switch over domain_type
 
-  return VectorToPylist(best_points_to_sample_C);
+  return VectorToNumpyArray(best_points_to_sample_C);
 }
 */
-boost::python::list EvaluateEIAtPointListWrapper(const GaussianProcess& gaussian_process,
-                                                 const boost::python::list& initial_guesses,
-                                                 const boost::python::list& points_being_sampled,
-                                                 int num_multistarts, int num_to_sample,
-                                                 int num_being_sampled, double best_so_far,
-                                                 int max_int_steps, int max_num_threads,
-                                                 RandomnessSourceContainer& randomness_source,
-                                                 boost::python::dict& status) {
+boost::python::object EvaluateEIAtPointListWrapper(const GaussianProcess& gaussian_process,
+                                                   const boost::python::object& initial_guesses,
+                                                   const boost::python::object& points_being_sampled,
+                                                   int num_multistarts, int num_to_sample,
+                                                   int num_being_sampled, double best_so_far,
+                                                   int max_int_steps, int max_num_threads,
+                                                   RandomnessSourceContainer& randomness_source,
+                                                   boost::python::dict& status) {
   // abort if we do not have enough sources of randomness to run with max_num_threads
   if (unlikely(max_num_threads > static_cast<int>(randomness_source.normal_rng_vec.size()))) {
     OL_THROW_EXCEPTION(LowerBoundException<int>, "Fewer randomness_sources than max_num_threads.", randomness_source.normal_rng_vec.size(), max_num_threads);
@@ -437,7 +437,7 @@ boost::python::list EvaluateEIAtPointListWrapper(const GaussianProcess& gaussian
 
   status["evaluate_EI_at_point_list"] = found_flag;
 
-  return VectorToPylist(result_function_values_C);
+  return VectorToNumpyArray(result_function_values_C);
 }
 
 }  // end unnamed namespace
@@ -44,10 +44,10 @@ namespace optimal_learning {
 namespace {
 
 double ComputeExpectedImprovementMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
-                                             const boost::python::list& points_to_sample,
-                                             const boost::python::list& points_being_sampled,
+                                             const boost::python::object& points_to_sample,
+                                             const boost::python::object& points_being_sampled,
                                              int num_to_sample, int num_being_sampled,
-                                             int max_int_steps, const boost::python::list& best_so_far,
+                                             int max_int_steps, const boost::python::object& best_so_far,
                                              RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
@@ -75,12 +75,12 @@ double ComputeExpectedImprovementMCMCWrapper(GaussianProcessMCMC& gaussian_proce
   return ei_evaluator.ComputeExpectedImprovement(&ei_state);
 }
 
-boost::python::list ComputeGradExpectedImprovementMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
-                                                              const boost::python::list& points_to_sample,
-                                                              const boost::python::list& points_being_sampled,
-                                                              int num_to_sample, int num_being_sampled,
-                                                              int max_int_steps, const boost::python::list& best_so_far,
-                                                              RandomnessSourceContainer& randomness_source) {
+boost::python::object ComputeGradExpectedImprovementMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                                const boost::python::object& points_to_sample,
+                                                                const boost::python::object& points_being_sampled,
+                                                                int num_to_sample, int num_being_sampled,
+                                                                int max_int_steps, const boost::python::object& best_so_far,
+                                                                RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -107,7 +107,7 @@ boost::python::list ComputeGradExpectedImprovementMCMCWrapper(GaussianProcessMCM
                                                        randomness_source.normal_rng_vec.data(), &state_vector);
   ei_evaluator.ComputeGradExpectedImprovement(&ei_state, grad_EI.data());
 
-  return VectorToPylist(grad_EI);
+  return VectorToNumpyArray(grad_EI);
 }
 
 /*!\rst
@@ -190,14 +190,14 @@ void DispatchExpectedImprovementMCMCOptimization(const boost::python::object& op
   }  // end switch over optimizer_type
 }
 
-boost::python::list MultistartExpectedImprovementMCMCOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                       GaussianProcessMCMC& gaussian_process_mcmc,
-                                                                       const boost::python::list& domain_bounds,
-                                                                       const boost::python::list& points_being_sampled,
-                                                                       int num_to_sample, int num_being_sampled,
-                                                                       const boost::python::list& best_so_far, int max_int_steps, int max_num_threads,
-                                                                       RandomnessSourceContainer& randomness_source,
-                                                                       boost::python::dict& status) {
+boost::python::object MultistartExpectedImprovementMCMCOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                         GaussianProcessMCMC& gaussian_process_mcmc,
+                                                                         const boost::python::object& domain_bounds,
+                                                                         const boost::python::object& points_being_sampled,
+                                                                         int num_to_sample, int num_being_sampled,
+                                                                         const boost::python::object& best_so_far, int max_int_steps, int max_num_threads,
+                                                                         RandomnessSourceContainer& randomness_source,
+                                                                         boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
 
@@ -249,17 +249,17 @@ boost::python::list MultistartExpectedImprovementMCMCOptimizationWrapper(const b
     }
   }  // end switch over domain_type
 
-  return VectorToPylist(best_points_to_sample_C);
+  return VectorToNumpyArray(best_points_to_sample_C);
 }
 
-boost::python::list EvaluateEIMCMCAtPointListWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
-                                                     const boost::python::list& initial_guesses,
-                                                     const boost::python::list& points_being_sampled,
-                                                     int num_multistarts, int num_to_sample,
-                                                     int num_being_sampled, const boost::python::list& best_so_far,
-                                                     int max_int_steps, int max_num_threads,
-                                                     RandomnessSourceContainer& randomness_source,
-                                                     boost::python::dict& status) {
+boost::python::object EvaluateEIMCMCAtPointListWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                       const boost::python::object& initial_guesses,
+                                                       const boost::python::object& points_being_sampled,
+                                                       int num_multistarts, int num_to_sample,
+                                                       int num_being_sampled, const boost::python::object& best_so_far,
+                                                       int max_int_steps, int max_num_threads,
+                                                       RandomnessSourceContainer& randomness_source,
+                                                       boost::python::dict& status) {
   // abort if we do not have enough sources of randomness to run with max_num_threads
   if (unlikely(max_num_threads > static_cast<int>(randomness_source.normal_rng_vec.size()))) {
     OL_THROW_EXCEPTION(LowerBoundException<int>, "Fewer randomness_sources than max_num_threads.", randomness_source.normal_rng_vec.size(), max_num_threads);
@@ -294,7 +294,7 @@ boost::python::list EvaluateEIMCMCAtPointListWrapper(GaussianProcessMCMC& gaussi
 
   status["evaluate_EI_at_point_list"] = found_flag;
 
-  return VectorToPylist(result_function_values_C);
+  return VectorToNumpyArray(result_function_values_C);
 }
 }  // end unnamed namespace
 
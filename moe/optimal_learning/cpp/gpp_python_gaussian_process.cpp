@@ -22,6 +22,8 @@
 #include <boost/python/class.hpp>  // NOLINT(build/include_order)
 #include <boost/python/list.hpp>  // NOLINT(build/include_order)
 #include <boost/python/make_constructor.hpp>  // NOLINT(build/include_order)
+#include <boost/python/manage_new_object.hpp>  // NOLINT(build/include_order)
+#include <boost/python/return_value_policy.hpp>  // NOLINT(build/include_order)
 
 #include "gpp_common.hpp"
 #include "gpp_covariance.hpp"
@@ -37,13 +39,13 @@ namespace {
 
 /*!\rst
   Surrogate "constructor" for GaussianProcess intended only for use by boost::python.  This aliases the normal C++ constructor,
-  replacing ``double const * restrict`` arguments with ``const boost::python::list&`` arguments.
+  replacing ``double const * restrict`` arguments with ``const boost::python::object&`` arguments.
 \endrst*/
-GaussianProcess * make_gaussian_process(const boost::python::list& hyperparameters,
-                                        const boost::python::list& points_sampled,
-                                        const boost::python::list& points_sampled_value,
-                                        const boost::python::list& noise_variance,
-                                        const boost::python::list& derivatives,
+GaussianProcess * make_gaussian_process(const boost::python::object& hyperparameters,
+                                        const boost::python::object& points_sampled,
+                                        const boost::python::object& points_sampled_value,
+                                        const boost::python::object& noise_variance,
+                                        const boost::python::object& derivatives,
                                         int num_derivatives, int dim, int num_sampled) {
   const int num_to_sample = 0;
   const boost::python::list points_to_sample_dummy;
@@ -61,7 +63,7 @@ GaussianProcess * make_gaussian_process(const boost::python::list& hyperparamete
   return new_gp;
 }
 
-boost::python::list GetMeanWrapper(const GaussianProcess& gaussian_process, const boost::python::list& points_to_sample, int num_to_sample) {
+boost::python::object GetMeanWrapper(const GaussianProcess& gaussian_process, const boost::python::object& points_to_sample, int num_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -74,13 +76,13 @@ boost::python::list GetMeanWrapper(const GaussianProcess& gaussian_process, cons
                                                     input_container.num_to_sample, nullptr, 0, num_derivatives);
   gaussian_process.ComputeMeanOfPoints(points_to_sample_state, to_sample_mean.data());
 
-  return VectorToPylist(to_sample_mean);
+  return VectorToNumpyArray(to_sample_mean);
 }
 
 
-boost::python::list GetAdditionalMeanWrapper(const GaussianProcess& gaussian_process,
-                                             const boost::python::list& discrete_pts,
-                                             int num_pts) {
+boost::python::object GetAdditionalMeanWrapper(const GaussianProcess& gaussian_process,
+                                               const boost::python::object& discrete_pts,
+                                               int num_pts) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -92,12 +94,12 @@ boost::python::list GetAdditionalMeanWrapper(const GaussianProcess& gaussian_pro
   gaussian_process.ComputeMeanOfAdditionalPoints(input_container.points_to_sample.data(), input_container.num_to_sample,
                                                  nullptr, 0, to_sample_mean.data());
 
-  return VectorToPylist(to_sample_mean);
+  return VectorToNumpyArray(to_sample_mean);
 }
 
-boost::python::list GetGradMeanWrapper(const GaussianProcess& gaussian_process,
-                                       const boost::python::list& points_to_sample,
-                                       int num_to_sample) {
+boost::python::object GetGradMeanWrapper(const GaussianProcess& gaussian_process,
+                                         const boost::python::object& points_to_sample,
+                                         int num_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -112,12 +114,12 @@ boost::python::list GetGradMeanWrapper(const GaussianProcess& gaussian_process,
 
   gaussian_process.ComputeGradMeanOfPoints(points_to_sample_state, to_sample_grad_mean.data());
 
-  return VectorToPylist(to_sample_grad_mean);
+  return VectorToNumpyArray(to_sample_grad_mean);
 }
 
-boost::python::list GetVarWrapper(const GaussianProcess& gaussian_process,
-                                  const boost::python::list& points_to_sample,
-                                  int num_to_sample) {
+boost::python::object GetVarWrapper(const GaussianProcess& gaussian_process,
+                                    const boost::python::object& points_to_sample,
+                                    int num_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -133,8 +135,6 @@ boost::python::list GetVarWrapper(const GaussianProcess& gaussian_process,
   gaussian_process.ComputeVarianceOfPoints(&points_to_sample_state, gaussian_process.derivatives().data(),
                                            gaussian_process.num_derivatives(), to_sample_var.data());
 
-  boost::python::list result;
-
   // copy lower triangle of chol_var into its upper triangle b/c python expects a proper symmetric matrix
   for (int i = 0; i < num_to_sample * (1+gaussian_process.num_derivatives()); ++i) {
     for (int j = 0; j < i; ++j) {
@@ -143,19 +143,14 @@ boost::python::list GetVarWrapper(const GaussianProcess& gaussian_process,
     }
   }
 
-  for (int i = 0; i < num_to_sample * (1+gaussian_process.num_derivatives()); ++i) {
-    for (int j = 0; j < num_to_sample * (1+gaussian_process.num_derivatives()); ++j) {
-      result.append(to_sample_var[j*num_to_sample * (1+gaussian_process.num_derivatives()) + i]);
-    }
-  }
-
-  return result;
+  // symmetric: the (row-major) python matrix is the same as the (column-major) C++ one
+  return VectorToNumpyArray(to_sample_var);
 }
 
 
-boost::python::list GetCholVarWrapper(const GaussianProcess& gaussian_process,
-                                      const boost::python::list& points_to_sample,
-                                      int num_to_sample) {
+boost::python::object GetCholVarWrapper(const GaussianProcess& gaussian_process,
+                                        const boost::python::object& points_to_sample,
+                                        int num_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
   PythonInterfaceInputContainer input_container(points_to_sample, gradients, gaussian_process.dim(),
@@ -174,21 +169,21 @@ boost::python::list GetCholVarWrapper(const GaussianProcess& gaussian_process,
     OL_THROW_EXCEPTION(SingularMatrixException, "GP-Variance matrix singular. Check for duplicate points_to_sample or points_to_sample duplicating points_sampled with 0 noise.", chol_var.data(), num_to_sample, leading_minor);
   }
 
-  boost::python::list result;
-
   ZeroUpperTriangle(num_to_sample, chol_var.data());
+  std::vector<double> result(chol_var.size());
   for (int i = 0; i < num_to_sample * (1+gaussian_process.num_derivatives()); ++i) {
     for (int j = 0; j < num_to_sample * (1+gaussian_process.num_derivatives()); ++j) {
-      result.append(chol_var[j * num_to_sample * (1+gaussian_process.num_derivatives()) + i]);
+      result[i*num_to_sample * (1+gaussian_process.num_derivatives()) + j] =
+          chol_var[j * num_to_sample * (1+gaussian_process.num_derivatives()) + i];
     }
   }
-  return result;
+  return VectorToNumpyArray(result);
 }
 
 
-boost::python::list GetGradVarWrapper(const GaussianProcess& gaussian_process,
-                                      const boost::python::list& points_to_sample,
-                                      int num_to_sample, int num_derivatives) {
+boost::python::object GetGradVarWrapper(const GaussianProcess& gaussian_process,
+                                        const boost::python::object& points_to_sample,
+                                        int num_to_sample, int num_derivatives) {
   int num_derivatives_input =0;
   const boost::python::list gradients;
 
@@ -203,12 +198,12 @@ boost::python::list GetGradVarWrapper(const GaussianProcess& gaussian_process,
 
   gaussian_process.ComputeGradVarianceOfPoints(&points_to_sample_state, to_sample_grad_var.data());
 
-  return VectorToPylist(to_sample_grad_var);
+  return VectorToNumpyArray(to_sample_grad_var);
 }
 
-boost::python::list GetGradCholVarWrapper(const GaussianProcess& gaussian_process,
-                                          const boost::python::list& points_to_sample,
-                                          int num_to_sample, int num_derivatives) {
+boost::python::object GetGradCholVarWrapper(const GaussianProcess& gaussian_process,
+                                            const boost::python::object& points_to_sample,
+                                            int num_to_sample, int num_derivatives) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -232,14 +227,15 @@ boost::python::list GetGradCholVarWrapper(const GaussianProcess& gaussian_proces
   gaussian_process.ComputeGradCholeskyVarianceOfPoints(&points_to_sample_state, chol_var.data(),
                                                        to_sample_grad_var.data());
 
-  return VectorToPylist(to_sample_grad_var);
+  return VectorToNumpyArray(to_sample_grad_var);
 }
 
 void AddPointsToGPWrapper(GaussianProcess * gaussian_process,
-                          const boost::python::list& new_points,
-                          const boost::python::list& new_points_value,
-                          //const boost::python::list& new_points_noise_variance,
-                          int num_new_points) {
+                          const boost::python::object& new_points,
+                          const boost::python::object& new_points_value,
+                          //const boost::python::object& new_points_noise_variance,
+                          int num_new_points,
+                          bool incremental_cholesky) {
   int dim = gaussian_process->dim();
   std::vector<double> new_points_C(dim*num_new_points);
   std::vector<double> new_points_value_C(num_new_points * (1 + gaussian_process->num_derivatives()));
@@ -249,11 +245,12 @@ void AddPointsToGPWrapper(GaussianProcess * gaussian_process,
   CopyPylistToVector(new_points_value, num_new_points * (1 + gaussian_process->num_derivatives()), new_points_value_C);
   //CopyPylistToVector(new_points_noise_variance, num_new_points, new_points_noise_variance_C);
 
-  gaussian_process->AddPointsToGP(new_points_C.data(), new_points_value_C.data(), num_new_points);
+  gaussian_process->AddPointsToGP(new_points_C.data(), new_points_value_C.data(), num_new_points, true,
+                                  incremental_cholesky);
 }
 
-boost::python::list SamplePointFromGPWrapper(GaussianProcess * gaussian_process,
-                                             const boost::python::list& point_to_sample) {
+boost::python::object SamplePointFromGPWrapper(GaussianProcess * gaussian_process,
+                                               const boost::python::object& point_to_sample) {
   int num_to_sample = 1;  // we're only drawing 1 point at a time here
 
   int num_derivatives_input = 0;
@@ -265,13 +262,13 @@ boost::python::list SamplePointFromGPWrapper(GaussianProcess * gaussian_process,
   std::vector<double> results(input_container.num_to_sample * (1+gaussian_process->num_derivatives()));
 
   gaussian_process->SamplePointFromGP(input_container.points_to_sample.data(), results.data());
-  return VectorToPylist(results);
+  return VectorToNumpyArray(results);
 }
 
-boost::python::list SampleGlobalOptimaFromGPWrapper(GaussianProcess * gaussian_process,
-                                                    int const num_optima,
-                                                    int const inner_number,
-                                                    const boost::python::list& domain_bounds){
+boost::python::object SampleGlobalOptimaFromGPWrapper(GaussianProcess * gaussian_process,
+                                                      int const num_optima,
+                                                      int const inner_number,
+                                                      const boost::python::object& domain_bounds){
   int dim = gaussian_process->dim();
   std::vector<ClosedInterval> gp_domain(dim);
   CopyPylistToClosedIntervalVector(domain_bounds, dim, gp_domain);
@@ -280,7 +277,11 @@ boost::python::list SampleGlobalOptimaFromGPWrapper(GaussianProcess * gaussian_p
 
   std::vector<double> points_optima(num_optima * dim);
   gaussian_process->SampleGlobalOptimaFromGP(num_optima, inner_number, tensor_domain, points_optima.data());
-  return VectorToPylist(points_optima);
+  return VectorToNumpyArray(points_optima);
+}
+
+GaussianProcess * CloneGaussianProcessWrapper(const GaussianProcess& gaussian_process) {
+  return gaussian_process.Clone();
 }
 
 void PrintHistoricalData(const GaussianProcess& gaussian_process) {
@@ -424,6 +425,15 @@ void ExportGaussianProcessFunctions() {
         :type new_points_noise_variance: list of float64 with shape (num_new_points, )
         :param num_new_points: number of new points to add to the GP
         :type num_new_points: int
+        :param incremental_cholesky: extend the cholesky factor of the covariance with the new rows instead of
+          recomputing it (falls back to the full factorization if the new block is ill-conditioned)
+        :type incremental_cholesky: bool
+      )%%")
+      .def("clone", CloneGaussianProcessWrapper, boost::python::return_value_policy<boost::python::manage_new_object>(), R"%%(
+        Return a copy of this GP, with its derived quantities (cholesky factor, ...); nothing is factorized again.
+
+        :return: independent copy of this GP
+        :rtype: GPP.GaussianProcess
       )%%")
       .def("sample_point_from_gp", SamplePointFromGPWrapper, R"%%(
         Sample a function value from a Gaussian Process prior, provided a point at which to sample.
@@ -43,7 +43,7 @@ namespace {
 
 double ComputePosteriorMeanWrapper(const GaussianProcess& gaussian_process,
                                    const int num_fidelity,
-                                   const boost::python::list& points_to_sample) {
+                                   const boost::python::object& points_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -56,9 +56,9 @@ double ComputePosteriorMeanWrapper(const GaussianProcess& gaussian_process,
   return ps_evaluator.ComputePosteriorMean(&ps_state);
 }
 
-boost::python::list ComputeGradPosteriorMeanWrapper(const GaussianProcess& gaussian_process,
-                                                    const int num_fidelity,
-                                                    const boost::python::list& points_to_sample) {
+boost::python::object ComputeGradPosteriorMeanWrapper(const GaussianProcess& gaussian_process,
+                                                      const int num_fidelity,
+                                                      const boost::python::object& points_to_sample) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -71,16 +71,16 @@ boost::python::list ComputeGradPosteriorMeanWrapper(const GaussianProcess& gauss
   PosteriorMeanEvaluator::StateType ps_state(ps_evaluator, num_fidelity, input_container.points_to_sample.data(), configure_for_gradients);
 
   ps_evaluator.ComputeGradPosteriorMean(&ps_state, grad_PS.data());
-  return VectorToPylist(grad_PS);
+  return VectorToNumpyArray(grad_PS);
 }
 
 double ComputeKnowledgeGradientWrapper(const GaussianProcess& gaussian_process,
                                        const int num_fidelity,
                                        const boost::python::object& optimizer_parameters,
-                                       const boost::python::list& domain_bounds,
-                                       const boost::python::list& discrete_pts,
-                                       const boost::python::list& points_to_sample,
-                                       const boost::python::list& points_being_sampled,
+                                       const boost::python::object& domain_bounds,
+                                       const boost::python::object& discrete_pts,
+                                       const boost::python::object& points_to_sample,
+                                       const boost::python::object& points_being_sampled,
                                        int num_pts, int num_to_sample, int num_being_sampled,
                                        int max_int_steps, double best_so_far, RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
@@ -112,15 +112,15 @@ double ComputeKnowledgeGradientWrapper(const GaussianProcess& gaussian_process,
   return kg_evaluator.ComputeKnowledgeGradient(&kg_state);
 }
 
-boost::python::list ComputeGradKnowledgeGradientWrapper(const GaussianProcess& gaussian_process,
-                                                        const int num_fidelity,
-                                                        const boost::python::object& optimizer_parameters,
-                                                        const boost::python::list& domain_bounds,
-                                                        const boost::python::list& discrete_pts,
-                                                        const boost::python::list& points_to_sample,
-                                                        const boost::python::list& points_being_sampled,
-                                                        int num_pts, int num_to_sample, int num_being_sampled,
-                                                        int max_int_steps, double best_so_far, RandomnessSourceContainer& randomness_source) {
+boost::python::object ComputeGradKnowledgeGradientWrapper(const GaussianProcess& gaussian_process,
+                                                          const int num_fidelity,
+                                                          const boost::python::object& optimizer_parameters,
+                                                          const boost::python::object& domain_bounds,
+                                                          const boost::python::object& discrete_pts,
+                                                          const boost::python::object& points_to_sample,
+                                                          const boost::python::object& points_being_sampled,
+                                                          int num_pts, int num_to_sample, int num_being_sampled,
+                                                          int max_int_steps, double best_so_far, RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -150,7 +150,7 @@ boost::python::list ComputeGradKnowledgeGradientWrapper(const GaussianProcess& g
                                                                       configure_for_gradients, randomness_source.normal_rng_vec.data());
   kg_evaluator.ComputeGradKnowledgeGradient(&kg_state, grad_KG.data());
 
-  return VectorToPylist(grad_KG);
+  return VectorToNumpyArray(grad_KG);
 }
 
 /*!\rst
@@ -240,16 +240,16 @@ void DispatchKnowledgeGradientOptimization(const boost::python::object& optimize
   }  // end switch over optimizer_type
 }
 
-boost::python::list MultistartKnowledgeGradientOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                   const boost::python::object& optimizer_parameters_inner,
-                                                                   const GaussianProcess& gaussian_process, const int num_fidelity,
-                                                                   const boost::python::list& domain_bounds,
-                                                                   const boost::python::list& discrete_pts,
-                                                                   const boost::python::list& points_being_sampled,
-                                                                   int num_pts, int num_to_sample, int num_being_sampled,
-                                                                   double best_so_far, int max_int_steps, int max_num_threads,
-                                                                   RandomnessSourceContainer& randomness_source,
-                                                                   boost::python::dict& status) {
+boost::python::object MultistartKnowledgeGradientOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                     const boost::python::object& optimizer_parameters_inner,
+                                                                     const GaussianProcess& gaussian_process, const int num_fidelity,
+                                                                     const boost::python::object& domain_bounds,
+                                                                     const boost::python::object& discrete_pts,
+                                                                     const boost::python::object& points_being_sampled,
+                                                                     int num_pts, int num_to_sample, int num_being_sampled,
+                                                                     double best_so_far, int max_int_steps, int max_num_threads,
+                                                                     RandomnessSourceContainer& randomness_source,
+                                                                     boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
 
@@ -300,14 +300,14 @@ boost::python::list MultistartKnowledgeGradientOptimizationWrapper(const boost::
       break;
     }
   }  // end switch over domain_type
-  return VectorToPylist(best_points_to_sample_C);
+  return VectorToNumpyArray(best_points_to_sample_C);
 }
 
-boost::python::list ComputeOptimalPosteriorMeanWrapper(const GaussianProcess& gaussian_process, const int num_fidelity,
-                                                       const boost::python::object& optimizer_parameters,
-                                                       const boost::python::list& domain_bounds,
-                                                       const boost::python::list& initial_guess,
-                                                       boost::python::dict& status) {
+boost::python::object ComputeOptimalPosteriorMeanWrapper(const GaussianProcess& gaussian_process, const int num_fidelity,
+                                                         const boost::python::object& optimizer_parameters,
+                                                         const boost::python::object& domain_bounds,
+                                                         const boost::python::object& initial_guess,
+                                                         boost::python::dict& status) {
     int dim = gaussian_process.dim();
 
     int num_derivatives_input = 0;
@@ -346,19 +346,19 @@ boost::python::list ComputeOptimalPosteriorMeanWrapper(const GaussianProcess& ga
         break;
       }
     }  // end switch over domain_type
-    return VectorToPylist(best_points_to_sample_C);
+    return VectorToNumpyArray(best_points_to_sample_C);
 }
 
-boost::python::list EvaluateKGAtPointListWrapper(const GaussianProcess& gaussian_process,
-                                                 const int num_fidelity, const boost::python::object& optimizer_parameters,
-                                                 const boost::python::list& domain_bounds,
-                                                 const boost::python::list& discrete_being_sampled,
-                                                 const boost::python::list& initial_guesses,
-                                                 int num_multistarts, int num_pts, int num_to_sample,
-                                                 int num_being_sampled, double best_so_far,
-                                                 int max_int_steps, int max_num_threads,
-                                                 RandomnessSourceContainer& randomness_source,
-                                                 boost::python::dict& status) {
+boost::python::object EvaluateKGAtPointListWrapper(const GaussianProcess& gaussian_process,
+                                                   const int num_fidelity, const boost::python::object& optimizer_parameters,
+                                                   const boost::python::object& domain_bounds,
+                                                   const boost::python::object& discrete_being_sampled,
+                                                   const boost::python::object& initial_guesses,
+                                                   int num_multistarts, int num_pts, int num_to_sample,
+                                                   int num_being_sampled, double best_so_far,
+                                                   int max_int_steps, int max_num_threads,
+                                                   RandomnessSourceContainer& randomness_source,
+                                                   boost::python::dict& status) {
   // abort if we do not have enough sources of randomness to run with max_num_threads
   if (unlikely(max_num_threads > static_cast<int>(randomness_source.normal_rng_vec.size()))) {
     OL_THROW_EXCEPTION(LowerBoundException<int>, "Fewer randomness_sources than max_num_threads.", randomness_source.normal_rng_vec.size(), max_num_threads);
@@ -393,7 +393,7 @@ boost::python::list EvaluateKGAtPointListWrapper(const GaussianProcess& gaussian
 
   status["evaluate_KG_at_point_list"] = found_flag;
 
-  return VectorToPylist(result_function_values_C);
+  return VectorToNumpyArray(result_function_values_C);
 }
 }  // end unnamed namespace
 
@@ -28,6 +28,8 @@
 #include <boost/python/list.hpp>  // NOLINT(build/include_order)
 #include <boost/python/object.hpp>  // NOLINT(build/include_order)
 #include <boost/python/make_constructor.hpp>  // NOLINT(build/include_order)
+#include <boost/python/manage_new_object.hpp>  // NOLINT(build/include_order)
+#include <boost/python/return_value_policy.hpp>  // NOLINT(build/include_order)
 
 #include "gpp_common.hpp"
 #include "gpp_covariance.hpp"
@@ -45,13 +47,13 @@ namespace optimal_learning {
 namespace {
 /*!\rst
   Surrogate "constructor" for GaussianProcess intended only for use by boost::python.  This aliases the normal C++ constructor,
-  replacing ``double const * restrict`` arguments with ``const boost::python::list&`` arguments.
+  replacing ``double const * restrict`` arguments with ``const boost::python::object&`` arguments.
 \endrst*/
-GaussianProcessMCMC * make_gaussian_process_mcmc(const boost::python::list& hyperparameters_list,
-                                                 const boost::python::list& noise_variance_list,
-                                                 const boost::python::list& points_sampled,
-                                                 const boost::python::list& points_sampled_value,
-                                                 const boost::python::list& derivatives,
+GaussianProcessMCMC * make_gaussian_process_mcmc(const boost::python::object& hyperparameters_list,
+                                                 const boost::python::object& noise_variance_list,
+                                                 const boost::python::object& points_sampled,
+                                                 const boost::python::object& points_sampled_value,
+                                                 const boost::python::object& derivatives,
                                                  int num_mcmc, int num_derivatives, int dim, int num_sampled) {
   std::vector<double> hyperparameters_list_vector(num_mcmc*(dim+1));
   CopyPylistToVector(hyperparameters_list, num_mcmc*(dim+1), hyperparameters_list_vector);
@@ -78,15 +80,55 @@ GaussianProcessMCMC * make_gaussian_process_mcmc(const boost::python::list& hype
   return new_gp_mcmc;
 }
 
+void AddPointsToGPMCMCWrapper(GaussianProcessMCMC * gaussian_process_mcmc,
+                              const boost::python::object& new_points,
+                              const boost::python::object& new_points_value,
+                              int num_new_points,
+                              bool incremental_cholesky) {
+  int dim = gaussian_process_mcmc->dim();
+  std::vector<double> new_points_C(dim*num_new_points);
+  std::vector<double> new_points_value_C(num_new_points * (1 + gaussian_process_mcmc->num_derivatives()));
+
+  CopyPylistToVector(new_points, dim*num_new_points, new_points_C);
+  CopyPylistToVector(new_points_value, num_new_points * (1 + gaussian_process_mcmc->num_derivatives()), new_points_value_C);
+
+  gaussian_process_mcmc->AddPointsToGP(new_points_C.data(), new_points_value_C.data(), num_new_points,
+                                       incremental_cholesky);
+}
+
+void SetHyperparametersMCMCWrapper(GaussianProcessMCMC * gaussian_process_mcmc,
+                                   const boost::python::object& hyperparameters_list,
+                                   const boost::python::object& noise_variance_list,
+                                   const boost::python::object& reuse_index,
+                                   int num_mcmc) {
+  int dim = gaussian_process_mcmc->dim();
+  int num_derivatives = gaussian_process_mcmc->num_derivatives();
+  std::vector<double> hyperparameters_list_vector(num_mcmc*(dim+1));
+  CopyPylistToVector(hyperparameters_list, num_mcmc*(dim+1), hyperparameters_list_vector);
+
+  std::vector<double> noise_variance_list_vector(num_mcmc*(1+num_derivatives));
+  CopyPylistToVector(noise_variance_list, num_mcmc*(1+num_derivatives), noise_variance_list_vector);
+
+  std::vector<int> reuse_index_vector(num_mcmc);
+  CopyPylistToIntVector(reuse_index, num_mcmc, reuse_index_vector);
+
+  gaussian_process_mcmc->SetHyperparameters(hyperparameters_list_vector.data(), noise_variance_list_vector.data(),
+                                            reuse_index_vector.data(), num_mcmc);
+}
+
+GaussianProcessMCMC * CloneGaussianProcessMCMCWrapper(const GaussianProcessMCMC& gaussian_process_mcmc) {
+  return new GaussianProcessMCMC(gaussian_process_mcmc);
+}
+
 double ComputeKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
                                            const int num_fidelity,
                                            const boost::python::object& optimizer_parameters,
-                                           const boost::python::list& domain_bounds,
-                                           const boost::python::list& discrete_pts,
-                                           const boost::python::list& points_to_sample,
-                                           const boost::python::list& points_being_sampled,
+                                           const boost::python::object& domain_bounds,
+                                           const boost::python::object& discrete_pts,
+                                           const boost::python::object& points_to_sample,
+                                           const boost::python::object& points_being_sampled,
                                            int num_pts, int num_to_sample, int num_being_sampled,
-                                           int max_int_steps, const boost::python::list& best_so_far,
+                                           int max_int_steps, const boost::python::object& best_so_far,
                                            RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
@@ -123,16 +165,16 @@ double ComputeKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process
   return kg_evaluator.ComputeKnowledgeGradient(&kg_state);
 }
 
-boost::python::list ComputeGradKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
-                                                            const int num_fidelity,
-                                                            const boost::python::object& optimizer_parameters,
-                                                            const boost::python::list& domain_bounds,
-                                                            const boost::python::list& discrete_pts,
-                                                            const boost::python::list& points_to_sample,
-                                                            const boost::python::list& points_being_sampled,
-                                                            int num_pts, int num_to_sample, int num_being_sampled,
-                                                            int max_int_steps, const boost::python::list& best_so_far,
-                                                            RandomnessSourceContainer& randomness_source) {
+boost::python::object ComputeGradKnowledgeGradientMCMCWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                              const int num_fidelity,
+                                                              const boost::python::object& optimizer_parameters,
+                                                              const boost::python::object& domain_bounds,
+                                                              const boost::python::object& discrete_pts,
+                                                              const boost::python::object& points_to_sample,
+                                                              const boost::python::object& points_being_sampled,
+                                                              int num_pts, int num_to_sample, int num_being_sampled,
+                                                              int max_int_steps, const boost::python::object& best_so_far,
+                                                              RandomnessSourceContainer& randomness_source) {
   int num_derivatives_input = 0;
   const boost::python::list gradients;
 
@@ -170,7 +212,7 @@ boost::python::list ComputeGradKnowledgeGradientMCMCWrapper(GaussianProcessMCMC&
                                                                           randomness_source.normal_rng_vec.data(), &state_vector);
   kg_evaluator.ComputeGradKnowledgeGradient(&kg_state, grad_KG.data());
 
-  return VectorToPylist(grad_KG);
+  return VectorToNumpyArray(grad_KG);
 }
 
 /*!\rst
@@ -259,17 +301,17 @@ void DispatchKnowledgeGradientMCMCOptimization(const boost::python::object& opti
   }  // end switch over optimizer_type
 }
 
-boost::python::list MultistartKnowledgeGradientMCMCOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                       const boost::python::object& optimizer_parameters_inner,
-                                                                       GaussianProcessMCMC& gaussian_process_mcmc, const int num_fidelity,
-                                                                       const boost::python::list& domain_bounds,
-                                                                       const boost::python::list& discrete_pts,
-                                                                       const boost::python::list& points_being_sampled,
-                                                                       int num_pts, int num_to_sample, int num_being_sampled,
-                                                                       const boost::python::list& best_so_far, int max_int_steps, int max_num_threads,
-                                                                       //const boost::python::list& restart_pts, int num_multistarts,
-                                                                       RandomnessSourceContainer& randomness_source,
-                                                                       boost::python::dict& status) {
+boost::python::object MultistartKnowledgeGradientMCMCOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                         const boost::python::object& optimizer_parameters_inner,
+                                                                         GaussianProcessMCMC& gaussian_process_mcmc, const int num_fidelity,
+                                                                         const boost::python::object& domain_bounds,
+                                                                         const boost::python::object& discrete_pts,
+                                                                         const boost::python::object& points_being_sampled,
+                                                                         int num_pts, int num_to_sample, int num_being_sampled,
+                                                                         const boost::python::object& best_so_far, int max_int_steps, int max_num_threads,
+                                                                         //const boost::python::object& restart_pts, int num_multistarts,
+                                                                         RandomnessSourceContainer& randomness_source,
+                                                                         boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
   
@@ -325,66 +367,106 @@ boost::python::list MultistartKnowledgeGradientMCMCOptimizationWrapper(const boo
     }
   }  // end switch over domain_type
 
-  return VectorToPylist(best_points_to_sample_C);
+  return VectorToNumpyArray(best_points_to_sample_C);
 }
 
-boost::python::list EvaluateKGMCMCAtPointListWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
-                                                     const int num_fidelity,
-                                                     const boost::python::object& optimizer_parameters,
-                                                     const boost::python::list& domain_bounds,
-                                                     const boost::python::list& initial_guesses,
-                                                     const boost::python::list& discrete_being_sampled,
-                                                     int num_multistarts, int num_pts, int num_to_sample,
-                                                     int num_being_sampled, const boost::python::list& best_so_far,
-                                                     int max_int_steps, int max_num_threads,
-                                                     RandomnessSourceContainer& randomness_source,
-                                                     boost::python::dict& status) {
+boost::python::object EvaluateKGMCMCAtPointListWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                       const int num_fidelity,
+                                                       const boost::python::object& optimizer_parameters,
+                                                       const boost::python::object& domain_bounds,
+                                                       const boost::python::object& initial_guesses,
+                                                       const boost::python::object& discrete_being_sampled,
+                                                       int num_multistarts, int num_pts, int num_to_sample,
+                                                       int num_being_sampled, const boost::python::object& best_so_far,
+                                                       int max_int_steps, int max_num_threads,
+                                                       RandomnessSourceContainer& randomness_source,
+                                                       boost::python::dict& status) {
   // abort if we do not have enough sources of randomness to run with max_num_threads
   if (unlikely(max_num_threads > static_cast<int>(randomness_source.normal_rng_vec.size()))) {
     OL_THROW_EXCEPTION(LowerBoundException<int>, "Fewer randomness_sources than max_num_threads.", randomness_source.normal_rng_vec.size(), max_num_threads);
   }
 
-  int num_to_sample_input = 0;  // No points to sample; we are generating these via KG optimization
-  const boost::python::list points_to_sample_dummy;
-
-  int num_derivatives_input = 0;
-  const boost::python::list gradients;
-
-  PythonInterfaceInputContainer input_container(discrete_being_sampled, gradients, gaussian_process_mcmc.dim(),
-                                                num_pts*gaussian_process_mcmc.num_mcmc()+num_being_sampled, num_derivatives_input);
-  int num_discrete_pts_and_pts_being_sampled = num_pts*gaussian_process_mcmc.num_mcmc()*(gaussian_process_mcmc.dim()-num_fidelity)
-                                               + num_being_sampled*gaussian_process_mcmc.dim();
+  const int dim = gaussian_process_mcmc.dim();
+  int num_discrete_pts_and_pts_being_sampled = num_pts*gaussian_process_mcmc.num_mcmc()*(dim-num_fidelity)
+                                               + num_being_sampled*dim;
   std::vector<double> discrete_pts_and_pts_being_sampled(num_discrete_pts_and_pts_being_sampled);
   CopyPylistToVector(discrete_being_sampled, num_discrete_pts_and_pts_being_sampled, discrete_pts_and_pts_being_sampled);
 
-  std::vector<double> result_point_C(input_container.dim);  // not used
+  // every initial guess is a set of num_to_sample points
+  std::vector<double> result_point_C(num_to_sample*dim);  // not used
   std::vector<double> result_function_values_C(num_multistarts);
-  std::vector<double> initial_guesses_C(input_container.dim * num_multistarts);
+  std::vector<double> initial_guesses_C(num_to_sample*dim*num_multistarts);
 
-  CopyPylistToVector(initial_guesses, input_container.dim * num_multistarts, initial_guesses_C);
+  CopyPylistToVector(initial_guesses, num_to_sample*dim*num_multistarts, initial_guesses_C);
 
   ThreadSchedule thread_schedule(max_num_threads, omp_sched_static);
   bool found_flag = false;
 
-  std::vector<ClosedInterval> domain_bounds_C(input_container.dim);
-  CopyPylistToClosedIntervalVector(domain_bounds, input_container.dim, domain_bounds_C);
+  std::vector<ClosedInterval> domain_bounds_C(dim);
+  CopyPylistToClosedIntervalVector(domain_bounds, dim, domain_bounds_C);
 
   std::vector<double> best_so_far_list(gaussian_process_mcmc.num_mcmc());
   CopyPylistToVector(best_so_far, gaussian_process_mcmc.num_mcmc(), best_so_far_list);
 
-  TensorProductDomain domain(domain_bounds_C.data(), input_container.dim);
-  TensorProductDomain inner_domain(domain_bounds_C.data(), input_container.dim- num_fidelity);
+  TensorProductDomain domain(domain_bounds_C.data(), dim);
+  TensorProductDomain inner_domain(domain_bounds_C.data(), dim-num_fidelity);
   const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
 
   EvaluateKGMCMCAtPointList(gaussian_process_mcmc, num_fidelity, gradient_descent_parameters, domain, inner_domain, thread_schedule, initial_guesses_C.data(),
-                            discrete_pts_and_pts_being_sampled.data() + num_pts*gaussian_process_mcmc.num_mcmc()*(gaussian_process_mcmc.dim()-num_fidelity),
-                            discrete_pts_and_pts_being_sampled.data(), num_multistarts, num_to_sample, input_container.num_being_sampled,
+                            discrete_pts_and_pts_being_sampled.data() + num_pts*gaussian_process_mcmc.num_mcmc()*(dim-num_fidelity),
+                            discrete_pts_and_pts_being_sampled.data(), num_multistarts, num_to_sample, num_being_sampled,
                             num_pts, best_so_far_list.data(), max_int_steps, &found_flag, randomness_source.normal_rng_vec.data(),
                             result_function_values_C.data(), result_point_C.data());
 
   status["evaluate_KG_at_point_list"] = found_flag;
 
-  return VectorToPylist(result_function_values_C);
+  return VectorToNumpyArray(result_function_values_C);
+}
+
+boost::python::object EvaluateGradKGMCMCAtPointListWrapper(GaussianProcessMCMC& gaussian_process_mcmc,
+                                                           const int num_fidelity,
+                                                           const boost::python::object& optimizer_parameters,
+                                                           const boost::python::object& domain_bounds,
+                                                           const boost::python::object& points_to_sample,
+                                                           const boost::python::object& discrete_being_sampled,
+                                                           int num_multistarts, int num_pts, int num_to_sample,
+                                                           int num_being_sampled, const boost::python::object& best_so_far,
+                                                           int max_int_steps, int max_num_threads,
+                                                           RandomnessSourceContainer& randomness_source) {
+  // abort if we do not have enough sources of randomness to run with max_num_threads
+  if (unlikely(max_num_threads > static_cast<int>(randomness_source.normal_rng_vec.size()))) {
+    OL_THROW_EXCEPTION(LowerBoundException<int>, "Fewer randomness_sources than max_num_threads.", randomness_source.normal_rng_vec.size(), max_num_threads);
+  }
+
+  const int dim = gaussian_process_mcmc.dim();
+  int num_discrete_pts_and_pts_being_sampled = num_pts*gaussian_process_mcmc.num_mcmc()*(dim-num_fidelity)
+                                               + num_being_sampled*dim;
+  std::vector<double> discrete_pts_and_pts_being_sampled(num_discrete_pts_and_pts_being_sampled);
+  CopyPylistToVector(discrete_being_sampled, num_discrete_pts_and_pts_being_sampled, discrete_pts_and_pts_being_sampled);
+
+  std::vector<double> points_to_sample_C(num_multistarts*num_to_sample*dim);
+  CopyPylistToVector(points_to_sample, num_multistarts*num_to_sample*dim, points_to_sample_C);
+  std::vector<double> grad_KG(num_multistarts*num_to_sample*dim);
+
+  ThreadSchedule thread_schedule(max_num_threads, omp_sched_static);
+
+  std::vector<ClosedInterval> domain_bounds_C(dim-num_fidelity);
+  CopyPylistToClosedIntervalVector(domain_bounds, dim-num_fidelity, domain_bounds_C);
+
+  std::vector<double> best_so_far_list(gaussian_process_mcmc.num_mcmc());
+  CopyPylistToVector(best_so_far, gaussian_process_mcmc.num_mcmc(), best_so_far_list);
+
+  TensorProductDomain inner_domain(domain_bounds_C.data(), dim-num_fidelity);
+  const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
+
+  EvaluateGradKGMCMCAtPointList(gaussian_process_mcmc, num_fidelity, gradient_descent_parameters, inner_domain, thread_schedule,
+                                points_to_sample_C.data(),
+                                discrete_pts_and_pts_being_sampled.data() + num_pts*gaussian_process_mcmc.num_mcmc()*(dim-num_fidelity),
+                                discrete_pts_and_pts_being_sampled.data(), num_multistarts, num_to_sample, num_being_sampled,
+                                num_pts, best_so_far_list.data(), max_int_steps, randomness_source.normal_rng_vec.data(),
+                                grad_KG.data());
+
+  return VectorToNumpyArray(grad_KG);
 }
 }  // end unnamed namespace
 
@@ -407,6 +489,38 @@ void ExportKnowldegeGradientMCMCFunctions() {
     :type param: int > 0
     :param num_sampled: number of already-sampled points
     :type num_sampled: int > 0
+          )%%")
+      .def("add_sampled_points", AddPointsToGPMCMCWrapper, R"%%(
+    Add the specified (point, fcn value) historical data to every GP of this ``GPP.GaussianProcessMCMC``.
+
+    :param new_points: coordinates of each new point to add
+    :type new_points: list of float64 with shape (num_new_points, dim)
+    :param new_points_value: function value (and derivatives) at each new point
+    :type new_points_value: list of float64 with shape (num_new_points, num_derivatives + 1)
+    :param num_new_points: number of new points to add to the GPs
+    :type num_new_points: int
+    :param incremental_cholesky: extend the cholesky factors of the covariances with the new rows instead of
+      recomputing them (falls back to the full factorization if the new block is ill-conditioned)
+    :type incremental_cholesky: bool
+          )%%")
+      .def("set_hyperparameters", SetHyperparametersMCMCWrapper, R"%%(
+    Replace the hyperparameter samples, copying the GPs whose hyperparameters did not change.
+
+    :param hyperparameters_list: covariance hyperparameters of each sample
+    :type hyperparameters_list: list of float64 with shape (num_mcmc, dim + 1)
+    :param noise_variance_list: noise variance of each sample
+    :type noise_variance_list: list of float64 with shape (num_mcmc, num_derivatives + 1)
+    :param reuse_index: index of the current GP with the same hyperparameters as each sample, or -1
+    :type reuse_index: list of int with shape (num_mcmc, )
+    :param num_mcmc: number of hyperparameter samples
+    :type num_mcmc: int > 0
+          )%%")
+      .def("clone", CloneGaussianProcessMCMCWrapper, boost::python::return_value_policy<boost::python::manage_new_object>(), R"%%(
+    Return a copy of this ``GPP.GaussianProcessMCMC``, with the derived quantities (cholesky factors, ...) of its GPs;
+    nothing is factorized again.
+
+    :return: independent copy of this object
+    :rtype: GPP.GaussianProcessMCMC
           )%%");
 
   boost::python::def("compute_knowledge_gradient_mcmc", ComputeKnowledgeGradientMCMCWrapper, R"%%(
@@ -566,5 +680,41 @@ void ExportKnowldegeGradientMCMCFunctions() {
     :return: EI values at each point of the initial_guesses list, in the same order
     :rtype: list of float64 with shape (num_multistarts, )
     )%%");
+
+  boost::python::def("evaluate_grad_KG_mcmc_at_point_list", EvaluateGradKGMCMCAtPointListWrapper, R"%%(
+    Evaluates the gradient of knowledge gradient wrt points_to_sample at each set of points of points_to_sample;
+    can handle q,p-KG. Used to run the restarts of a gradient ascent in lockstep.
+
+    Equivalent to::
+
+      result = []
+      for points in points_to_sample:
+          result.append(compute_grad_knowledge_gradient_mcmc(points, ...))
+
+    But this method is substantially faster (loop in C++ and multithreaded).
+
+    :param gaussian_process_mcmc: GaussianProcessMCMC object (holds the GPs of the hyperparameter samples)
+    :type gaussian_process_mcmc: GPP.GaussianProcessMCMC
+    :param points_to_sample: sets of points at which to evaluate the gradient of KG
+    :type points_to_sample: list of float64 with shape (num_multistarts, num_to_sample, dim)
+    :param discrete_being_sampled: discretization points of each GP followed by the points being sampled
+    :type discrete_being_sampled: list of float64
+    :param num_multistarts: number of sets of points
+    :type num_multistarts: int > 0
+    :param num_to_sample: number of potential future samples; gradients are evaluated wrt these points (i.e., the "q" in q,p-KG)
+    :type num_to_sample: int > 0
+    :param num_being_sampled: number of points being sampled concurrently (i.e., the p in q,p-KG)
+    :type num_being_sampled: int >= 0
+    :param best_so_far: best posterior mean of each GP so far
+    :type best_so_far: list of float64 with shape (num_mcmc, )
+    :param max_int_steps: number of MC integration points in KG
+    :type max_int_steps: int >= 0
+    :param max_num_threads: max number of threads to use
+    :type max_num_threads: int >= 1
+    :param randomness_source: object containing randomness sources, at least max_num_threads of them
+    :type randomness_source: GPP.RandomnessSourceContainer
+    :return: gradient of KG at each set of points_to_sample, in the same order
+    :rtype: list of float64 with shape (num_multistarts, num_to_sample, dim)
+    )%%");
 }
 }
\ No newline at end of file
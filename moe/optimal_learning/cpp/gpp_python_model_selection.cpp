@@ -17,10 +17,14 @@
 
 // NOLINT-ing the C, C++ header includes as well; otherwise cpplint gets confused
 #include <algorithm>  // NOLINT(build/include_order)
+#include <exception>  // NOLINT(build/include_order)
 #include <limits>  // NOLINT(build/include_order)
+#include <mutex>  // NOLINT(build/include_order)
 #include <string>  // NOLINT(build/include_order)
 #include <vector>  // NOLINT(build/include_order)
 
+#include <omp.h>  // NOLINT(build/include_order)
+
 #include <boost/python/def.hpp>  // NOLINT(build/include_order)
 #include <boost/python/dict.hpp>  // NOLINT(build/include_order)
 #include <boost/python/extract.hpp>  // NOLINT(build/include_order)
@@ -32,6 +36,7 @@
 #include "gpp_domain.hpp"
 #include "gpp_exception.hpp"
 #include "gpp_geometry.hpp"
+#include "gpp_logging.hpp"
 #include "gpp_model_selection.hpp"
 #include "gpp_optimizer_parameters.hpp"
 #include "gpp_python_common.hpp"
@@ -40,14 +45,14 @@ namespace optimal_learning {
 
 namespace {
 
-double ComputeLogLikelihoodWrapper(const boost::python::list& points_sampled,
-                                   const boost::python::list& points_sampled_value,
+double ComputeLogLikelihoodWrapper(const boost::python::object& points_sampled,
+                                   const boost::python::object& points_sampled_value,
                                    int dim, int num_sampled,
                                    LogLikelihoodTypes objective_type,
-                                   const boost::python::list& hyperparameters,
-                                   const boost::python::list& derivatives,
+                                   const boost::python::object& hyperparameters,
+                                   const boost::python::object& derivatives,
                                    int num_derivatives,
-                                   const boost::python::list& noise_variance) {
+                                   const boost::python::object& noise_variance) {
   const int num_to_sample = 0;
   const boost::python::list points_to_sample_dummy;
 
@@ -86,14 +91,71 @@ double ComputeLogLikelihoodWrapper(const boost::python::list& points_sampled,
   }  // end switch over objective_type
 }
 
-boost::python::list ComputeHyperparameterGradLogLikelihoodWrapper(const boost::python::list& points_sampled,
-                                                                  const boost::python::list& points_sampled_value,
-                                                                  int dim, int num_sampled,
-                                                                  LogLikelihoodTypes objective_type,
-                                                                  const boost::python::list& hyperparameters,
-                                                                  const boost::python::list& derivatives,
-                                                                  int num_derivatives,
-                                                                  const boost::python::list& noise_variance) {
+boost::python::object ComputeLogLikelihoodListWrapper(const boost::python::object& points_sampled,
+                                                      const boost::python::object& points_sampled_value,
+                                                      int dim, int num_sampled,
+                                                      LogLikelihoodTypes objective_type,
+                                                      const boost::python::object& hyperparameters_list,
+                                                      const boost::python::object& derivatives,
+                                                      int num_derivatives,
+                                                      const boost::python::object& noise_variance_list,
+                                                      int num_hyperparameter_sets,
+                                                      int max_num_threads) {
+  if (unlikely(objective_type != LogLikelihoodTypes::kLogMarginalLikelihood)) {
+    OL_THROW_EXCEPTION(OptimalLearningException, "ERROR: invalid objective mode choice.");
+  }
+
+  std::vector<double> points_sampled_C(dim*num_sampled);
+  std::vector<double> points_sampled_value_C(num_sampled*(1+num_derivatives));
+  std::vector<int> derivatives_C(num_derivatives);
+  std::vector<double> hyperparameters_list_C(num_hyperparameter_sets*(1+dim));
+  std::vector<double> noise_variance_list_C(num_hyperparameter_sets*(1+num_derivatives));
+  CopyPylistToVector(points_sampled, dim*num_sampled, points_sampled_C);
+  CopyPylistToVector(points_sampled_value, num_sampled*(1+num_derivatives), points_sampled_value_C);
+  CopyPylistToIntVector(derivatives, num_derivatives, derivatives_C);
+  CopyPylistToVector(hyperparameters_list, num_hyperparameter_sets*(1+dim), hyperparameters_list_C);
+  CopyPylistToVector(noise_variance_list, num_hyperparameter_sets*(1+num_derivatives), noise_variance_list_C);
+
+  LogMarginalLikelihoodEvaluator log_marginal_eval(points_sampled_C.data(), points_sampled_value_C.data(),
+                                                   derivatives_C.data(), num_derivatives, dim, num_sampled);
+  std::vector<double> log_likelihood_list(num_hyperparameter_sets);
+
+  // each hyperparameter set is evaluated exactly as in ComputeLogLikelihoodWrapper, independently of the
+  // thread running it: the results do not depend on max_num_threads.
+  // Exceptions cannot leave the parallel region; see gpp_optimization.hpp (MultistartOptimizer) for details.
+  std::once_flag exception_capture_flag;
+  std::exception_ptr captured_exception;
+#pragma omp parallel for num_threads(max_num_threads) schedule(dynamic, 1)
+  for (int i = 0; i < num_hyperparameter_sets; ++i) {
+    try {
+      double const * hyperparameters = hyperparameters_list_C.data() + i*(1+dim);
+      MaternNu2p5 sqexp(dim, hyperparameters[0], hyperparameters + 1);
+      std::vector<double> noise_variance(noise_variance_list_C.begin() + i*(1+num_derivatives),
+                                         noise_variance_list_C.begin() + (i+1)*(1+num_derivatives));
+      LogMarginalLikelihoodState log_marginal_state(log_marginal_eval, sqexp, noise_variance);
+      log_likelihood_list[i] = log_marginal_eval.ComputeLogLikelihood(log_marginal_state);
+    } catch (const std::exception& except) {
+      OL_ERROR_PRINTF("Log likelihood of hyperparameter set %d of %d failed. Message:\n%s\n", i, num_hyperparameter_sets, except.what());
+      std::call_once(exception_capture_flag, [&captured_exception]() {
+          captured_exception = std::current_exception();
+        });
+    }
+  }
+  if (captured_exception != nullptr) {
+    std::rethrow_exception(captured_exception);
+  }
+
+  return VectorToNumpyArray(log_likelihood_list);
+}
+
+boost::python::object ComputeHyperparameterGradLogLikelihoodWrapper(const boost::python::object& points_sampled,
+                                                                    const boost::python::object& points_sampled_value,
+                                                                    int dim, int num_sampled,
+                                                                    LogLikelihoodTypes objective_type,
+                                                                    const boost::python::object& hyperparameters,
+                                                                    const boost::python::object& derivatives,
+                                                                    int num_derivatives,
+                                                                    const boost::python::object& noise_variance) {
   const int num_to_sample = 0;
   const boost::python::list points_to_sample_dummy;
 
@@ -131,7 +193,7 @@ boost::python::list ComputeHyperparameterGradLogLikelihoodWrapper(const boost::p
       break;
     }
   }  // end switch over objective_type
-  return VectorToPylist(grad_log_likelihood);
+  return VectorToNumpyArray(grad_log_likelihood);
 }
 
 /*!\rst
@@ -216,17 +278,17 @@ void DispatchHyperparameterOptimization(const boost::python::object& optimizer_p
   }  // end switch over optimzer_type for LogLikelihoodTypes::kLogMarginalLikelihood
 }
 
-boost::python::list MultistartHyperparameterOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                const boost::python::list& hyperparameter_domain,
-                                                                const boost::python::list& points_sampled,
-                                                                const boost::python::list& points_sampled_value,
-                                                                int dim, int num_sampled,
-                                                                const boost::python::list& hyperparameters,
-                                                                const boost::python::list& noise_variance,
-                                                                const boost::python::list& derivatives,
-                                                                int num_derivatives, int max_num_threads,
-                                                                RandomnessSourceContainer& randomness_source,
-                                                                boost::python::dict& status) {
+boost::python::object MultistartHyperparameterOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                  const boost::python::object& hyperparameter_domain,
+                                                                  const boost::python::object& points_sampled,
+                                                                  const boost::python::object& points_sampled_value,
+                                                                  int dim, int num_sampled,
+                                                                  const boost::python::object& hyperparameters,
+                                                                  const boost::python::object& noise_variance,
+                                                                  const boost::python::object& derivatives,
+                                                                  int num_derivatives, int max_num_threads,
+                                                                  RandomnessSourceContainer& randomness_source,
+                                                                  boost::python::dict& status) {
   // TODO(GH-131): make domain objects constructible from python; and pass them in through
   // the optimizer_parameters python object
   const int num_to_sample = 0;
@@ -275,20 +337,20 @@ boost::python::list MultistartHyperparameterOptimizationWrapper(const boost::pyt
     }
   }  // end switch over objective_type
 
-  return VectorToPylist(new_hyperparameters);
+  return VectorToNumpyArray(new_hyperparameters);
 }
 
-boost::python::list EvaluateLogLikelihoodAtHyperparameterListWrapper(const boost::python::list& hyperparameter_list,
-                                                                     const boost::python::list& points_sampled,
-                                                                     const boost::python::list& points_sampled_value,
-                                                                     int dim, int num_sampled,
-                                                                     LogLikelihoodTypes objective_mode,
-                                                                     const boost::python::list& hyperparameters,
-                                                                     const boost::python::list& noise_variance,
-                                                                     const boost::python::list& derivatives,
-                                                                     int num_derivatives,
-                                                                     int num_multistarts, int max_num_threads,
-                                                                     boost::python::dict& status) {
+boost::python::object EvaluateLogLikelihoodAtHyperparameterListWrapper(const boost::python::object& hyperparameter_list,
+                                                                       const boost::python::object& points_sampled,
+                                                                       const boost::python::object& points_sampled_value,
+                                                                       int dim, int num_sampled,
+                                                                       LogLikelihoodTypes objective_mode,
+                                                                       const boost::python::object& hyperparameters,
+                                                                       const boost::python::object& noise_variance,
+                                                                       const boost::python::object& derivatives,
+                                                                       int num_derivatives,
+                                                                       int num_multistarts, int max_num_threads,
+                                                                       boost::python::dict& status) {
   const int num_to_sample = 0;
   const boost::python::list points_to_sample_dummy;
   PythonInterfaceInputContainer input_container(hyperparameters, points_sampled, points_sampled_value, noise_variance,
@@ -337,19 +399,19 @@ boost::python::list EvaluateLogLikelihoodAtHyperparameterListWrapper(const boost
     }
   }
 
-  return VectorToPylist(result_function_values_C);
+  return VectorToNumpyArray(result_function_values_C);
 }
 
-boost::python::list RestartedGradientDescentHyperparameterOptimizationWrapper(const boost::python::object& optimizer_parameters,
-                                                                              const boost::python::list& hyperparameter_domain,
-                                                                              const boost::python::list& points_sampled,
-                                                                              const boost::python::list& points_sampled_value,
-                                                                              int dim, int num_sampled,
-                                                                              const boost::python::list& hyperparameters,
-                                                                              const boost::python::list& noise_variance,
-                                                                              const boost::python::list& derivatives,
-                                                                              int num_derivatives,
-                                                                              boost::python::dict& status){
+boost::python::object RestartedGradientDescentHyperparameterOptimizationWrapper(const boost::python::object& optimizer_parameters,
+                                                                                const boost::python::object& hyperparameter_domain,
+                                                                                const boost::python::object& points_sampled,
+                                                                                const boost::python::object& points_sampled_value,
+                                                                                int dim, int num_sampled,
+                                                                                const boost::python::object& hyperparameters,
+                                                                                const boost::python::object& noise_variance,
+                                                                                const boost::python::object& derivatives,
+                                                                                int num_derivatives,
+                                                                                boost::python::dict& status){
   // the optimizer_parameters python object
   const int num_to_sample = 0;
   const boost::python::list points_to_sample_dummy;
@@ -372,7 +434,7 @@ boost::python::list RestartedGradientDescentHyperparameterOptimizationWrapper(co
   const GradientDescentParameters& gradient_descent_parameters = boost::python::extract<GradientDescentParameters&>(optimizer_parameters.attr("optimizer_parameters"));
   RestartedGradientDescentHyperparameterOptimizationTensor(log_likelihood_eval, sqexp, input_container.noise_variance, gradient_descent_parameters,
                                                            hyperparameter_domain_C.data(), new_hyperparameters.data());
-  return VectorToPylist(new_hyperparameters);
+  return VectorToNumpyArray(new_hyperparameters);
 }
 
 
@@ -401,6 +463,36 @@ void ExportModelSelectionFunctions() {
     :rtype: float64
     )%%");
 
+  boost::python::def("compute_log_likelihood_list", ComputeLogLikelihoodListWrapper, R"%%(
+    Computes the log marginal likelihood of the prior for each of several hyperparameter sets,
+    evaluating the sets in parallel. Each value is identical to the corresponding ``compute_log_likelihood`` result.
+
+    :param points_sampled: points that have already been sampled
+    :type points_sampled: list of float64 with shape (num_sampled, dim)
+    :param points_sampled_value: values of the already-sampled points
+    :type points_sampled_value: list of float64 with shape (num_sampled, )
+    :param dim: the spatial dimension of a point (i.e., number of independent params in experiment)
+    :type dim: int > 0
+    :param num_sampled: number of already-sampled points
+    :type num_sampled: int > 0
+    :param objective_mode: describes which log likelihood measure to compute; only kLogMarginalLikelihood is supported
+    :type objective_mode: GPP.LogLikelihoodTypes (enum)
+    :param hyperparameters_list: covariance hyperparameters ``[\alpha, lengths]`` of each set
+    :type hyperparameters_list: list of float64 with shape (num_hyperparameter_sets, dim + 1)
+    :param derivatives: indices of the dimensions whose derivatives were sampled
+    :type derivatives: list of int with shape (num_derivatives, )
+    :param num_derivatives: number of derivatives
+    :type num_derivatives: int >= 0
+    :param noise_variance_list: the ``\sigma_n^2`` (noise variance) of the value and of each derivative, for each set
+    :type noise_variance_list: list of float64 with shape (num_hyperparameter_sets, num_derivatives + 1)
+    :param num_hyperparameter_sets: number of hyperparameter sets
+    :type num_hyperparameter_sets: int > 0
+    :param max_num_threads: maximum number of threads to use, >= 1
+    :type max_num_threads: int > 0
+    :return: computed log marginal likelihood of each set
+    :rtype: list of float64 with shape (num_hyperparameter_sets, )
+    )%%");
+
   boost::python::def("compute_hyperparameter_grad_log_likelihood", ComputeHyperparameterGradLogLikelihoodWrapper, R"%%(
     Computes the gradient of the specified log likelihood measure of model fit using the given
     hyperparameters. Gradient computed wrt the given hyperparameters.
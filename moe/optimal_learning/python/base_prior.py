@@ -319,7 +319,7 @@ class LognormalPrior(BasePrior):
 
 
 class NormalPrior(BasePrior):
-    def __init__(self, sigma, mean=0):
+    def __init__(self, sigma, mean=0, rng = None):
         """
         Normal prior
 
@@ -331,6 +331,10 @@ class NormalPrior(BasePrior):
         mean: float
             Specifies the mean of the normal distribution
         """
+        if rng is None:
+            self.rng = np.random.RandomState(42)
+        else:
+            self.rng = rng
 
         self.sigma = sigma
         self.mean = mean
@@ -368,9 +372,9 @@ class NormalPrior(BasePrior):
             The samples from the prior.
         """
 
-        p0 = np.random.normal(loc=self.mean,
-                              scale=self.sigma,
-                              size=n_samples)
+        p0 = self.rng.normal(loc=self.mean,
+                             scale=self.sigma,
+                             size=n_samples)
         return p0[:, np.newaxis]
 
     def gradient(self, theta):
@@ -4,23 +4,26 @@ import numpy
 
 
 def cppify(array):
-    """Flatten a numpy array and copies it to a list for C++ consumption.
+    """Flatten a numpy array into a contiguous buffer for C++ consumption.
 
-    TODO(GH-159): This function will be unnecessary when C++ accepts numpy arrays.
+    The C++ bindings read any C-contiguous float64 (or integer) buffer with a single copy, so this avoids
+    building a list of python floats. Integer arrays keep their dtype (e.g., ``derivatives``), other arrays
+    are converted to float64. No copy is made if ``array`` is already a contiguous float64 array.
 
     :param array: array to convert
     :type array: array-like (e.g., ndarray, list, etc.) of float64
-    :return: list copied from flattened array
-    :rtype: list
+    :return: flattened, C-contiguous copy (or view) of the input
+    :rtype: array of float64 (or int) with shape (array.size)
 
     """
-    return list(numpy.ravel(array))
+    array = numpy.ravel(array)
+    if array.dtype.kind not in 'iu':
+        array = array.astype(numpy.float64, copy=False)
+    return numpy.ascontiguousarray(array)
 
 
 def uncppify(array, expected_shape):
-    """Reshape a copy of the input array into the expected shape.
-
-    TODO(GH-159): If C++ returns numpy arrays, we can kill this function (instead, call reshape directly).
+    """Reshape the input array (e.g., a flat array returned by C++) into the expected shape.
 
     :param array: array to reshape
     :type array: array-like
@@ -38,12 +41,12 @@ def cppify_hyperparameters(hyperparameters):
 
     C++ interface expects hyperparameters in a list, where:
     hyperparameters[0]: ``float64 = \alpha`` (``\sigma_f^2``, signal variance)
-    hyperparameters[1]: list = length scales (len = dim, one length per spatial dimension)
+    hyperparameters[1]: array = length scales (len = dim, one length per spatial dimension)
 
     :param hyperparameters: hyperparameters to convert
     :type hyperparameters: array of float64 with shape (num_hyperparameters)
     :return: hyperparameters converted to C++ input format
-    :rtype: list where item [0] is a float and item [1] is a list of float with len = dim
+    :rtype: list where item [0] is a float and item [1] is an array of float64 with shape (dim)
 
     """
     return [numpy.float64(hyperparameters[0]), cppify(hyperparameters[1:])]
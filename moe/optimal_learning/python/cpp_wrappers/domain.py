@@ -8,6 +8,8 @@ for C++ calls to construct the matching C++ domain object.
 import copy
 from logging import warning
 
+import numpy
+
 import moe.build.GPP as C_GP
 from moe.optimal_learning.python.constant import TENSOR_PRODUCT_DOMAIN_TYPE, SIMPLEX_INTERSECT_TENSOR_PRODUCT_DOMAIN_TYPE
 from moe.optimal_learning.python.interfaces.domain_interface import DomainInterface
@@ -35,6 +37,9 @@ class TensorProductDomain(PythonTensorProductDomain):
         """
         self._domain_bounds = copy.deepcopy(domain_bounds)
         self._domain_type = C_GP.DomainTypes.tensor_product
+        # Used by the python fallback of compute_update_restricted_to_domain
+        self._lower_bounds = numpy.ascontiguousarray([interval.min for interval in self._domain_bounds], dtype=numpy.float64)
+        self._upper_bounds = numpy.ascontiguousarray([interval.max for interval in self._domain_bounds], dtype=numpy.float64)
 
     @property
     def dim(self):
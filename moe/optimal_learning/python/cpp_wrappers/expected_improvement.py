@@ -127,7 +127,8 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
             points_to_sample=None,
             points_being_sampled=None,
             num_mc_iterations=DEFAULT_EXPECTED_IMPROVEMENT_MC_ITERATIONS,
-            randomness=None
+            randomness=None,
+            max_num_threads=DEFAULT_MAX_NUM_THREADS,
     ):
         """Construct an ExpectedImprovement object that knows how to call C++ for evaluation of member functions.
 
@@ -139,8 +140,11 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
         :type points_being_sampled: array of float64 with shape (num_being_sampled, dim)
         :param num_mc_iterations: number of monte-carlo iterations to use (when monte-carlo integration is used to compute EI)
         :type num_mc_iterations: int > 0
-        :param randomness: RNGs used by C++ as the source of normal random numbers when monte-carlo is used
+        :param randomness: RNGs used by C++ as the source of normal random numbers when monte-carlo is used, with at least
+          max_num_threads sources; kept for all the calls of this object
         :type randomness: RandomnessSourceContainer (C++ object; e.g., from C_GP.RandomnessSourceContainer())
+        :param max_num_threads: default number of threads of evaluate_at_point_list, >= 1
+        :type max_num_threads: int > 0
 
         """
         self._num_mc_iterations = num_mc_iterations
@@ -165,12 +169,13 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
             self.current_point = points_to_sample
 
         if randomness is None:
-            self._randomness = C_GP.RandomnessSourceContainer(1)  # create randomness for only 1 thread
+            self._randomness = C_GP.RandomnessSourceContainer(max_num_threads)  # one source per thread
             # Set seed based on less repeatable factors (e.g,. time)
             self._randomness.SetRandomizedUniformGeneratorSeed(0)
             self._randomness.SetRandomizedNormalRNGSeed(0)
         else:
             self._randomness = randomness
+        self._max_num_threads = max_num_threads
 
         self.objective_type = None  # Not used for EI, but the field is expected in C++
 
@@ -213,7 +218,7 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
             self,
             points_to_evaluate,
             randomness=None,
-            max_num_threads=DEFAULT_MAX_NUM_THREADS,
+            max_num_threads=None,
             status=None,
     ):
         """Evaluate Expected Improvement (1,p-EI) over a specified list of ``points_to_evaluate``.
@@ -228,7 +233,7 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
         :type points_to_evaluate: array of float64 with shape (num_to_evaluate, self.dim)
         :param randomness: RNGs used by C++ to generate initial guesses and as the source of normal random numbers when monte-carlo is used
         :type randomness: RandomnessSourceContainer (C++ object; e.g., from C_GP.RandomnessSourceContainer())
-        :param max_num_threads: maximum number of threads to use, >= 1
+        :param max_num_threads: maximum number of threads to use, >= 1 (default: the max_num_threads of this object)
         :type max_num_threads: int > 0
         :param status: (output) status messages from C++ (e.g., reporting on optimizer success, etc.)
         :type status: dict
@@ -236,9 +241,13 @@ class ExpectedImprovement(ExpectedImprovementInterface, OptimizableInterface):
         :rtype: array of float64 with shape (points_to_evaluate.shape[0])
 
         """
+        if max_num_threads is None:
+            max_num_threads = self._max_num_threads
+
         # Create enough randomness sources if none are specified.
         if randomness is None:
-            if max_num_threads == 1:
+            if max_num_threads <= self._max_num_threads:
+                # Reuse the persistent sources instead of seeding new ones on every call
                 randomness = self._randomness
             else:
                 randomness = C_GP.RandomnessSourceContainer(max_num_threads)
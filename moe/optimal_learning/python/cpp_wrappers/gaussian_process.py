@@ -139,6 +139,23 @@ class GaussianProcess(GaussianProcessInterface):
         """
         return copy.deepcopy(self._historical_data)
 
+    def clone(self):
+        """Return a copy of this Gaussian Process that can be updated (e.g., with :meth:`add_sampled_points`) independently.
+
+        C++ copies the derived quantities (cholesky factors, ...) instead of computing them again.
+
+        :return: copy of this object
+        :rtype: GaussianProcess
+
+        """
+        gaussian_process = copy.copy(self)
+        gaussian_process._covariance = copy.deepcopy(self._covariance)
+        gaussian_process._noise_variance = numpy.copy(self._noise_variance)
+        gaussian_process._historical_data = copy.deepcopy(self._historical_data)
+        gaussian_process._derivatives = numpy.copy(self._derivatives)
+        gaussian_process._gaussian_process = self._gaussian_process.clone()
+        return gaussian_process
+
     def compute_mean_of_points(self, points_to_sample):
         r"""Compute the mean of this GP at each of point of ``Xs`` (``points_to_sample``).
 
@@ -315,14 +332,20 @@ class GaussianProcess(GaussianProcessInterface):
         )
         return cpp_utils.uncppify(grad_chol_decomp, (num_derivatives, num_to_sample*(1 + self._num_derivatives), num_to_sample*(1 + self._num_derivatives), self.dim))
 
-    def add_sampled_points(self, sampled_points):
+    def add_sampled_points(self, sampled_points, incremental_cholesky=False):
         r"""Add sampled point(s) (point, value, noise) to the GP's prior data.
 
         Also forces recomputation of all derived quantities for GP to remain consistent.
 
+        With ``incremental_cholesky``, the cholesky factor of the covariance is extended with the new rows
+        (``O(N^2 * num_to_add)``) instead of being recomputed (``O(N^3)``); C++ falls back to the full
+        factorization if the appended block is ill-conditioned.
+
         :param sampled_points: :class:`moe.optimal_learning.python.SamplePoint` objects to load
           into the GP (containing point, function value, and noise variance)
         :type sampled_points: list of :class:`~moe.optimal_learning.python.SamplePoint` objects (or SamplePoint-like iterables)
+        :param incremental_cholesky: whether to extend the current cholesky factor instead of recomputing it
+        :type incremental_cholesky: bool
 
         """
         # TODO(GH-159): When C++ can pass back numpy arrays, we can stop keeping a duplicate in self._historical_data.
@@ -336,6 +359,7 @@ class GaussianProcess(GaussianProcessInterface):
             cpp_utils.cppify(self._historical_data.points_sampled_value[num_sampled_prev:]),
             # cpp_utils.cppify(self._historical_data.points_sampled_noise_variance[num_sampled_prev:]),
             num_to_add,
+            incremental_cholesky,
         )
 
     def sample_point_from_gp(self, point_to_sample, noise_variance=0.0):
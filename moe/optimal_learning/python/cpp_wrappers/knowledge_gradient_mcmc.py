@@ -244,6 +244,70 @@ class GaussianProcessMCMC(object):
         """
         return copy.deepcopy(self._historical_data)
 
+    def clone(self):
+        """Return a copy of this Gaussian Process MCMC that can be updated (e.g., with :meth:`add_sampled_points`) independently.
+
+        C++ copies the derived quantities (cholesky factors, ...) instead of computing them again.
+
+        :return: copy of this object
+        :rtype: GaussianProcessMCMC
+
+        """
+        gaussian_process_mcmc = copy.copy(self)
+        gaussian_process_mcmc._hyperparameters_list = numpy.copy(self._hyperparameters_list)
+        gaussian_process_mcmc._noise_variance_list = numpy.copy(self._noise_variance_list)
+        gaussian_process_mcmc._historical_data = copy.deepcopy(self._historical_data)
+        gaussian_process_mcmc._derivatives = numpy.copy(self._derivatives)
+        gaussian_process_mcmc._gaussian_process_mcmc = self._gaussian_process_mcmc.clone()
+        return gaussian_process_mcmc
+
+    def add_sampled_points(self, sampled_points, incremental_cholesky=False):
+        r"""Add sampled point(s) (point, value, noise) to the prior data of every GP.
+
+        With ``incremental_cholesky``, the cholesky factors of the covariances are extended with the new rows
+        instead of being recomputed; see :meth:`GaussianProcess.add_sampled_points`.
+
+        :param sampled_points: :class:`moe.optimal_learning.python.SamplePoint` objects to load
+          into the GPs (containing point, function value, and noise variance)
+        :type sampled_points: list of :class:`~moe.optimal_learning.python.SamplePoint` objects (or SamplePoint-like iterables)
+        :param incremental_cholesky: whether to extend the current cholesky factors instead of recomputing them
+        :type incremental_cholesky: bool
+
+        """
+        num_sampled_prev = self.num_sampled
+        num_to_add = len(sampled_points)
+        self._historical_data.append_sample_points(sampled_points)
+
+        self._gaussian_process_mcmc.add_sampled_points(
+            cpp_utils.cppify(self._historical_data.points_sampled[num_sampled_prev:, ...]),
+            cpp_utils.cppify(self._historical_data.points_sampled_value[num_sampled_prev:]),
+            num_to_add,
+            incremental_cholesky,
+        )
+
+    def set_hyperparameters(self, hyperparameters_list, noise_variance_list):
+        """Replace the hyperparameter samples; the GPs of the samples already present are kept, not factorized again.
+
+        :param hyperparameters_list: covariance hyperparameters of each sample
+        :type hyperparameters_list: array of float64 with shape (num_mcmc, dim + 1)
+        :param noise_variance_list: noise variance of each sample
+        :type noise_variance_list: array of float64 with shape (num_mcmc, num_derivatives + 1)
+
+        """
+        current = {(hypers.tobytes(), noise.tobytes()): i for i, (hypers, noise)
+                   in enumerate(zip(self._hyperparameters_list, self._noise_variance_list))}
+        reuse_index = numpy.array([current.get((hypers.tobytes(), noise.tobytes()), -1)
+                                   for hypers, noise in zip(hyperparameters_list, noise_variance_list)], dtype=int)
+        self._hyperparameters_list = copy.deepcopy(hyperparameters_list)
+        self._noise_variance_list = copy.deepcopy(noise_variance_list)
+        self._num_mcmc = hyperparameters_list.shape[0]
+        self._gaussian_process_mcmc.set_hyperparameters(
+            cpp_utils.cppify(self._hyperparameters_list),
+            cpp_utils.cppify(self._noise_variance_list),
+            cpp_utils.cppify(reuse_index),
+            self._num_mcmc,
+        )
+
 def multistart_knowledge_gradient_mcmc_optimization(
         kg_optimizer,
         inner_optimizer,
@@ -357,6 +421,7 @@ class KnowledgeGradientMCMC(OptimizableInterface):
             points_being_sampled=None,
             num_mc_iterations=DEFAULT_EXPECTED_IMPROVEMENT_MC_ITERATIONS,
             randomness=None,
+            max_num_threads=DEFAULT_MAX_NUM_THREADS,
     ):
         """Construct a KnowledgeGradient object that supports q,p-KG.
         TODO(GH-56): Allow callers to pass in a source of randomness.
@@ -372,8 +437,11 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         :type points_being_sampled: array of float64 with shape (num_being_sampled, dim)
         :param num_mc_iterations: number of monte-carlo iterations to use (when monte-carlo integration is used to compute KG)
         :type num_mc_iterations: int > 0
-        :param randomness: random source(s) used for monte-carlo integration (when applicable) (UNUSED)
-        :type randomness: (UNUSED)
+        :param randomness: random source(s) used for monte-carlo integration (when applicable), with at least
+          max_num_threads sources; kept for all the calls of this object
+        :type randomness: RandomnessSourceContainer (C++ object; e.g., from C_GP.RandomnessSourceContainer())
+        :param max_num_threads: default number of threads of evaluate_at_point_list, >= 1
+        :type max_num_threads: int > 0
         """
         self._num_mc_iterations = num_mc_iterations
         self._gaussian_process_mcmc = gaussian_process_mcmc
@@ -405,12 +473,13 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         self._num_to_sample = self._points_to_sample.shape[0]
 
         if randomness is None:
-            self._randomness = C_GP.RandomnessSourceContainer(1)  # create randomness for only 1 thread
+            self._randomness = C_GP.RandomnessSourceContainer(max_num_threads)  # one source per thread
             # Set seed based on less repeatable factors (e.g,. time)
             self._randomness.SetRandomizedUniformGeneratorSeed(0)
             self._randomness.SetRandomizedNormalRNGSeed(0)
         else:
             self._randomness = randomness
+        self._max_num_threads = max_num_threads
 
         self.objective_type = None  # Not used for KG, but the field is expected in C++
 
@@ -455,7 +524,7 @@ class KnowledgeGradientMCMC(OptimizableInterface):
             self,
             points_to_evaluate,
             randomness=None,
-            max_num_threads=DEFAULT_MAX_NUM_THREADS,
+            max_num_threads=None,
             status=None,
     ):
         """Evaluate knowledge gradient (1,p-EI) over a specified list of ``points_to_evaluate``.
@@ -470,7 +539,7 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         :type points_to_evaluate: array of float64 with shape (num_to_evaluate, self.dim)
         :param randomness: RNGs used by C++ to generate initial guesses and as the source of normal random numbers when monte-carlo is used
         :type randomness: RandomnessSourceContainer (C++ object; e.g., from C_GP.RandomnessSourceContainer())
-        :param max_num_threads: maximum number of threads to use, >= 1
+        :param max_num_threads: maximum number of threads to use, >= 1 (default: the max_num_threads of this object)
         :type max_num_threads: int > 0
         :param status: (output) status messages from C++ (e.g., reporting on optimizer success, etc.)
         :type status: dict
@@ -478,9 +547,13 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         :rtype: array of float64 with shape (points_to_evaluate.shape[0])
 
         """
+        if max_num_threads is None:
+            max_num_threads = self._max_num_threads
+
         # Create enough randomness sources if none are specified.
         if randomness is None:
-            if max_num_threads == 1:
+            if max_num_threads <= self._max_num_threads:
+                # Reuse the persistent sources instead of seeding new ones on every call
                 randomness = self._randomness
             else:
                 randomness = C_GP.RandomnessSourceContainer(max_num_threads)
@@ -501,8 +574,8 @@ class KnowledgeGradientMCMC(OptimizableInterface):
             self._num_fidelity,
             self._inner_optimizer.optimizer_parameters,
             cpp_utils.cppify(self._inner_optimizer.domain.domain_bounds),
-            cpp_utils.cppify(discrete_being_sampled),
             cpp_utils.cppify(points_to_evaluate),
+            cpp_utils.cppify(discrete_being_sampled),
             num_to_evaluate,
             self.discrete,
             num_to_sample,
@@ -515,6 +588,59 @@ class KnowledgeGradientMCMC(OptimizableInterface):
         )
         return kg_values_mcmc
 
+    def evaluate_grad_at_point_list(
+            self,
+            points_to_evaluate,
+            randomness=None,
+            max_num_threads=None,
+    ):
+        """Evaluate the gradient of knowledge gradient over a specified list of sets of ``points_to_evaluate``.
+
+        Equivalent to calling :meth:`compute_grad_knowledge_gradient_mcmc` after setting each set of points as the
+        current point, in a single (multithreaded) C++ call. ``self._points_to_sample`` is unchanged.
+
+        :param points_to_evaluate: sets of points at which to compute the gradient of KG
+        :type points_to_evaluate: array of float64 with shape (num_to_evaluate, num_to_sample, self.dim)
+        :param randomness: RNGs used by C++ as the source of normal random numbers when monte-carlo is used
+        :type randomness: RandomnessSourceContainer (C++ object; e.g., from C_GP.RandomnessSourceContainer())
+        :param max_num_threads: maximum number of threads to use, >= 1 (default: the max_num_threads of this object)
+        :type max_num_threads: int > 0
+        :return: gradient of KG at each set of points_to_evaluate
+        :rtype: array of float64 with shape (num_to_evaluate, num_to_sample, self.dim)
+
+        """
+        if max_num_threads is None:
+            max_num_threads = self._max_num_threads
+
+        if randomness is None:
+            if max_num_threads <= self._max_num_threads:
+                randomness = self._randomness
+            else:
+                randomness = C_GP.RandomnessSourceContainer(max_num_threads)
+                # Set seeds based on less repeatable factors (e.g,. time)
+                randomness.SetRandomizedUniformGeneratorSeed(0)
+                randomness.SetRandomizedNormalRNGSeed(0)
+
+        num_to_evaluate, num_to_sample, _ = points_to_evaluate.shape
+        discrete_being_sampled = numpy.concatenate((numpy.ravel(self._discrete_pts_list), numpy.ravel(self._points_being_sampled)))
+        grad_kg_values_mcmc = C_GP.evaluate_grad_KG_mcmc_at_point_list(
+            self._gaussian_process_mcmc._gaussian_process_mcmc,
+            self._num_fidelity,
+            self._inner_optimizer.optimizer_parameters,
+            cpp_utils.cppify(self._inner_optimizer.domain.domain_bounds),
+            cpp_utils.cppify(points_to_evaluate),
+            cpp_utils.cppify(discrete_being_sampled),
+            num_to_evaluate,
+            self.discrete,
+            num_to_sample,
+            self.num_being_sampled,
+            cpp_utils.cppify(self._best_so_far_list),
+            self._num_mc_iterations,
+            max_num_threads,
+            randomness,
+        )
+        return cpp_utils.uncppify(grad_kg_values_mcmc, (num_to_evaluate, num_to_sample, self.dim))
+
     def compute_knowledge_gradient_mcmc(self, force_monte_carlo=False):
         r"""Compute the knowledge gradient at ``points_to_sample``, with ``points_being_sampled`` concurrent points being sampled.
 
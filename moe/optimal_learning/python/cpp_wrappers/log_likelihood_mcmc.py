@@ -60,6 +60,7 @@ import emcee
 from scipy import optimize
 
 import moe.build.GPP as C_GP
+from moe.optimal_learning.python.constant import DEFAULT_MAX_NUM_THREADS
 from moe.optimal_learning.python.cpp_wrappers import cpp_utils
 from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponential
 from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
@@ -88,9 +89,25 @@ class GaussianProcessLogLikelihoodMCMC(object):
     """
 
     def __init__(self, historical_data, derivatives, prior, chain_length, burnin_steps, n_hypers,
-                 log_likelihood_type=C_GP.LogLikelihoodTypes.log_marginal_likelihood, noisy = True, rng = None):
+                 log_likelihood_type=C_GP.LogLikelihoodTypes.log_marginal_likelihood, noisy = True, rng = None,
+                 incremental_chain_length=None, max_incremental_points=None, full_chain_every=None,
+                 adaptive_stop=False, autocorr_check_interval=50, autocorr_factor=50, autocorr_tol=0.01,
+                 min_acceptance_fraction=0.1, vectorize_likelihood=False, max_num_threads=DEFAULT_MAX_NUM_THREADS):
         """Construct a LogLikelihood object that knows how to call C++ for evaluation of member functions.
 
+        After the burn-in, every call to :meth:`train` continues the chains from the last walker positions.
+        With ``incremental_chain_length`` set, the continuation is a short chain of that length (warm start),
+        as long as at most ``max_incremental_points`` points were added since the last training and the training
+        is not the ``full_chain_every``-th one since the last full chain (``chain_length`` steps).
+        With ``adaptive_stop``, a chain stops before its nominal length once it is longer than ``autocorr_factor``
+        times the estimated integrated autocorrelation time, the estimate changed less than ``autocorr_tol``
+        (relative) since the previous check and the mean acceptance fraction is at least ``min_acceptance_fraction``.
+        With ``vectorize_likelihood``, the walkers of each ensemble move are evaluated in a single C++ call
+        (:meth:`compute_log_likelihood_list`), on up to ``max_num_threads`` threads; the chains are identical
+        to the serial ones for the same ``rng``.
+        All the randomness of the sampling (initial walkers without a prior, emcee moves, choice of ``hypers``)
+        comes from ``rng``, so the chains are reproducible given its seed (and the seeds of ``prior``).
+
         :param covariance_function: covariance object encoding assumptions about the GP's behavior on our data
         :type covariance_function: :class:`moe.optimal_learning.python.interfaces.covariance_interface.CovarianceInterface` subclass
           (e.g., from :mod:`moe.optimal_learning.python.cpp_wrappers.covariance`).
@@ -98,6 +115,28 @@ class GaussianProcessLogLikelihoodMCMC(object):
         :type historical_data: :class:`moe.optimal_learning.python.data_containers.HistoricalData` object
         :param log_likelihood_type: enum specifying which log likelihood measure to compute
         :type log_likelihood_type: GPP.LogLikelihoodTypes
+        :param rng: source of the randomness of the sampling (None: seeded from the global numpy.random)
+        :type rng: numpy.random.RandomState or None
+        :param incremental_chain_length: length of the warm-started chain run when few points were added (None: always ``chain_length``)
+        :type incremental_chain_length: int > 0 or None
+        :param max_incremental_points: max number of points added since the last training for a warm-started chain (None: no limit)
+        :type max_incremental_points: int > 0 or None
+        :param full_chain_every: run a full chain every ``full_chain_every`` trainings (None: only when required by the above)
+        :type full_chain_every: int > 0 or None
+        :param adaptive_stop: whether to stop the chains early based on autocorrelation and acceptance statistics
+        :type adaptive_stop: bool
+        :param autocorr_check_interval: number of steps between two checks of the stopping rule
+        :type autocorr_check_interval: int > 0
+        :param autocorr_factor: min chain length, in units of the integrated autocorrelation time
+        :type autocorr_factor: float64 > 0
+        :param autocorr_tol: max relative change of the autocorrelation time estimate between two checks
+        :type autocorr_tol: float64 > 0
+        :param min_acceptance_fraction: min mean acceptance fraction of the walkers
+        :type min_acceptance_fraction: float64 in [0, 1]
+        :param vectorize_likelihood: whether to evaluate all the walker positions of a move in one (multithreaded) call
+        :type vectorize_likelihood: bool
+        :param max_num_threads: maximum number of threads used by the vectorized likelihood
+        :type max_num_threads: int > 0
 
         """
         self._historical_data = copy.deepcopy(historical_data)
@@ -112,6 +151,8 @@ class GaussianProcessLogLikelihoodMCMC(object):
         self.burned = False
         self.burnin_steps = burnin_steps
         self._models = []
+        self._model_keys = []  # (hyperparameters, noise) of each model, see train
+        self._gaussian_process_mcmc = None
         self.noisy = noisy
 
         if rng is None:
@@ -121,6 +162,20 @@ class GaussianProcessLogLikelihoodMCMC(object):
         self.n_hypers = n_hypers
         self.n_chains = max(n_hypers, 2*(self._historical_data.dim+1+1+self._num_derivatives))
 
+        self.incremental_chain_length = incremental_chain_length
+        self.max_incremental_points = max_incremental_points
+        self.full_chain_every = full_chain_every
+        self.adaptive_stop = adaptive_stop
+        self.autocorr_check_interval = autocorr_check_interval
+        self.autocorr_factor = autocorr_factor
+        self.autocorr_tol = autocorr_tol
+        self.min_acceptance_fraction = min_acceptance_fraction
+        self.vectorize_likelihood = vectorize_likelihood
+        self.max_num_threads = max_num_threads
+        self._num_sampled_at_last_train = self._historical_data.num_sampled
+        self._trainings_since_full_chain = 0
+        self.last_chain_length = 0
+
     @property
     def dim(self):
         """Return the number of spatial dimensions."""
@@ -186,35 +241,51 @@ class GaussianProcessLogLikelihoodMCMC(object):
 
         if do_optimize:
           # We have one walker for each hyperparameter configuration
-          sampler = emcee.EnsembleSampler(self.n_chains, 1 + self.dim + self._num_derivatives + 1,
-                                            self.compute_log_likelihood)
+          if self.vectorize_likelihood:
+              sampler = emcee.EnsembleSampler(self.n_chains, 1 + self.dim + self._num_derivatives + 1,
+                                              self.compute_log_likelihood_list, vectorize=True)
+          else:
+              sampler = emcee.EnsembleSampler(self.n_chains, 1 + self.dim + self._num_derivatives + 1,
+                                              self.compute_log_likelihood)
+          # emcee draws its moves from its own RandomState (rstate0 only accepts a state tuple): start it
+          # from self.rng, and hand its state back below so that self.rng carries the whole sampling state
+          sampler.random_state = self.rng.get_state()
 
           # Do a burn-in in the first iteration
           if not self.burned:
             # Initialize the walkers by sampling from the prior
             if self.prior is None:
-                self.p0 = numpy.random.rand(self.n_chains, 1 + self.dim + self._num_derivatives + 1)
+                self.p0 = self.rng.rand(self.n_chains, 1 + self.dim + self._num_derivatives + 1)
             else:
                 self.p0 = self.prior.sample_from_prior(self.n_chains)
             # Run MCMC sampling
-            self.p0, _, _ = sampler.run_mcmc(self.p0, self.burnin_steps,
-                                             rstate0=self.rng)
+            self.p0, _, _ = sampler.run_mcmc(self.p0, self.burnin_steps)
 
             self.burned = True
+            sampler.reset()
 
           # Start sampling
-          pos, _, _ = sampler.run_mcmc(self.p0, self.chain_length,
-                                       rstate0=self.rng, skip_initial_state_check=True)
+          pos = self._run_chain(sampler, self._next_chain_length())
 
           # Save the current position, it will be the start point in
           # the next iteration
           self.p0 = pos
+          self._num_sampled_at_last_train = self._num_sampled
+          self.rng.set_state(sampler.random_state)
 
           # Take the last samples from each walker
-          self.hypers = sampler.chain[numpy.random.choice(self.n_chains, self.n_hypers), -1]
+          self.hypers = sampler.chain[self.rng.choice(self.n_chains, self.n_hypers), -1]
 
         self.is_trained = True
+        self._build_models()
+
+    def _build_models(self):
+        """Build a GP for each sampled hyperparameter configuration ``self.hypers``."""
+        # Walkers that did not move keep their hyperparameters: their GPs (kept up to date by
+        # add_sampled_points) are reused instead of being factorized again
+        previous_models = dict(zip(self._model_keys, self._models))
         self._models = []
+        self._model_keys = []
         hypers_list = []
         noises_list = []
         for sample in self.hypers:
@@ -224,24 +295,111 @@ class GaussianProcessLogLikelihoodMCMC(object):
             # Instantiate a GP for each hyperparameter configuration
             cov_hyps = sample[:(self.dim+1)]
             hypers_list.append(cov_hyps)
-            se = SquareExponential(cov_hyps)
             if self.noisy:
                 noise = sample[(self.dim+1):]
             else:
                 noise = numpy.array((1+self._num_derivatives)*[1.e-8])
             noises_list.append(noise)
-            model = GaussianProcess(se, noise,
-                                    self._historical_data,
-                                    self.derivatives)
+            key = (cov_hyps.tobytes(), noise.tobytes())
+            model = previous_models.pop(key, None)
+            if model is None:
+                model = GaussianProcess(SquareExponential(cov_hyps), noise,
+                                        self._historical_data,
+                                        self.derivatives)
             self._models.append(model)
+            self._model_keys.append(key)
 
-        self._gaussian_process_mcmc = GaussianProcessMCMC(numpy.array(hypers_list), numpy.array(noises_list),
-                                                          self._historical_data, self.derivatives)
+        if self._gaussian_process_mcmc is None:
+            self._gaussian_process_mcmc = GaussianProcessMCMC(numpy.array(hypers_list), numpy.array(noises_list),
+                                                              self._historical_data, self.derivatives)
+        else:
+            # Same reuse for the GPs of the KG (kept up to date by add_sampled_points as well)
+            self._gaussian_process_mcmc.set_hyperparameters(numpy.array(hypers_list), numpy.array(noises_list))
+
+    def get_state(self):
+        """Return what is needed to continue the chains later (see :meth:`set_state`).
+
+        :return: walker positions ``p0``, sampled hyperparameters ``hypers``, state of ``rng`` (the source of all the
+          randomness of the chains) and chain scheduling counters
+        :rtype: dict of str: array of float64 or int
+
+        """
+        _, rng_keys, rng_pos, rng_has_gauss, rng_cached_gaussian = self.rng.get_state()
+        return {
+            'p0': numpy.copy(self.p0),
+            'hypers': numpy.array(self.hypers),
+            'rng_keys': rng_keys,
+            'rng_pos': rng_pos,
+            'rng_has_gauss': rng_has_gauss,
+            'rng_cached_gaussian': rng_cached_gaussian,
+            'num_sampled_at_last_train': self._num_sampled_at_last_train,
+            'trainings_since_full_chain': self._trainings_since_full_chain,
+            'last_chain_length': self.last_chain_length,
+        }
+
+    def set_state(self, state):
+        """Continue from a state returned by :meth:`get_state` (of an object with the same historical data).
+
+        The burn-in is skipped: the next :meth:`train` continues the chains from the saved walkers. The models are
+        rebuilt from the saved hyperparameters, without sampling.
+
+        :param state: state returned by :meth:`get_state`
+        :type state: dict of str: array of float64 or int
+
+        """
+        self.p0 = numpy.array(state['p0'])
+        self.hypers = numpy.array(state['hypers'])
+        self.rng.set_state(('MT19937', numpy.asarray(state['rng_keys'], dtype=numpy.uint32), int(state['rng_pos']),
+                            int(state['rng_has_gauss']), float(state['rng_cached_gaussian'])))
+        self._num_sampled_at_last_train = int(state['num_sampled_at_last_train'])
+        self._trainings_since_full_chain = int(state['trainings_since_full_chain'])
+        self.last_chain_length = int(state['last_chain_length'])
+        self.burned = True
+        self.is_trained = True
+        self._models = []
+        self._model_keys = []
+        self._build_models()
+
+    def _next_chain_length(self):
+        """Return the length of the next chain: full or warm-started (see the constructor)."""
+        incremental = self.incremental_chain_length is not None
+        if incremental and self.max_incremental_points is not None:
+            incremental = self._num_sampled - self._num_sampled_at_last_train <= self.max_incremental_points
+        if incremental and self.full_chain_every is not None:
+            # Every full_chain_every-th training runs a full chain
+            incremental = self._trainings_since_full_chain < self.full_chain_every - 1
+        if incremental:
+            self._trainings_since_full_chain += 1
+            return self.incremental_chain_length
+        self._trainings_since_full_chain = 0
+        return self.chain_length
+
+    def _run_chain(self, sampler, chain_length):
+        """Run ``chain_length`` steps from ``self.p0`` (stopping early if ``adaptive_stop``) and return the last walker positions."""
+        if not self.adaptive_stop:
+            pos, _, _ = sampler.run_mcmc(self.p0, chain_length, skip_initial_state_check=True)
+            self.last_chain_length = chain_length
+            return pos
+
+        old_tau = numpy.inf
+        for state in sampler.sample(self.p0, iterations=chain_length, skip_initial_state_check=True):
+            if sampler.iteration % self.autocorr_check_interval:
+                continue
+            tau = numpy.max(sampler.get_autocorr_time(tol=0))
+            converged = (numpy.isfinite(tau) and
+                         sampler.iteration > self.autocorr_factor * tau and
+                         numpy.abs(old_tau - tau) < self.autocorr_tol * tau and
+                         numpy.mean(sampler.acceptance_fraction) >= self.min_acceptance_fraction)
+            if converged:
+                break
+            old_tau = tau
+        self.last_chain_length = sampler.iteration
+        return state.coords
 
     def optimize(self, do_optimize=True, **kwargs):
 
         if self.prior is None:
-            self.p0 = numpy.random.rand(1 + self.dim + self._num_derivatives + 1)
+            self.p0 = self.rng.rand(1 + self.dim + self._num_derivatives + 1)
         else:
             self.p0 = self.prior.sample_from_prior(1)
 
@@ -249,6 +407,7 @@ class GaussianProcessLogLikelihoodMCMC(object):
 
         self.is_trained = True
         self._models = []
+        self._model_keys = []
         hypers_list = []
         noises_list = []
         for sample in self.hypers:
@@ -274,18 +433,17 @@ class GaussianProcessLogLikelihoodMCMC(object):
                                                           self._historical_data, self.derivatives)
 
 
-    def compute_log_likelihood(self, hyps0):
-        r"""Compute the objective_type measure at the specified hyperparameters.
+    def _split_hyperparameters(self, hyps0):
+        r"""Return the log prior (1 without prior), covariance hyperparameters and noise of the log-scale sample ``hyps0``.
 
-        :return: value of log_likelihood evaluated at hyperparameters (``LL(y | X, \theta)``)
-        :rtype: float64
+        The log prior is -inf if ``hyps0`` is out of bounds or has zero prior probability.
 
         """
         # Bound the hyperparameter space to keep things sane. Note all
         # hyperparameters live on a log scale
         hyps = hyps0.copy()
         if numpy.any((-20 > hyps) + (hyps > 20)):
-            return -numpy.inf
+            return -numpy.inf, None, None
         if not self.noisy:
             # TODO: this is actually overwriting the input array, causing the MC sampler to have just
             # log(1.e-8) as the 4th (last) column entries of the walkers coordinates, thus breaking the entire thing...
@@ -300,7 +458,16 @@ class GaussianProcessLogLikelihoodMCMC(object):
         hyps = numpy.exp(hyps)
         cov_hyps = hyps[:(self.dim+1)]
         noise = hyps[(self.dim+1):]
+        return posterior, cov_hyps, noise
+
+    def compute_log_likelihood(self, hyps0):
+        r"""Compute the objective_type measure at the specified hyperparameters.
 
+        :return: value of log_likelihood evaluated at hyperparameters (``LL(y | X, \theta)``)
+        :rtype: float64
+
+        """
+        posterior, cov_hyps, noise = self._split_hyperparameters(hyps0)
         if posterior == -numpy.inf:
             return -numpy.inf
         else:
@@ -316,6 +483,37 @@ class GaussianProcessLogLikelihoodMCMC(object):
                     )
             return val
 
+    def compute_log_likelihood_list(self, hyps_list):
+        r"""Compute the objective_type measure at each row of ``hyps_list``, in a single multithreaded C++ call.
+
+        Each value is identical to :meth:`compute_log_likelihood` of the same row.
+
+        :param hyps_list: log-scale hyperparameter samples (e.g., the walker positions of an ensemble move)
+        :type hyps_list: array of float64 with shape (num_samples, num_hyperparameters)
+        :return: value of log_likelihood evaluated at each sample
+        :rtype: array of float64 with shape (num_samples, )
+
+        """
+        split = [self._split_hyperparameters(hyps0) for hyps0 in hyps_list]
+        log_likelihood_list = numpy.full(len(split), -numpy.inf)
+        valid = [i for i, (posterior, _, _) in enumerate(split) if posterior != -numpy.inf]
+        if valid:
+            values = C_GP.compute_log_likelihood_list(
+                    cpp_utils.cppify(self._points_sampled),
+                    cpp_utils.cppify(self._points_sampled_value),
+                    self.dim,
+                    self._num_sampled,
+                    self.objective_type,
+                    cpp_utils.cppify([split[i][1] for i in valid]),
+                    cpp_utils.cppify(self._derivatives), self._num_derivatives,
+                    cpp_utils.cppify([split[i][2] for i in valid]),
+                    len(valid),
+                    self.max_num_threads,
+                    )
+            for i, value in zip(valid, values):
+                log_likelihood_list[i] = split[i][0] + value
+        return log_likelihood_list
+
     def nll(self, hyps):
         result = self.compute_log_likelihood(hyps)
         return -result
@@ -334,4 +532,7 @@ class GaussianProcessLogLikelihoodMCMC(object):
         self._historical_data.append_sample_points(sampled_points)
         if len(self.models) > 0:
             for model in self._models:
-                model.add_sampled_points(sampled_points)
\ No newline at end of file
+                # same hyperparameters, only new rows: extend the cholesky factors
+                model.add_sampled_points(sampled_points, incremental_cholesky=True)
+        if self._gaussian_process_mcmc is not None:
+            self._gaussian_process_mcmc.add_sampled_points(sampled_points, incremental_cholesky=True)
\ No newline at end of file
@@ -89,6 +89,36 @@ def generate_grid_points(points_per_dimension, domain_bounds):
     return numpy.vstack(list(map(numpy.ravel, mesh_grid))).T
 
 
+def compute_update_restricted_to_bounds(lower_bounds, upper_bounds, max_relative_change, current_point, update_vector):
+    r"""Limit ``update_vector`` so that ``current_point`` + update stays inside the box [``lower_bounds``, ``upper_bounds``].
+
+    Each coordinate of the step is limited to ``max_relative_change`` times the distance of ``current_point``
+    to the nearest boundary in that dimension, keeping its direction of travel. The bounds broadcast against
+    the last axis, so a stack of points (and updates) is limited in one operation.
+
+    :param lower_bounds: "left" bound of each dimension
+    :type lower_bounds: array of float64 with shape (dim)
+    :param upper_bounds: "right" bound of each dimension
+    :type upper_bounds: array of float64 with shape (dim)
+    :param max_relative_change: max change allowed per update (as a relative fraction of current distance to boundary)
+    :type max_relative_change: float64 in (0, 1]
+    :param current_point: starting point(s)
+    :type current_point: array of float64 with shape (..., dim)
+    :param update_vector: proposed update(s)
+    :type update_vector: array of float64 with shape (..., dim)
+    :return: new update(s) so that the final point(s) remain inside the box
+    :rtype: array of float64 with shape (..., dim)
+
+    """
+    # Note: since all boundary planes are axis-aligned, projecting becomes very simple.
+    distance_to_boundary = numpy.fmin(current_point - lower_bounds, upper_bounds - current_point)
+    # 0 < max_relative_change <= 1 so at worst we reach the boundary.
+    max_step = max_relative_change * distance_to_boundary
+    # Move the max allowed distance, in the original direction of travel (obtained via copy-sign)
+    return numpy.where(numpy.fabs(update_vector) > max_step, numpy.copysign(max_step, update_vector),
+                       update_vector).astype(numpy.float64, copy=False)
+
+
 # See ClosedInterval (below) for docstring.
 _BaseClosedInterval = collections.namedtuple('ClosedInterval', ['min', 'max'])
 
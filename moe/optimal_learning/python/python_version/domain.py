@@ -18,7 +18,7 @@ import copy
 import numpy
 
 from moe.optimal_learning.python.constant import TENSOR_PRODUCT_DOMAIN_TYPE
-from moe.optimal_learning.python.geometry_utils import generate_grid_points, generate_latin_hypercube_points
+from moe.optimal_learning.python.geometry_utils import compute_update_restricted_to_bounds, generate_grid_points, generate_latin_hypercube_points
 from moe.optimal_learning.python.interfaces.domain_interface import DomainInterface
 
 
@@ -45,6 +45,9 @@ class TensorProductDomain(DomainInterface):
             if interval.is_empty():
                 raise ValueError('Tensor product region is EMPTY.')
 
+        self._lower_bounds = numpy.ascontiguousarray([interval.min for interval in self._domain_bounds], dtype=numpy.float64)
+        self._upper_bounds = numpy.ascontiguousarray([interval.max for interval in self._domain_bounds], dtype=numpy.float64)
+
     @property
     def dim(self):
         """Return the number of spatial dimensions."""
@@ -173,30 +176,13 @@ class TensorProductDomain(DomainInterface):
 
         :param max_relative_change: max change allowed per update (as a relative fraction of current distance to boundary)
         :type max_relative_change: float64 in (0, 1]
-        :param current_point: starting point
-        :type current_point: array of float64 with shape (dim)
-        :param update_vector: proposed update
-        :type update_vector: array of float64 with shape (dim)
-        :return: new update so that the final point remains inside the domain
-        :rtype: array of float64 with shape (dim)
+        :param current_point: starting point, or one starting point per row
+        :type current_point: array of float64 with shape (dim) or (num_points, dim)
+        :param update_vector: proposed update, or one update per row of ``current_point``
+        :type update_vector: array of float64 with the shape of ``current_point``
+        :return: new update so that the final point(s) remain inside the domain
+        :rtype: array of float64 with the shape of ``current_point``
 
         """
-        # TODO(GH-58): Vectorize the loop over j, step.
-        output_update = numpy.empty(self.dim)
-        # Note: since all boundary planes are axis-aligned, projecting becomes very simple.
-        for j, step in enumerate(update_vector):
-            # Distance to the nearest boundary in the j-th dimension
-            distance_to_boundary = numpy.fmin(
-                current_point[j] - self._domain_bounds[j].min,
-                self._domain_bounds[j].max - current_point[j])
-
-            desired_step = step
-            # If we are close to a boundary, optionally (via max_relative_change) limit the step size
-            # 0 < max_relative_change <= 1 so at worst we reach the boundary.
-            if numpy.fabs(step) > max_relative_change * distance_to_boundary:
-                # Move the max allowed distance, in the original direction of travel (obtained via copy-sign)
-                desired_step = numpy.copysign(max_relative_change * distance_to_boundary, step)
-
-            output_update[j] = desired_step
-
-        return output_update
+        return compute_update_restricted_to_bounds(self._lower_bounds, self._upper_bounds, max_relative_change,
+                                                   current_point, update_vector)
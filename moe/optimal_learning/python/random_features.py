@@ -28,6 +28,20 @@ if use_woodbury_if_faster is False, it never uses the woodbury version
 """
 def sample_gp_with_random_features(gp, nFeatures, use_woodbury_if_faster=True):
 
+    W, b, sigma2, theta = sample_gp_thetas_with_random_features(gp, nFeatures, 1, use_woodbury_if_faster)
+
+    return random_features_function(W, b, sigma2, theta[:,0])
+
+
+"""
+Draw nSamples GP samples that share the same random features (W, b).
+The design matrix and its factorization only depend on the features and on the data,
+so they are computed once and all the coefficients are drawn together.
+Returns W, b, the kernel amplitude sigma2 and theta, of size nFeatures by nSamples,
+one column of coefficients per sample.
+"""
+def sample_gp_thetas_with_random_features(gp, nFeatures, nSamples, use_woodbury_if_faster=True):
+
     d = gp.dim
     N_data = gp.num_sampled
     N_derivatives = gp.num_derivatives
@@ -43,12 +57,13 @@ def sample_gp_with_random_features(gp, nFeatures, use_woodbury_if_faster=True):
     W = old_div(npr.randn(nFeatures, d), hyperparameters[1:])
     b = npr.uniform(low=0, high=2*np.pi, size=nFeatures)[:,None]
 
-    randomness = npr.randn(nFeatures)
+    randomness = npr.randn(nFeatures, nSamples)
 
     # W has size nFeatures by d
     # tDesignMatrix has size Nfeatures by Ndata
     # woodbury has size Ndata by Ndata
     # z is a vector of length nFeatures
+    # randomness and theta have size nFeatures by nSamples
 
     if gp._points_sampled.shape[0]>0:
         tDesignMatrix = np.sqrt(2.0 * sigma2 / nFeatures) * np.cos(np.dot(W, \
@@ -89,7 +104,7 @@ def sample_gp_with_random_features(gp, nFeatures, use_woodbury_if_faster=True):
 
             # We sample from the posterior of the coefficients
             theta = randomness - \
-                    np.dot(tDesignMatrix, np.dot(U, (R * np.dot(U.T, np.dot(tDesignMatrix.T, randomness))))) + m
+                    np.dot(tDesignMatrix, np.dot(U, (R[:,None] * np.dot(U.T, np.dot(tDesignMatrix.T, randomness))))) + m[:,None]
 
         else:
             # all you are doing here is sampling from the posterior of the linear model
@@ -105,12 +120,22 @@ def sample_gp_with_random_features(gp, nFeatures, use_woodbury_if_faster=True):
             chol_Sigma_inverse = spla.cholesky(np.dot(tDesignMatrix, tDesignMatrix.T) + np.eye(nFeatures))
             Sigma = chol2inv(chol_Sigma_inverse)
             m = spla.cho_solve((chol_Sigma_inverse, False), np.dot(tDesignMatrix, observed_value))
-            theta = m + np.dot(randomness, spla.cholesky(Sigma, lower=False)).T
+            theta = m[:,None] + np.dot(spla.cholesky(Sigma, lower=False).T, randomness)
 
 
     else:
         # We sample from the prior -- same for Matern
-        theta = npr.randn(nFeatures)
+        theta = npr.randn(nFeatures, nSamples)
+
+    return W, b, sigma2, theta
+
+
+"""
+Returns the function x -> theta^T phi(x) of the random features W, b
+"""
+def random_features_function(W, b, sigma2, theta):
+
+    nFeatures = W.shape[0]
 
     def wrapper(x, gradient):
         # the argument "gradient" is
@@ -123,7 +148,7 @@ def sample_gp_with_random_features(gp, nFeatures, use_woodbury_if_faster=True):
         if not gradient:
             result = np.dot(theta.T, np.sqrt(2.0 * sigma2 / nFeatures) * np.cos(np.dot(W, x.T) + b))
             if result.size == 1:
-                result = float(result) # if the answer is just a number, take it out of the numpy array wrapper
+                result = float(result.item()) # if the answer is just a number, take it out of the numpy array wrapper
                 # (failure to do so messed up NLopt and it only gives a cryptic error message)
             return result
         else:
@@ -141,7 +166,8 @@ initialize an optimization. If nothing on the grid satisfies the constraint, the
 we return None wrapper_functions should be a dict with keys 'objective' and optionally 'constraints'
 """
 # find MINIMUM if minimize=True, else find a maximum
-def global_optimization_of_GP_approximation(funs, domain_bounds, num_dims, grid):
+# maxiter and tol bound the SLSQP refinement of the best point of the grid
+def global_optimization_of_GP_approximation(funs, domain_bounds, num_dims, grid, maxiter=100, tol=1e-6):
 
     assert num_dims == grid.shape[1]
 
@@ -152,14 +178,20 @@ def global_optimization_of_GP_approximation(funs, domain_bounds, num_dims, grid)
     best_guess_index = np.argmin(obj_evals)
     best_guess_value = np.min(obj_evals)
 
-    x_initial = grid[best_guess_index]
+    return local_optimization_of_GP_approximation(funs, domain_bounds, grid[best_guess_index], best_guess_value,
+                                                  maxiter, tol)
+
+
+# refine the best point of the grid x_initial, whose value is best_guess_value
+def local_optimization_of_GP_approximation(funs, domain_bounds, x_initial, best_guess_value, maxiter=100, tol=1e-6):
 
     f       = lambda x: float(funs(x, gradient=False))
     f_prime = lambda x: funs(x, gradient=True).flatten()
 
     bounds = [(bounds[0], bounds[1]) for bounds in domain_bounds]
 
-    opt_x = spo.fmin_slsqp(f, x_initial.copy(), bounds=bounds, disp=0, fprime=f_prime, f_ieqcons=None, fprime_ieqcons=None)
+    opt_x = spo.fmin_slsqp(f, x_initial.copy(), bounds=bounds, disp=0, fprime=f_prime, f_ieqcons=None, fprime_ieqcons=None,
+                           iter=maxiter, acc=tol)
 
     if f(opt_x) < best_guess_value:
         return opt_x[None]
@@ -168,12 +200,70 @@ def global_optimization_of_GP_approximation(funs, domain_bounds, num_dims, grid)
         return x_initial[None]
 
 
-def sample_from_global_optima(gp, nFeatures, domain_bounds, grid, nPoints):
-    points = np.zeros((nPoints, gp.dim))
-    for num in range(nPoints):
-        points[num, :] = global_optimization_of_GP_approximation(sample_gp_with_random_features(gp, nFeatures), domain_bounds, gp.dim, grid)
-    return points
+"""
+Refine at once the minima of the nSamples functions sharing the random features W, b,
+theta has size nFeatures by nSamples and x_initial size nSamples by d.
+The functions are independent, so the sum of their values is minimized by a single L-BFGS-B
+run over the stacked points: objective and gradient of all the paths are two matrix products.
+maxiter and tol (ftol and gtol of L-BFGS-B) bound the cost of the refinement.
+Returns the refined points, or x_initial for the paths that did not improve on best_guess_values.
+"""
+def batch_local_optimization_of_GP_approximation(W, b, sigma2, theta, domain_bounds, x_initial, best_guess_values,
+                                                 maxiter=100, tol=1e-6):
+
+    nFeatures = W.shape[0]
+    nSamples, d = x_initial.shape
+    scale = np.sqrt(2.0 * sigma2 / nFeatures)
+
+    def evaluate(x):
+        # column s of arg holds the features of the point of sample s
+        arg = np.dot(W, x.T) + b
+        return scale * np.sum(theta * np.cos(arg), axis=0), arg
+
+    def f_and_f_prime(x_flat):
+        values, arg = evaluate(x_flat.reshape(nSamples, d))
+        grad = -scale * np.dot((theta * np.sin(arg)).T, W)
+        return np.sum(values), grad.ravel()
 
+    bounds = [(bounds[0], bounds[1]) for bounds in domain_bounds] * nSamples
 
+    result = spo.minimize(f_and_f_prime, x_initial.ravel(), jac=True, method='L-BFGS-B', bounds=bounds,
+                          options={'maxiter': maxiter, 'ftol': tol, 'gtol': tol})
 
+    opt_x = result.x.reshape(nSamples, d)
+    improved = evaluate(opt_x)[0] < best_guess_values
+    return np.where(improved[:,None], opt_x, x_initial)
 
+
+"""
+Sample nPoints global optima of the GP.
+The samples are split among nBases sets of random features: the samples of a set share
+the factorization of the design matrix and are evaluated on the grid with a single matrix product.
+The best points of the grid are then refined, all together with L-BFGS-B (refinement='batch')
+or one at a time with SLSQP (refinement='serial'), in at most maxiter iterations.
+"""
+def sample_from_global_optima(gp, nFeatures, domain_bounds, grid, nPoints, nBases=1, refinement='batch',
+                              maxiter=100, tol=1e-6):
+    assert gp.dim == grid.shape[1]
+    if refinement not in ('batch', 'serial'):
+        raise ValueError('Unknown refinement {0}, choose between batch and serial'.format(refinement))
+
+    points = np.zeros((nPoints, gp.dim))
+    for indices in np.array_split(np.arange(nPoints), min(nBases, nPoints)):
+        W, b, sigma2, theta = sample_gp_thetas_with_random_features(gp, nFeatures, len(indices))
+
+        # grid_evals has size len(indices) by the number of grid points
+        grid_evals = np.dot(theta.T, np.sqrt(2.0 * sigma2 / nFeatures) * np.cos(np.dot(W, grid.T) + b))
+        best_guess_index = np.argmin(grid_evals, axis=1)
+        best_guess_values = grid_evals[np.arange(len(indices)), best_guess_index]
+
+        if refinement == 'batch':
+            points[indices, :] = batch_local_optimization_of_GP_approximation(W, b, sigma2, theta, domain_bounds,
+                                                                              grid[best_guess_index], best_guess_values,
+                                                                              maxiter, tol)
+        else:
+            for sample, num in enumerate(indices):
+                funs = random_features_function(W, b, sigma2, theta[:,sample])
+                points[num, :] = local_optimization_of_GP_approximation(funs, domain_bounds, grid[best_guess_index[sample]],
+                                                                         best_guess_values[sample], maxiter, tol)
+    return points
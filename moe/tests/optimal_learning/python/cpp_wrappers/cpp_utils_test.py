@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Test the conversion of numpy arrays to and from the C++ input format."""
+import numpy
+
+from moe.optimal_learning.python.cpp_wrappers import cpp_utils
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class TestCppUtils(OptimalLearningTestCase):
+
+    """Test cppify/uncppify, the conversion of the inputs of the C++ calls."""
+
+    # Size of a typical discretization of the domain handed to the knowledge gradient
+    num_discrete_pts = 1000
+    dim = 8
+
+    def test_cppify_gives_contiguous_buffers(self):
+        """Float inputs become flat contiguous float64 arrays, integer inputs keep their dtype."""
+        points = numpy.random.uniform(size=(self.dim, 3)).T
+        flat = cpp_utils.cppify(points)
+        assert flat.flags['C_CONTIGUOUS'] and flat.dtype == numpy.float64
+        self.assert_vector_within_relative(flat, numpy.ravel(points), 0.0)
+
+        assert cpp_utils.cppify(numpy.arange(3)).dtype.kind == 'i'
+        assert cpp_utils.cppify([1.0, 2.0]).dtype == numpy.float64
+        assert cpp_utils.cppify(numpy.ones(2, dtype=numpy.float32)).dtype == numpy.float64
+
+    def test_uncppify_roundtrip(self):
+        """uncppify undoes cppify."""
+        points = numpy.random.uniform(size=(self.num_discrete_pts, self.dim))
+        result = cpp_utils.uncppify(cpp_utils.cppify(points), points.shape)
+        self.assert_vector_within_relative(result.ravel(), points.ravel(), 0.0)
+
+    def test_cppify_does_not_copy_contiguous_arrays(self):
+        """A contiguous float64 array is passed to C++ as it is (flattened view), with the same values."""
+        points = numpy.random.uniform(size=(self.num_discrete_pts, self.dim))
+        flat = cpp_utils.cppify(points)
+        assert isinstance(flat, numpy.ndarray)
+        assert flat.flags['C_CONTIGUOUS'] and flat.dtype == numpy.float64 and flat.shape == (points.size, )
+        assert numpy.shares_memory(flat, points)
+        self.assert_vector_within_relative(flat, points.ravel(), 0.0)
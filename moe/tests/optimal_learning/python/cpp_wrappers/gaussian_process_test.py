@@ -11,6 +11,7 @@ from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponentia
 from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
 from moe.optimal_learning.python.data_containers import HistoricalData, SamplePoint
 from moe.tests.optimal_learning.python.gaussian_process_test_case import GaussianProcessTestCase
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
 
 
 class TestGaussianProcess(GaussianProcessTestCase):
@@ -161,3 +162,34 @@ class TestGaussianProcess(GaussianProcessTestCase):
                     cpp_grad_var = cpp_gp.compute_grad_cholesky_variance_of_points(points_to_sample)
                     python_grad_var = python_gp.compute_grad_cholesky_variance_of_points(points_to_sample)
                     self.assert_vector_within_relative(python_grad_var, cpp_grad_var, grad_var_tolerance)
+
+
+class TestIncrementalCholesky(OptimalLearningTestCase):
+
+    """Test GaussianProcess.add_sampled_points with the cholesky factor extended against a fresh factorization."""
+
+    def test_gp_add_sampled_points_incremental_cholesky(self):
+        """Test that extending the cholesky factor gives the same GP as recomputing it."""
+        numpy.random.seed(8794)
+        dim = 3
+        covariance = SquareExponential([1.0] + [0.4] * dim)
+        noise_variance = numpy.array([1.0e-4])
+        derivatives = numpy.arange(0)
+        historical_data = HistoricalData(dim)
+        historical_data.append_sample_points([SamplePoint(numpy.random.uniform(size=dim), numpy.random.normal())
+                                              for _ in range(10)])
+        full_gp = GaussianProcess(covariance, noise_variance, historical_data, derivatives)
+        incremental_gp = GaussianProcess(covariance, noise_variance, historical_data, derivatives)
+
+        points_to_sample = numpy.random.uniform(size=(5, dim))
+        for num_to_add in (1, 4):
+            new_points = [SamplePoint(numpy.random.uniform(size=dim), numpy.random.normal()) for _ in range(num_to_add)]
+            full_gp.add_sampled_points(new_points)
+            incremental_gp.add_sampled_points(new_points, incremental_cholesky=True)
+
+            self.assert_vector_within_relative(incremental_gp.compute_mean_of_points(points_to_sample),
+                                               full_gp.compute_mean_of_points(points_to_sample), 1.0e-9)
+            self.assert_vector_within_relative(incremental_gp.compute_variance_of_points(points_to_sample),
+                                               full_gp.compute_variance_of_points(points_to_sample), 1.0e-9)
+            self.assert_vector_within_relative(incremental_gp.compute_cholesky_variance_of_points(points_to_sample).ravel(),
+                                               full_gp.compute_cholesky_variance_of_points(points_to_sample).ravel(), 1.0e-9)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Test the chain scheduling (warm start, periodic full chains, adaptive stop) of the MCMC log likelihood."""
+import numpy
+
+from moe.optimal_learning.python.cpp_wrappers import log_likelihood_mcmc
+from moe.optimal_learning.python.data_containers import HistoricalData, SamplePoint
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class _GaussianLogLikelihoodMCMC(log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC):
+
+    """Replace the log likelihood with a standard normal so that only the sampling logic is exercised."""
+
+    def compute_log_likelihood(self, hyps0):
+        """Return the log density of a standard normal at ``hyps0``."""
+        return -0.5 * numpy.dot(hyps0, hyps0)
+
+    def compute_log_likelihood_list(self, hyps_list):
+        """Return the log density of a standard normal at each row of ``hyps_list``."""
+        return numpy.array([self.compute_log_likelihood(hyps0) for hyps0 in hyps_list])
+
+
+class TestLogLikelihoodMCMC(OptimalLearningTestCase):
+
+    """Test the length of the chains run by GaussianProcessLogLikelihoodMCMC.train."""
+
+    dim = 2
+
+    def _build_log_likelihood(self, historical_data=None, seed=314, **kwargs):
+        """Build a log likelihood object on ``historical_data`` (a few random points by default), sampling with ``RandomState(seed)``."""
+        if historical_data is None:
+            historical_data = HistoricalData(self.dim)
+            historical_data.append_sample_points([SamplePoint(numpy.random.uniform(size=self.dim), 1.0) for _ in range(5)])
+        return _GaussianLogLikelihoodMCMC(historical_data, numpy.arange(0), None, chain_length=400, burnin_steps=100,
+                                          n_hypers=1, rng=numpy.random.RandomState(seed), **kwargs)
+
+    def _add_points(self, log_likelihood, num_points):
+        """Append ``num_points`` random points to the historical data (no models are trained)."""
+        log_likelihood.add_sampled_points([SamplePoint(numpy.random.uniform(size=self.dim), 1.0) for _ in range(num_points)])
+
+    def test_full_chain_without_incremental_option(self):
+        """Without incremental options every training runs ``chain_length`` steps."""
+        log_likelihood = self._build_log_likelihood()
+        for _ in range(3):
+            log_likelihood.train()
+            assert log_likelihood.last_chain_length == 400
+            self._add_points(log_likelihood, 1)
+
+    def test_incremental_chain_schedule(self):
+        """Warm-started chains are short, full chains run every ``full_chain_every`` trainings or after many new points."""
+        log_likelihood = self._build_log_likelihood(incremental_chain_length=20, max_incremental_points=2, full_chain_every=2)
+        chain_lengths = []
+        for num_points in (0, 1, 1, 1, 3, 1):
+            self._add_points(log_likelihood, num_points)
+            log_likelihood.train()
+            chain_lengths.append(log_likelihood.last_chain_length)
+        # Full chains: every second training, and when 3 points were added at once
+        assert chain_lengths == [20, 400, 20, 400, 400, 20]
+
+    def test_vectorized_likelihood_is_reproducible(self):
+        """Evaluating all the walkers of a move in one call gives the same chains as the serial evaluation."""
+        historical_data = self._build_log_likelihood().get_historical_data_copy()
+        walkers = []
+        for vectorize_likelihood in (False, True):
+            log_likelihood = self._build_log_likelihood(historical_data, vectorize_likelihood=vectorize_likelihood)
+            log_likelihood.train()
+            walkers.append(log_likelihood.p0)
+        numpy.testing.assert_array_equal(walkers[0], walkers[1])
+
+    def test_chains_depend_only_on_rng(self):
+        """The chains and the sampled hyperparameters are set by the seed of ``rng``, whatever the global numpy.random state."""
+        historical_data = self._build_log_likelihood().get_historical_data_copy()
+        walkers = []
+        hypers = []
+        for global_seed, seed in ((1, 27), (2, 27), (1, 28)):
+            numpy.random.seed(global_seed)
+            log_likelihood = self._build_log_likelihood(historical_data, seed=seed)
+            log_likelihood.train()
+            walkers.append(log_likelihood.p0)
+            hypers.append(log_likelihood.hypers)
+        numpy.testing.assert_array_equal(walkers[0], walkers[1])
+        numpy.testing.assert_array_equal(hypers[0], hypers[1])
+        assert not numpy.any(walkers[0] == walkers[2])
+
+    def test_adaptive_stop(self):
+        """The adaptive stopping rule ends a long chain early on an easy target, and the walkers keep their shape."""
+        log_likelihood = self._build_log_likelihood(adaptive_stop=True, autocorr_factor=5, autocorr_tol=0.2)
+        log_likelihood.chain_length = 5000
+        log_likelihood.train()
+        assert log_likelihood.last_chain_length < 5000
+        assert log_likelihood.p0.shape == (log_likelihood.n_chains, self.dim + 2)
+
+    def test_set_state_continues_chains(self):
+        """An object restored with set_state skips the burn-in and continues the chains exactly as the original one."""
+        log_likelihood = self._build_log_likelihood(incremental_chain_length=20)
+        log_likelihood.train()
+        restored = self._build_log_likelihood(log_likelihood.get_historical_data_copy(), incremental_chain_length=20)
+        restored.set_state(log_likelihood.get_state())
+        assert restored.burned and len(restored.models) == len(log_likelihood.models)
+
+        walkers = []
+        for likelihood in (log_likelihood, restored):
+            numpy.random.seed(1618)
+            self._add_points(likelihood, 1)
+            likelihood.train()
+            walkers.append(likelihood.p0)
+            assert likelihood.last_chain_length == 20
+        numpy.testing.assert_array_equal(walkers[0], walkers[1])
+
+
+class TestLogLikelihoodList(OptimalLearningTestCase):
+
+    """Test the multithreaded C++ compute_log_likelihood_list against compute_log_likelihood."""
+
+    dim = 2
+
+    def test_list_matches_single_evaluations(self):
+        """Each value of a batch equals the log likelihood of its row, and out of bounds rows are -inf."""
+        numpy.random.seed(1414)
+        points = numpy.random.uniform(size=(12, self.dim))
+        historical_data = HistoricalData(self.dim)
+        historical_data.append_sample_points([SamplePoint(point, numpy.sum(numpy.sin(3.0 * point)), 1.0e-3)
+                                              for point in points])
+        log_likelihood = log_likelihood_mcmc.GaussianProcessLogLikelihoodMCMC(
+            historical_data, numpy.arange(0), None, chain_length=10, burnin_steps=10, n_hypers=1,
+            rng=numpy.random.RandomState(314), max_num_threads=4)
+
+        hyps_list = numpy.random.normal(scale=0.5, size=(9, self.dim + 2))
+        hyps_list[:, -1] = numpy.log(1.0e-3) + 0.1 * hyps_list[:, -1]
+        hyps_list[4, 0] = 25.0  # out of bounds
+
+        values = log_likelihood.compute_log_likelihood_list(hyps_list)
+        expected_values = numpy.array([log_likelihood.compute_log_likelihood(hyps0) for hyps0 in hyps_list])
+        assert values.shape == (9, )
+        assert values[4] == expected_values[4] == -numpy.inf
+        valid = numpy.isfinite(expected_values)
+        assert numpy.count_nonzero(valid) == 8
+        self.assert_vector_within_relative(values[valid], expected_values[valid], 1.0e-12)
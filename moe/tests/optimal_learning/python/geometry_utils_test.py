@@ -4,7 +4,7 @@ import numpy
 
 import pytest
 
-from moe.optimal_learning.python.geometry_utils import ClosedInterval, generate_grid_points, generate_latin_hypercube_points
+from moe.optimal_learning.python.geometry_utils import ClosedInterval, compute_update_restricted_to_bounds, generate_grid_points, generate_latin_hypercube_points
 from moe.optimal_learning.python.python_version.domain import TensorProductDomain
 from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
 
@@ -128,6 +128,36 @@ class TestGridPointGeneration(OptimalLearningTestCase):
         self.assert_vector_within_relative(grid_test, grid_truth, 0.0)
 
 
+class TestUpdateRestrictedToBounds(OptimalLearningTestCase):
+
+    """Test the limitation of the optimizer updates near the boundaries of a tensor product domain."""
+
+    domain_bounds = ClosedInterval.build_closed_intervals_from_list([[0.0, 1.0], [-2.0, 3.0], [2.71, 3.14]])
+
+    def test_steps_limited_to_boundary(self):
+        """Steps longer than max_relative_change times the distance to the boundary are shortened, the others kept."""
+        lower_bounds = numpy.array([interval.min for interval in self.domain_bounds])
+        upper_bounds = numpy.array([interval.max for interval in self.domain_bounds])
+        current_point = numpy.array([0.9, -1.0, 3.0])
+        update_vector = numpy.array([0.5, -0.2, -0.5])
+        truth = numpy.array([0.05, -0.2, -0.07])
+        test = compute_update_restricted_to_bounds(lower_bounds, upper_bounds, 0.5, current_point, update_vector)
+        self.assert_vector_within_relative(test, truth, 1.0e-12)
+
+    def test_stacked_points_match_single_points(self):
+        """A stack of points gets the same updates as the points one by one, and stays inside the domain."""
+        domain = TensorProductDomain(self.domain_bounds)
+        current_points = domain.generate_uniform_random_points_in_domain(20)
+        update_vectors = numpy.random.normal(scale=2.0, size=current_points.shape)
+        for max_relative_change in (0.5, 1.0):
+            test = domain.compute_update_restricted_to_domain(max_relative_change, current_points, update_vectors)
+            assert test.shape == current_points.shape
+            for i in range(current_points.shape[0]):
+                truth = domain.compute_update_restricted_to_domain(max_relative_change, current_points[i, ...], update_vectors[i, ...])
+                self.assert_vector_within_relative(test[i, ...], truth, 0.0)
+                assert domain.check_point_inside(current_points[i, ...] + test[i, ...])
+
+
 class TestClosedInterval(OptimalLearningTestCase):
 
     """Tests for ClosedInterval's member functions."""
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Test the batched sampling of global optima with random features."""
+import numpy
+
+from moe.optimal_learning.python import random_features
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+
+
+class _Covariance(object):
+
+    """Square exponential hyperparameters: amplitude followed by the length scales."""
+
+    def get_hyperparameters(self):
+        """Return the hyperparameters of the covariance."""
+        return numpy.array([1.0, 0.3, 0.4])
+
+
+class _GaussianProcess(object):
+
+    """Expose the attributes of the C++ GaussianProcess read by the random features, without derivatives."""
+
+    dim = 2
+    num_derivatives = 0
+    derivatives = numpy.arange(0)
+    noise_variance = numpy.array([1.0e-4])
+
+    def __init__(self, num_sampled):
+        """Observe a smooth function at ``num_sampled`` random points."""
+        self.num_sampled = num_sampled
+        self._points_sampled = numpy.random.uniform(size=(num_sampled, self.dim))
+        self._points_sampled_value = numpy.sin(5.0 * self._points_sampled.sum(axis=1))[:, None]
+
+    def get_covariance_copy(self):
+        """Return the covariance of the GP."""
+        return _Covariance()
+
+
+class TestSampleFromGlobalOptima(OptimalLearningTestCase):
+
+    """Test sample_gp_thetas_with_random_features and sample_from_global_optima."""
+
+    domain_bounds = [[0.0, 1.0], [0.0, 1.0]]
+
+    def test_single_sample_matches_batch(self):
+        """A one sample batch gives the same function as sample_gp_with_random_features, with and without Woodbury."""
+        x = numpy.random.uniform(size=(20, 2))
+        for num_sampled in (10, 200):
+            gp = _GaussianProcess(num_sampled)
+            numpy.random.seed(42)
+            expected = random_features.sample_gp_with_random_features(gp, 100)(x, False)
+            numpy.random.seed(42)
+            W, b, sigma2, theta = random_features.sample_gp_thetas_with_random_features(gp, 100, 1)
+            result = random_features.random_features_function(W, b, sigma2, theta[:, 0])(x, False)
+            self.assert_vector_within_relative(result, expected, 1.0e-12)
+
+    def test_optima_in_domain(self):
+        """Every basis produces its share of optima, all inside the domain."""
+        gp = _GaussianProcess(20)
+        grid = numpy.random.uniform(size=(50, 2))
+        for num_bases in (1, 3, 20):
+            points = random_features.sample_from_global_optima(gp, 100, self.domain_bounds, grid, 7, nBases=num_bases)
+            assert points.shape == (7, 2)
+            assert numpy.all(points >= 0.0) and numpy.all(points <= 1.0)
+
+    def test_batch_refinement_matches_serial(self):
+        """Refining all the paths with one L-BFGS-B run reaches the minima found by SLSQP path by path."""
+        gp = _GaussianProcess(20)
+        grid = numpy.random.uniform(size=(50, 2))
+        numpy.random.seed(7)
+        W, b, sigma2, theta = random_features.sample_gp_thetas_with_random_features(gp, 100, 10)
+        values = {}
+        for refinement in ('serial', 'batch'):
+            numpy.random.seed(7)
+            points = random_features.sample_from_global_optima(gp, 100, self.domain_bounds, grid, 10, refinement=refinement)
+            values[refinement] = numpy.array([random_features.random_features_function(W, b, sigma2, theta[:, sample])(point, False)
+                                              for sample, point in enumerate(points)])
+        self.assert_vector_within_relative(values['batch'], values['serial'], 1.0e-3)
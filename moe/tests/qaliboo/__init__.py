@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+r"""Tests for the :mod:`qaliboo` package (finite domains, precomputed functions, the ParallelMaliboo building blocks)."""
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Test that the result sinks buffer their rows and append to the rows of the previous runs."""
+import os
+
+import numpy
+import pandas as pd
+import pytest
+
+from qaliboo import aux
+
+
+def _rows(start, stop, **extra_columns):
+    rows = pd.DataFrame({'index': numpy.arange(start, stop), 'value': numpy.arange(start, stop) * 0.5})
+    for column, value in extra_columns.items():
+        rows[column] = value
+    return rows
+
+
+def _read_npz(path):
+    with numpy.load(path, allow_pickle=True) as archive:
+        return {column: archive[column].tolist() for column in archive.files}
+
+
+def _read_parquet(path):
+    return pd.read_parquet(path).to_dict(orient='list')
+
+
+class TestCsvSink(object):
+
+    """Test CsvSink: rows appended to a single CSV file with one header."""
+
+    def test_header_written_once(self, tmp_path):
+        """Every write appends rows, the header is only written by the first one."""
+        path = str(tmp_path / 'info.csv')
+        sink = aux.CsvSink(path)
+        for start in range(3):
+            sink.append(_rows(start, start + 1))
+        sink.close()
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert lines.count('index,value') == 1 and len(lines) == 4
+        assert pd.read_csv(path).to_dict(orient='list') == {'index': [0, 1, 2], 'value': [0.0, 0.5, 1.0]}
+
+    def test_reopened_sink_appends(self, tmp_path):
+        """A sink opened on an existing CSV continues it without a second header, an empty file gets one."""
+        path = str(tmp_path / 'info.csv')
+        open(path, 'w').close()
+        sink = aux.CsvSink(path)
+        sink.append(_rows(0, 2))
+        sink.close()
+
+        sink = aux.CsvSink(path)
+        sink.append(_rows(2, 3))
+        sink.close()
+        with open(path) as f:
+            assert f.read().count('index') == 1
+        assert pd.read_csv(path)['index'].tolist() == [0, 1, 2]
+
+    def test_flush_every_and_fsync_every(self, tmp_path, monkeypatch):
+        """Rows are written in groups of flush_every, every fsync_every-th write is forced to disk."""
+        fsyncs = []
+        monkeypatch.setattr(aux.os, 'fsync', fsyncs.append)
+        path = str(tmp_path / 'info.csv')
+        sink = aux.CsvSink(path, flush_every=3, fsync_every=2)
+
+        sink.append(_rows(0, 2))
+        assert os.path.getsize(path) == 0
+        sink.append(_rows(2, 3))
+        assert pd.read_csv(path)['index'].tolist() == [0, 1, 2] and not fsyncs
+        sink.append(_rows(3, 6))
+        assert len(pd.read_csv(path)) == 6 and len(fsyncs) == 1
+
+        sink.append(_rows(6, 7))
+        assert len(pd.read_csv(path)) == 6
+        sink.close()
+        assert pd.read_csv(path)['index'].tolist() == list(range(7)) and len(fsyncs) == 1
+
+
+@pytest.fixture(params=['npz', 'parquet'])
+def sink_backend(request):
+    """Sink class and reader (path -> dict of column lists) of each chunked backend."""
+    if request.param == 'parquet':
+        pytest.importorskip('pyarrow')
+        return aux.ParquetSink, _read_parquet
+    return aux.NpzSink, _read_npz
+
+
+class TestChunkedSinks(object):
+
+    """Test NpzSink and ParquetSink: one chunk file per write, merged into the result file on close."""
+
+    def test_writes_are_chunks_merged_on_close(self, sink_backend, tmp_path):
+        """Every flush writes a new chunk (the previous ones are not rewritten), close concatenates them."""
+        sink_class, read = sink_backend
+        path = str(tmp_path / ('history' + sink_class.extension))
+        sink = sink_class(path, flush_every=2)
+        sink.append(_rows(0, 1))
+        assert not os.listdir(str(tmp_path))
+        sink.append(_rows(1, 2))
+        sink.append(_rows(2, 5))
+        chunks = sorted(os.listdir(str(tmp_path)))
+        assert len(chunks) == 2 and all(chunk.startswith('history' + sink_class.extension + '.part') for chunk in chunks)
+        with open(os.path.join(str(tmp_path), chunks[0]), 'rb') as f:
+            first_chunk = f.read()
+
+        sink.append(_rows(5, 6))
+        sink.flush()
+        assert len(os.listdir(str(tmp_path))) == 3
+        with open(os.path.join(str(tmp_path), chunks[0]), 'rb') as f:
+            assert f.read() == first_chunk
+
+        sink.close()
+        assert os.listdir(str(tmp_path)) == [os.path.basename(path)]
+        assert read(path) == {'index': list(range(6)), 'value': [0.5 * i for i in range(6)]}
+
+    def test_reopened_sink_appends(self, sink_backend, tmp_path):
+        """A sink opened on an existing file keeps its rows; new columns are missing in the previous rows."""
+        sink_class, read = sink_backend
+        path = str(tmp_path / ('history' + sink_class.extension))
+        sink = sink_class(path)
+        sink.append(_rows(0, 2))
+        sink.close()
+
+        sink = sink_class(path)
+        sink.append(_rows(2, 3, extra=1.0))
+        sink.close()
+        columns = read(path)
+        assert columns['index'] == [0, 1, 2]
+        assert columns['value'] == [0.0, 0.5, 1.0]
+        assert columns['extra'][2] == 1.0
+        assert all(value is None or numpy.isnan(value) for value in columns['extra'][:2])
+
+    def test_chunks_of_interrupted_run_are_kept(self, sink_backend, tmp_path):
+        """The chunks written by a sink that was never closed are merged by the next sink on the same file."""
+        sink_class, read = sink_backend
+        path = str(tmp_path / ('history' + sink_class.extension))
+        interrupted = sink_class(path)
+        interrupted.append(_rows(0, 2))
+        interrupted.append(_rows(2, 3))
+
+        sink = sink_class(path)
+        sink.append(_rows(3, 4))
+        sink.close()
+        assert read(path)['index'] == [0, 1, 2, 3]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Benchmark of the inputs of the GPP bindings: python lists (as passed before cppify returned arrays) against contiguous arrays.
+
+Times one call of ``compute_grad_knowledge_gradient_mcmc`` with a discretization-sized ``discrete_pts_list``. Run it
+from the root directory of the repository (nothing is asserted, it only prints the timings)::
+
+    python -m moe.tests.qaliboo.benchmark_cpp_inputs
+
+"""
+import time
+
+import numpy
+
+import moe.build.GPP as C_GP
+from moe.optimal_learning.python.cpp_wrappers import cpp_utils
+from moe.tests.qaliboo.knowledge_gradient_test_utils import build_domain, build_knowledge_gradient, build_snapshot
+from qaliboo import multistart
+
+
+def best_time(function, args, repeat):
+    """Best time over ``repeat`` calls of ``function(*args)``, and the last result."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def grad_knowledge_gradient_inputs(kg, convert):
+    """Arguments of C_GP.compute_grad_knowledge_gradient_mcmc for ``kg``, with the arrays converted by ``convert``."""
+    return (
+        kg._gaussian_process_mcmc._gaussian_process_mcmc,
+        kg._num_fidelity,
+        kg._inner_optimizer.optimizer_parameters,
+        convert(kg._inner_optimizer.domain.domain_bounds),
+        convert(kg._discrete_pts_list),
+        convert(kg._points_to_sample),
+        convert(kg._points_being_sampled),
+        kg.discrete,
+        kg.num_to_sample,
+        kg.num_being_sampled,
+        kg._num_mc_iterations,
+        convert(kg._best_so_far_list),
+        kg._randomness,
+    )
+
+
+def to_list(array):
+    """Flat list of python floats, the input format of the bindings before cppify returned arrays."""
+    return numpy.ravel(array).tolist()
+
+
+if __name__ == "__main__":
+    num_discrete_pts = 1000
+    num_mc_iterations = 1
+    repeat = 20
+    numpy.random.seed(0)
+    kg = build_knowledge_gradient(build_snapshot(num_sampled=20, num_discrete_pts=num_discrete_pts,
+                                                 num_mc_iterations=num_mc_iterations), build_domain())
+    kg.set_current_point(numpy.random.uniform(size=(kg.num_to_sample, kg.dim)))
+
+    list_args = grad_knowledge_gradient_inputs(kg, to_list)
+    array_args = grad_knowledge_gradient_inputs(kg, cpp_utils.cppify)
+    # Same MC draws for both calls
+    multistart.seed_randomness(kg, 1)
+    list_time, list_grad = best_time(C_GP.compute_grad_knowledge_gradient_mcmc, list_args, repeat)
+    multistart.seed_randomness(kg, 1)
+    array_time, array_grad = best_time(C_GP.compute_grad_knowledge_gradient_mcmc, array_args, repeat)
+
+    print('discrete points: %d, MC iterations: %d' % (num_discrete_pts, num_mc_iterations))
+    print('max abs difference of the gradients: %.2e' % numpy.max(numpy.abs(numpy.asarray(list_grad) - numpy.asarray(array_grad))))
+    print('list inputs:  %.6f s' % list_time)
+    print('array inputs: %.6f s' % array_time)
+    print('speedup:      %.2fx' % (list_time / array_time))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Test the checkpoints of the optimization state."""
+import json
+import os
+
+import numpy
+import pytest
+
+from qaliboo import checkpoint
+
+
+class TestCheckpoint(object):
+
+    """Test save/load of a checkpoint directory."""
+
+    def test_round_trip(self, tmp_path):
+        """load returns the arrays and scalars of the last save, the previous archives are removed."""
+        directory = str(tmp_path / 'checkpoints')
+        arrays = {'points': numpy.arange(6.0).reshape(3, 2), 'mask': numpy.array([True, False, True])}
+        checkpoint.save(directory, 0, {'points': numpy.zeros(1)}, {'global_time': 0.0})
+        checkpoint.save(directory, 4, arrays, {'global_time': 12.5, 'result_folder': None})
+
+        iteration, loaded, info = checkpoint.load(directory)
+        assert iteration == 4
+        assert info == {'global_time': 12.5, 'result_folder': None}
+        assert sorted(loaded) == ['mask', 'points']
+        for name, value in arrays.items():
+            numpy.testing.assert_array_equal(loaded[name], value)
+            assert loaded[name].dtype == value.dtype
+        assert sorted(os.listdir(directory)) == [checkpoint.MANIFEST, 'state-4.npz']
+
+    def test_corrupted_archive_is_rejected(self, tmp_path):
+        """An archive whose SHA-256 does not match the manifest is not loaded."""
+        directory = str(tmp_path / 'checkpoints')
+        checkpoint.save(directory, 1, {'points': numpy.ones(4)}, {})
+        manifest_path = os.path.join(directory, checkpoint.MANIFEST)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['sha256'] = '0' * 64
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        with pytest.raises(ValueError):
+            checkpoint.load(directory)
+
+    def test_unknown_version_is_rejected(self, tmp_path):
+        """A manifest of another format version is not loaded."""
+        directory = str(tmp_path / 'checkpoints')
+        checkpoint.save(directory, 1, {'points': numpy.ones(4)}, {})
+        manifest_path = os.path.join(directory, checkpoint.MANIFEST)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['version'] = checkpoint.FORMAT_VERSION + 1
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        with pytest.raises(ValueError):
+            checkpoint.load(directory)
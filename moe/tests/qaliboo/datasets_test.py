@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Test the memory-mapped binary cache of the datasets."""
+import numpy
+import pandas as pd
+
+from qaliboo import datasets
+
+
+def _write_csv(csv_file, scale=1.0):
+    data = pd.DataFrame({'a': numpy.arange(6.0), 'b': numpy.arange(6.0) * 10.0,
+                         'cost': numpy.arange(6.0) * scale, 'time': numpy.ones(6)})
+    data.to_csv(csv_file, index=False)
+
+
+def _build_dataset(csv_file, cache_dir, param_cols=('a', 'b')):
+    return datasets.Dataset(csv_file=csv_file, param_cols=list(param_cols), target_col='cost', time_col='time',
+                            cache_dir=cache_dir)
+
+
+class TestDatasetCache(object):
+
+    """Test that the cache is used only while the CSV file and the column selection are unchanged."""
+
+    def test_cache_is_memory_mapped(self, tmp_path):
+        """The first load reads the CSV and writes the cache, the next one memory-maps it."""
+        csv_file, cache_dir = str(tmp_path / 'data.csv'), str(tmp_path / 'cache')
+        _write_csv(csv_file)
+        first = _build_dataset(csv_file, cache_dir)
+        assert not isinstance(first._load()['X'], numpy.memmap)
+
+        second = _build_dataset(csv_file, cache_dir)
+        assert isinstance(second._load()['X'], numpy.memmap)
+        numpy.testing.assert_array_equal(second.X.values, first.X.values)
+        numpy.testing.assert_array_equal(second.y.values, first.y.values)
+
+    def test_column_selection_invalidates_cache(self, tmp_path):
+        """Other parameter columns on the same file are read from the CSV, not from the cache of the previous columns."""
+        csv_file, cache_dir = str(tmp_path / 'data.csv'), str(tmp_path / 'cache')
+        _write_csv(csv_file)
+        _build_dataset(csv_file, cache_dir)._load()
+
+        dataset = _build_dataset(csv_file, cache_dir, param_cols=('b', ))
+        assert not isinstance(dataset._load()['X'], numpy.memmap)
+        assert list(dataset.X.columns) == ['b']
+        numpy.testing.assert_array_equal(dataset.X.values.ravel(), numpy.arange(6.0) * 10.0)
+
+    def test_file_change_invalidates_cache(self, tmp_path):
+        """A CSV file rewritten with other values is read again."""
+        csv_file, cache_dir = str(tmp_path / 'data.csv'), str(tmp_path / 'cache')
+        _write_csv(csv_file)
+        _build_dataset(csv_file, cache_dir)._load()
+
+        _write_csv(csv_file, scale=2.0)
+        dataset = _build_dataset(csv_file, cache_dir)
+        assert not isinstance(dataset._load()['y'], numpy.memmap)
+        numpy.testing.assert_array_equal(dataset.y.values, numpy.arange(6.0) * 2.0)
+        # ... and the new values are cached in turn
+        assert isinstance(_build_dataset(csv_file, cache_dir)._load()['y'], numpy.memmap)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Test the kriging believer fantasies of the points still being evaluated."""
+import numpy
+
+from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as KG
+from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponential
+from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from moe.tests.qaliboo.knowledge_gradient_test_utils import build_domain, build_snapshot, knowledge_gradient_values
+from qaliboo import fantasy
+
+
+class TestFantasize(OptimalLearningTestCase):
+
+    """Test that the fantasized GPs believe their posterior mean at the pending points."""
+
+    def _build_models(self, hyperparameters_list, snapshot=None):
+        if snapshot is None:
+            snapshot = build_snapshot(num_sampled=8)
+        noise_variance_list = numpy.full((len(hyperparameters_list), 1), 1.0e-4)
+        gaussian_process_list = [GaussianProcess(SquareExponential(hyps), noise, snapshot.historical_data, snapshot.derivatives)
+                                 for hyps, noise in zip(hyperparameters_list, noise_variance_list)]
+        gaussian_process_mcmc = KG.GaussianProcessMCMC(numpy.array(hyperparameters_list), noise_variance_list,
+                                                       snapshot.historical_data, snapshot.derivatives)
+        return gaussian_process_mcmc, gaussian_process_list
+
+    def test_fantasy_means_are_posterior_means(self):
+        """The pending points get their posterior mean as value, the fantasized GP keeps that mean there with a lower variance."""
+        numpy.random.seed(2)
+        gaussian_process_mcmc, gaussian_process_list = self._build_models([[1.0, 0.3, 0.3]])
+        pending_points = numpy.random.uniform(size=(3, 2))
+        gaussian_process = gaussian_process_list[0]
+
+        fantasy_mcmc, fantasy_list = fantasy.fantasize(gaussian_process_mcmc, gaussian_process_list, pending_points)
+        fantasy_gp = fantasy_list[0]
+        assert fantasy_mcmc.num_sampled == fantasy_gp.num_sampled == 8 + 3
+        historical_data = fantasy_gp.get_historical_data_copy()
+        numpy.testing.assert_array_equal(historical_data.points_sampled[8:], pending_points)
+        self.assert_vector_within_relative(historical_data.points_sampled_value[8:].ravel(),
+                                           gaussian_process.compute_mean_of_points(pending_points), 1.0e-12)
+        numpy.testing.assert_array_equal(fantasy_mcmc.get_historical_data_copy().points_sampled_value,
+                                         historical_data.points_sampled_value)
+
+        # Up to the noise and the constant prior mean, estimated again with the fantasies
+        self.assert_vector_within_relative(fantasy_gp.compute_mean_of_points(pending_points),
+                                           gaussian_process.compute_mean_of_points(pending_points), 1.0e-4)
+        assert numpy.all(fantasy_gp.compute_variance_of_points(pending_points)
+                         < gaussian_process.compute_variance_of_points(pending_points))
+        # The GPs of the optimization are left untouched
+        assert gaussian_process.num_sampled == gaussian_process_mcmc.num_sampled == 8
+
+    def test_believer_values_average_hyperparameter_samples(self):
+        """With several hyperparameter samples, the fantasized value is the average of their posterior means."""
+        numpy.random.seed(3)
+        gaussian_process_mcmc, gaussian_process_list = self._build_models([[1.0, 0.3, 0.3], [2.0, 0.5, 0.2]])
+        pending_points = numpy.random.uniform(size=(2, 2))
+
+        _, fantasy_list = fantasy.fantasize(gaussian_process_mcmc, gaussian_process_list, pending_points)
+        expected_values = numpy.mean([gp.compute_mean_of_points(pending_points) for gp in gaussian_process_list], axis=0)
+        assert len(fantasy_list) == 2
+        for fantasy_gp in fantasy_list:
+            self.assert_vector_within_relative(fantasy_gp.get_historical_data_copy().points_sampled_value[8:].ravel(),
+                                               expected_values, 1.0e-12)
+
+    def test_fantasies_match_rebuilt_models(self):
+        """The copies extended with the fantasies (incremental cholesky) match GPs built from scratch on the same data."""
+        numpy.random.seed(4)
+        domain = build_domain()
+        hyperparameters_list = numpy.array([[1.0, 0.3, 0.3], [2.0, 0.5, 0.2]])
+        snapshot = build_snapshot(num_sampled=8)
+        gaussian_process_mcmc, gaussian_process_list = self._build_models(hyperparameters_list, snapshot)
+        pending_points = numpy.random.uniform(size=(3, 2))
+        test_points = numpy.random.uniform(size=(5, 2))
+        mean_before = gaussian_process_list[0].compute_mean_of_points(test_points)
+
+        fantasy_mcmc, fantasy_list = fantasy.fantasize(gaussian_process_mcmc, gaussian_process_list, pending_points)
+        historical_data = fantasy_mcmc.get_historical_data_copy()
+        rebuilt_mcmc, rebuilt_list = self._build_models(hyperparameters_list,
+                                                        snapshot._replace(historical_data=historical_data))
+
+        for fantasy_gp, rebuilt_gp in zip(fantasy_list, rebuilt_list):
+            assert fantasy_gp.num_sampled == rebuilt_gp.num_sampled == 8 + 3
+            self.assert_vector_within_relative(fantasy_gp.compute_mean_of_points(test_points),
+                                               rebuilt_gp.compute_mean_of_points(test_points), 1.0e-9)
+            self.assert_vector_within_relative(fantasy_gp.compute_variance_of_points(test_points).ravel(),
+                                               rebuilt_gp.compute_variance_of_points(test_points).ravel(), 1.0e-9)
+
+        rebuilt_snapshot = snapshot._replace(historical_data=historical_data, hyperparameters_list=hyperparameters_list,
+                                             noise_variance_list=numpy.full((2, 1), 1.0e-4),
+                                             discrete_pts_list=2 * snapshot.discrete_pts_list)
+        points_list = numpy.random.uniform(size=(3, snapshot.num_to_sample, 2))
+        self.assert_vector_within_relative(knowledge_gradient_values(fantasy_mcmc, rebuilt_snapshot, domain, points_list),
+                                           knowledge_gradient_values(rebuilt_mcmc, rebuilt_snapshot, domain, points_list),
+                                           1.0e-9)
+
+        # The C++ objects of the copies are independent of the GPs of the optimization
+        self.assert_vector_within_relative(gaussian_process_list[0].compute_mean_of_points(test_points), mean_before, 0.0)
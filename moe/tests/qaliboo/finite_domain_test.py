@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Test the batch nearest-neighbour lookup of the finite domains against a brute-force search."""
+import numpy
+
+import pytest
+
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from qaliboo.finite_domain import CPPFiniteDomain, FiniteDomain
+
+
+class TestFiniteDomain(OptimalLearningTestCase):
+
+    """Test find_distances_indexes_closest_points_batch of FiniteDomain and CPPFiniteDomain."""
+
+    num_points = 200
+    dim = 3
+
+    @pytest.mark.parametrize('domain_class', [FiniteDomain, CPPFiniteDomain])
+    def test_batch_lookup_matches_brute_force(self, domain_class):
+        """The closest point of each query is the argmin of the distances to the whole dataset."""
+        rng = numpy.random.RandomState(42)
+        data = rng.uniform(size=(self.num_points, self.dim))
+        points = rng.uniform(size=(50, self.dim))
+        domain = domain_class(data)
+
+        distances, indexes = domain.find_distances_indexes_closest_points_batch(points, k=5)
+        assert distances.shape == (50, 5) and indexes.shape == (50, 5)
+
+        all_distances = numpy.linalg.norm(points[:, numpy.newaxis, :] - data[numpy.newaxis, :, :], axis=2)
+        numpy.testing.assert_array_equal(indexes[:, 0], numpy.argmin(all_distances, axis=1))
+        expected_distances = numpy.sort(all_distances, axis=1)[:, :5]
+        self.assert_vector_within_relative(distances.ravel(), expected_distances.ravel(), 1.0e-12)
+
+    @pytest.mark.parametrize('domain_class', [FiniteDomain, CPPFiniteDomain])
+    def test_batch_lookup_caps_k(self, domain_class):
+        """A single point gives 2D results and ``k`` is capped at the size of the domain."""
+        data = numpy.random.uniform(size=(4, self.dim))
+        domain = domain_class(data)
+        distances, indexes = domain.find_distances_indexes_closest_points_batch(data[2], k=30)
+        assert distances.shape == (1, 4)
+        assert indexes[0, 0] == 2 and distances[0, 0] == 0.0
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Test the C++ GaussianProcessMCMC kept up to date in place against one built from scratch."""
+import copy
+
+import numpy
+
+from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as KG
+from moe.optimal_learning.python.data_containers import SamplePoint
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from moe.tests.qaliboo.knowledge_gradient_test_utils import (build_domain, build_knowledge_gradient, build_snapshot,
+                                                            knowledge_gradient_values)
+from qaliboo import multistart
+
+
+class TestGaussianProcessMCMC(OptimalLearningTestCase):
+
+    """Test add_sampled_points and set_hyperparameters of GaussianProcessMCMC through the KG they define."""
+
+    def test_updated_in_place_matches_rebuilt(self):
+        """Appending points (incremental cholesky) and replacing hyperparameters gives the GPs built from scratch."""
+        numpy.random.seed(5)
+        domain = build_domain()
+        snapshot = build_snapshot(num_sampled=8)
+        gaussian_process_mcmc = KG.GaussianProcessMCMC(snapshot.hyperparameters_list, snapshot.noise_variance_list,
+                                                       snapshot.historical_data, snapshot.derivatives)
+
+        new_points = numpy.random.uniform(size=(3, 2))
+        sampled_points = [SamplePoint(point, numpy.sum((point - 0.3) ** 2), 1.0e-4) for point in new_points]
+        gaussian_process_mcmc.add_sampled_points(sampled_points[:1], incremental_cholesky=True)
+        gaussian_process_mcmc.add_sampled_points(sampled_points[1:], incremental_cholesky=True)
+        # The first sample is kept (copied), the second one is new
+        hyperparameters_list = numpy.array([[1.2, 0.25, 0.4], [1.0, 0.3, 0.3]])
+        noise_variance_list = numpy.array([[1.0e-4], [1.0e-4]])
+        gaussian_process_mcmc.set_hyperparameters(hyperparameters_list, noise_variance_list)
+
+        rebuilt_snapshot = copy.deepcopy(snapshot)
+        rebuilt_snapshot.historical_data.append_sample_points(sampled_points)
+        rebuilt_snapshot = rebuilt_snapshot._replace(hyperparameters_list=hyperparameters_list,
+                                                     noise_variance_list=noise_variance_list,
+                                                     discrete_pts_list=2 * snapshot.discrete_pts_list)
+        rebuilt_mcmc = KG.GaussianProcessMCMC(hyperparameters_list, noise_variance_list,
+                                              rebuilt_snapshot.historical_data, snapshot.derivatives)
+
+        assert gaussian_process_mcmc.num_sampled == rebuilt_mcmc.num_sampled == 11
+        points_list = numpy.random.uniform(size=(4, snapshot.num_to_sample, 2))
+        values = knowledge_gradient_values(gaussian_process_mcmc, rebuilt_snapshot, domain, points_list)
+        expected_values = knowledge_gradient_values(rebuilt_mcmc, rebuilt_snapshot, domain, points_list)
+        self.assert_vector_within_relative(values, expected_values, 1.0e-9)
+
+
+class TestKnowledgeGradientMCMCPointList(OptimalLearningTestCase):
+
+    """Test the batch evaluations of KnowledgeGradientMCMC against one set of points at a time."""
+
+    def test_grad_at_point_list_matches_single_gradients(self):
+        """evaluate_grad_at_point_list gives compute_grad_knowledge_gradient_mcmc of each set of points."""
+        numpy.random.seed(11)
+        domain = build_domain()
+        kg = build_knowledge_gradient(build_snapshot(num_to_sample=2), domain)
+        points_to_evaluate = numpy.random.uniform(size=(5, 2, 2))
+        multistart.seed_randomness(kg, 3)
+
+        grads = kg.evaluate_grad_at_point_list(points_to_evaluate)
+        assert grads.shape == points_to_evaluate.shape
+        for points, grad in zip(points_to_evaluate, grads):
+            kg.set_current_point(points)
+            numpy.testing.assert_allclose(grad, kg.compute_grad_knowledge_gradient_mcmc(), rtol=1.0e-10, atol=1.0e-12)
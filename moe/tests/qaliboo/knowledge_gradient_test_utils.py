@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Utilities building a small KnowledgeGradientMCMC (and its multistart snapshot) on a 2D finite domain."""
+import numpy
+
+from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as KG
+from moe.optimal_learning.python.cpp_wrappers import optimization as cpp_optimization
+from moe.optimal_learning.python.data_containers import HistoricalData, SamplePoint
+from qaliboo import multistart
+from qaliboo.finite_domain import CPPFiniteDomain
+
+
+SGD_PARAMS_KWARGS = dict(num_multistarts=5, max_num_steps=6, max_num_restarts=3, num_steps_averaged=3,
+                         gamma=0.0, pre_mult=1.0, max_relative_change=0.2, tolerance=1.0e-10)
+
+
+def build_domain(num_points_per_dim=15):
+    """Regular grid on the unit square."""
+    coords = numpy.linspace(0.0, 1.0, num_points_per_dim)
+    return CPPFiniteDomain.Grid(coords, coords)
+
+
+def build_snapshot(num_sampled=8, num_to_sample=2, num_discrete_pts=10, num_mc_iterations=16,
+                   points_being_sampled=None, seed=0):
+    """Snapshot of a KG with one set of hyperparameters, on ``num_sampled`` noisy samples of a quadratic."""
+    rng = numpy.random.RandomState(seed)
+    points = rng.uniform(size=(num_sampled, 2))
+    values = numpy.sum((points - 0.3) ** 2, axis=1)
+    historical_data = HistoricalData(2)
+    historical_data.append_sample_points([SamplePoint(point, value, 1.0e-4) for point, value in zip(points, values)])
+    return multistart.KGSnapshot(
+        token=seed,
+        hyperparameters_list=numpy.array([[1.0, 0.3, 0.3]]),
+        noise_variance_list=numpy.array([1.0e-4]),
+        historical_data=historical_data,
+        derivatives=numpy.arange(0),
+        discrete_pts_list=[rng.uniform(size=(num_discrete_pts, 2))],
+        points_being_sampled=points_being_sampled,
+        num_to_sample=num_to_sample,
+        num_mc_iterations=num_mc_iterations,
+        ml_model=None,
+        nm=False,
+        penalize=False,
+        error=1.0,
+        sa_population_size=0,
+    )
+
+
+def build_knowledge_gradient(snapshot, domain, max_num_threads=1):
+    """KnowledgeGradientMCMC described by ``snapshot``."""
+    sgd_params = cpp_optimization.GradientDescentParameters(**SGD_PARAMS_KWARGS)
+    return multistart.rebuild_kg(snapshot, domain, sgd_params, max_num_threads)
+
+
+def knowledge_gradient_values(gaussian_process_mcmc, snapshot, domain, points_list):
+    """KG of each set of ``points_list``, on ``gaussian_process_mcmc`` and the other inputs of ``snapshot`` (same seed for every set)."""
+    kg = build_knowledge_gradient(snapshot, domain)
+    kg = KG.KnowledgeGradientMCMC(gaussian_process_mcmc=gaussian_process_mcmc,
+                                  gaussian_process_list=kg._gaussian_process_list,
+                                  num_fidelity=0,
+                                  inner_optimizer=kg._inner_optimizer,
+                                  discrete_pts_list=snapshot.discrete_pts_list,
+                                  num_to_sample=snapshot.num_to_sample,
+                                  num_mc_iterations=snapshot.num_mc_iterations,
+                                  max_num_threads=1)
+    values = []
+    for points in points_list:
+        multistart.seed_randomness(kg, 7)
+        kg.set_current_point(points)
+        values.append(kg.compute_knowledge_gradient_mcmc())
+    return numpy.array(values)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""Test that the restarts of the multistart optimization do not depend on the number of workers."""
+import numpy
+
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from moe.tests.qaliboo.knowledge_gradient_test_utils import SGD_PARAMS_KWARGS, build_domain, build_knowledge_gradient, build_snapshot
+from qaliboo import multistart
+
+
+class TestMultistart(OptimalLearningTestCase):
+
+    """Test optimize_points (n_jobs=1) against a MultistartPool (n_jobs>1)."""
+
+    seeds = [17, 4, 2718, 9]
+
+    def test_pool_matches_sequential_restarts(self):
+        """The pool returns the points and KG values of the sequential restarts, in the order of the seeds."""
+        domain = build_domain()
+        snapshot = build_snapshot()
+        # One thread per worker, as the sequential restarts
+        pool = multistart.MultistartPool(2, domain, SGD_PARAMS_KWARGS, max_num_threads=2)
+        try:
+            pool_results = pool.optimize(snapshot, self.seeds)
+        finally:
+            pool.close()
+
+        kg = build_knowledge_gradient(snapshot, domain)
+        sequential_results = multistart.optimize_points(self.seeds, kg, domain, snapshot.num_to_sample)
+
+        assert len(pool_results) == len(self.seeds)
+        for (pool_point, pool_value), (point, value) in zip(pool_results, sequential_results):
+            assert pool_point.shape == (snapshot.num_to_sample, 2)
+            self.assert_vector_within_relative(pool_point.ravel(), point.ravel(), 1.0e-12)
+            self.assert_scalar_within_relative(pool_value, value, 1.0e-12)
+
+    def test_sequential_restarts_only_depend_on_seed(self):
+        """A restart gives the same result whatever restarts ran before it."""
+        domain = build_domain()
+        kg = build_knowledge_gradient(build_snapshot(), domain)
+        all_results = multistart.optimize_points(self.seeds, kg, domain, 2)
+        last_result = multistart.optimize_points(self.seeds[-1:], kg, domain, 2)
+        numpy.testing.assert_array_equal(all_results[-1][0], last_result[0][0])
+        assert all_results[-1][1] == last_result[0][1]
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Test the optimization loops of ParallelMaliboo on a small precomputed function."""
+import numpy
+
+from moe.optimal_learning.python.data_containers import SamplePoint
+from moe.tests.qaliboo.precomputed_function_test_utils import build_precomputed_function
+from qaliboo.parallel_maliboo import ParallelMaliboo
+
+
+def _build_function(tmp_path):
+    """Precomputed function on a 7x7 grid of the unit square: a quadratic cost and its evaluation time."""
+    coords = numpy.linspace(0.0, 1.0, 7)
+    points = numpy.array([(x0, x1) for x0 in coords for x1 in coords])
+    return build_precomputed_function(tmp_path, points, numpy.sum((points - 0.3) ** 2, axis=1), 1.0 + numpy.sum(points, axis=1),
+                                      name='grid.csv')
+
+
+def _build_optimizer(tmp_path, **kwargs):
+    """ParallelMaliboo on the function of _build_function, with few restarts to keep the tests short."""
+    function = _build_function(tmp_path)
+    optimizer = ParallelMaliboo(n_initial_points=5, batch_size=2, objective_func=function, domain=function,
+                                objective_func_name='ScaledLiGenTot', n_restarts=2, **kwargs)
+    return optimizer, function
+
+
+class TestPipelinedOptimization(object):
+
+    """Test sync_optimization(pipelined=True)."""
+
+    def test_batches_proposed_while_previous_is_evaluated(self, tmp_path):
+        """Each batch is proposed with the batch being evaluated as points being sampled, and all batches reach the GP."""
+        numpy.random.seed(0)
+        optimizer, function = _build_optimizer(tmp_path, n_iterations=3)
+        proposals = []
+        propose_next_points = optimizer.propose_next_points
+
+        def recording_propose_next_points(q, points_being_sampled=None):
+            points = propose_next_points(q, points_being_sampled)
+            proposals.append((points_being_sampled, numpy.array(points)))
+            return points
+
+        optimizer.propose_next_points = recording_propose_next_points
+        with optimizer:
+            optimizer.sync_optimization(pipelined=True)
+
+        # The first batch, then one per iteration but the last
+        assert len(proposals) == 3
+        assert proposals[0][0] is None
+        for (_, previous_batch), (points_being_sampled, _) in zip(proposals[:-1], proposals[1:]):
+            numpy.testing.assert_array_equal(points_being_sampled, previous_batch)
+
+        assert function.evaluation_count == 5 + 3 * 2
+        points_sampled = optimizer._gp_loglikelihood.get_historical_data_copy().points_sampled
+        assert points_sampled.shape == (5 + 3 * 2, 2)
+        # The batches are added to the GP in the order they were proposed
+        numpy.testing.assert_array_equal(points_sampled[5:], numpy.concatenate([batch for _, batch in proposals]))
+
+
+class TestCheckpointResume(object):
+
+    """Test ParallelMaliboo.checkpoint followed by a ParallelMaliboo built with resume_from."""
+
+    def test_resume_restores_state(self, tmp_path):
+        """The resumed optimizer has the data, ML model, sampled points and MCMC state of the checkpoint."""
+        numpy.random.seed(1)
+        directory = str(tmp_path / 'checkpoints')
+        # ub enables the ML model of the evaluation times
+        optimizer, function = _build_optimizer(tmp_path, n_iterations=3, ub=2.5, checkpoint_dir=directory)
+        with optimizer:
+            optimizer.checkpoint(1)
+
+        resumed, resumed_function = _build_optimizer(tmp_path, n_iterations=3, ub=2.5, resume_from=directory)
+        with resumed:
+            assert resumed._first_iteration == 2
+            assert resumed_function.evaluation_count == function.evaluation_count == 5
+            assert resumed._min_evaluated == optimizer._min_evaluated
+
+            historical_data = optimizer._gp_loglikelihood.get_historical_data_copy()
+            resumed_data = resumed._gp_loglikelihood.get_historical_data_copy()
+            numpy.testing.assert_array_equal(resumed_data.points_sampled, historical_data.points_sampled)
+            numpy.testing.assert_array_equal(resumed_data.points_sampled_value, historical_data.points_sampled_value)
+            numpy.testing.assert_array_equal(resumed_data.points_sampled_noise_variance,
+                                             historical_data.points_sampled_noise_variance)
+
+            numpy.testing.assert_array_equal(resumed._ml_model.X_data, optimizer._ml_model.X_data)
+            numpy.testing.assert_array_equal(resumed._ml_model.y_data, optimizer._ml_model.y_data)
+
+            mask = function.get_sampled_mask()
+            assert numpy.count_nonzero(mask) == 5
+            numpy.testing.assert_array_equal(resumed_function.get_sampled_mask(), mask)
+
+            state = optimizer._gp_loglikelihood.get_state()
+            resumed_state = resumed._gp_loglikelihood.get_state()
+            assert sorted(resumed_state) == sorted(state)
+            for name, value in state.items():
+                numpy.testing.assert_array_equal(resumed_state[name], value)
+            # No chain is run on resume: the models come from the saved hyperparameters
+            assert len(resumed._gp_loglikelihood.models) == len(optimizer._gp_loglikelihood.models)
+
+    def test_resume_continues_the_chains(self, tmp_path):
+        """After a resume, the next training samples the hyperparameters the uninterrupted run would have sampled."""
+        numpy.random.seed(2)
+        directory = str(tmp_path / 'checkpoints')
+        optimizer, function = _build_optimizer(tmp_path, n_iterations=3, checkpoint_dir=directory)
+        with optimizer:
+            optimizer.checkpoint(1)
+            resumed, _ = _build_optimizer(tmp_path, n_iterations=3, resume_from=directory)
+            with resumed:
+                point = numpy.array([0.5, 0.5])
+                noise_variance = optimizer._gp_loglikelihood.get_historical_data_copy().points_sampled_noise_variance[0]
+                sample_point = SamplePoint(point, function.evaluate_true(point)[0], noise_variance)
+                hypers = []
+                # The global numpy.random state differs between the two runs, as after a restart
+                for gp_loglikelihood, global_seed in ((optimizer._gp_loglikelihood, 3), (resumed._gp_loglikelihood, 4)):
+                    numpy.random.seed(global_seed)
+                    gp_loglikelihood.add_sampled_points([sample_point])
+                    gp_loglikelihood.train()
+                    hypers.append(gp_loglikelihood.hypers)
+        numpy.testing.assert_array_equal(hypers[0], hypers[1])
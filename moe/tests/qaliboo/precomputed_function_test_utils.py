@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Utilities building small precomputed functions (a CSV dataset of points, costs and evaluation times) for the tests."""
+import numpy
+import pandas as pd
+
+from qaliboo import datasets
+from qaliboo.precomputed_functions import _PrecomputedFunction
+
+
+def build_precomputed_function(tmp_path, points, cost, time, name='data.csv', **kwargs):
+    """Precomputed function on the rows of ``points`` (one column per dimension, x0, x1, ...) with their ``cost`` and ``time``.
+
+    The dataset is written to ``tmp_path / name`` unless it already exists, so functions built twice in a test share it.
+    The other keyword arguments are passed to _PrecomputedFunction (e.g., ``cache_size``).
+
+    """
+    points = numpy.reshape(points, (len(points), -1))
+    param_cols = ['x%d' % i for i in range(points.shape[1])]
+    csv_file = tmp_path / name
+    if not csv_file.exists():
+        data = pd.DataFrame(points, columns=param_cols)
+        data['cost'] = cost
+        data['time'] = time
+        data.to_csv(str(csv_file), index=False)
+    dataset = datasets.Dataset(csv_file=str(csv_file), param_cols=param_cols, target_col='cost', time_col='time',
+                               Realtime_col='time', use_cache=False)
+    return _PrecomputedFunction(dataset=dataset, **kwargs)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Test the projection cache of the precomputed functions."""
+import numpy
+
+from moe.tests.qaliboo.precomputed_function_test_utils import build_precomputed_function
+
+
+def _build_function(tmp_path, cache_size):
+    """Build a precomputed function on a small 1D dataset whose rows are at 0, 1, ..., 9."""
+    points = numpy.arange(10.0)
+    return build_precomputed_function(tmp_path, points, points ** 2, points + 1.0, cache_size=cache_size)
+
+
+class TestSnapToDomain(object):
+
+    """Test the hit/miss counting and the LRU eviction of _PrecomputedFunction.snap_to_domain."""
+
+    def test_hits_and_misses(self, tmp_path):
+        """Points rounding to the same key share one lookup, and evaluate_true/evaluate_time use the same row."""
+        function = _build_function(tmp_path, cache_size=8)
+        assert function.snap_to_domain(numpy.array([3.1])) == 3
+        assert function.snap_to_domain(numpy.array([3.1 + 1.0e-12])) == 3
+        assert (function.cache_hits, function.cache_misses) == (1, 1)
+
+        values, index, _ = function.evaluate_true(numpy.array([6.9]))
+        assert index == 7 and values == 49.0
+        assert function.evaluate_time(numpy.array([6.9])) == 8.0
+        assert (function.cache_hits, function.cache_misses) == (2, 2)
+
+        function.clear_cache()
+        assert (function.cache_hits, function.cache_misses) == (0, 0)
+        function.snap_to_domain(numpy.array([3.1]))
+        assert function.cache_misses == 1
+
+    def test_eviction_at_capacity(self, tmp_path):
+        """The least recently used key is dropped once the cache holds ``cache_size`` keys."""
+        function = _build_function(tmp_path, cache_size=2)
+        function.snap_to_domain(numpy.array([1.0]))
+        function.snap_to_domain(numpy.array([2.0]))
+        function.snap_to_domain(numpy.array([1.0]))  # 1.0 becomes the most recently used key
+        function.snap_to_domain(numpy.array([3.0]))  # evicts 2.0
+        assert (function.cache_hits, function.cache_misses) == (1, 3)
+
+        function.snap_to_domain(numpy.array([1.0]))
+        assert function.cache_hits == 2
+        function.snap_to_domain(numpy.array([2.0]))
+        assert function.cache_misses == 4
+
+    def test_disabled_cache(self, tmp_path):
+        """With ``cache_size=0`` nothing is stored or counted."""
+        function = _build_function(tmp_path, cache_size=0)
+        for _ in range(3):
+            assert function.snap_to_domain(numpy.array([4.2])) == 4
+        assert (function.cache_hits, function.cache_misses) == (0, 0)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Test the event-driven scheduling of the objective function evaluations."""
+import concurrent.futures
+
+import pytest
+
+from qaliboo import scheduler
+
+
+class _ManualExecutor(object):
+
+    """Executor whose futures are completed by the test, in the order it chooses."""
+
+    def __init__(self):
+        self.futures = {}
+        self.is_shutdown = False
+
+    def submit(self, request_id, point):
+        future = concurrent.futures.Future()
+        self.futures[request_id] = future
+        return future
+
+    def shutdown(self):
+        self.is_shutdown = True
+
+
+class TestEvaluationScheduler(object):
+
+    """Test the slots, the completion order and the closing of EvaluationScheduler."""
+
+    def test_wait_returns_results_in_completion_order(self):
+        """Each result comes back with the point of its request, in the order the evaluations finish."""
+        executor = _ManualExecutor()
+        evaluations = scheduler.EvaluationScheduler(executor, 3)
+        request_ids = [evaluations.submit([float(i)]) for i in range(3)]
+        assert evaluations.free_slots == 0
+        with pytest.raises(RuntimeError):
+            evaluations.submit([3.0])
+
+        executor.futures[request_ids[2]].set_result(('value 2', 2, 0.5))
+        assert evaluations.wait() == [(request_ids[2], [2.0], ('value 2', 2, 0.5))]
+        assert evaluations.free_slots == 1
+        assert evaluations.pending_points == [[0.0], [1.0]]
+
+        executor.futures[request_ids[1]].set_result(('value 1', 1, 0.5))
+        executor.futures[request_ids[0]].set_result(('value 0', 0, 0.5))
+        results = evaluations.wait()
+        assert [(request_id, point) for request_id, point, _ in results] == [(request_ids[1], [1.0]), (request_ids[0], [0.0])]
+        assert evaluations.free_slots == 3
+        assert evaluations.wait() == []
+
+    def test_wait_timeout_and_failure(self):
+        """wait returns nothing when no evaluation finishes in time, and raises the error of a failed one."""
+        executor = _ManualExecutor()
+        evaluations = scheduler.EvaluationScheduler(executor, 2)
+        request_id = evaluations.submit([0.0])
+        assert evaluations.wait(timeout=0.01) == []
+
+        executor.futures[request_id].set_exception(RuntimeError('Evaluation failed'))
+        with pytest.raises(RuntimeError):
+            evaluations.wait()
+
+    def test_close_cancels_and_shuts_down(self):
+        """close cancels the evaluations still pending and shuts the executor down."""
+        executor = _ManualExecutor()
+        evaluations = scheduler.EvaluationScheduler(executor, 2)
+        request_id = evaluations.submit([0.0])
+        evaluations.close()
+        assert executor.futures[request_id].cancelled()
+        assert executor.is_shutdown
+        assert evaluations.free_slots == 2 and evaluations.pending_points == []
+
+
+class _SquareObjective(object):
+
+    """Objective returning (value, index, time) like the precomputed functions; fails on negative points."""
+
+    def evaluate(self, point):
+        if point[0] < 0.0:
+            raise ValueError('negative point')
+        return point[0] ** 2, int(point[0]), 0.0
+
+
+class TestEvaluationPool(object):
+
+    """Test the evaluations run by the forked workers of EvaluationPool."""
+
+    def test_map_async_in_order_of_points(self):
+        """The futures of map_async give the result of each point, in the order of the points."""
+        pool = scheduler.EvaluationPool(_SquareObjective(), 2)
+        try:
+            points = [[3.0], [1.0], [2.0], [5.0]]
+            results = [future.result(timeout=60) for future in pool.map_async(points)]
+            assert [(value, index) for value, index, _ in results] == [(9.0, 3), (1.0, 1), (4.0, 2), (25.0, 5)]
+
+            with pytest.raises(RuntimeError):
+                pool.map_async([[-1.0]])[0].result(timeout=60)
+        finally:
+            pool.shutdown()
+
+    def test_workers_need_name_without_fork(self):
+        """Workers not forked cannot inherit the objective function: its name is required."""
+        with pytest.raises(ValueError):
+            scheduler.EvaluationPool(_SquareObjective(), 2, start_method='spawn')
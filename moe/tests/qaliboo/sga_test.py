@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Test the stochastic gradient ascent of all the restarts in lockstep."""
+import numpy
+
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from moe.tests.qaliboo.knowledge_gradient_test_utils import build_domain, build_knowledge_gradient, build_snapshot
+from qaliboo import SGA as sga
+from qaliboo import multistart
+
+
+class TestLockstepGradientAscent(OptimalLearningTestCase):
+
+    """Test stochastic_gradient_lockstep and optimize_points_lockstep against one restart at a time."""
+
+    seeds = [17, 4, 9]
+
+    def test_lockstep_matches_single_restarts(self):
+        """Each restart of the lockstep ascent ends where stochastic_gradient takes it."""
+        numpy.random.seed(3)
+        domain = build_domain()
+        kg = build_knowledge_gradient(build_snapshot(num_to_sample=2), domain)
+        starting_points = numpy.array([domain.generate_uniform_random_points_in_domain(2) for _ in range(4)])
+        multistart.seed_randomness(kg, 5)
+
+        new_points = sga.stochastic_gradient_lockstep(kg, domain, starting_points)
+        assert new_points.shape == starting_points.shape
+        for starting_point, new_point in zip(starting_points, new_points):
+            # The gradients agree to rounding, accumulated over the steps
+            numpy.testing.assert_allclose(new_point, sga.stochastic_gradient(kg, domain, starting_point), rtol=0.0, atol=1.0e-8)
+
+    def test_optimize_points_lockstep_starting_points(self):
+        """optimize_points_lockstep starts each restart from the random point of its seed, as optimize_point."""
+        domain = build_domain()
+        kg = build_knowledge_gradient(build_snapshot(num_to_sample=2), domain)
+        multistart.seed_randomness(kg, 5)
+
+        results = multistart.optimize_points_lockstep(self.seeds, kg, domain, 2)
+        assert len(results) == len(self.seeds)
+        for seed, (new_point, kg_value) in zip(self.seeds, results):
+            numpy.random.seed(seed)
+            starting_point = numpy.array(domain.generate_uniform_random_points_in_domain(2))
+            expected_point = sga.stochastic_gradient(kg, domain, starting_point)
+            numpy.testing.assert_allclose(new_point, expected_point, rtol=0.0, atol=1.0e-8)
+            kg.set_current_point(expected_point)
+            self.assert_scalar_within_relative(kg_value, kg.compute_knowledge_gradient_mcmc(), 1.0e-6)
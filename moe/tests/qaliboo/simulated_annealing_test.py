@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Test the scores of the population (parallel tempering) simulated annealing."""
+import numpy
+
+from moe.tests.optimal_learning.python.optimal_learning_test_case import OptimalLearningTestCase
+from moe.tests.qaliboo.knowledge_gradient_test_utils import build_domain, build_knowledge_gradient, build_snapshot
+from qaliboo import simulated_annealing as SA
+
+
+class _RecordingKnowledgeGradient(object):
+
+    """Forward evaluate_at_point_list to a KnowledgeGradientMCMC and record the sets of points scored and their values."""
+
+    def __init__(self, kg):
+        self._kg = kg
+        self.points = []
+        self.values = []
+
+    def evaluate_at_point_list(self, points_to_evaluate, **kwargs):
+        values = self._kg.evaluate_at_point_list(points_to_evaluate, **kwargs)
+        self.points.extend(numpy.copy(points_to_evaluate))
+        self.values.extend(values)
+        return values
+
+
+class TestPopulationSimulatedAnnealing(OptimalLearningTestCase):
+
+    """Test simulated_annealing_population against the KG computed one set of points at a time."""
+
+    def test_neighbour_scores_match_knowledge_gradient(self):
+        """Every set of points scored by the annealing gets the value of compute_knowledge_gradient_mcmc."""
+        numpy.random.seed(31)
+        domain = build_domain()
+        kg = build_knowledge_gradient(build_snapshot(num_to_sample=2, num_mc_iterations=32), domain)
+        recorder = _RecordingKnowledgeGradient(kg)
+        initial_point = numpy.array(domain.generate_uniform_random_points_in_domain(2))
+
+        best_point = SA.simulated_annealing_population(domain, recorder, initial_point, 5, 2, 0.1,
+                                                       population_size=4, max_num_threads=1)
+
+        # The initial population and the neighbours of the 5 steps
+        assert len(recorder.points) == 4 * 6
+        for points, value in zip(recorder.points, recorder.values):
+            kg.set_current_point(points)
+            self.assert_scalar_within_relative(value, kg.compute_knowledge_gradient_mcmc(), 1.0e-12)
+
+        # The best point is one of the scored sets, with the highest score
+        best_index = numpy.argmax(recorder.values)
+        self.assert_vector_within_relative(best_point.ravel(), recorder.points[best_index].ravel(), 0.0)
@@ -0,0 +1,55 @@
+import warnings
+import numpy as np
+import pytest
+from ep_test_utils import build_problem, run_stage
+
+
+EXECUTORS = [None, 'thread', 'process']
+
+
+#The arrays of the outputs, the factorizations being compared through the matrices they factor
+def stage_outputs(stage_result, indices):
+    outputs = [stage_result.x_minimum, stage_result.K, stage_result.K_star_min, stage_result.m_f_minimum, stage_result.v_f_minimum, \
+               stage_result.c_and_m]
+    outputs = [value[indices] for value in outputs]
+    outputs.append([stage_result.K_plus_W_tilde_factor[j].solve(np.eye(stage_result.K_plus_W_tilde_factor[j].size)) for j in indices])
+    outputs.append([stage_result.K_n_cholesky[j] for j in indices])
+    return outputs
+
+
+#The stage runs with the warnings as errors, as in run_PES
+def run_stage_with_errors(problem, executor):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        return run_stage(problem, executor)
+
+
+@pytest.fixture(scope = 'module')
+def serial_result():
+    return run_stage_with_errors(build_problem(num_of_hyperSets = 4), None)
+
+
+@pytest.mark.parametrize('executor', EXECUTORS[1:])
+def test_executors_give_identical_outputs(serial_result, executor):
+    stage_result = run_stage_with_errors(build_problem(num_of_hyperSets = 4), executor)
+    assert np.all(stage_result.valid) and np.all(serial_result.valid)
+    assert not stage_result.failures
+    for value, expected in zip(stage_outputs(stage_result, range(4)), stage_outputs(serial_result, range(4))):
+        np.testing.assert_array_equal(value, expected)
+
+
+#A set of hyperparameters failing in the EP (tiny lengthscales) and one failing in the factorization of the observations
+#(negative variance) are counted and left out, the other sets are not changed
+@pytest.mark.parametrize('executor', EXECUTORS)
+def test_failures_are_counted_and_excluded(serial_result, executor):
+    Xsamples, Ysamples, sigma, l, noise = build_problem(num_of_hyperSets = 4)
+    l[1] = 10**(-8)
+    sigma[2] = -1.0
+    stage_result = run_stage_with_errors((Xsamples, Ysamples, sigma, l, noise), executor)
+
+    np.testing.assert_array_equal(stage_result.valid, [True, False, False, True])
+    assert sum(stage_result.failures.values()) == 2
+    assert sorted(error.split(':')[0] for error in stage_result.failures) == ['LinAlgError', 'RuntimeWarning']
+    assert stage_result.K_plus_W_tilde_factor[1] is None and stage_result.K_n_cholesky[2] is None
+    for value, expected in zip(stage_outputs(stage_result, [0, 3]), stage_outputs(serial_result, [0, 3])):
+        np.testing.assert_array_equal(value, expected)
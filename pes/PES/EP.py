@@ -2,6 +2,7 @@ import numpy as np
 import scipy.linalg as spla
 from PES.utilities import *
 from PES.compute_covariance import *
+from PES.factorization import *
 
 
 
@@ -20,17 +21,17 @@ from PES.compute_covariance import *
 #                          the actual hessians at the x_minimum. However, considering the computational cost, we use approximation 
 #                          of the hessians here. The author uses the same idea in his original code. For the original code, please visit 
 #                          https://bitbucket.org/jmh233/codepesnips2014/src/master/sourceFiles/. 
-def Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_minimum, d, l_vec, sigma, noise, hess_at_min):
+#            @L_obs: the lower Cholesky factor of the kernel matrix of the n observations (the upper-left block of K_c), e.g. from a
+#                    CholeskyCache. It is computed if None.
+#The third output is the BlockCholesky factorization of [K + W_tilde], which is never inverted explicitly.
+def Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_minimum, d, l_vec, sigma, noise, hess_at_min, L_obs = None):
     
 
+    #K_c, dimension is (n+d+d*(d-1)/2)x(n+d+d*(d-1)/2), K_cz, dimension is (n+d+d*(d-1)/2)x(d+1) and
     #K_z, dimension is (d+1)x(d+1)
-    K_z = compute_K_z(x_minimum, sigma, l_vec, noise, d)
-
-    #K_c, dimension is (n+d+d*(d-1)/2)x(n+d+d*(d-1)/2)
-    K_c = compute_K_c(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
+    K_c, K_cz, K_z = compute_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec)
 
     #K_zc, dimension is (d+1)x(n+d+d*(d-1)/2)
-    K_cz = compute_K_cz(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
     K_zc = K_cz.T
 
     #Covariance matrix between z and c, the dimension is ( (n+d+d*(d-1)/2) + (d+1))^2
@@ -47,14 +48,18 @@ def Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_mi
     c = np.concatenate((value_of_nObservations, zero_gradient, off_dia_hess))
 
 
-    K_c_inverse = compute_inverse(K_c)
+    #Factorization of K_c, from the Cholesky factor of the block of the n observations
+    if L_obs is None:
+        L_obs = spla.cholesky(K_c[:n, :n], lower = True)
+    K_c_factor = BlockCholesky(L_obs, K_c[:n, n:], K_c[n:, n:])
+    K_c_inverse_K_cz = K_c_factor.solve(K_cz)
 
 
     #m_0 is a (d+1)x1 matrix
-    m_0 = np.dot(np.dot(K_zc, K_c_inverse), c.T)
+    m_0 = np.dot(K_c_inverse_K_cz.T, c)
 
     #v_0 is a (d+1)x(d+1) matrix
-    v_0 = K_z - np.dot(np.dot(K_zc, K_c_inverse), K_cz)
+    v_0 = K_z - np.dot(K_zc, K_c_inverse_K_cz)
 
     min_of_nObservations = np.amin(value_of_nObservations)
 
@@ -192,8 +197,9 @@ def Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_mi
         
 
     v_tilde = np.reciprocal(v_tilde_inverse)
-    #[K + W_tilde], dimension is ((d+1) + (n+d+d*(d-1)/2))^2
-    K_plus_W_tilde_inverse = compute_inverse(np.diag(np.concatenate((np.zeros(int(n+d+d*(d-1)/2)), v_tilde))) + K)
+    #[K + W_tilde], dimension is ((d+1) + (n+d+d*(d-1)/2))^2. W_tilde only adds v_tilde to the diagonal of the z block, so it is 
+    #factored from the factor of K_c
+    K_plus_W_tilde_factor = BlockCholesky(K_c_factor.lower(), K_cz, K_z + np.diag(v_tilde))
 
     #[c; m_tilde], dimension is ((d+1) + (n+d+d*(d-1)/2))x1, mAux
     c_and_m = np.array(np.concatenate((c, m_tilde)))
@@ -209,10 +215,10 @@ def Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_mi
 
     #m_f_minimum, dimension 1x1, one of the two elements in the m_f vector defined in the paper. Note here, we compute the m_f vector 
     #elementwise.
-    m_f_minimum = np.dot(np.dot(K_star_min, K_plus_W_tilde_inverse), c_and_m)
+    m_f_minimum = K_plus_W_tilde_factor.inner(K_star_min[:, None], c_and_m[:, None])[0, 0]
 
     #v_f_minimum, dimension 1x1, one of the elements in the V_f vector defined in the paper, which corresponds to the variance of the 
     #posterior distribution of f(x_min). Since cov(f(x_min), f(x_min)) is the 0 distance squared exponential, so it equals to sigma.
-    v_f_minimum = sigma - np.dot(np.dot(K_star_min, K_plus_W_tilde_inverse), K_star_min.T)
+    v_f_minimum = sigma - K_plus_W_tilde_factor.inner(K_star_min[:, None], K_star_min[:, None])[0, 0]
 
-    return K, K_star_min, K_plus_W_tilde_inverse, m_f_minimum, v_f_minimum, c_and_m
\ No newline at end of file
+    return K, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m
\ No newline at end of file
@@ -0,0 +1,184 @@
+import collections
+import concurrent.futures
+import multiprocessing
+import time
+import traceback
+import warnings
+import numpy as np
+import numpy.random as npr
+from PES.utilities import *
+from PES.sample_minimum import *
+from PES.EP import *
+from PES.factorization import *
+
+
+
+#This file runs, for every sample of the hyperparameters, the first two parts of the PES: the sample of the global minimum with
+#random features and the expectation propagation. The samples of the hyperparameters are independent, so this stage can run on
+#a pool of threads or processes.
+
+
+
+#Outputs of the stage. The arrays are indexed by the sample of the hyperparameters, only the rows where valid is True are set.
+#   @x_minimum: (M, d) sampled minimums
+#   @K, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m: the outputs of Expectation_Propagation, stacked
+#   @K_n_cholesky: the lower Cholesky factors of K_n + noise*I used by the acquisition function
+#   @valid: (M,) whether the computation succeeded for the sample
+#   @failures: collections.Counter of the exceptions raised, by type and message
+#   @timing: dict with the time spent (summed over the samples) in 'sample_minimum', 'hessian' and 'EP', and the elapsed 'wall' time
+EPStageResult = collections.namedtuple('EPStageResult', ['x_minimum', 'K', 'K_star_min', 'K_plus_W_tilde_factor', 'm_f_minimum',
+                                                         'v_f_minimum', 'c_and_m', 'K_n_cholesky', 'valid', 'failures', 'timing'])
+
+
+
+#Function to sample the minimum and run the EP for one sample of the hyperparameters. It returns the index of the sample, the
+#outputs of Expectation_Propagation (None if it failed), the error message (None if it succeeded) and the time spent in each step.
+#Parameters: @task: tuple (index, seed, num_of_features, d, Xsamples, Ysamples, sigma, l, noise, initial_point, bnds, L_obs), 
+#                   L_obs being the Cholesky factor of the kernel matrix of the observations or None
+def EP_for_hyperSet(task):
+    j, seed, num_of_features, d, Xsamples, Ysamples, sigma, l, noise, initial_point, bnds, L_obs = task
+    times = np.zeros(3)
+    try:
+        start = time.time()
+        result = sample_min_with_randFeatures(num_of_features, d, Xsamples, Ysamples, sigma, l, noise, initial_point, 'L-BFGS-B', \
+                                              False, bnds, npr.RandomState(seed))
+        x_minimum = result.x
+        times[0] = time.time() - start
+
+        start = time.time()
+        hess_at_min = compute_inverse(result.hess_inv.todense())
+        times[1] = time.time() - start
+
+        start = time.time()
+        value_of_nObservations = (Ysamples.T)[0]
+        outputs = Expectation_Propagation(Xsamples, value_of_nObservations, len(Ysamples), x_minimum, d, l, sigma, noise, hess_at_min, \
+                                          L_obs)
+        times[2] = time.time() - start
+        return j, (x_minimum,) + tuple(outputs), None, times
+    except Exception as error:
+        message = traceback.format_exception_only(type(error), error)[-1].strip()
+        return j, None, message, times
+
+
+
+def _init_worker():
+    #Numerical warnings are treated as failures, as in run_PES
+    warnings.filterwarnings("error")
+
+
+
+#Class to run EP_for_hyperSet for all the samples of the hyperparameters.
+#Parameters: @executor: None to run serially, 'thread' or 'process' to use a pool of threads or of (forked) processes
+#            @num_of_workers: number of threads/processes of the pool, by default the number of cpus
+class EPStage:
+
+    def __init__(self, executor = None, num_of_workers = None):
+        if executor not in (None, 'thread', 'process'):
+            raise ValueError('Unknown executor ' + str(executor) + ', choose among None, thread and process.')
+        self.executor = executor
+        self._pool = None
+        if executor == 'thread':
+            self._pool = concurrent.futures.ThreadPoolExecutor(num_of_workers)
+        elif executor == 'process':
+            self._pool = concurrent.futures.ProcessPoolExecutor(num_of_workers, mp_context = multiprocessing.get_context('fork'), \
+                                                                initializer = _init_worker)
+
+
+    #Run the stage for the hyperparameters (sigma, l, noise). The seeds of the random features are drawn from the global numpy
+    #random generator, so the results do not depend on the executor.
+    #The Cholesky factors of the kernel matrices of the observations are taken from factor_cache (a CholeskyCache keyed by the
+    #index of the set of hyperparameters), if any.
+    #Parameters: @num_of_features: the number of features used to sample the minimum
+    #            @d: the dimensions of the objective function
+    #            @Xsamples, Ysamples: observations we have and their function values
+    #            @sigma, l, noise: the M samples of the hyperparameters
+    #            @initial_point: the initial point of the optimization of the approximate posterior samples
+    #            @bnds: the bounds of the domain
+    #            @factor_cache: the CholeskyCache of the factors of the kernel matrices of the observations
+    def run(self, num_of_features, d, Xsamples, Ysamples, sigma, l, noise, initial_point, bnds, factor_cache = None):
+        start = time.time()
+        num_of_hyperSets = len(sigma)
+        n = len(Xsamples)
+        size = int(n + d + d*(d-1)/2 + d + 1)
+
+        if factor_cache is None:
+            factor_cache = CholeskyCache()
+        failures = collections.Counter()
+        start_factor = time.time()
+        L_obs = [observations_cholesky(factor_cache, j, Xsamples, sigma[j], l[j], noise[j], failures) for j in range(num_of_hyperSets)]
+        factor_time = time.time() - start_factor
+
+        seeds = npr.randint(2**31 - 1, size = num_of_hyperSets)
+        tasks = [(j, seeds[j], num_of_features, d, Xsamples, Ysamples, sigma[j], l[j], noise[j], initial_point, bnds, L_obs[j]) \
+                 for j in range(num_of_hyperSets) if L_obs[j] is not None]
+        if self._pool is None:
+            results = map(EP_for_hyperSet, tasks)
+        else:
+            results = self._pool.map(EP_for_hyperSet, tasks)
+
+        x_minimum = np.zeros((num_of_hyperSets, d))
+        K = np.zeros((num_of_hyperSets, size, size))
+        K_star_min = np.zeros((num_of_hyperSets, size))
+        K_plus_W_tilde_factor = np.empty(num_of_hyperSets, dtype = object)
+        m_f_minimum = np.zeros(num_of_hyperSets)
+        v_f_minimum = np.zeros(num_of_hyperSets)
+        c_and_m = np.zeros((num_of_hyperSets, size))
+        K_n_cholesky = np.empty(num_of_hyperSets, dtype = object)
+        valid = np.zeros(num_of_hyperSets, dtype = bool)
+        step_times = np.zeros(3)
+
+        for j, outputs, error, times in results:
+            step_times = step_times + times
+            if outputs is None:
+                failures[error] += 1
+                continue
+            x_minimum[j], K[j], K_star_min[j], K_plus_W_tilde_factor[j], m_f_minimum[j], v_f_minimum[j], c_and_m[j] = outputs
+            valid[j] = True
+
+        #The acquisition function uses the factor of K_n + noise*I, K_n already including the noise once
+        start_factor = time.time()
+        for j in np.nonzero(valid)[0]:
+            K_n_cholesky[j] = observations_cholesky(factor_cache, j, Xsamples, sigma[j], l[j], noise[j], failures, 'acquisition')
+            valid[j] = K_n_cholesky[j] is not None
+        factor_time = factor_time + time.time() - start_factor
+
+        timing = {'factorization': factor_time, 'sample_minimum': step_times[0], 'hessian': step_times[1], 'EP': step_times[2], \
+                  'wall': time.time() - start}
+        return EPStageResult(x_minimum, K, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m, K_n_cholesky, valid, \
+                             failures, timing)
+
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+
+#Function to return the lower Cholesky factor of the kernel matrix of the observations for the set of hyperparameters j, as in 
+#K_c (the noise and a jitter on the diagonal) or, for the 'acquisition', with the noise added once more. It returns None and 
+#counts the failure if the matrix is not positive definite.
+def observations_cholesky(factor_cache, j, Xsamples, sigma, l, noise, failures, name = 'observations'):
+    jitter = noise + sigma*10**(-10)
+    if name == 'acquisition':
+        jitter = jitter + noise
+    try:
+        return factor_cache.factor((j, name), Xsamples, sigma, l, jitter)
+    except np.linalg.LinAlgError as error:
+        failures['LinAlgError: ' + str(error)] += 1
+        return None
+
+
+
+#Function to print the number of failed samples, the failures and the timing breakdown of the stage
+#Parameters: @stage_result: the EPStageResult to report
+def report_EP_stage(stage_result):
+    num_of_hyperSets = len(stage_result.valid)
+    num_of_failures = num_of_hyperSets - int(np.sum(stage_result.valid))
+    timing = stage_result.timing
+    print('EP stage: ' + str(num_of_hyperSets - num_of_failures) + '/' + str(num_of_hyperSets) + ' hyperparameter sets succeeded, ' + \
+          'wall ' + '%.3f' % timing['wall'] + 's (factorizations ' + '%.3f' % timing['factorization'] + 's, sample minimum ' + \
+          '%.3f' % timing['sample_minimum'] + 's, hessian ' + \
+          '%.3f' % timing['hessian'] + 's, EP ' + '%.3f' % timing['EP'] + 's summed over the sets)')
+    for error, count in stage_result.failures.most_common():
+        print('    ' + str(count) + ' x ' + error)
@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.linalg as spla
 from PES.utilities import *
 from PES.compute_covariance import *
 
@@ -22,11 +23,11 @@ from PES.compute_covariance import *
 #            @l_vec: the lengthscale parameter of the squared exponential kernel
 #            @sigma: the variance parameter of the squared exponential kernel
 #            @noise: the white noise of the function, which is obtained from simulation
-#            @K: the same matrix defined in the Appendix section of the paper, which is the kernel matrix containing the 
-#                covariance evaluated on the stacked vector [z; c]. Here, it is one of the output of the Expectation_Propagation
-#                function
+#            @K_n_cholesky: the lower Cholesky factor of K_n + noise*I, K_n being the kernel matrix of the n observations (the 
+#                           upper-left block of K, the kernel matrix of [c; z] defined in the Appendix section of the paper)
 #            @K_star_min: K_star_min is the cross-covariance column evaluated between f(x_min) and [z; c]
-#            @K_plus_W_tilde_inverse: (K + W_tilde)^(-1), the same expression defined in the Appendix of the paper
+#            @K_plus_W_tilde_factor: the BlockCholesky factorization of (K + W_tilde), the same expression defined in the Appendix 
+#                                    of the paper. It is one of the output of the Expectation_Propagation function.
 #            @m_f_minimum: one of the two elements in the m_f vector defined in the paper. Note here, we compute the m_f vector 
 #                          elementwise. it is one of the output of the Expectation_Propagation function.
 #            @v_f_minimum: one of the elements in the V_f vector defined in the paper, which corresponds to the variance of the 
@@ -34,28 +35,32 @@ from PES.compute_covariance import *
 #            @c_and_m: the stack vector of c and m_tilde, [c; m_tilde]. It is one of the output of the Expectation_Propagation function.
 #            @num_of_hyperSets: the number of the samples of the hyperparameters of the squared exponential kernel. It is the M defined
 #            					in the paper. 
-def PES_aquisition_function_multi(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K, K_star_min,K_plus_W_tilde_inverse, m_f_minimum, v_f_minimum, c_and_m, num_of_hyperSets):
+#xPrime can also be an (n, d) array of points: the acquisition function is then evaluated at all of them at once, and the result
+#is an array of n values.
+def PES_aquisition_function_multi(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K_n_cholesky, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m, num_of_hyperSets):
     
-    objective = 0
-    count = 0
+    batched = np.ndim(xPrime) == 2
+    xPrime = np.reshape(xPrime, (-1, np.shape(Xsamples)[1]))
+
+    objective = np.zeros(len(xPrime))
+    count = np.zeros(len(xPrime))
     
     for i in range(num_of_hyperSets):
         try: 
-            new_objective, scalar_count = PES_aquisition_function(xPrime, Xsamples, x_minimum[i], l_vec[i], sigma[i], noise[i], \
-                                                K[i], K_star_min[i], K_plus_W_tilde_inverse[i], m_f_minimum[i], \
+            new_objective, scalar_count = PES_aquisition_function_batch(xPrime, Xsamples, x_minimum[i], l_vec[i], sigma[i], noise[i], \
+                                                K_n_cholesky[i], K_star_min[i], K_plus_W_tilde_factor[i], m_f_minimum[i], \
                                                 v_f_minimum[i], c_and_m[i])
-            if scalar_count < 10**(5):
-                objective = objective + new_objective
-                count = count + 1
+            #A point whose computation failed for this set of hyperparameters is averaged over the other sets only
+            valid = (scalar_count < 10**(5)) & np.isfinite(new_objective)
+            objective[valid] = objective[valid] + new_objective[valid]
+            count = count + valid
         except:
             pass
 
-    if count == 0:
-        objective = 10**(200)
-    else:
-        objective = objective/count
+    #10.0**200, a python int that large would make an array of objects
+    objective = np.where(count == 0, 10.0**(200), objective/np.maximum(count, 1))
     
-    return objective
+    return objective if batched else objective[0]
 
 
 
@@ -69,89 +74,78 @@ def PES_aquisition_function_multi(xPrime, Xsamples, x_minimum, l_vec, sigma, noi
 #            @l_vec: the lengthscale parameter of the squared exponential kernel
 #            @sigma: the variance parameter of the squared exponential kernel
 #            @noise: the white noise of the function, which is obtained from simulation
-#            @K: the same matrix defined in the Appendix section of the paper, which is the kernel matrix containing the 
-#                covariance evaluated on the stacked vector [z; c]. Here, it is one of the output of the Expectation_Propagation
-#                function
+#            @K_n_cholesky: the lower Cholesky factor of K_n + noise*I, K_n being the kernel matrix of the n observations (the 
+#                           upper-left block of K, the kernel matrix of [c; z] defined in the Appendix section of the paper)
 #            @K_star_min: K_star_min is the cross-covariance column evaluated between f(x_min) and [z; c]
-#            @K_plus_W_tilde_inverse: (K + W_tilde)^(-1), the same expression defined in the Appendix of the paper
+#            @K_plus_W_tilde_factor: the BlockCholesky factorization of (K + W_tilde), the same expression defined in the Appendix 
+#                                    of the paper. It is one of the output of the Expectation_Propagation function.
 #            @m_f_minimum: one of the two elements in the m_f vector defined in the paper. Note here, we compute the m_f vector 
 #                          elementwise. it is one of the output of the Expectation_Propagation function.
 #            @v_f_minimum: one of the elements in the V_f vector defined in the paper, which corresponds to the variance of the 
 #                          posterior distribution of f(x_min). It is one of the output of the Expectation_Propagation function.
 #            @c_and_m: the stack vector of c and m_tilde, [c; m_tilde]. It is one of the output of the Expectation_Propagation function.
-def PES_aquisition_function(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K, K_star_min,K_plus_W_tilde_inverse, m_f_minimum, v_f_minimum, c_and_m):
+def PES_aquisition_function(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K_n_cholesky, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m):
     
-    num_of_obser = len(Xsamples)
-    xPrime = np.array([xPrime])
-    #K_star is the cross-covariance column evaluated between f(x) and [c;z], its dimension is 1x(n+d+d*(d-1)/2 +d+1)
-    #with f(x_min) being the last element
-    K_star = compute_cov_xPrime_cz(xPrime, Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
+    objective, scalar_count = PES_aquisition_function_batch(np.reshape(xPrime, (1, -1)), Xsamples, x_minimum, l_vec, sigma, noise, \
+                                                            K_n_cholesky, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, \
+                                                            c_and_m)
+    return objective[0], scalar_count[0]
 
-    
-    #m_f_evaluated is the other element of the m_f vector
-    m_f_evaluated = np.dot(np.dot(K_star, K_plus_W_tilde_inverse), c_and_m)
-    #v_f_evaluated is one of the element of the V_f vector, which corresponds to the variance of the 
-    #posterior distribution of f(x)
-    v_f_evaluated = sigma - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), K_star.T)
 
 
-    # Compute the covariance between f(x) and f(x_min), its dimension is 1x1
-    cov_evaluated_minimum = K_star[-1]
 
-    #v_f_evaluated_minimum is one of the element of the V_f vector, which corresponds to the posterior covariance between the 
-    #f(x) and f(x_min)
-    v_f_evaluated_minimum = cov_evaluated_minimum - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), K_star_min.T)
-    
 
-    #This prevents v from being close to zero. 
-    scalar = 1 - 10**(-4)
-    v_too_small = True
+#This function is the unmarginalized version of the PES evaluated at the n rows of xPrime at once, with the same parameters as
+#PES_aquisition_function. The triangular solves with the factors of (K + W_tilde) and of the kernel matrix of the observations
+#are done for all the points at once. Returns the arrays of the n objectives and of the n scalar counts; the objective of the 
+#points where the computation breaks down (e.g. a negative variance) is not finite.
+def PES_aquisition_function_batch(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K_n_cholesky, K_star_min, K_plus_W_tilde_factor, m_f_minimum, v_f_minimum, c_and_m):
 
-    scalar_count = 0
-    
-    if (v_f_evaluated + v_f_minimum) < 10**(-10):
-        v = v_f_evaluated + v_f_minimum
-        
-    else:
-        while (v_too_small) and (scalar_count < (10**(9) + 5)):
-            v_too_small = False
+    num_of_obser = len(Xsamples)
+    #K_star is the cross-covariance between f(x) and [c;z], its dimension is nx(n+d+d*(d-1)/2 +d+1) with f(x_min) being the last column
+    K_star = compute_cov_xPrimes_cz(xPrime, Xsamples, x_minimum, sigma, l_vec)
+    #K_star (K + W_tilde)^(-1) [c_and_m, K_star_min, K_star^T] through triangular solves with the factor of (K + W_tilde)
+    a, r = K_plus_W_tilde_factor.whiten(K_star.T)
+    schur_r = K_plus_W_tilde_factor.schur_solve(r)
+    a_c_and_m, r_c_and_m = K_plus_W_tilde_factor.whiten(c_and_m[:, None])
+    a_min, r_min = K_plus_W_tilde_factor.whiten(K_star_min[:, None])
+
+    with np.errstate(all = 'ignore'):
+        m_f_evaluated = (np.dot(a.T, a_c_and_m) + np.dot(schur_r.T, r_c_and_m))[:, 0]
+        v_f_evaluated = sigma - np.sum(a * a, axis = 0) - np.sum(r * schur_r, axis = 0)
+        v_f_evaluated_minimum = K_star[:, -1] - (np.dot(a.T, a_min) + np.dot(schur_r.T, r_min))[:, 0]
+
+        #This prevents v from being close to zero. 
+        scalar = np.full(len(xPrime), 1 - 10**(-4))
+        scalar_count = np.zeros(len(xPrime), dtype = int)
+        v_too_small = (v_f_evaluated + v_f_minimum) >= 10**(-10)
+        while np.any(v_too_small):
+            scalar_count = scalar_count + v_too_small
             scaled_v = v_f_evaluated - 2*scalar*v_f_evaluated_minimum + v_f_minimum
-            if scaled_v < 10**(-10):
-                scalar = scalar**2
-                v_too_small = True
-            scalar_count = scalar_count + 1
-
-        v = v_f_evaluated - 2*scalar*v_f_evaluated_minimum + v_f_minimum
+            v_too_small = v_too_small & (scaled_v < 10**(-10))
+            scalar = np.where(v_too_small, scalar**2, scalar)
+            v_too_small = v_too_small & (scalar_count < 10**(9) + 5)
 
-    alpha = np.divide(m_f_evaluated - m_f_minimum, np.sqrt(v))
+        v = np.where(scalar_count == 0, v_f_evaluated + v_f_minimum, v_f_evaluated - 2*scalar*v_f_evaluated_minimum + v_f_minimum)
 
-    beta = (1/np.sqrt(2*np.pi))*np.exp(-0.5*alpha**2 - log_Phi(alpha))
+        alpha = np.divide(m_f_evaluated - m_f_minimum, np.sqrt(v))
 
+        beta = (1/np.sqrt(2*np.pi))*np.exp(-0.5*alpha**2 - log_Phi(alpha))
 
-    Vf_ccT_Vf = np.multiply(v_f_evaluated - v_f_evaluated_minimum, v_f_evaluated - v_f_evaluated_minimum)
-    beta_over_v = np.divide(beta, v)
+        Vf_ccT_Vf = np.multiply(v_f_evaluated - v_f_evaluated_minimum, v_f_evaluated - v_f_evaluated_minimum)
+        beta_over_v = np.divide(beta, v)
 
-    v_n_x_xmin = v_f_evaluated - np.multiply(np.multiply(beta_over_v, alpha + beta), Vf_ccT_Vf) + noise      
-    
-    
-    
-    #covariance matrix between n observations and n observations, dimension should be nxn
-    K_n = K[:len(Xsamples), :len(Xsamples)]
-
-    if len(xPrime) > 0:
-        #vector of covariance between x_to_be_evaluated and n observations, dimension should be 1xn
-        k_n_x = K_star[:len(Xsamples)]
-        v_n_x = noise + sigma*(1 + 10**(-10)) - np.dot(np.dot(k_n_x, compute_inverse(K_n + noise*np.eye(len(Xsamples)))), k_n_x.T)
-    else:
-        v_n_x = noise + sigma*(1 + 10**(-10))
+        v_n_x_xmin = v_f_evaluated - np.multiply(np.multiply(beta_over_v, alpha + beta), Vf_ccT_Vf) + noise
 
+        #covariance between the points to be evaluated and n observations, whitened by the factor of K_n + noise*I
+        k_n_x = spla.solve_triangular(K_n_cholesky, K_star[:, :num_of_obser].T, lower = True)
+        v_n_x = noise + sigma*(1 + 10**(-10)) - np.sum(k_n_x * k_n_x, axis = 0)
 
+        objective = 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x + noise)) - 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x_xmin + noise))
 
-    objective = 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x + noise)) - 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x_xmin + noise))
-    
     #since we use the scipy minimize later, here we put a negtive sign at the beginning
     objective = -objective
-    
+
     return objective, scalar_count
 
     
@@ -622,101 +622,128 @@ def cov_gradXprime_max(xPrime, value_at_max, sigma, l, m):
 
 
 
-#Compute the covariance between x and [c,z] with f(x_min) being the last element in [c, z]
-def compute_cov_xPrime_cz(xPrime, Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec):
-    x_nob = cov_xPrime_nObservations(xPrime, Xsamples, sigma, l_vec)
-    x_grad_min = cov_xPrime_maxGrad(xPrime, x_minimum, sigma, l_vec)
-    x_off_dia = cov_xPrime_nonDiaHess(xPrime, x_minimum, sigma, l_vec)
-    x_dia_hess = cov_xPrime_diaHess(xPrime, x_minimum, sigma, l_vec)
-    x_x_min = cov_xPrime_max(xPrime, x_minimum, sigma, l_vec)
-
-    result = np.concatenate((x_nob, x_grad_min, x_off_dia, x_dia_hess, x_x_min), axis = 1)
-    result = result[0]
-    return result
-    
-    
-    
+##################################################
+##################################################
+#Vectorized kernel blocks. The element-wise functions above are kept as the reference implementation; the functions
+#below build the same blocks at once with NumPy broadcasting, and are the ones used by EP and the acquisition function.
 
-#Compute the kernel matrix between z and z   
-def compute_K_z(x_minimum, sigma, l_vec, noise, d):
 
-    min_min = cov_max_max(x_minimum, sigma, noise, l_vec)
-    dia_min = cov_diaHess_max(x_minimum, sigma, l_vec)
-    dia_dia = cov_diaHess_diaHess(x_minimum, sigma, l_vec)
-    
-    first_row = np.concatenate((dia_dia, dia_min), axis = 1)
-    second_row = np.concatenate((dia_min.T, min_min), axis = 1)
-    
-    result = np.vstack((first_row, second_row))
-    result = result + sigma * (10**(-10))*np.eye(result.shape[0])
-    
-    return result
 
+#Compute, for every row x of X, the covariance between f(x) and f(y), the gradient of f at y and the hessian of f at y.
+#Returns k with shape (n,), grad with shape (n,d) (grad[i,m] = cov_x_devY(X[i], y, sigma, l, m)) and hess with shape
+#(n,d,d) (hess[i,m,n] = cov_x_devdevY(X[i], y, sigma, l, m, n)).
+def cov_points_derivatives(X, y, sigma, l):
+    X = np.atleast_2d(X)
+    l_squared = np.asarray(l, dtype=float)**2
+    scaled_diff = (X - y)/l_squared
+    k = sigma * np.exp(-0.5*np.sum((X - y)**2/l_squared, axis = 1))
+    grad = scaled_diff * k[:, None]
+    hess = (scaled_diff[:, :, None]*scaled_diff[:, None, :] - np.diag(1.0/l_squared)) * k[:, None, None]
+    return k, grad, hess
 
 
 
+#Compute the covariance between every row of X and every row of Y, the result has shape (len(X), len(Y))
+def cov_cross_points(X, Y, sigma, l):
+    l_squared = np.asarray(l, dtype=float)**2
+    diff = X[:, None, :] - Y[None, :, :]
+    return sigma * np.exp(-0.5*np.sum(diff**2/l_squared, axis = 2))
 
 
-#Compute the kernel matrix between c and c
-def compute_K_c(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec):
-    
+
+#Compute covariance matrix of n observations in d dimensions, same as covNobeservations
+def cov_observations(Xsamples, sigma, noise, l):
+    cov_matrix = cov_cross_points(Xsamples, Xsamples, sigma, l)
+    cov_matrix[np.diag_indices_from(cov_matrix)] += noise
+    return cov_matrix
+
+
+
+#Compute the blocks of the kernel matrix of [c; z], with c = [f(Xsamples), gradient at the minimum, off-diagonal hessian
+#at the minimum] and z = [diagonal hessian at the minimum, f(x_min)]. Returns K_c, K_cz and K_z, as compute_K_c,
+#compute_K_cz and compute_K_z.
+#All the derivatives of the blocks between quantities at the minimum are evaluated at zero distance, where the first
+#and third derivatives of the kernel vanish: those blocks only depend on sigma and the lengthscales.
+def compute_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec):
     d = len(x_minimum)
-    nob_nob = covNobeservations(Xsamples, num_of_obser, sigma, noise, l_vec)
-    nob_grad = cov_nObser_maxGrad(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
-    nob_off_dia = cov_nObser_off_maxHess(Xsamples, x_minimum, num_of_obser, sigma, l_vec)
-    grad_grad = cov_maxGrad_maxGrad(x_minimum, sigma, l_vec)
-    grad_off_hess = cov_maxGrad_off_maxHess(x_minimum, sigma, l_vec)
-    nonDia_nonDia = cov_nonDiaHess_nonDiaHess(x_minimum, sigma, l_vec)
-    
-    first_row = np.concatenate((np.concatenate((nob_nob, nob_grad), axis = 1), nob_off_dia), axis = 1 )
-    second_row = np.concatenate((np.concatenate((nob_grad.T, grad_grad), axis = 1), grad_off_hess), axis = 1 )
-    third_row = np.concatenate((np.concatenate((nob_off_dia.T, grad_off_hess.T), axis = 1), nonDia_nonDia), axis = 1 )
-    
-    result = np.vstack((first_row,second_row, third_row))
-    result = result + sigma * (10**(-10))*np.eye(result.shape[0])
+    n = len(Xsamples)
+    num_off_diagonal = int(d*(d-1)/2)
+    inverse_l_squared = 1.0/np.asarray(l_vec, dtype=float)**2
+    rows, cols = np.triu_indices(d, 1)
+
+    k, grad, hess = cov_points_derivatives(Xsamples, x_minimum, sigma, l_vec)
+
+    #c and c
+    nob_nob = cov_observations(Xsamples, sigma, noise, l_vec)
+    grad_grad = np.diag(sigma*inverse_l_squared)
+    nonDia_nonDia = np.diag(sigma*inverse_l_squared[rows]*inverse_l_squared[cols])
+    K_c = np.block([
+        [nob_nob, grad, hess[:, rows, cols]],
+        [grad.T, grad_grad, np.zeros((d, num_off_diagonal))],
+        [hess[:, rows, cols].T, np.zeros((num_off_diagonal, d)), nonDia_nonDia],
+    ])
+    K_c = K_c + sigma * (10**(-10))*np.eye(K_c.shape[0])
+
+    #c and z
+    K_cz = np.zeros((n + d + num_off_diagonal, d + 1))
+    K_cz[:n, :d] = np.diagonal(hess, axis1 = 1, axis2 = 2)
+    K_cz[:n, d] = k
+
+    #z and z
+    dia_dia = sigma*(np.outer(inverse_l_squared, inverse_l_squared) + 2*np.diag(inverse_l_squared**2))
+    dia_min = -sigma*inverse_l_squared[:, None]
+    K_z = np.block([
+        [dia_dia, dia_min],
+        [dia_min.T, np.array([[sigma + noise]])],
+    ])
+    K_z = K_z + sigma * (10**(-10))*np.eye(K_z.shape[0])
+
+    return K_c, K_cz, K_z
+
+
+
+
+#Compute the covariance between every row of xPrime and [c,z] with f(x_min) being the last element in [c, z], the result
+#has shape (len(xPrime), n+d+d*(d-1)/2+d+1)
+def compute_cov_xPrimes_cz(xPrime, Xsamples, x_minimum, sigma, l_vec):
+    xPrime = np.atleast_2d(xPrime)
+    rows, cols = np.triu_indices(len(x_minimum), 1)
+    x_nob = cov_cross_points(xPrime, Xsamples, sigma, l_vec)
+    k, grad, hess = cov_points_derivatives(xPrime, x_minimum, sigma, l_vec)
+
+    result = np.concatenate((x_nob, grad, hess[:, rows, cols], np.diagonal(hess, axis1 = 1, axis2 = 2), k[:, None]), axis = 1)
     return result
-    
 
 
 
+#Compute the covariance between x and [c,z] with f(x_min) being the last element in [c, z]
+def compute_cov_xPrime_cz(xPrime, Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec):
+    return compute_cov_xPrimes_cz(np.atleast_2d(xPrime)[:1], Xsamples, x_minimum, sigma, l_vec)[0]
+
+
+
+
+#Compute the kernel matrix between z and z
+def compute_K_z(x_minimum, sigma, l_vec, noise, d):
+    return compute_K_blocks(np.zeros((0, d)), x_minimum, sigma, noise, l_vec)[2]
+
+
+
+
+#Compute the kernel matrix between c and c
+def compute_K_c(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec):
+    return compute_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec)[0]
+
 
-    
 
 
-    
 #Compute cross covariance between c and z with last element being f(x_min)
 def compute_K_cz(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec):
-    d = len(x_minimum)
-     
-    #n Observations and diagonal hessian
-    nob_dia_hess = cov_nObser_diagonal_maxHess(Xsamples, x_minimum, num_of_obser, sigma, l_vec)
-        
-    #n Observations and minimum
-    nob_min = cov_nObser_max(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
-    
-    #gradient at minimum and diagonal hessian
-    grad_dia_hess = cov_maxGrad_diaHess(x_minimum, sigma, l_vec)
-    
-    #gradient at minimum and minimum
-    grad_min  = cov_maxGrad_max(x_minimum, sigma, l_vec)
-    
-    #non diagonal hessian and diagonal hessian
-    nonDia_dia = cov_nonDiaHess_diaHess(x_minimum, sigma, l_vec)
-    
-    #non diagonal hessian and minimum
-    off_hess_min = np.array([cov_nonDiaHess_max(x_minimum, sigma, l_vec)]).T
+    return compute_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec)[1]
+
 
-        
-    first_row = np.concatenate((nob_dia_hess, nob_min), axis = 1)
-    second_row = np.concatenate((grad_dia_hess, grad_min), axis = 1)
-    third_row = np.concatenate((nonDia_dia, off_hess_min), axis = 1)
-    
-    result = np.vstack((first_row, second_row, third_row))
-    return result
-    
 
 
-    
 #Use the results of K_Z, K_c and K_cz to compute the kernel matrix K. It is the same as K defined in the Appendix B.1
 def compute_K(K_z, K_c, K_cz):
     first_row = np.concatenate((K_c, K_cz), axis = 1)
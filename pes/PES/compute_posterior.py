@@ -1,4 +1,5 @@
 import numpy as np
+import scipy.linalg as spla
 from PES.compute_covariance import *
 
 
@@ -11,19 +12,19 @@ from PES.compute_covariance import *
 #Parameters: @xPrime: the input vector
 #            @X_nObservations: observations we have. Here it is the set of the past observations X_n plus the new sampled point.
 #            @value_of_nObservations: the function values of X_nObservations
-#            @K_plus_I_inverse: (K_n + I)^(-1)
+#            @K_plus_I_cholesky: the lower Cholesky factor of (K_n + I)
 #            @l: the lengthscale parameter of the squared exponential kernel
 #            @sigma: the variance parameter of the squared exponential kernel
 #            @num_of_hyperSets: the number of the samples of the hyperparameters of the squared exponential kernel. It is the M defined
 #                               in the paper. 
-def posterior_mean_given_nObservations(xPrime, X_nObservations, value_of_nObservations, K_plus_I_inverse, l, sigma, num_of_hyperSets):
+def posterior_mean_given_nObservations(xPrime, X_nObservations, value_of_nObservations, K_plus_I_cholesky, l, sigma, num_of_hyperSets):
     f = 0
     xPrime = np.array([xPrime])
     for i in range(num_of_hyperSets):
         #the cross-variance between x and n observations, dimension should be 1xn
         k_n_x = cov_xPrime_nObservations(xPrime, X_nObservations, sigma[i], l[i])
         #value_of_nObservations should have dimension nx1, the dimension of f should be 1x1
-        temp_mean = np.dot(np.dot(k_n_x, K_plus_I_inverse[i]), value_of_nObservations)
+        temp_mean = np.dot(k_n_x, spla.cho_solve((K_plus_I_cholesky[i], True), value_of_nObservations))
         f = f + temp_mean[0,0]
         
     f = f/num_of_hyperSets
@@ -39,13 +40,13 @@ def posterior_mean_given_nObservations(xPrime, X_nObservations, value_of_nObserv
 #Parameters: @xPrime: the input vector
 #            @X_nObservations: observations we have. Here it is the set of the past observations X_n plus the new sampled point.
 #            @value_of_nObservations: the function values of X_nObservations
-#            @K_plus_I_inverse: (K_n + I)^(-1)
+#            @K_plus_I_cholesky: the lower Cholesky factor of (K_n + I)
 #            @l: the lengthscale parameter of the squared exponential kernel
 #            @sigma: the variance parameter of the squared exponential kernel
 #            @num_of_hyperSets: the number of the samples of the hyperparameters of the squared exponential kernel. It is the M defined
 #                               in the paper. 
 #            @the dimensions of the objective function
-def posterior_gradient_given_nObservations(xPrime, X_nObservations, value_of_nObservations, K_plus_I_inverse, l, sigma, num_of_hyperSets, d):
+def posterior_gradient_given_nObservations(xPrime, X_nObservations, value_of_nObservations, K_plus_I_cholesky, l, sigma, num_of_hyperSets, d):
     
     gradient = np.zeros((d))
     num_of_obser = len(X_nObservations)
@@ -64,7 +65,7 @@ def posterior_gradient_given_nObservations(xPrime, X_nObservations, value_of_nOb
         dx_k_n_x = -np.multiply(np.multiply(n_l, n_x - X_nObservations), k_n_x_d_copies)
         
         #dimension should be dx1
-        new_grad = np.dot(np.dot(dx_k_n_x.T, K_plus_I_inverse[i]), value_of_nObservations)
+        new_grad = np.dot(dx_k_n_x.T, spla.cho_solve((K_plus_I_cholesky[i], True), value_of_nObservations))
         new_grad = new_grad.T
         new_grad = new_grad[0]
         gradient = gradient + new_grad
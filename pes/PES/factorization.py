@@ -0,0 +1,125 @@
+import numpy as np
+import scipy.linalg as spla
+from PES.compute_covariance import *
+
+
+
+#This file includes the factorizations used in place of explicit inverses of the kernel matrices: the Cholesky factors of the 
+#kernel matrices of the observations, cached across the PES iterations, and the block factorization of the kernel matrices of 
+#[c; z] built on top of them.
+
+
+
+#Factorization of the symmetric matrix M = [[A, B], [B^T, C]] given the lower Cholesky factor L11 of A, through the Schur 
+#complement S = C - B^T A^(-1) B. S is factored with Cholesky if it is positive definite, with LU otherwise (e.g. for negative 
+#EP site variances in C).
+#Parameters: @L11: lower Cholesky factor of A
+#            @B: the off-diagonal block
+#            @C: the lower-right block
+class BlockCholesky:
+
+    def __init__(self, L11, B, C):
+        self.L11 = L11
+        self.Q = spla.solve_triangular(L11, B, lower = True)
+        S = C - np.dot(self.Q.T, self.Q)
+        try:
+            self.schur_cholesky = spla.cho_factor(S, lower = True)
+            self.schur_lu = None
+        except np.linalg.LinAlgError:
+            self.schur_cholesky = None
+            self.schur_lu = spla.lu_factor(S)
+
+    @property
+    def size(self):
+        return self.L11.shape[0] + self.Q.shape[1]
+
+    #Function to split the rows of U as [U_1; U_2] and return a = L11^(-1) U_1 and r = U_2 - B^T A^(-1) U_1. For any U and V:
+    #U^T M^(-1) V = a_U^T a_V + r_U^T S^(-1) r_V
+    def whiten(self, U):
+        n = self.L11.shape[0]
+        a = spla.solve_triangular(self.L11, U[:n], lower = True)
+        r = U[n:] - np.dot(self.Q.T, a)
+        return a, r
+
+    #Function to compute S^(-1) r
+    def schur_solve(self, r):
+        if self.schur_cholesky is not None:
+            return spla.cho_solve(self.schur_cholesky, r)
+        return spla.lu_solve(self.schur_lu, r)
+
+    #Function to compute M^(-1) U
+    def solve(self, U):
+        a, r = self.whiten(U)
+        x_2 = self.schur_solve(r)
+        x_1 = spla.solve_triangular(self.L11, a - np.dot(self.Q, x_2), lower = True, trans = 'T')
+        return np.concatenate((x_1, x_2), axis = 0)
+
+    #Function to compute U^T M^(-1) V
+    def inner(self, U, V):
+        a_U, r_U = self.whiten(U)
+        a_V, r_V = self.whiten(V)
+        return np.dot(a_U.T, a_V) + np.dot(r_U.T, self.schur_solve(r_V))
+
+    #Function to return the lower Cholesky factor of M, only available if S was factored with Cholesky
+    def lower(self):
+        if self.schur_cholesky is None:
+            raise np.linalg.LinAlgError('The Schur complement is not positive definite')
+        n = self.L11.shape[0]
+        L = np.zeros((self.size, self.size))
+        L[:n, :n] = self.L11
+        L[n:, :n] = self.Q.T
+        L[n:, n:] = np.tril(self.schur_cholesky[0])
+        return L
+
+
+
+#Cache of the lower Cholesky factors of the kernel matrices of the observations k(Xsamples, Xsamples) + jitter*I, keyed by the 
+#index of the set of hyperparameters (and by a name, for the different jitters). A factor is reused if the hyperparameters are 
+#unchanged and the observations only had rows appended: the factor is then extended with the new rows instead of recomputed.
+#In run_PES the hyperparameters are sampled again after every new observation, so the factors are not extended there: the only
+#reuse is the factor of the posterior-mean step, found again by the EP stage of the next iteration. The block append only pays 
+#off when new observations are added while the hyperparameters are held fixed.
+class CholeskyCache:
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.appends = 0
+        self.misses = 0
+
+    #Function to return the lower Cholesky factor of k(Xsamples, Xsamples) + jitter*I
+    #Parameters: @key: the index of the set of hyperparameters, or a tuple (index, name)
+    #            @Xsamples: observations we have
+    #            @sigma, l: the parameters of the squared exponential kernel
+    #            @jitter: the value added to the diagonal (e.g. the noise)
+    def factor(self, key, Xsamples, sigma, l, jitter):
+        hyperparameters = np.concatenate(([sigma, jitter], np.ravel(l)))
+        entry = self._entries.get(key)
+        n = len(Xsamples)
+        if entry is not None and np.array_equal(entry['hyperparameters'], hyperparameters) and len(entry['Xsamples']) <= n \
+           and np.array_equal(entry['Xsamples'], Xsamples[:len(entry['Xsamples'])]):
+            n_old = len(entry['Xsamples'])
+            if n_old == n:
+                self.hits = self.hits + 1
+                return entry['L']
+            L = self._append(entry['L'], entry['Xsamples'], Xsamples[n_old:], sigma, l, jitter)
+            self.appends = self.appends + 1
+        else:
+            L = spla.cholesky(cov_cross_points(Xsamples, Xsamples, sigma, l) + jitter*np.eye(n), lower = True)
+            self.misses = self.misses + 1
+        self._entries[key] = {'hyperparameters': hyperparameters, 'Xsamples': np.array(Xsamples), 'L': L}
+        return L
+
+    #Function to extend the factor L of the observations X_old with the new observations X_new
+    def _append(self, L, X_old, X_new, sigma, l, jitter):
+        n_old = len(X_old)
+        n_new = len(X_new)
+        B = cov_cross_points(X_old, X_new, sigma, l)
+        C = cov_cross_points(X_new, X_new, sigma, l) + jitter*np.eye(n_new)
+        L_21 = spla.solve_triangular(L, B, lower = True).T
+        L_22 = spla.cholesky(C - np.dot(L_21, L_21.T), lower = True)
+        result = np.zeros((n_old + n_new, n_old + n_new))
+        result[:n_old, :n_old] = L
+        result[n_old:, :n_old] = L_21
+        result[n_old:, n_old:] = L_22
+        return result
@@ -21,7 +21,9 @@ import scipy.optimize as spo
 #                              choose any method specified in the scipy.optimize.minimize     
 #            @maxiter: maximum iterations of scipy.optimize.minimize     
 #            @bnds: the bounds of the domain
-def global_optimization(function_to_optimize, d,x_min, x_max, gradient = None, gridsize = 500, stored_min_guesses = None, using_grid = True, optimize_method = 'L-BFGS-B', maxiter = 1000, bnds = None):
+#            @vectorized: whether function_to_optimize also accepts an (n, d) array of points and returns the n values. If true, the 
+#                         grid is evaluated with a single call.
+def global_optimization(function_to_optimize, d,x_min, x_max, gradient = None, gridsize = 500, stored_min_guesses = None, using_grid = True, optimize_method = 'L-BFGS-B', maxiter = 1000, bnds = None, vectorized = False):
     
     
     if (using_grid is False) and (stored_min_guesses is None):
@@ -51,8 +53,16 @@ def global_optimization(function_to_optimize, d,x_min, x_max, gradient = None, g
     grid_function_values = []
     
 
+    #Evaluate input function at all the grid points at once, the grid is evaluated point by point if it fails
+    if vectorized:
+        try:
+            grid_function_values = list(function_to_optimize(np.reshape(grid, (len(grid), d))))
+        except:
+            grid_function_values = []
+            print('vectorized grid evaluation error')
+
     #Evaluate input function at grid points
-    for i in range(len(grid)):
+    for i in range(len(grid) if len(grid_function_values) == 0 else 0):
         if d == 1:
             try:
                 grid_function_values.append(function_to_optimize(grid[i,0]))
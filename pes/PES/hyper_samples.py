@@ -1,5 +1,6 @@
 import GPy
 import numpy as np
+from PES.utilities import chain_lengths, effective_sample_size
 
 
 #This function includes functions to draw samples from the posterior distribution of the hyperparameters. Here we use Gpy packakge 
@@ -113,7 +114,34 @@ def sample_hypers_hmc(X_nObservations, value_of_observations, d, initial_value_o
     return m_kern_noise_M, m_kern_lengthscale_M, m_kern_variance_M
 
 
-#The wrapper of the two sampling function.
+#State of the Metropolis-Hastings chains of sample_hypers_mcmc_chain, kept across the PES iterations to warm start the chains
+#from where the previous iteration stopped. After each call it also holds the effective sample size of the samples drawn.
+class MCMCChainState:
+
+    def __init__(self):
+        #last accepted point (GPy optimizer_array) of each chain, None before the first call
+        self.positions = None
+        #covariance and scale of the proposal
+        self.cov = None
+        self.scale = None
+        #effective sample size of each hyperparameter (variance, lengthscales, noise) in the last call
+        self.ess = None
+        self.num_of_samples = 0
+
+    #Function to print the effective sample size of the last samples, to help choosing the thinning
+    def report(self):
+        if self.ess is None:
+            return
+        print('Hyperparameter samples: ' + str(self.num_of_samples) + ', effective sample size min ' + '%.1f' % np.min(self.ess) + \
+              ', per hyperparameter (variance, lengthscales, noise): ' + ', '.join('%.1f' % value for value in self.ess))
+
+
+
+
+#Function to sample the posterior distribution of the hyperparameters with one burn-in and thinned samples of long Metropolis-
+#Hastings chains, instead of a new chain per sample as in sample_hypers_mcmc: it takes number_burn*3 + num_of_set_hyper*thinning 
+#steps instead of num_of_set_hyper*(number_burn + num_of_set_hyper)*3. If chain_state holds the chains of a previous call, they 
+#are continued from their last point with the shorter burn-in number_burn_warm.
 #Parameters: @X_nObservations: observations we have, which is the X_n
 #            @value_of_observations: the function values of the observations
 #            @d: the dimensions of the objective function
@@ -121,15 +149,111 @@ def sample_hypers_hmc(X_nObservations, value_of_observations, d, initial_value_o
 #            @num_of_set_hyper: the number of the samples of the hyperparameters of the kernel we want to draw. It is the M defined
 #                               in the paper. 
 #            @number_burn: number of burnins
-#            @sample_method: the method used to sample the posterior distribution of the hyperparameters. User can choose 'mcmc' or 'hmc'.
-def sample_hypers(X_nObservations, value_of_observations, d, initial_value_of_l = None, num_of_set_hyper = 100, number_burn = 50, sample_method = 'mcmc', seed = None):
-    if sample_method is 'mcmc':
+#            @thinning: number of steps of a chain between two samples
+#            @num_of_chains: number of independent chains the samples are split among
+#            @chain_state: MCMCChainState used to warm start the chains and to store their state, None to always start anew
+#            @number_burn_warm: number of burnins of the warm started chains
+def sample_hypers_mcmc_chain(X_nObservations, value_of_observations, d, initial_value_of_l = None, num_of_set_hyper = 100, number_burn = 50, \
+                             thinning = 3, num_of_chains = 1, chain_state = None, number_burn_warm = 5, seed = None):
+
+    if seed is not None:
+        np.random.seed(seed)
+    
+    if initial_value_of_l is None:
+        lengthscale = 0.3 * np.ones((d))
+    else:
+        lengthscale = initial_value_of_l * np.ones((d))
+
+
+    k = GPy.kern.RBF(input_dim = d, lengthscale = lengthscale, ARD = True)
+    m = GPy.models.GPRegression(X_nObservations, value_of_observations, k)
+
+    # Give some general prior distributions for model parameters
+    m.kern.lengthscale.set_prior(GPy.priors.Gamma(2.5, 5.0))
+    m.kern.variance.set_prior(GPy.priors.Gamma(1.0,1.0))
+    m.likelihood.variance.set_prior(GPy.priors.Gamma(1.0,1.0))   
+
+    warm = chain_state is not None and chain_state.positions is not None
+    if warm:
+        positions = chain_state.positions
+        burn = number_burn_warm*3
+    else:
+        positions = [m.optimizer_array.copy() for _ in range(num_of_chains)]
+        burn = number_burn*3
+
+    samples = []
+    chain_points = []
+    ess = 0
+    new_positions = []
+    for start, (num_of_samples, num_of_steps) in zip(positions, chain_lengths(num_of_set_hyper, len(positions), burn, thinning)):
+        if num_of_samples == 0:
+            new_positions.append(start)
+            continue
+        m.optimizer_array = start
+        mcmc = GPy.inference.mcmc.Metropolis_Hastings(m, cov = chain_state.cov if warm else None)
+        if warm:
+            mcmc.scale = chain_state.scale
+        #The chain stores its point every thinning steps after the burn-in
+        mcmc.sample(Ntotal = num_of_steps, Nburn = burn, Nthin = thinning, tune = False)
+        chain = mcmc.chains[-1][-num_of_samples:]
+        new_positions.append(np.array(chain[-1]))
+        chain_points.extend(chain)
+
+        #The chain holds the transformed parameters of the optimizer, the model gives the hyperparameters
+        chain_params = []
+        for point in chain:
+            m.optimizer_array = point
+            chain_params.append(m.param_array.copy())
+        samples.extend(chain_params)
+        ess = ess + effective_sample_size(chain_params)
+
+    if chain_state is not None:
+        chain_state.positions = new_positions
+        #The next chains propose with the covariance of the samples, once there are enough of them to estimate it
+        chain_points = np.array(chain_points)
+        if len(chain_points) > 2*chain_points.shape[1]:
+            chain_state.cov = np.cov(chain_points.T) + 10**(-8)*np.eye(chain_points.shape[1])
+        chain_state.scale = mcmc.scale
+        chain_state.ess = ess
+        chain_state.num_of_samples = len(samples)
+
+    #Store num_of_set_hyper number of hyper parameters, ordered as in sample_hypers_hmc
+    samples = np.array(samples)
+    m_kern_variance_M = samples[:, 0]
+    m_kern_lengthscale_M = samples[:, 1:-1]
+    m_noise_M = samples[:, -1]
+
+    return m_noise_M, m_kern_lengthscale_M, m_kern_variance_M
+
+
+
+
+#The wrapper of the sampling functions.
+#Parameters: @X_nObservations: observations we have, which is the X_n
+#            @value_of_observations: the function values of the observations
+#            @d: the dimensions of the objective function
+#            @initial_value_of_l: the initial value of l to begin with simulations
+#            @num_of_set_hyper: the number of the samples of the hyperparameters of the kernel we want to draw. It is the M defined
+#                               in the paper. 
+#            @number_burn: number of burnins
+#            @sample_method: the method used to sample the posterior distribution of the hyperparameters. User can choose 'mcmc', 
+#                            'mcmc_chain' (thinned samples of a single chain, see sample_hypers_mcmc_chain) or 'hmc'.
+#            @thinning: number of steps between two samples of the 'mcmc_chain' method
+#            @chain_state: MCMCChainState to warm start the chains of the 'mcmc_chain' method across calls
+#            @num_of_chains: number of independent chains of the 'mcmc_chain' method
+def sample_hypers(X_nObservations, value_of_observations, d, initial_value_of_l = None, num_of_set_hyper = 100, number_burn = 50, sample_method = 'mcmc', seed = None, \
+                  thinning = 3, chain_state = None, num_of_chains = 1):
+    if sample_method == 'mcmc':
         noise, l, sigma = sample_hypers_mcmc(X_nObservations, value_of_observations, d, initial_value_of_l, num_of_set_hyper, number_burn)
         return noise, l, sigma
-    elif sample_method is 'hmc':
+    elif sample_method == 'mcmc_chain':
+        noise, l, sigma = sample_hypers_mcmc_chain(X_nObservations, value_of_observations, d, initial_value_of_l, num_of_set_hyper, number_burn, \
+                                                   thinning, num_of_chains, chain_state)
+        return noise, l, sigma
+    elif sample_method == 'hmc':
         print('enter hmc')
         noise, l, sigma = sample_hypers_hmc(X_nObservations, value_of_observations, d, initial_value_of_l, num_of_set_hyper, number_burn)
         return noise, l, sigma
     else:
-        print('Sample method is not available. Please choose between mcmc and hmc.')
+        print('Sample method is not available. Please choose among mcmc, mcmc_chain and hmc.')
         return None
\ No newline at end of file
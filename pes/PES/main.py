@@ -12,6 +12,7 @@ from PES.sample_minimum import *
 from PES.PES import *
 from PES.compute_posterior import *
 from PES.EP import *
+from PES.EP_stage import *
 from PES.global_optimization import *
 from PES.target_function import *
 
@@ -28,7 +29,7 @@ from PES.target_function import *
 #                                            It is the M defined in the paper.
 #            @number_of_burnin: number of burnins
 #            @sampling_method: the method used to sample the posterior distribution of the hyperparameters. User can choose 
-#                              'mcmc' or 'hmc'.
+#                              'mcmc', 'mcmc_chain' or 'hmc'.
 #            @number_of_initial_points: the number of samples we want to use as initial observations
 #            @number_of_experiments: number of experiments we want to run. For each experiment, we use different randomizations 
 #                                    for starting points.
@@ -37,9 +38,30 @@ from PES.target_function import *
 #            @optimization_method: optimization method used when calling global_optimization function. User can choose any method 
 #                                  specified in the scipy.optimize.minimize 
 #            @seed: seed specified for randomization
+#            @EP_executor: how the minimum sampling and the EP of the hyperparameter sets are run: None (serially), 'thread' or 
+#                          'process' (on a pool of threads or processes)
+#            @EP_num_of_workers: the number of threads/processes of the pool, by default the number of cpus
+#            @thinning: for the 'mcmc_chain' sampling method, the number of steps of the chain between two samples. The chain is 
+#                       continued across the iterations, and the effective sample size of the samples is printed to tune it.
+#            @num_of_chains: for the 'mcmc_chain' sampling method, the number of independent chains the samples are split among
 def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperparameter_sets = 100, number_of_burnin = 50, \
             sampling_method = 'mcmc', number_of_initial_points = 3, number_of_experiments = 1, number_of_iterations = 60, \
-            number_of_features = 1000, optimization_method = 'SLSQP', seed = None): 
+            number_of_features = 1000, optimization_method = 'SLSQP', seed = None, EP_executor = None, EP_num_of_workers = None, \
+            thinning = 3, num_of_chains = 1): 
+
+    EP_stage = EPStage(EP_executor, EP_num_of_workers)
+    try:
+        return _run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperparameter_sets, number_of_burnin, \
+                        sampling_method, number_of_initial_points, number_of_experiments, number_of_iterations, \
+                        number_of_features, optimization_method, seed, EP_stage, thinning, num_of_chains)
+    finally:
+        EP_stage.close()
+
+
+
+def _run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperparameter_sets, number_of_burnin, sampling_method, \
+             number_of_initial_points, number_of_experiments, number_of_iterations, number_of_features, optimization_method, seed, \
+             EP_stage, thinning, num_of_chains):
 
     warnings.filterwarnings('ignore')
     check_result_file_exist()
@@ -99,8 +121,13 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
 
 
         #We sample from the posterior distribution of the hyper-parameters
+        hyper_chain_state = MCMCChainState()
+        #Cholesky factors of the kernel matrices of the observations, by set of hyperparameters. The hyperparameters change with
+        #every new observation, so a factor is only reused from the posterior-mean step by the next EP stage (see CholeskyCache)
+        factor_cache = CholeskyCache()
         with hide_prints():
-            noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed)
+            noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed, \
+                                            thinning, hyper_chain_state, num_of_chains)
 
             
 
@@ -123,44 +150,15 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
             initial_point = guesses[-1,:]
 
             num_of_features = number_of_features
-            num_of_obser = len(Ysamples)
-            x_minimum_vec = []
-            K_vec = []
-            K_star_min_vec = []
-            K_plus_W_tilde_inverse_vec = []
-            m_f_minimum_vec = []
-            v_f_minimum_vec = []
-            c_and_m_vec = []
-            opt_method = 'L-BFGS-B'
 
             warnings.filterwarnings("error")
-            valid_num_hyperSets = 0
-
-            for j in range(num_of_hyperSets):
-                opt_method = 'L-BFGS-B'
-                try:
-                    result = sample_min_with_randFeatures(num_of_features, d, Xsamples, Ysamples, sigma[j], l[j], noise[j], initial_point, opt_method, False, bnds)
-                    x_minimum = result.x
-                    x_minimum_vec.append(x_minimum)
-                    if opt_method == 'L-BFGS-B':
-                        hess_at_min_inverse = result.hess_inv.todense()
-                    else:
-                        hess_at_min_inverse = result.hess_inv
-                    hess_at_min = compute_inverse(hess_at_min_inverse)  
-
-                    value_of_nObservations = (Ysamples.T)[0]
-                    K, K_star_min, K_plus_W_tilde_inverse, m_f_minimum, v_f_minimum, c_and_m = Expectation_Propagation(Xsamples, value_of_nObservations, num_of_obser, x_minimum, d, l[j,:], sigma[j], noise[j], hess_at_min)
-                    K_vec.append(K)
-                    K_star_min_vec.append(K_star_min)
-                    K_plus_W_tilde_inverse_vec.append(K_plus_W_tilde_inverse)
-                    m_f_minimum_vec.append(m_f_minimum)
-                    v_f_minimum_vec.append(v_f_minimum)
-                    c_and_m_vec.append(c_and_m)
-                    valid_num_hyperSets = valid_num_hyperSets + 1
-                except:
-                    pass
-
-            num_of_hyperSets = valid_num_hyperSets
+
+            #Sample the minimum and run the EP for every set of hyperparameters, the failed sets are left out
+            stage_result = EP_stage.run(num_of_features, d, Xsamples, Ysamples, sigma, l, noise, initial_point, bnds, factor_cache)
+            report_EP_stage(stage_result)
+            valid = stage_result.valid
+
+            num_of_hyperSets = int(np.sum(valid))
 
             opt_method = optimization_method 
 
@@ -170,14 +168,16 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
 
             try:
 
-                PES = functools.partial(PES_aquisition_function_multi, Xsamples = Xsamples, x_minimum = x_minimum_vec, l_vec = l, \
-                                        sigma = sigma, noise = noise, K = K_vec, K_star_min = K_star_min_vec, \
-                                         K_plus_W_tilde_inverse = K_plus_W_tilde_inverse_vec, \
-                                         m_f_minimum = m_f_minimum_vec, v_f_minimum = v_f_minimum_vec, c_and_m = c_and_m_vec, \
-                                         num_of_hyperSets = num_of_hyperSets)
+                PES = functools.partial(PES_aquisition_function_multi, Xsamples = Xsamples, x_minimum = stage_result.x_minimum[valid], \
+                                        l_vec = l[valid], sigma = sigma[valid], noise = noise[valid], \
+                                        K_n_cholesky = stage_result.K_n_cholesky[valid], K_star_min = stage_result.K_star_min[valid], \
+                                        K_plus_W_tilde_factor = stage_result.K_plus_W_tilde_factor[valid], \
+                                        m_f_minimum = stage_result.m_f_minimum[valid], v_f_minimum = stage_result.v_f_minimum[valid], \
+                                        c_and_m = stage_result.c_and_m[valid], num_of_hyperSets = num_of_hyperSets)
 
                 ret = global_optimization(PES, d, x_min, x_max, gradient = None, gridsize = 500, stored_min_guesses = None, \
-                                          using_grid = True, optimize_method = opt_method, maxiter = 2000, bnds = bnds)
+                                          using_grid = True, optimize_method = opt_method, maxiter = 2000, bnds = bnds, \
+                                          vectorized = True)
 
 
                 optimum = np.array(ret.x)
@@ -191,7 +191,8 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
             if PES_fail:
                 warnings.filterwarnings('ignore')
                 with hide_prints():
-                    noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed)
+                    noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed, \
+                                                    thinning, hyper_chain_state, num_of_chains)
 
                 print('return back due to PES fail')
                 continue
@@ -211,7 +212,8 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
             num_of_hyperSets = num_of_hyperSets_initial
             try:
                 with hide_prints():
-                    noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed)
+                    noise, l, sigma = sample_hypers(Xsamples, Ysamples, d, 0.3, num_of_hyperSets_initial, number_burn, sample_method, seed, \
+                                                    thinning, hyper_chain_state, num_of_chains)
 
             except:
                 if len(Xsamples) > Xsamples_count_before:
@@ -223,29 +225,27 @@ def run_PES(target_function, x_minimum, x_maximum, dimension, number_of_hyperpar
 
             end_2 = time.time()
             print('Retraining the model takes '+ str(end_2 - start_2) + ' seconds')
+            hyper_chain_state.report()
                 
             write_data_to_file("Xsamples.txt", optimum)
             write_data_to_file("Ysamples.txt", optimum_value)
 
 
             start_3 = time.time()
-            K_plus_I_inverse_vec = []
-            num_of_obser = len(Xsamples)
-
-            for w in range(num_of_hyperSets):
-                K_plus_I_inverse = covNobeservations(Xsamples, num_of_obser, sigma[w], noise[w], l[w]) + sigma[w]*10**(-10)*np.eye((num_of_obser))
-                K_plus_I_inverse_vec.append(np.array(K_plus_I_inverse))
-
             warnings.filterwarnings("error")
             try: 
 
+                #The same factors are used by the EP stage of the next iteration
+                K_plus_I_cholesky_vec = [factor_cache.factor((w, 'observations'), Xsamples, sigma[w], l[w], noise[w] + sigma[w]*10**(-10)) \
+                                         for w in range(num_of_hyperSets)]
+
                 pos_mean_function = functools.partial(posterior_mean_given_nObservations, X_nObservations = Xsamples, value_of_nObservations = Ysamples, \
-                                                K_plus_I_inverse = K_plus_I_inverse_vec, l = l, sigma = sigma, \
+                                                K_plus_I_cholesky = K_plus_I_cholesky_vec, l = l, sigma = sigma, \
                                                 num_of_hyperSets = num_of_hyperSets)
 
 
                 pos_mean_grad_function = functools.partial(posterior_gradient_given_nObservations, X_nObservations = Xsamples, value_of_nObservations = Ysamples, \
-                                                K_plus_I_inverse = K_plus_I_inverse_vec, l = l, sigma = sigma, \
+                                                K_plus_I_cholesky = K_plus_I_cholesky_vec, l = l, sigma = sigma, \
                                                 num_of_hyperSets = num_of_hyperSets, d = d)
 
                 ret_pos = global_optimization(pos_mean_function, d, x_min, x_max, gradient = pos_mean_grad_function, gridsize = 500, \
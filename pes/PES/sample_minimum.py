@@ -20,11 +20,16 @@ from PES.utilities import *
 #			 				 posterior distribution 
 #			 @optimize_method: method used to optimize the approximate posterior distribution. User can 
 #			 				   choose any method specified in the scipy.optimize.minimize     
-def sample_min_with_randFeatures(num_features, d, nObservations, value_of_nObservations, alpha, l, noise, initial_point, optimize_method = 'L-BFGS-B', maximize = False, bnds = None):
+#			 @random_state: the numpy.random.RandomState used to draw the features and theta. By default, the global
+#			 				numpy random generator
+def sample_min_with_randFeatures(num_features, d, nObservations, value_of_nObservations, alpha, l, noise, initial_point, optimize_method = 'L-BFGS-B', maximize = False, bnds = None, random_state = None):
     
+    if random_state is None:
+        random_state = npr
+
     l = np.array([l, ]*num_features)
-    W = np.divide(npr.randn(num_features, d), l)
-    b = 2*np.pi*npr.uniform(0,1,num_features)
+    W = np.divide(random_state.randn(num_features, d), l)
+    b = 2*np.pi*random_state.uniform(0,1,num_features)
     num_of_nObservations = len(nObservations)
     b_for_nObservations = np.array([b,]*num_of_nObservations).T
 
@@ -40,7 +45,7 @@ def sample_min_with_randFeatures(num_features, d, nObservations, value_of_nObser
     mean_of_post_theta = np.squeeze(np.asarray(mean_of_post_theta))
     variance_of_post_theta = A_inverse
 
-    sample_of_theta = npr.multivariate_normal(mean_of_post_theta, variance_of_post_theta)
+    sample_of_theta = random_state.multivariate_normal(mean_of_post_theta, variance_of_post_theta)
     
     
     def function_to_optimize(x):
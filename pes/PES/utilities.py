@@ -10,13 +10,7 @@ import sys
 #Parameters: @x
 def log_Phi(x):
     if isinstance(x, np.ndarray):
-        result = []
-        for value in x:
-            if value > 5:
-                result.append(-sps.norm.sf(value))
-            else:
-                result.append(sps.norm.logcdf(value))
-        result = np.array(result)
+        result = np.where(x > 5, -sps.norm.sf(x), sps.norm.logcdf(x))
     else:
         if x > 5:
             result = -sps.norm.sf(x)
@@ -142,4 +136,49 @@ class hide_prints:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stdout.close()
-        sys.stdout = self._original_stdout
\ No newline at end of file
+        sys.stdout = self._original_stdout
+
+
+
+#Function to compute the effective sample size of each column of the samples of one chain. It uses the initial positive sequence 
+#estimator of the integrated autocorrelation time (sum of the autocorrelations, stopped at the first negative sum of two 
+#consecutive lags).
+#Parameters: @samples: (number of samples, number of parameters) samples of the chain
+def effective_sample_size(samples):
+    samples = np.asarray(samples, dtype = float)
+    n = samples.shape[0]
+    if n < 4:
+        return np.full(samples.shape[1], float(n))
+
+    centered = samples - np.mean(samples, axis = 0)
+    #Autocorrelation of each column through the FFT, zero-padded to avoid the circular correlation
+    f = np.fft.rfft(centered, n = 2*n, axis = 0)
+    autocov = np.fft.irfft(f * np.conjugate(f), axis = 0)[:n] / n
+
+    ess = np.zeros(samples.shape[1])
+    for j in range(samples.shape[1]):
+        if autocov[0, j] <= 0:
+            ess[j] = n
+            continue
+        rho = autocov[:, j] / autocov[0, j]
+        pairs = rho[:n - n % 2].reshape(-1, 2).sum(axis = 1)
+        negative = np.nonzero(pairs < 0)[0]
+        num_pairs = negative[0] if len(negative) > 0 else len(pairs)
+        tau = -1 + 2*np.sum(pairs[:num_pairs])
+        ess[j] = n / max(tau, 1.0)
+    return ess
+
+
+
+
+#Function to split num_of_set_hyper samples among num_of_chains Metropolis-Hastings chains of GPy, and to get the number of steps
+#each chain runs. A GPy chain stores its point at the steps it > Nburn with it % Nthin == 0, so burn + (n + 1)*thinning steps
+#store at least the n samples of a chain, whatever the remainder of burn modulo thinning.
+#Parameters: @num_of_set_hyper: the number of samples of the hyperparameters
+#            @num_of_chains: the number of chains
+#            @burn: the number of burn-in steps of each chain
+#            @thinning: the number of steps of a chain between two samples
+#Returns the list of (number of samples, number of steps) of each chain
+def chain_lengths(num_of_set_hyper, num_of_chains, burn, thinning):
+    samples_per_chain = [len(chain_samples) for chain_samples in np.array_split(np.arange(num_of_set_hyper), num_of_chains)]
+    return [(num_of_samples, burn + (num_of_samples + 1)*thinning) for num_of_samples in samples_per_chain]
@@ -0,0 +1,142 @@
+import numpy as np
+import numpy.random as npr
+import pytest
+from ep_test_utils import build_problem, run_stage
+from PES.PES import PES_aquisition_function, PES_aquisition_function_batch, PES_aquisition_function_multi
+from PES.compute_covariance import compute_cov_xPrime_cz
+from PES.global_optimization import global_optimization
+from PES.utilities import compute_inverse, get_bounds, log_Phi
+
+
+#Acquisition function of one point with the dense inverses, as computed point by point before PES_aquisition_function_batch.
+#Numerical errors raise, as in run_PES where the warnings are errors.
+def reference_acquisition(xPrime, Xsamples, x_minimum, l_vec, sigma, noise, K_n_cholesky, K_star_min, K_plus_W_tilde_factor, \
+                          m_f_minimum, v_f_minimum, c_and_m):
+    with np.errstate(all = 'raise'):
+        K_plus_W_tilde_inverse = K_plus_W_tilde_factor.solve(np.eye(K_plus_W_tilde_factor.size))
+        K_star = compute_cov_xPrime_cz(np.array([xPrime]), Xsamples, x_minimum, len(Xsamples), sigma, noise, l_vec)
+        m_f_evaluated = np.dot(np.dot(K_star, K_plus_W_tilde_inverse), c_and_m)
+        v_f_evaluated = sigma - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), K_star.T)
+        v_f_evaluated_minimum = K_star[-1] - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), K_star_min.T)
+
+        scalar = 1 - 10**(-4)
+        v_too_small = True
+        scalar_count = 0
+        if (v_f_evaluated + v_f_minimum) < 10**(-10):
+            v = v_f_evaluated + v_f_minimum
+        else:
+            while (v_too_small) and (scalar_count < (10**(9) + 5)):
+                v_too_small = False
+                scaled_v = v_f_evaluated - 2*scalar*v_f_evaluated_minimum + v_f_minimum
+                if scaled_v < 10**(-10):
+                    scalar = scalar**2
+                    v_too_small = True
+                scalar_count = scalar_count + 1
+            v = v_f_evaluated - 2*scalar*v_f_evaluated_minimum + v_f_minimum
+
+        alpha = np.divide(m_f_evaluated - m_f_minimum, np.sqrt(v))
+        beta = (1/np.sqrt(2*np.pi))*np.exp(-0.5*alpha**2 - log_Phi(alpha))
+        Vf_ccT_Vf = np.multiply(v_f_evaluated - v_f_evaluated_minimum, v_f_evaluated - v_f_evaluated_minimum)
+        v_n_x_xmin = v_f_evaluated - np.multiply(np.multiply(np.divide(beta, v), alpha + beta), Vf_ccT_Vf) + noise
+
+        k_n_x = K_star[:len(Xsamples)]
+        v_n_x = noise + sigma*(1 + 10**(-10)) - np.dot(np.dot(k_n_x, compute_inverse(np.dot(K_n_cholesky, K_n_cholesky.T))), k_n_x.T)
+        objective = 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x + noise)) - 0.5*np.log(2*np.pi*np.exp(1)*(v_n_x_xmin + noise))
+    return -objective, scalar_count
+
+
+#Marginalized acquisition function of one point: mean over the sets of hyperparameters where the computation succeeds
+def reference_multi(xPrime, inputs):
+    objective = 0
+    count = 0
+    for i in range(len(inputs[1])):
+        try:
+            new_objective, scalar_count = reference_acquisition(xPrime, inputs[0], *[value[i] for value in inputs[1:]])
+            if scalar_count < 10**(5):
+                objective = objective + new_objective
+                count = count + 1
+        except FloatingPointError:
+            pass
+    return float(10**(200)) if count == 0 else objective/count
+
+
+#Inputs of the acquisition function (Xsamples, then the arrays indexed by the set of hyperparameters) from the EP stage
+def acquisition_inputs(problem):
+    Xsamples, Ysamples, sigma, l, noise = problem
+    stage_result = run_stage(problem)
+    assert np.all(stage_result.valid)
+    return [Xsamples, stage_result.x_minimum, l, sigma, noise, stage_result.K_n_cholesky, stage_result.K_star_min, \
+            stage_result.K_plus_W_tilde_factor, stage_result.m_f_minimum, stage_result.v_f_minimum.copy(), stage_result.c_and_m]
+
+
+@pytest.fixture(scope = 'module')
+def inputs():
+    return acquisition_inputs(build_problem())
+
+
+def test_batch_matches_per_point(inputs):
+    points = np.vstack((npr.RandomState(0).uniform(size = (20, 2)), inputs[1]))
+    for i in range(len(inputs[1])):
+        set_inputs = [inputs[0]] + [value[i] for value in inputs[1:]]
+        objective, scalar_count = PES_aquisition_function_batch(points, *set_inputs)
+        expected = [reference_acquisition(point, *set_inputs) for point in points]
+        np.testing.assert_allclose(objective, [value for value, _ in expected], rtol = 1e-8, atol = 1e-10)
+        np.testing.assert_array_equal(scalar_count, [count for _, count in expected])
+        single_objective, single_count = PES_aquisition_function(points[0], *set_inputs)
+        np.testing.assert_allclose(single_objective, objective[0], rtol = 1e-12)
+        assert single_count == scalar_count[0]
+
+
+#v_f_minimum chosen so that v_f(x) + v_f(x_min) - 2 v_f(x, x_min) is too small at a point (the scalar is squared until it is
+#large enough), and so that v_f(x) + v_f(x_min) < 10^(-10) (scalar_count 0, a negative variance and a non finite objective)
+def test_batch_scalar_count_and_non_finite_branches(inputs):
+    x = np.array([0.45, 0.4])
+    set_inputs = [inputs[0]] + [value[0] for value in inputs[1:]]
+    K_plus_W_tilde_inverse = set_inputs[7].solve(np.eye(set_inputs[7].size))
+    K_star = compute_cov_xPrime_cz(np.array([x]), inputs[0], set_inputs[1], len(inputs[0]), set_inputs[3], set_inputs[4], \
+                                   set_inputs[2])
+    v_f_evaluated = set_inputs[3] - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), K_star)
+    v_f_evaluated_minimum = K_star[-1] - np.dot(np.dot(K_star, K_plus_W_tilde_inverse), set_inputs[6])
+    assert v_f_evaluated_minimum > 10**(-4)
+
+    points = np.array([x, [0.9, 0.1]])
+    for v_f_minimum, expected_count in ((v_f_evaluated_minimum - v_f_evaluated, 14), (-1.0, 0)):
+        set_inputs[9] = v_f_minimum
+        objective, scalar_count = PES_aquisition_function_batch(points, *set_inputs)
+        assert scalar_count[0] == expected_count
+        if expected_count == 0:
+            assert not np.isfinite(objective[0])
+            with pytest.raises(FloatingPointError):
+                reference_acquisition(x, *set_inputs)
+        else:
+            expected = reference_acquisition(x, *set_inputs)
+            assert scalar_count[0] == expected[1]
+            np.testing.assert_allclose(objective[0], expected[0], rtol = 1e-8)
+
+
+#A set of hyperparameters with a negative variance at every point is left out of the mean, and a point where every set fails
+#gets 10^200
+def test_multi_and_vectorized_grid_match_per_point(inputs):
+    inputs = list(inputs)
+    inputs[9] = inputs[9].copy()
+    inputs[9][-1] = -1.0
+    points = npr.RandomState(1).uniform(size = (15, 2))
+    num_of_hyperSets = len(inputs[1])
+
+    objective = PES_aquisition_function_multi(points, *inputs, num_of_hyperSets)
+    np.testing.assert_allclose(objective, [reference_multi(point, inputs) for point in points], rtol = 1e-8, atol = 1e-10)
+    np.testing.assert_allclose(PES_aquisition_function_multi(points[3], *inputs, num_of_hyperSets), objective[3], rtol = 1e-12)
+
+    failing = list(inputs)
+    failing[9] = np.full(num_of_hyperSets, -1.0)
+    np.testing.assert_array_equal(PES_aquisition_function_multi(points[:2], *failing, num_of_hyperSets), [float(10**(200))]*2)
+
+    #The grid evaluated with one call or point by point gives the same starting point, hence the same optimum
+    PES = lambda xPrime: PES_aquisition_function_multi(xPrime, *inputs, num_of_hyperSets)
+    results = []
+    for vectorized in (False, True):
+        npr.seed(5)
+        results.append(global_optimization(PES, 2, np.zeros(2), np.ones(2), gridsize = 50, optimize_method = 'L-BFGS-B', \
+                                           maxiter = 20, bnds = get_bounds(np.zeros(2), np.ones(2)), vectorized = vectorized))
+    np.testing.assert_allclose(results[0].x, results[1].x, rtol = 1e-10, atol = 1e-12)
+    assert results[0].fun == results[1].fun
@@ -0,0 +1,73 @@
+import time
+import numpy as np
+from PES.compute_covariance import *
+
+
+#Benchmark of the kernel matrices of [c; z] built by EP for every sample of the hyperparameters: the element-wise
+#implementation (nested Python loops) against the vectorized one (compute_K_blocks). Run it from the root directory of
+#the 'pes' folder:
+#    python3 benchmark_covariance.py
+#The comparison of the results also runs with the test suite, in compute_covariance_test.py
+
+
+
+#Element-wise construction of K_c, K_cz and K_z, as done before compute_K_blocks
+def reference_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec):
+    num_of_obser = len(Xsamples)
+    nob_nob = covNobeservations(Xsamples, num_of_obser, sigma, noise, l_vec)
+    nob_grad = cov_nObser_maxGrad(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)
+    nob_off_dia = cov_nObser_off_maxHess(Xsamples, x_minimum, num_of_obser, sigma, l_vec)
+    grad_grad = cov_maxGrad_maxGrad(x_minimum, sigma, l_vec)
+    grad_off_hess = cov_maxGrad_off_maxHess(x_minimum, sigma, l_vec)
+    nonDia_nonDia = cov_nonDiaHess_nonDiaHess(x_minimum, sigma, l_vec)
+    K_c = np.block([[nob_nob, nob_grad, nob_off_dia],
+                    [nob_grad.T, grad_grad, grad_off_hess],
+                    [nob_off_dia.T, grad_off_hess.T, nonDia_nonDia]])
+    K_c = K_c + sigma * (10**(-10))*np.eye(K_c.shape[0])
+
+    K_cz = np.block([[cov_nObser_diagonal_maxHess(Xsamples, x_minimum, num_of_obser, sigma, l_vec),
+                      cov_nObser_max(Xsamples, x_minimum, num_of_obser, sigma, noise, l_vec)],
+                     [cov_maxGrad_diaHess(x_minimum, sigma, l_vec), cov_maxGrad_max(x_minimum, sigma, l_vec)],
+                     [cov_nonDiaHess_diaHess(x_minimum, sigma, l_vec),
+                      np.array([cov_nonDiaHess_max(x_minimum, sigma, l_vec)]).T]])
+
+    dia_min = cov_diaHess_max(x_minimum, sigma, l_vec)
+    K_z = np.block([[cov_diaHess_diaHess(x_minimum, sigma, l_vec), dia_min],
+                    [dia_min.T, cov_max_max(x_minimum, sigma, noise, l_vec)]])
+    K_z = K_z + sigma * (10**(-10))*np.eye(K_z.shape[0])
+    return K_c, K_cz, K_z
+
+
+
+#Best time over `repeat` calls of function(*args)
+def best_time(function, args, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+
+if __name__ == "__main__":
+    d = 6
+    n = 100
+    repeat = 5
+    rng = np.random.RandomState(0)
+    Xsamples = rng.uniform(size=(n, d))
+    x_minimum = rng.uniform(size=d)
+    l_vec = rng.uniform(0.1, 1.0, size=d)
+    sigma = 1.3
+    noise = 10**(-3)
+
+    reference_time, reference = best_time(reference_K_blocks, (Xsamples, x_minimum, sigma, noise, l_vec), repeat)
+    vectorized_time, vectorized = best_time(compute_K_blocks, (Xsamples, x_minimum, sigma, noise, l_vec), repeat)
+
+    for name, expected, result in zip(('K_c', 'K_cz', 'K_z'), reference, vectorized):
+        assert np.allclose(expected, result, rtol=1e-12, atol=1e-12), name
+        print('%s %s: max abs difference %.2e' % (name, result.shape, np.max(np.abs(expected - result))))
+    print('d = %d, n = %d' % (d, n))
+    print('element-wise: %.4f s' % reference_time)
+    print('vectorized:   %.4f s' % vectorized_time)
+    print('speedup:      %.0fx' % (reference_time/vectorized_time))
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+from PES.compute_covariance import compute_K_blocks
+from benchmark_covariance import reference_K_blocks
+
+
+#compute_K_blocks against the element-wise construction of K_c, K_cz and K_z (see benchmark_covariance.py)
+@pytest.mark.parametrize('d, n', [(1, 5), (2, 20), (6, 100)])
+def test_compute_K_blocks_matches_element_wise(d, n):
+    rng = np.random.RandomState(d*n)
+    Xsamples = rng.uniform(size=(n, d))
+    x_minimum = rng.uniform(size=d)
+    l_vec = rng.uniform(0.1, 1.0, size=d)
+    sigma = 1.3
+    noise = 10**(-3)
+
+    reference = reference_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec)
+    vectorized = compute_K_blocks(Xsamples, x_minimum, sigma, noise, l_vec)
+    for name, expected, result in zip(('K_c', 'K_cz', 'K_z'), reference, vectorized):
+        assert result.shape == expected.shape, name
+        np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12, err_msg=name)
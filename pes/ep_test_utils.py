@@ -0,0 +1,28 @@
+import numpy as np
+from PES.EP_stage import EPStage
+from PES.utilities import get_bounds
+
+
+#Small problem for the tests of the EP stage and of the acquisition function: n noisy observations of a quadratic (minimum at
+#0.4) on [0, 1]^d and num_of_hyperSets sets of hyperparameters around sigma = 1, l = 0.4, noise = 10^(-3)
+def build_problem(n = 8, d = 2, num_of_hyperSets = 3, seed = 2):
+    rng = np.random.RandomState(seed)
+    Xsamples = rng.uniform(size = (n, d))
+    Ysamples = 2*np.sum((Xsamples - 0.4)**2, axis = 1)[:, None] - 0.5 + 10**(-3)*rng.normal(size = (n, 1))
+    sigma = rng.uniform(0.8, 1.2, size = num_of_hyperSets)
+    l = rng.uniform(0.3, 0.5, size = (num_of_hyperSets, d))
+    noise = np.full(num_of_hyperSets, 10**(-3))
+    return Xsamples, Ysamples, sigma, l, noise
+
+
+#Run the EP stage on the problem with the given executor, the seeds of the random features being drawn from np.random.seed(seed)
+def run_stage(problem, executor = None, num_of_features = 200, seed = 1):
+    Xsamples, Ysamples, sigma, l, noise = problem
+    d = Xsamples.shape[1]
+    stage = EPStage(executor, 2)
+    try:
+        np.random.seed(seed)
+        return stage.run(num_of_features, d, Xsamples, Ysamples, sigma, l, noise, Xsamples[np.argmin(Ysamples)], \
+                         get_bounds(np.zeros(d), np.ones(d)))
+    finally:
+        stage.close()
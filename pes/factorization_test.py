@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from PES.compute_covariance import cov_cross_points
+from PES.factorization import BlockCholesky, CholeskyCache
+
+
+def _kernel_matrix(Xsamples, sigma, l, jitter):
+    return cov_cross_points(Xsamples, Xsamples, sigma, l) + jitter*np.eye(len(Xsamples))
+
+
+#M = [[A, B], [B^T, C]] with A the kernel matrix of n points; C gets negative diagonal terms (as EP site variances can) if
+#indefinite, which makes the Schur complement indefinite
+def _block_matrix(rng, n, m, indefinite):
+    A = _kernel_matrix(rng.uniform(size=(n, 2)), 1.3, np.array([0.4, 0.7]), 10**(-2))
+    B = 0.1*rng.normal(size=(n, m))
+    C = np.eye(m) + np.dot(B.T, np.linalg.solve(A, B))
+    if indefinite:
+        C[0, 0] = C[0, 0] - 3.0
+    return A, B, C, np.block([[A, B], [B.T, C]])
+
+
+#solve, inner and lower of BlockCholesky against the dense matrix
+@pytest.mark.parametrize('indefinite', [False, True])
+def test_block_cholesky_matches_dense(indefinite):
+    rng = np.random.RandomState(7)
+    A, B, C, M = _block_matrix(rng, 12, 4, indefinite)
+    factor = BlockCholesky(np.linalg.cholesky(A), B, C)
+    assert factor.size == 16
+    assert (factor.schur_cholesky is None) == indefinite
+
+    U = rng.normal(size=(16, 3))
+    V = rng.normal(size=(16, 2))
+    np.testing.assert_allclose(factor.solve(U), np.linalg.solve(M, U), rtol=1e-10, atol=1e-10)
+    np.testing.assert_allclose(factor.inner(U, V), np.dot(U.T, np.linalg.solve(M, V)), rtol=1e-10, atol=1e-10)
+    if indefinite:
+        with pytest.raises(np.linalg.LinAlgError):
+            factor.lower()
+    else:
+        np.testing.assert_allclose(factor.lower(), np.linalg.cholesky(M), rtol=1e-10, atol=1e-12)
+
+
+#Hits for the same observations, a block append for appended rows, a new factorization for new hyperparameters
+def test_cholesky_cache_reuses_and_extends_factors():
+    rng = np.random.RandomState(3)
+    Xsamples = rng.uniform(size=(15, 3))
+    sigma = 1.1
+    l = np.array([0.3, 0.5, 0.8])
+    jitter = 10**(-3)
+    cache = CholeskyCache()
+
+    L = cache.factor(0, Xsamples[:10], sigma, l, jitter)
+    assert cache.factor(0, Xsamples[:10], sigma, l, jitter) is L
+    L_appended = cache.factor(0, Xsamples, sigma, l, jitter)
+    assert (cache.misses, cache.hits, cache.appends) == (1, 1, 1)
+    np.testing.assert_allclose(L_appended, np.linalg.cholesky(_kernel_matrix(Xsamples, sigma, l, jitter)), rtol=1e-10, \
+                               atol=1e-12)
+
+    #Other hyperparameters, or other rows, are factored again
+    cache.factor(0, Xsamples, 2.0*sigma, l, jitter)
+    cache.factor(0, Xsamples[::-1], 2.0*sigma, l, jitter)
+    cache.factor((0, 'acquisition'), Xsamples, sigma, l, jitter)
+    assert (cache.misses, cache.hits, cache.appends) == (4, 1, 1)
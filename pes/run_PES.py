@@ -64,7 +64,7 @@ dimension = 6
 #                                            It is the M defined in the paper.
 #            @number_of_burnin: number of burnins
 #            @sampling_method: the method used to sample the posterior distribution of the hyperparameters. User can choose 
-#                              'mcmc' or 'hmc'.
+#                              'mcmc', 'mcmc_chain' (thinned samples of a single chain continued across the iterations) or 'hmc'.
 #            @number_of_initial_points: the number of samples we want to use as initial observations
 #            @number_of_experiments: number of experiments we want to run. For each experiment, we use different randomizations 
 #                                    for starting points.
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from PES.utilities import chain_lengths, effective_sample_size
+
+
+#Stationary AR(1) chain x_t = rho*x_{t-1} + sqrt(1 - rho^2)*e_t, of effective sample size n*(1 - rho)/(1 + rho)
+def _ar1_chain(rng, n, rho):
+    noise = rng.normal(size=n)
+    chain = np.zeros(n)
+    chain[0] = noise[0]
+    for t in range(1, n):
+        chain[t] = rho*chain[t - 1] + np.sqrt(1 - rho**2)*noise[t]
+    return chain
+
+
+#The mean over independent chains of the estimates, to keep the tolerance tight
+def test_effective_sample_size_of_ar1_chains():
+    rng = np.random.RandomState(0)
+    n = 5000
+    num_of_chains = 20
+    for rho in [0.0, 0.5, 0.9]:
+        samples = np.array([_ar1_chain(rng, n, rho) for _ in range(num_of_chains)]).T
+        ess = effective_sample_size(samples)
+        assert ess.shape == (num_of_chains, ) and np.all(ess <= n)
+        np.testing.assert_allclose(np.mean(ess), n*(1 - rho)/(1 + rho), rtol=0.08)
+
+
+def test_effective_sample_size_of_short_and_constant_chains():
+    np.testing.assert_array_equal(effective_sample_size(np.ones((3, 2))), [3.0, 3.0])
+    np.testing.assert_array_equal(effective_sample_size(np.ones((10, 1))), [10.0])
+
+
+#GPy's Metropolis_Hastings.sample stores the point of the steps it > Nburn with it % Nthin == 0
+def _stored_steps(Ntotal, Nburn, Nthin):
+    return [it for it in range(Ntotal) if it > Nburn and it % Nthin == 0]
+
+
+@pytest.mark.parametrize('num_of_chains', [1, 3, 7])
+@pytest.mark.parametrize('thinning', [1, 2, 3, 5])
+@pytest.mark.parametrize('burn', [0, 3, 15, 16])
+def test_chain_lengths_store_every_sample(num_of_chains, thinning, burn):
+    lengths = chain_lengths(5, num_of_chains, burn, thinning)
+    assert len(lengths) == num_of_chains
+    assert sum(num_of_samples for num_of_samples, _ in lengths) == 5
+    for num_of_samples, num_of_steps in lengths:
+        assert num_of_steps == burn + (num_of_samples + 1)*thinning
+        steps = _stored_steps(num_of_steps, burn, thinning)
+        assert num_of_samples <= len(steps) <= num_of_samples + 1
+        #The samples kept (the last ones) are thinning steps apart, after the burn-in
+        kept = steps[len(steps) - num_of_samples:]
+        assert all(step > burn for step in kept)
+        assert all(np.diff(kept) == thinning)
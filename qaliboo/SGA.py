@@ -22,9 +22,7 @@ def stochastic_gradient(kg, domain, new_point, para_sgd=60,
         G = kg.compute_grad_objective_function() # the same as compute_grad_knowledge_gradient_mcmc()
         G = alpha_t*G
         
-        for k in range(n_samples):
-            new_point_update = domain.compute_update_restricted_to_domain(max_relative_change, new_point[k], G[k])
-            new_point[k] = new_point[k] + new_point_update
+        new_point = new_point + domain.compute_update_restricted_to_domain(max_relative_change, new_point, G)
     
     return new_point             
         
@@ -39,12 +37,12 @@ def stochastic_gradient_ml(kg, domain, new_point, ml_model, para_sgd=100, gamma=
         G = kg.compute_grad_objective_function() # the same as compute_grad_knowledge_gradient_mcmc()
         G = alpha_t*G
 
-        for k in range(n_samples):
-            new_point_update = domain.compute_update_restricted_to_domain(max_relative_change, new_point[k], G[k])
-            candidate = new_point[k] + new_point_update
-            if (not ml_model.check_inside([candidate])) and (ml_model.check_inside([new_point[k]])):
-                candidate = adjust_to_satisfy_constraint(candidate, G[k], ml_model)
-            new_point[k] = candidate
+        candidates = new_point + domain.compute_update_restricted_to_domain(max_relative_change, new_point, G)
+        # Points moving out of the feasible region are pulled back
+        leaving = ml_model.inside_mask(new_point) & ~ml_model.inside_mask(candidates)
+        for k in np.flatnonzero(leaving):
+            candidates[k] = adjust_to_satisfy_constraint(candidates[k], G[k], ml_model)
+        new_point = candidates
 
     
     return new_point             
@@ -55,3 +53,57 @@ def adjust_to_satisfy_constraint(point, grad, ml_model):
             if ml_model.check_inside([point]):
                 return point
         return point 
+
+
+####################################
+#######  LOCKSTEP GRADIENT  ########
+####################################
+# All the restarts advance together: points has shape (R, q, d), the gradients of
+# the R sets of points come from a single evaluate_grad_at_point_list call and the
+# step limitation near the boundaries is a single domain.compute_update_restricted_to_domain call.
+
+
+def stochastic_gradient_lockstep(kg, domain, new_points, para_sgd=60, gamma=0.7, alpha=1.0,
+                                 max_relative_change=0.5, ml_model=None):
+    '''
+    Stochastic gradient ascent of the R restarts new_points (shape (R, q, d)) in lockstep.
+    With ml_model, the points leaving the feasible region are pulled back as in stochastic_gradient_ml.
+    '''
+    new_points = np.array(new_points, dtype=float)
+    num_restarts, n_samples, n_features = new_points.shape
+
+    for j in range(para_sgd):
+
+        alpha_t = alpha/((1+j)**gamma)     # otherwise alpha = alpha/(1+j)
+        G = alpha_t*kg.evaluate_grad_at_point_list(new_points)
+
+        candidates = new_points + domain.compute_update_restricted_to_domain(max_relative_change, new_points, G)
+        if ml_model is not None:
+            flat_points = new_points.reshape(-1, n_features)
+            flat_candidates = candidates.reshape(-1, n_features)
+            # Points moving out of the feasible region
+            leaving = ml_model.inside_mask(flat_points) & ~ml_model.inside_mask(flat_candidates)
+            if np.any(leaving):
+                flat_candidates[leaving] = adjust_to_satisfy_constraint_batch(flat_candidates[leaving],
+                                                                              G.reshape(-1, n_features)[leaving], ml_model)
+        new_points = candidates
+
+    return new_points
+
+
+def stochastic_gradient_ml_lockstep(kg, domain, new_points, ml_model, para_sgd=100, gamma=0.7, alpha=1.0, max_relative_change=1):
+    return stochastic_gradient_lockstep(kg, domain, new_points, para_sgd, gamma, alpha, max_relative_change, ml_model)
+
+
+def adjust_to_satisfy_constraint_batch(points, grads, ml_model):
+    '''
+    adjust_to_satisfy_constraint applied to each row of points: a point stops moving once it is feasible.
+    '''
+    points = points.copy()
+    moving = np.ones(points.shape[0], dtype=bool)
+    for i in range(10):
+        points[moving] -= 0.1*grads[moving]
+        moving[moving] = ~ml_model.inside_mask(points[moving])
+        if not np.any(moving):
+            break
+    return points
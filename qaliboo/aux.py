@@ -1,8 +1,11 @@
 import pandas as pd
+import numpy as np
 import json
 from qaliboo import machine_learning_models
 import os
+import atexit
 import datetime
+import functools
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/query26_vm_ram.csv' 
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/ligen_synth_table.csv'
 #dat = '/home/lbarone/QALIBOO/qaliboo/datasets/stereomatch10.csv'
@@ -16,6 +19,245 @@ def define_dat(problem):
         dat = '/home/lbarone/QALIBOO/qaliboo/datasets/query26_vm_ram.csv'
     return dat
 
+
+@functools.lru_cache(maxsize=None)
+def load_dataset(dat):
+    '''
+    Read the dataset CSV only once per run. The DataFrame is shared: do not modify it.
+    '''
+    return pd.read_csv(dat)
+
+
+class _ResultSink:
+
+    extension = None
+
+    def __init__(self, path, flush_every=1, fsync_every=0):
+        """
+        Append-only writer of the rows of a result file.
+
+        Args:
+            path (str): Path of the output file.
+            flush_every (int, optional): Number of rows kept in memory before writing them. Defaults to 1.
+            fsync_every (int, optional): Force the data to disk every fsync_every writes, 0 never. Defaults to 0.
+        """
+        self.path = path
+        self._flush_every = max(flush_every, 1)
+        self._fsync_every = fsync_every
+        self._buffer = []
+        self._n_buffered = 0
+        self._n_writes = 0
+
+    def append(self, rows):
+        '''
+        Append the rows of the DataFrame `rows`.
+        '''
+        self._buffer.append(rows)
+        self._n_buffered += len(rows)
+        if self._n_buffered >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self._write(pd.concat(self._buffer, ignore_index=True))
+        self._buffer = []
+        self._n_buffered = 0
+        self._n_writes += 1
+        if self._fsync_every and self._n_writes % self._fsync_every == 0:
+            self._fsync()
+
+    def close(self):
+        self.flush()
+
+    def _write(self, rows):
+        raise NotImplementedError
+
+    def _fsync(self):
+        pass
+
+
+class CsvSink(_ResultSink):
+
+    extension = '.csv'
+
+    def __init__(self, path, flush_every=1, fsync_every=0):
+        super().__init__(path, flush_every, fsync_every)
+        # An existing file (e.g. written by a previous run) is continued, not rewritten
+        self._write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a', newline='')
+
+    def _write(self, rows):
+        rows.to_csv(self._file, header=self._write_header, index=False)
+        self._write_header = False
+        self._file.flush()
+
+    def _fsync(self):
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class _ChunkedSink(_ResultSink):
+
+    def __init__(self, path, flush_every=1, fsync_every=0):
+        """
+        Columnar sink: every write is a new chunk file next to `path`, the chunks are
+        merged into `path` (after the rows it already holds) on close. The chunks left
+        by an interrupted run are merged by the next sink opened on the same path.
+        """
+        super().__init__(path, flush_every, fsync_every)
+        self._n_chunks = len(self._chunk_paths())
+
+    def _chunk_path(self, index):
+        return f'{self.path}.part{index:06d}{self.extension}'
+
+    def _chunk_paths(self):
+        folder, name = os.path.split(self.path)
+        prefix = name + '.part'
+        chunks = [entry for entry in os.listdir(folder or '.')
+                  if entry.startswith(prefix) and entry.endswith(self.extension)]
+        return [os.path.join(folder, entry) for entry in sorted(chunks)]
+
+    def _write(self, rows):
+        chunk_path = self._chunk_path(self._n_chunks)
+        self._n_chunks += 1
+        tmp_path = chunk_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            self._write_chunk(rows, f)
+            if self._fsync_every and (self._n_writes + 1) % self._fsync_every == 0:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, chunk_path)
+
+    def close(self):
+        super().close()
+        chunk_paths = self._chunk_paths()
+        if not chunk_paths:
+            return
+        sources = ([self.path] if os.path.exists(self.path) else []) + chunk_paths
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            self._merge(sources, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        for chunk_path in chunk_paths:
+            os.remove(chunk_path)
+        self._n_chunks = 0
+
+    def _write_chunk(self, rows, f):
+        raise NotImplementedError
+
+    def _merge(self, sources, f):
+        raise NotImplementedError
+
+
+class NpzSink(_ChunkedSink):
+
+    extension = '.npz'
+
+    def __init__(self, path, flush_every=1, fsync_every=0):
+        """
+        Columnar sink: one array per column in a NumPy .npz archive.
+
+        An archive cannot be appended to: each write is a chunk archive, concatenated
+        into `path` on close.
+        """
+        super().__init__(path, flush_every, fsync_every)
+
+    def _write_chunk(self, rows, f):
+        np.savez(f, **{str(column): rows[column].to_numpy() for column in rows.columns})
+
+    def _merge(self, sources, f):
+        columns = {}
+        n_rows = 0
+        for source in sources:
+            with np.load(source, allow_pickle=True) as chunk:
+                n_chunk_rows = len(chunk[chunk.files[0]]) if chunk.files else 0
+                for column in chunk.files:
+                    columns.setdefault(column, [None]*n_rows)
+                for column, values in columns.items():
+                    values.extend(chunk[column].tolist() if column in chunk.files else [None]*n_chunk_rows)
+            n_rows += n_chunk_rows
+        np.savez(f, **{column: np.asarray(values) for column, values in columns.items()})
+
+
+class ParquetSink(_ChunkedSink):
+
+    extension = '.parquet'
+
+    def __init__(self, path, flush_every=1, fsync_every=0):
+        """
+        Columnar sink: each write is a chunk Parquet file, the chunks become the row
+        groups of `path` on close. Requires pyarrow.
+        """
+        import pyarrow
+        import pyarrow.parquet
+        super().__init__(path, flush_every, fsync_every)
+        self._pyarrow = pyarrow
+
+    def _write_chunk(self, rows, f):
+        self._pyarrow.parquet.write_table(self._pyarrow.Table.from_pandas(rows, preserve_index=False), f)
+
+    def _merge(self, sources, f):
+        files = [self._pyarrow.parquet.ParquetFile(source) for source in sources]
+        schema = self._pyarrow.unify_schemas([parquet_file.schema_arrow for parquet_file in files])
+        with self._pyarrow.parquet.ParquetWriter(f, schema) as writer:
+            for parquet_file in files:
+                for index in range(parquet_file.num_row_groups):
+                    row_group = parquet_file.read_row_group(index)
+                    for field in schema:
+                        if field.name not in row_group.column_names:
+                            row_group = row_group.append_column(field, self._pyarrow.nulls(len(row_group), field.type))
+                    writer.write_table(row_group.select(schema.names).cast(schema))
+                parquet_file.close()
+
+
+_SINK_BACKENDS = {'csv': CsvSink, 'npz': NpzSink, 'parquet': ParquetSink}
+_sink_options = dict(backend='csv', flush_every=1, fsync_every=0)
+_sinks = {}
+
+
+def configure_sinks(backend='csv', flush_every=1, fsync_every=0):
+    '''
+    Set how the result files are written: backend ('csv', 'npz' or 'parquet'), number of rows
+    buffered before each write and number of writes between two fsync (0 never).
+    Applies to the files opened afterwards.
+    '''
+    if backend not in _SINK_BACKENDS:
+        raise ValueError(f'Unknown result backend {backend}, choose among {list(_SINK_BACKENDS)}')
+    _sink_options.update(backend=backend, flush_every=flush_every, fsync_every=fsync_every)
+
+
+def get_sink(path):
+    '''
+    Sink appending to the result file `path` (with the extension of the backend),
+    opened on first use and kept open until close_sinks.
+    '''
+    sink_class = _SINK_BACKENDS[_sink_options['backend']]
+    path = os.path.splitext(path)[0] + sink_class.extension
+    if path not in _sinks:
+        _sinks[path] = sink_class(path, _sink_options['flush_every'], _sink_options['fsync_every'])
+    return _sinks[path]
+
+
+def flush_sinks():
+    for sink in _sinks.values():
+        sink.flush()
+
+
+def close_sinks():
+    while _sinks:
+        _, sink = _sinks.popitem()
+        sink.close()
+
+
+atexit.register(close_sinks)
+
+
 def create_result_folder(sub_folder):
     main_folder = './results/'
     if not os.path.exists(main_folder):
@@ -32,25 +274,18 @@ def create_result_folder(sub_folder):
     return result_folder
 
 def csv_init(result_folder, dat_indices, dat):
-    dataset_csv_path = dat
-    df = pd.read_csv(dataset_csv_path)
+    df = load_dataset(dat)
     new_df = pd.DataFrame({'dat_index': dat_indices})
     new_df = df.iloc[dat_indices, :]
     output_csv_path = f'{result_folder}/init.csv'
     new_df.to_csv(output_csv_path, index=False)
 
 def csv_history(result_folder, iter_values, dat_indices, dat):
-    dataset_csv_path = dat
-    df = pd.read_csv(dataset_csv_path)
+    df = load_dataset(dat)
     output_csv_path = os.path.join(result_folder, 'history.csv')
-    if os.path.exists(output_csv_path):
-        existing_df = pd.read_csv(output_csv_path)
-    else:
-        existing_df = pd.DataFrame()
-    selected_rows_df = df.loc[dat_indices, :]
+    selected_rows_df = df.loc[dat_indices, :].copy()
     selected_rows_df.insert(0, 'index', iter_values)
-    updated_df = pd.concat([existing_df, selected_rows_df], ignore_index=True)
-    updated_df.to_csv(output_csv_path, index=False)
+    get_sink(output_csv_path).append(selected_rows_df)
 
 def csv_info(iteration, q, evaluation_count, global_time, unfeasible_points, mape, result_folder, error):
     # Creare un DataFrame con i nuovi dati
@@ -68,17 +303,8 @@ def csv_info(iteration, q, evaluation_count, global_time, unfeasible_points, map
     # Percorso del file CSV
     output_csv_path = os.path.join(result_folder, 'info.csv')
 
-    # Se il file CSV esiste già, leggi i dati esistenti
-    if os.path.exists(output_csv_path):
-        existing_df = pd.read_csv(output_csv_path)
-    else:
-        existing_df = pd.DataFrame()  # Se il file non esiste, crea un DataFrame vuoto
-
-    # Concatena i dati esistenti con i nuovi dati
-    updated_df = pd.concat([existing_df, new_data_df], ignore_index=True)
-
-    # Salva il DataFrame aggiornato come file CSV
-    updated_df.to_csv(output_csv_path, index=False)
+    # Aggiungi i nuovi dati in coda al file
+    get_sink(output_csv_path).append(new_data_df)
 
 
 def csv_result_XGB(iteration, q, min_evaluated, evaluation_count, global_time, unfeasible_points, best_point, result_file):
@@ -94,18 +320,8 @@ def csv_result_XGB(iteration, q, min_evaluated, evaluation_count, global_time, u
     }
     new_data_df = pd.DataFrame(data)
 
-    # Percorso del file CSV
-    # Se il file CSV esiste già, leggi i dati esistenti
-    if os.path.exists(result_file):
-        existing_df = pd.read_csv(result_file)
-    else:
-        existing_df = pd.DataFrame()  # Se il file non esiste, crea un DataFrame vuoto
-
-    # Concatena i dati esistenti con i nuovi dati
-    updated_df = pd.concat([existing_df, new_data_df], ignore_index=True)
-
-    # Salva il DataFrame aggiornato come file CSV
-    updated_df.to_csv(result_file, index=False)
+    # Aggiungi i nuovi dati in coda al file
+    get_sink(result_file).append(new_data_df)
 
 def save_execution_time(times, result_folder):
     # Creare un DataFrame con i nuovi dati
@@ -117,17 +333,8 @@ def save_execution_time(times, result_folder):
     # Percorso del file CSV
     output_csv_path = os.path.join(result_folder, 'execution_times.csv')
 
-    # Se il file CSV esiste già, leggi i dati esistenti
-    if os.path.exists(output_csv_path):
-        existing_df = pd.read_csv(output_csv_path)
-    else:
-        existing_df = pd.DataFrame()  # Se il file non esiste, crea un DataFrame vuoto
-
-    # Concatena i dati esistenti con i nuovi dati
-    updated_df = pd.concat([existing_df, new_data_df], ignore_index=True)
-
-    # Salva il DataFrame aggiornato come file CSV
-    updated_df.to_csv(output_csv_path, index=False)
+    # Aggiungi i nuovi dati in coda al file
+    get_sink(output_csv_path).append(new_data_df)
 
 def csv_testfunction(iteration, q, objective_func_name, minimum_evaluated,n_evaluations,unfeasible_point, result_file):
     # Creare un DataFrame con i nuovi dati
@@ -141,18 +348,8 @@ def csv_testfunction(iteration, q, objective_func_name, minimum_evaluated,n_eval
     }
     new_data_df = pd.DataFrame(data)
 
-    # Se il file CSV esiste già, leggi i dati esistenti
-    if os.path.exists(result_file):
-        existing_df = pd.read_csv(result_file)
-    else:
-        existing_df = pd.DataFrame()
-
-    # Concatena i dati esistenti con i nuovi dati
-    updated_df = pd.concat([existing_df, new_data_df], ignore_index=True)
-
-    # Salva il DataFrame aggiornato come file CSV
-
-    updated_df.to_csv(result_file, index=False)
+    # Aggiungi i nuovi dati in coda al file
+    get_sink(result_file).append(new_data_df)
 
 
 
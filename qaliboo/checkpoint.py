@@ -0,0 +1,88 @@
+"""Checkpoint
+
+Periodic snapshots of an optimization, to resume it after a crash without
+evaluating the objective function again nor repeating the MCMC burn-in.
+
+A checkpoint directory holds:
+- state-<iteration>.npz: the arrays of the state, in a compressed NumPy archive;
+- manifest.json: the scalars of the state, the name of the archive with its
+  SHA-256, and the shape and dtype of every array.
+
+Both files are written to a temporary file and moved in place with os.replace.
+The manifest is written last: it always refers to a complete archive, so a
+crash while saving leaves the previous checkpoint valid. The older archives
+are only removed after the new manifest is in place.
+"""
+import datetime
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+
+def _atomic_write(path, write, mode='wb'):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, mode) as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save(directory, iteration, arrays, info):
+    '''
+    Save a checkpoint of the state after `iteration`.
+
+    Args:
+        directory (str): Checkpoint directory, created if missing.
+        iteration (int): Last completed iteration.
+        arrays (dict): Arrays of the state, by name.
+        info (dict): JSON serializable scalars of the state.
+    '''
+    os.makedirs(directory, exist_ok=True)
+    archive = f'state-{iteration}.npz'
+    archive_path = os.path.join(directory, archive)
+    _atomic_write(archive_path, lambda f: np.savez_compressed(f, **arrays))
+    manifest = {
+        'version': FORMAT_VERSION,
+        'iteration': iteration,
+        'created': datetime.datetime.now().isoformat(),
+        'archive': archive,
+        'sha256': _sha256(archive_path),
+        'arrays': {name: {'shape': list(np.shape(value)), 'dtype': str(np.asarray(value).dtype)}
+                   for name, value in arrays.items()},
+        'info': info,
+    }
+    _atomic_write(os.path.join(directory, MANIFEST), lambda f: json.dump(manifest, f, indent=2), mode='w')
+    for name in os.listdir(directory):
+        if name.startswith('state-') and name.endswith('.npz') and name != archive:
+            os.remove(os.path.join(directory, name))
+
+
+def load(directory):
+    '''
+    Load the last checkpoint saved in `directory`, returns (iteration, arrays, info).
+    '''
+    with open(os.path.join(directory, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest['version'] != FORMAT_VERSION:
+        raise ValueError(f"Checkpoint version {manifest['version']} is not supported (expected {FORMAT_VERSION})")
+    archive_path = os.path.join(directory, manifest['archive'])
+    if _sha256(archive_path) != manifest['sha256']:
+        raise ValueError(f'Checkpoint archive {archive_path} does not match its manifest')
+    with np.load(archive_path) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+    return manifest['iteration'], arrays, manifest['info']
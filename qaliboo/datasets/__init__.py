@@ -3,6 +3,8 @@
 The module contains three data sets and some auxiliary classes
 to load and read them.
 """
+import hashlib
+import json
 import logging
 
 import pandas as pd
@@ -17,11 +19,18 @@ _log.setLevel(logging.DEBUG)
 
 class Dataset:
 
+    _CACHE_VERSION = 1
+
     def __init__(self, csv_file: str, param_cols: List[str], target_col:str, 
-                 time_col:str, Realtime_col:str=None, reduce_to_unique:bool=False):
+                 time_col:str, Realtime_col:str=None, reduce_to_unique:bool=False,
+                 cache_dir:str=None, use_cache:bool=True):
         """
         Loads and processes data from a CSV file.
 
+        The CSV is read on first access to the data. The parameter matrix and the target,
+        time and real-time columns are then stored as .npy files in cache_dir and memory-mapped
+        by the following runs, as long as the SHA-256 of the CSV file is unchanged.
+
         Args:
             csv_file (str): Path to the CSV file.
             param_cols (List[str]): List of parameter column names.
@@ -29,6 +38,8 @@ class Dataset:
             time_col (str): Name of the time column.
             Realtime_col (str): Name of the real-time column.
             reduce_to_unique (bool, optional): If True, drops duplicate rows based on parameter and target columns. Defaults to False.
+            cache_dir (str, optional): Folder of the binary cache. Defaults to the .cache folder next to the datasets.
+            use_cache (bool, optional): If False, always read the CSV. Defaults to True.
         """
         self._param_cols = param_cols
         self._target_col = target_col
@@ -36,49 +47,121 @@ class Dataset:
         self._Realtime_col = Realtime_col
         self._reduce_to_unique = reduce_to_unique
         
-        csv_file = os.path.join(os.path.dirname(__file__), csv_file)
-        self._data = pd.read_csv(csv_file)
-        self._datatime = self._data[[time_col]]
-        
+        self._csv_file = os.path.join(os.path.dirname(__file__), csv_file)
+        self._cache_dir = cache_dir if cache_dir is not None else os.path.join(os.path.dirname(__file__), '.cache')
+        self._use_cache = use_cache
+        self._arrays = None
+        self._frames = {}
+
+    def _load(self):
+        if self._arrays is not None:
+            return self._arrays
+        arrays = None
+        if self._use_cache:
+            digest = _file_digest(self._csv_file)
+            arrays = self._load_cache(digest)
+        if arrays is None:
+            arrays = self._read_csv()
+            if self._use_cache:
+                self._save_cache(digest, arrays)
+        self._arrays = arrays
+        return arrays
+
+    def _read_csv(self):
+        data = pd.read_csv(self._csv_file)
+        arrays = {'time': data[self._time_col].values}
         if self._Realtime_col is not None:
-            self._dataRealtime = self._data[[Realtime_col]]
-        
-        if reduce_to_unique:
-            n_init_rows = len(self._data)
-            unique_data = self._data[param_cols + [target_col]].groupby(param_cols).agg(np.mean).reset_index()
+            arrays['real_time'] = data[self._Realtime_col].values
+
+        if self._reduce_to_unique:
+            n_init_rows = len(data)
+            unique_data = data[self._param_cols + [self._target_col]].groupby(self._param_cols).agg(np.mean).reset_index()
             n_rows = len(unique_data)
             if n_init_rows > n_rows:
-                logging.info(f'Duplicate data in {csv_file}. '
+                logging.info(f'Duplicate data in {self._csv_file}. '
                                 f'{n_init_rows - n_rows} rows could be dropped '
                                 f'({(n_init_rows - n_rows)/n_init_rows*100:.02f}%). '
                                 f'leaving {n_rows} rows')
                 logging.info(f'Dropping {n_init_rows - n_rows} rows')
-            self._data = unique_data
-       
+            data = unique_data
+
+        arrays['X'] = data[self._param_cols].values
+        arrays['y'] = data[self._target_col].values
+        return arrays
+
+    def _cache_prefix(self):
+        name = os.path.splitext(os.path.basename(self._csv_file))[0]
+        return os.path.join(self._cache_dir, name)
+
+    def _cache_key(self, digest):
+        return dict(version=self._CACHE_VERSION, sha256=digest, param_cols=self._param_cols,
+                    target_col=self._target_col, time_col=self._time_col,
+                    Realtime_col=self._Realtime_col, reduce_to_unique=self._reduce_to_unique)
+
+    def _load_cache(self, digest):
+        prefix = self._cache_prefix()
+        try:
+            with open(prefix + '.json') as f:
+                if json.load(f) != self._cache_key(digest):
+                    return None
+            names = ['X', 'y', 'time'] + (['real_time'] if self._Realtime_col is not None else [])
+            return {name: np.load(f'{prefix}.{name}.npy', mmap_mode='r') for name in names}
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self, digest, arrays):
+        if any(array.dtype == object for array in arrays.values()):
+            return
+        prefix = self._cache_prefix()
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(f'{prefix}.{name}.npy', array)
+            # The key is written last: a cache interrupted while saving is never used
+            with open(prefix + '.json', 'w') as f:
+                json.dump(self._cache_key(digest), f)
+        except OSError as e:
+            _log.warning(f'Cannot write the cache of {self._csv_file}: {e}')
 
     @property
     def X(self):
-        return self._data[self._param_cols]
+        if 'X' not in self._frames:
+            self._frames['X'] = pd.DataFrame(self._load()['X'], columns=self._param_cols, copy=False)
+        return self._frames['X']
 
     @property
     def y(self):
-        return self._data[self._target_col]
+        if 'y' not in self._frames:
+            self._frames['y'] = pd.Series(self._load()['y'], name=self._target_col, copy=False)
+        return self._frames['y']
     
     # Aggiustare qua perchè time è la variabile del machine learning
     @property
     def time(self):
-        return self._datatime[self._time_col]
+        if 'time' not in self._frames:
+            self._frames['time'] = pd.Series(self._load()['time'], name=self._time_col, copy=False)
+        return self._frames['time']
     
     @property
     def real_time(self):
         if self._Realtime_col == None: return None
-        return self._dataRealtime[self._Realtime_col]
+        if 'real_time' not in self._frames:
+            self._frames['real_time'] = pd.Series(self._load()['real_time'], name=self._Realtime_col, copy=False)
+        return self._frames['real_time']
     
     @property
     def folder(self):
         return os.path.dirname(__file__)
 
 
+def _file_digest(path, chunk_size=1 << 20):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
 LiGenTot = Dataset(
     csv_file='ligen_synth_table.csv',
     param_cols = ['ALIGN_SPLIT',
@@ -0,0 +1,45 @@
+"""Fantasy
+
+Kriging believer conditioning of the Gaussian processes on the points whose
+evaluation is still running.
+
+Passing the pending points to the KnowledgeGradientMCMC as points_being_sampled
+makes its Monte Carlo run over the union of the q new points and the p pending
+ones. Instead, the pending points can be added to copies of the GPs with their
+posterior mean as (fantasized) value, and the KG only optimizes the q new
+points. The GPs of the optimization are never modified: the fantasies are
+dropped with the copies, and the real values replace them when they arrive.
+
+The copies keep the cholesky factors of the GPs, which are extended with the
+rows of the p pending points (O(n^2 p) per GP) instead of being recomputed.
+"""
+import numpy as np
+
+from moe.optimal_learning.python import data_containers
+
+
+def kriging_believer_values(gaussian_process_list, points):
+    '''
+    Posterior mean at the points, averaged over the GPs of the hyperparameter samples.
+    '''
+    return np.mean([gp.compute_mean_of_points(points) for gp in gaussian_process_list], axis=0)
+
+
+def fantasize(gaussian_process_mcmc, gaussian_process_list, pending_points):
+    '''
+    Copies of gaussian_process_mcmc and of the GPs of gaussian_process_list whose historical data
+    also contain the pending points, with their kriging believer values.
+
+    Returns (gaussian_process_mcmc, gaussian_process_list) of the copies.
+    '''
+    if gaussian_process_mcmc.num_derivatives > 0:
+        raise ValueError('Kriging believer fantasies do not support derivative observations')
+    pending_points = np.atleast_2d(np.asarray(pending_points, dtype=float))
+    values = kriging_believer_values(gaussian_process_list, pending_points)
+
+    sample_points = [data_containers.SamplePoint(point, value) for point, value in zip(pending_points, values)]
+    fantasy_list = [gp.clone() for gp in gaussian_process_list]
+    fantasy_mcmc = gaussian_process_mcmc.clone()
+    for gp in fantasy_list + [fantasy_mcmc]:
+        gp.add_sampled_points(sample_points, incremental_cholesky=True)
+    return fantasy_mcmc, fantasy_list
@@ -33,6 +33,14 @@ class _AbstractFiniteDomain(abc.ABC):
         raise NotImplementedError
 
 
+def _query_k_nearest(kdtree, points, k, n_points):
+    """Query ``kdtree`` for the ``k`` nearest neighbours of each row of ``points``, always returning 2D arrays"""
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    k = min(k, n_points)
+    distances, indexes = kdtree.query(points, k=k, workers=-1)
+    return np.reshape(distances, (points.shape[0], k)), np.reshape(indexes, (points.shape[0], k))
+
+
 class FiniteDomain(_AbstractFiniteDomain):
 
     # TODO: Using this type of domain since C++ implementation
@@ -48,6 +56,9 @@ class FiniteDomain(_AbstractFiniteDomain):
         self._domain_bounds = [geometry_utils.ClosedInterval(np.min(data[:, i]).astype(float),
                                                              np.max(data[:, i]).astype(float))
                                for i in range(data.shape[1])]
+        # Contiguous copies of the bounds, used by compute_update_restricted_to_domain
+        self._lower_bounds = np.ascontiguousarray(np.min(data, axis=0), dtype=float)
+        self._upper_bounds = np.ascontiguousarray(np.max(data, axis=0), dtype=float)
 
     def sample_points_in_domain(self, sample_size: int, allow_previously_sampled: bool = False) -> np.ndarray:
         if allow_previously_sampled:
@@ -60,6 +71,17 @@ class FiniteDomain(_AbstractFiniteDomain):
         self._sampled[selected] = True
         return self._data[selected]
 
+    def get_sampled_mask(self) -> np.ndarray:
+        """Boolean mask of the points already returned by sample_points_in_domain"""
+        return self._sampled.copy()
+
+    def set_sampled_mask(self, mask: np.ndarray):
+        """Restore the mask returned by get_sampled_mask"""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self._sampled.shape:
+            raise ValueError(f'The mask has shape {mask.shape}, expected {self._sampled.shape}')
+        self._sampled = mask.copy()
+
     @property
     def dim(self) -> int:
         return self._data.shape[1]
@@ -103,38 +125,24 @@ class FiniteDomain(_AbstractFiniteDomain):
 
         :param max_relative_change: max change allowed per update (as a relative fraction of current distance to boundary)
         :type max_relative_change: float64 in (0, 1]
-        :param current_point: starting point
-        :type current_point: array of float64 with shape (dim)
-        :param update_vector: proposed update
-        :type update_vector: array of float64 with shape (dim)
-        :return: new update so that the final point remains inside the domain
-        :rtype: array of float64 with shape (dim)
+        :param current_point: starting point, or one starting point per row
+        :type current_point: array of float64 with shape (dim) or (num_points, dim)
+        :param update_vector: proposed update, or one update per row of ``current_point``
+        :type update_vector: array of float64 with the shape of ``current_point``
+        :return: new update so that the final point(s) remain inside the domain
+        :rtype: array of float64 with the shape of ``current_point``
 
         """
-        # TODO(GH-58): Vectorize the loop over j, step.
-        output_update = np.empty(self.dim)
-        # Note: since all boundary planes are axis-aligned, projecting becomes very simple.
-        for j, step in enumerate(update_vector):
-            # Distance to the nearest boundary in the j-th dimension
-            distance_to_boundary = np.fmin(
-                current_point[j] - self._domain_bounds[j].min,
-                self._domain_bounds[j].max - current_point[j])
-
-            desired_step = step
-            # If we are close to a boundary, optionally (via max_relative_change) limit the step size
-            # 0 < max_relative_change <= 1 so at worst we reach the boundary.
-            if np.fabs(step) > max_relative_change * distance_to_boundary:
-                # Move the max allowed distance, in the original direction of travel (obtained via copy-sign)
-                desired_step = np.copysign(max_relative_change * distance_to_boundary, step)
-
-            output_update[j] = desired_step
-
-        return output_update
+        return geometry_utils.compute_update_restricted_to_bounds(self._lower_bounds, self._upper_bounds,
+                                                                  max_relative_change, current_point, update_vector)
 
     def find_distances_indexes_closest_points(self, point: np.ndarray, k: int = 30) -> Tuple[float, int, np.ndarray]:
         distances, indexes = self._kdtree.query(point, k=k, workers=4)  # TODO: Decide the number of returned points k
         return distances, indexes, self._data[indexes]
 
+    def find_distances_indexes_closest_points_batch(self, points: np.ndarray, k: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        return _query_k_nearest(self._kdtree, points, k, self._data.shape[0])
+
     def find_distance_index_closest_point(self, point: np.ndarray) -> np.ndarray:
         return self.find_distances_indexes_closest_points(point, k=1)
 
@@ -149,10 +157,16 @@ class CPPFiniteDomain(_AbstractFiniteDomain):
         super().__init__(**kwargs)  # Just used for multi-class inheritance
         self._data = data
         self._cpp_finite_domain = C_GP.FiniteDomain(data.tolist(), data.shape[1])
+        # Spatial index used for the nearest neighbour lookups, the C++ domain
+        # computes (and sorts) the distance to every point at each query
+        self._kdtree = spatial.cKDTree(data)
 
         self._domain_bounds = [geometry_utils.ClosedInterval(np.min(data[:, i]).astype(float),
                                                              np.max(data[:, i]).astype(float))
                                for i in range(data.shape[1])]
+        # Contiguous copies of the bounds, used by compute_update_restricted_to_domain
+        self._lower_bounds = np.ascontiguousarray(np.min(data, axis=0), dtype=float)
+        self._upper_bounds = np.ascontiguousarray(np.max(data, axis=0), dtype=float)
 
     def sample_points_in_domain(self, sample_size: int, allow_previously_sampled: bool = False) -> np.ndarray:
         points_as_list = self._cpp_finite_domain.sample_points_in_domain(
@@ -163,6 +177,14 @@ class CPPFiniteDomain(_AbstractFiniteDomain):
             # Return something only if the list is not empty
             return np.array(points_as_list)
 
+    def get_sampled_mask(self) -> np.ndarray:
+        """Boolean mask of the points already returned by sample_points_in_domain"""
+        return np.array(self._cpp_finite_domain.get_selected_mask(), dtype=bool)
+
+    def set_sampled_mask(self, mask: np.ndarray):
+        """Restore the mask returned by get_sampled_mask"""
+        self._cpp_finite_domain.set_selected_mask([bool(selected) for selected in np.ravel(mask)])
+
     @property
     def dim(self) -> int:
         return self._cpp_finite_domain.dim()
@@ -210,39 +232,36 @@ class CPPFiniteDomain(_AbstractFiniteDomain):
 
         :param max_relative_change: max change allowed per update (as a relative fraction of current distance to boundary)
         :type max_relative_change: float64 in (0, 1]
-        :param current_point: starting point
-        :type current_point: array of float64 with shape (dim)
-        :param update_vector: proposed update
-        :type update_vector: array of float64 with shape (dim)
-        :return: new update so that the final point remains inside the domain
-        :rtype: array of float64 with shape (dim)
+        :param current_point: starting point, or one starting point per row
+        :type current_point: array of float64 with shape (dim) or (num_points, dim)
+        :param update_vector: proposed update, or one update per row of ``current_point``
+        :type update_vector: array of float64 with the shape of ``current_point``
+        :return: new update so that the final point(s) remain inside the domain
+        :rtype: array of float64 with the shape of ``current_point``
 
         """
-        # TODO(GH-58): Vectorize the loop over j, step.
-        output_update = np.empty(self.dim)
-        # Note: since all boundary planes are axis-aligned, projecting becomes very simple.
-        for j, step in enumerate(update_vector):
-            # Distance to the nearest boundary in the j-th dimension
-            distance_to_boundary = np.fmin(
-                current_point[j] - self._domain_bounds[j].min,
-                self._domain_bounds[j].max - current_point[j])
-
-            desired_step = step
-            # If we are close to a boundary, optionally (via max_relative_change) limit the step size
-            # 0 < max_relative_change <= 1 so at worst we reach the boundary.
-            if np.fabs(step) > max_relative_change * distance_to_boundary:
-                # Move the max allowed distance, in the original direction of travel (obtained via copy-sign)
-                desired_step = np.copysign(max_relative_change * distance_to_boundary, step)
-
-            output_update[j] = desired_step
-
-        return output_update
+        return geometry_utils.compute_update_restricted_to_bounds(self._lower_bounds, self._upper_bounds,
+                                                                  max_relative_change, current_point, update_vector)
 
     def find_distances_indexes_closest_points(self, point: np.ndarray, k=30) -> Tuple[float, int, np.ndarray]:
-        point_as_list = np.array(point).flatten().tolist()  # TODO: Multiple opposed cast, use something smarter
-        distances, indexes = self._cpp_finite_domain.find_distances_and_indexes_from_point(point_as_list)
-        distances, indexes = np.array(distances), np.array(indexes)
-        return distances[:k], indexes[:k], self._data[indexes][:k]
+        distances, indexes = self.find_distances_indexes_closest_points_batch(np.reshape(point, (1, self.dim)), k)
+        return distances[0], indexes[0], self._data[indexes[0]]
+
+    def find_distances_indexes_closest_points_batch(self, points: np.ndarray, k: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+        r"""Find the ``k`` points of the domain closest to each of the given points.
+
+        The lookup goes through a KD-tree built once on the domain data, so each query only
+        selects the ``k`` nearest points instead of sorting the distances to the whole dataset.
+
+        :param points: points to look up
+        :type points: array of float64 with shape (num_points, dim)
+        :param k: number of neighbours to return for each point (capped at the number of points in the domain)
+        :type k: int > 0
+        :return: distances and indexes of the closest points, ordered from closest to furthest
+        :rtype: tuple of (array of float64 with shape (num_points, k), array of int with shape (num_points, k))
+
+        """
+        return _query_k_nearest(self._kdtree, points, k, self._data.shape[0])
 
     def find_distance_index_closest_point(self, point: np.ndarray) -> np.ndarray:
         distances, indexes, closest_point = self.find_distances_indexes_closest_points(point, 1)
@@ -114,13 +114,19 @@ class ML_model:
         """
         Check if prediction of the point is inside the bounds.
         """
+        return bool(np.all(self.inside_mask(x)))
+
+    def inside_mask(self, x):
+        """
+        Check, point by point, if the prediction is inside the bounds.
+        """
         X = self.predict(x)
         if self._X_ub is not None and self._X_lb is not None:
-            return not np.any((X > self._X_ub) | (X < self._X_lb))
+            return ~((X > self._X_ub) | (X < self._X_lb))
         elif self._X_ub is not None:
-            return not np.any(X > self._X_ub)
+            return ~(X > self._X_ub)
         elif self._X_lb is not None:
-            return not np.any(X < self._X_lb)
+            return ~(X < self._X_lb)
         else:
             raise ValueError("Upper or lower bound should be provided.")
 
@@ -0,0 +1,259 @@
+"""Multistart
+
+Restarts of the acquisition function optimization (SA + SGA) are independent
+apart from their seed, so they can run on a pool of worker processes.
+
+The C++ objects (Gaussian processes, KnowledgeGradientMCMC, FiniteDomain) cannot
+be pickled: the workers receive a KGSnapshot with the GP hyperparameters, the
+historical data and the discretization points, and rebuild the acquisition
+function locally. The domain is handed to the workers once, when the pool is
+forked. The thread budget of the acquisition function is split among the
+workers.
+
+The OpenMP runtime does not survive a fork once its threads are running: the
+pool has to be created before the first multithreaded C++ call of the process.
+The Monte Carlo randomness of each restart is seeded from the seed of the
+restart, so the results do not depend on the number of workers.
+"""
+import collections
+import itertools
+import multiprocessing
+
+import numpy as np
+
+from moe.optimal_learning.python.cpp_wrappers import optimization as cpp_optimization, knowledge_gradient
+from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as KG
+from moe.optimal_learning.python.cpp_wrappers.covariance import SquareExponential
+from moe.optimal_learning.python.cpp_wrappers.gaussian_process import GaussianProcess
+from qaliboo import SGA as sga
+from qaliboo import runtime
+from qaliboo import simulated_annealing as SA
+
+
+KGSnapshot = collections.namedtuple('KGSnapshot', [
+    'token',
+    'hyperparameters_list',
+    'noise_variance_list',
+    'historical_data',
+    'derivatives',
+    'discrete_pts_list',
+    'points_being_sampled',
+    'num_to_sample',
+    'num_mc_iterations',
+    'ml_model',
+    'nm',
+    'penalize',
+    'error',
+    'sa_population_size',
+])
+
+_snapshot_counter = itertools.count()
+
+# Worker process state, set by _init_worker
+_worker_domain = None
+_worker_sgd_params_kwargs = None
+_worker_max_num_threads = 1
+_worker_kg = (None, None)  # (token, kg) of the last acquisition function rebuilt
+
+
+def take_snapshot(kg, ml_model=None, nm=False, penalize=False, error=1.0, sa_population_size=0):
+    '''
+    Build a picklable snapshot of the acquisition function `kg`.
+    '''
+    gaussian_process_mcmc = kg._gaussian_process_mcmc
+    return KGSnapshot(
+        token=next(_snapshot_counter),
+        hyperparameters_list=np.copy(gaussian_process_mcmc._hyperparameters_list),
+        noise_variance_list=np.copy(gaussian_process_mcmc._noise_variance_list),
+        historical_data=gaussian_process_mcmc.get_historical_data_copy(),
+        derivatives=np.copy(gaussian_process_mcmc._derivatives),
+        discrete_pts_list=[np.copy(pts) for pts in kg._discrete_pts_list],
+        points_being_sampled=np.copy(kg._points_being_sampled) if kg.num_being_sampled > 0 else None,
+        num_to_sample=kg.num_to_sample,
+        num_mc_iterations=kg._num_mc_iterations,
+        ml_model=ml_model,
+        nm=nm,
+        penalize=penalize,
+        error=error,
+        sa_population_size=sa_population_size,
+    )
+
+
+def rebuild_kg(snapshot, domain, sgd_params, max_num_threads=1):
+    '''
+    Rebuild the KnowledgeGradientMCMC described by `snapshot`, running with max_num_threads threads.
+    '''
+    gaussian_process_list = [GaussianProcess(SquareExponential(hyps), noise,
+                                             snapshot.historical_data, snapshot.derivatives)
+                             for hyps, noise in zip(snapshot.hyperparameters_list, snapshot.noise_variance_list)]
+    gaussian_process_mcmc = KG.GaussianProcessMCMC(snapshot.hyperparameters_list, snapshot.noise_variance_list,
+                                                   snapshot.historical_data, snapshot.derivatives)
+    ps_evaluator = knowledge_gradient.PosteriorMean(gaussian_process_list[0], 0)
+    ps_sgd_optimizer = cpp_optimization.GradientDescentOptimizer(domain, ps_evaluator, sgd_params)
+    return KG.KnowledgeGradientMCMC(gaussian_process_mcmc=gaussian_process_mcmc,
+                                    gaussian_process_list=gaussian_process_list,
+                                    num_fidelity=0,
+                                    inner_optimizer=ps_sgd_optimizer,
+                                    discrete_pts_list=snapshot.discrete_pts_list,
+                                    num_to_sample=snapshot.num_to_sample,
+                                    num_mc_iterations=snapshot.num_mc_iterations,
+                                    points_being_sampled=snapshot.points_being_sampled,
+                                    points_to_sample=None,
+                                    max_num_threads=max_num_threads)
+
+
+def optimize_point(seed, kg, domain, q, ml_model=None, nm=False, penalize=False, error=1.0, sa_population_size=0):
+    '''
+    Single restart: Simulated Annealing + Stochastic Gradient Ascent from a random point.
+
+    With sa_population_size > 0 the annealing is the population (parallel tempering) variant,
+    scoring all the neighbours of a step in a single C++ call.
+
+    Returns the point found and its (penalized) knowledge gradient.
+    '''
+    np.random.seed(seed)
+    init_point = np.array(domain.generate_uniform_random_points_in_domain(q))
+
+    if sa_population_size > 0:
+        new_point = SA.simulated_annealing_population(domain, kg, init_point, 40, 3 if ml_model is not None else 2, 0.1,
+                                                      population_size=sa_population_size, ml_model=ml_model)
+        # Gradient ascent refines the best point found by the annealing
+        if ml_model is not None:
+            new_point = sga.stochastic_gradient_ml(kg, domain, new_point, ml_model)
+        else:
+            new_point = sga.stochastic_gradient(kg, domain, new_point)
+    elif ml_model is not None:
+        new_point = SA.simulated_annealing_ML(domain, kg, ml_model, init_point, 40, 3, 0.1)
+        new_point = sga.stochastic_gradient_ml(kg, domain, init_point, ml_model)
+    else:
+        new_point = SA.simulated_annealing(domain, kg, init_point, 40, 2, 0.1)
+        new_point = sga.stochastic_gradient(kg, domain, init_point)
+
+    kg.set_current_point(new_point)
+    # Machine Learning Penalization method
+    identity = 1
+    if nm:
+        identity *= ml_model.nascent_minima(new_point)
+    if penalize:
+        identity *= ml_model.exponential_penality(new_point, 7, error)
+    kg_value = kg.compute_knowledge_gradient_mcmc()*identity
+    return new_point, kg_value
+
+
+def seed_randomness(kg, seed):
+    '''
+    Seed the Monte Carlo randomness of `kg` from the seed of a restart.
+    '''
+    kg._randomness.SetExplicitUniformGeneratorSeed(int(seed))
+    kg._randomness.SetExplicitNormalRNGSeed(int(seed))
+
+
+def optimize_points(seeds, kg, domain, q, ml_model=None, nm=False, penalize=False, error=1.0, sa_population_size=0):
+    '''
+    The restarts of optimize_point run one after the other, with the same randomness
+    as on the workers of a MultistartPool.
+
+    Returns the list of (point, kg_value) in the order of the seeds.
+    '''
+    results = []
+    for seed in seeds:
+        seed_randomness(kg, seed)
+        results.append(optimize_point(seed, kg, domain, q, ml_model, nm, penalize, error, sa_population_size))
+    return results
+
+
+def optimize_points_lockstep(seeds, kg, domain, q, ml_model=None, nm=False, penalize=False, error=1.0, sa_population_size=0):
+    '''
+    All the restarts of optimize_point at once: each seed gives the starting point optimize_point
+    uses, then the gradient ascent advances all the restarts in lockstep and their knowledge
+    gradients are computed in a single C++ call.
+
+    optimize_point starts the gradient ascent from its random point and discards the result of
+    simulated_annealing/simulated_annealing_ML, which only advance the NumPy RNG (reseeded by the
+    next restart): here they are not run. The population annealing, whose result is kept, is.
+
+    Returns the list of (point, kg_value) in the order of the seeds.
+    '''
+    starting_points = []
+    for seed in seeds:
+        np.random.seed(seed)
+        init_point = np.array(domain.generate_uniform_random_points_in_domain(q))
+        if sa_population_size > 0:
+            init_point = SA.simulated_annealing_population(domain, kg, init_point, 40, 3 if ml_model is not None else 2, 0.1,
+                                                           population_size=sa_population_size, ml_model=ml_model)
+        starting_points.append(init_point)
+
+    if ml_model is not None:
+        new_points = sga.stochastic_gradient_ml_lockstep(kg, domain, np.array(starting_points), ml_model)
+    else:
+        new_points = sga.stochastic_gradient_lockstep(kg, domain, np.array(starting_points))
+
+    kg_values = np.array(kg.evaluate_at_point_list(new_points))
+    # Machine Learning Penalization method
+    for i, new_point in enumerate(new_points):
+        if nm:
+            kg_values[i] *= ml_model.nascent_minima(new_point)
+        if penalize:
+            kg_values[i] *= ml_model.exponential_penality(new_point, 7, error)
+    return list(zip(new_points, kg_values))
+
+
+def _init_worker(domain, sgd_params_kwargs, max_num_threads):
+    global _worker_domain, _worker_sgd_params_kwargs, _worker_max_num_threads, _worker_kg
+    _worker_domain = domain
+    _worker_sgd_params_kwargs = sgd_params_kwargs
+    _worker_max_num_threads = max_num_threads
+    _worker_kg = (None, None)
+    # Kept for the lifetime of the worker
+    runtime.limit_threads(max_num_threads)
+
+
+def _optimize_point_from_snapshot(args):
+    global _worker_kg
+    snapshot, seed = args
+    token, kg = _worker_kg
+    if token != snapshot.token:
+        # All the restarts of an iteration share the snapshot: rebuild only once per worker
+        sgd_params = cpp_optimization.GradientDescentParameters(**_worker_sgd_params_kwargs)
+        kg = rebuild_kg(snapshot, _worker_domain, sgd_params, _worker_max_num_threads)
+        _worker_kg = (snapshot.token, kg)
+    # The Monte Carlo randomness only depends on the seed, not on the worker running the restart
+    seed_randomness(kg, seed)
+    return optimize_point(seed, kg, _worker_domain, snapshot.num_to_sample, snapshot.ml_model,
+                          snapshot.nm, snapshot.penalize, snapshot.error, snapshot.sa_population_size)
+
+
+class MultistartPool:
+
+    def __init__(self, n_workers, domain, sgd_params_kwargs, max_num_threads=None):
+        """
+        Persistent pool of processes running the restarts of the multistart optimization.
+        Create it before the first OpenMP (multithreaded C++) call of the process.
+
+        Args:
+            n_workers (int): Number of worker processes.
+            domain: Domain of the optimization, handed to the workers when they are forked.
+            sgd_params_kwargs (dict): Arguments of the GradientDescentParameters of the inner optimizer.
+            max_num_threads (int, optional): Threads of all the workers together, each worker gets
+                max_num_threads // n_workers of them (at least 1). Defaults to one thread per worker.
+        """
+        worker_num_threads = max(1, (max_num_threads or n_workers) // n_workers)
+        # The domain wraps C++ objects that cannot be pickled, the workers inherit it by forking
+        context = multiprocessing.get_context('fork')
+        self._n_workers = n_workers
+        self._pool = context.Pool(n_workers, initializer=_init_worker,
+                                  initargs=(domain, sgd_params_kwargs, worker_num_threads))
+
+    @property
+    def n_workers(self):
+        return self._n_workers
+
+    def optimize(self, snapshot, seeds):
+        '''
+        Run one restart per seed, returns the list of (point, kg_value) in the order of the seeds.
+        '''
+        return self._pool.map(_optimize_point_from_snapshot, [(snapshot, seed) for seed in seeds], chunksize=1)
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
@@ -3,7 +3,6 @@ import time
 import numpy as np
 import numpy.linalg
 import random
-from tqdm import tqdm 
 from moe.optimal_learning.python import data_containers
 from moe.optimal_learning.python.cpp_wrappers import log_likelihood_mcmc, optimization as cpp_optimization, knowledge_gradient
 from moe.optimal_learning.python.python_version import optimization as py_optimization
@@ -13,9 +12,13 @@ from moe.optimal_learning.python.cpp_wrappers import knowledge_gradient_mcmc as
 from examples import  auxiliary
 from qaliboo import SGA as sga
 from qaliboo.machine_learning_models import ML_model
-import multiprocessing
 from qaliboo import aux
+from qaliboo import checkpoint
 from qaliboo import simulated_annealing as SA 
+from qaliboo import multistart
+from qaliboo import fantasy
+from qaliboo import runtime
+from qaliboo import scheduler
 from sklearn.metrics import mean_absolute_percentage_error as mape
 
 logging.basicConfig(level=logging.NOTSET)
@@ -25,7 +28,13 @@ _log.setLevel(logging.DEBUG)
 class ParallelMaliboo:
     def __init__(self, n_initial_points: int = 10, n_iterations: int = 30, batch_size:int = 4,
                  m_domain_discretization: int= 30, objective_func = None, domain=None, objective_func_name=None, lb: float=None, 
-                 ub: float=None, dub:float=None, nm:bool=False, uniform_sample:bool=True, n_restarts:int = 15, save:bool=False):
+                 ub: float=None, dub:float=None, nm:bool=False, uniform_sample:bool=True, n_restarts:int = 15, save:bool=False,
+                 n_jobs:int = 1, sa_population_size:int = 0, incremental_chain_length:int = None,
+                 full_chain_every:int = None, adaptive_mcmc:bool = False, kg_num_threads:int = None,
+                 lockstep_sga:bool = False, eval_workers:int = None, eval_start_method:str = 'fork',
+                 fantasize_pending:bool = False, checkpoint_dir:str = None, checkpoint_every:int = 1,
+                 resume_from:str = None, result_backend:str = 'csv', result_flush_every:int = 1,
+                 result_fsync_every:int = 0):
         """
         Initializes an instance of ParallelMaliboo.
 
@@ -41,6 +50,28 @@ class ParallelMaliboo:
             uniform_sample (bool): True if domain is to be uniformly sampled (False if sample from the global optimum).
             n_restarts (int): Number of restarts for optimization.
             save (bool): True if the results have to be saved
+            n_jobs (int): Number of worker processes running the restarts of the multistart optimization (1 runs them sequentially).
+            sa_population_size (int): Number of chains of the population (parallel tempering) simulated annealing (0 uses the single chain one).
+            incremental_chain_length (int): Length of the warm-started MCMC chain run when the GP is updated with a batch of points (None runs full chains).
+            full_chain_every (int): Run a full MCMC chain every full_chain_every GP updates.
+            adaptive_mcmc (bool): True if the MCMC chains stop early based on autocorrelation and acceptance statistics.
+            kg_num_threads (int): Number of threads of the acquisition function computations, the other cores are left to the
+                objective function evaluations (None uses DEFAULT_MAX_NUM_THREADS).
+            lockstep_sga (bool): True if the gradient ascents of all the restarts run in lockstep (one C++ call per step),
+                used when n_jobs is 1.
+            eval_workers (int): Number of worker processes evaluating the objective function (None uses one per point
+                evaluated in parallel).
+            eval_start_method (str): Start method of the evaluation workers ('fork', 'spawn' or 'forkserver'), the
+                workers not forked load the objective function from objective_func_name.
+            fantasize_pending (bool): True if the points still being evaluated are added to copies of the GPs with their
+                posterior mean as value (kriging believer), instead of being passed to the KG as points being sampled.
+            checkpoint_dir (str): Directory of the checkpoints of the optimization (None does not save them).
+            checkpoint_every (int): Save a checkpoint every checkpoint_every iterations.
+            resume_from (str): Checkpoint directory to resume the optimization from: the initial points are not
+                evaluated again and the MCMC chains continue from the saved walkers, without burn-in.
+            result_backend (str): Format of the result files written when save is True ('csv', 'npz' or 'parquet').
+            result_flush_every (int): Number of rows of a result file kept in memory before writing them.
+            result_fsync_every (int): Force the result files to disk every result_fsync_every writes (0 never).
         """
         self._n_initial_points = n_initial_points
         self._n_iterations = n_iterations
@@ -54,34 +85,68 @@ class ParallelMaliboo:
         self._uniform_sample = uniform_sample
         self._n_restarts=n_restarts
         self._save=save
+        self._objective_func_name = objective_func_name
         self._dat = aux.define_dat(objective_func_name)
         self._dub = dub
+        self._n_jobs = n_jobs
+        self._sa_population_size = sa_population_size
+        self._lockstep_sga = lockstep_sga
+        self._multistart_pool = None
+        self._eval_workers = eval_workers
+        self._eval_start_method = eval_start_method
+        self._evaluation_pool = None
+        self._fantasize_pending = fantasize_pending
+        self._checkpoint_dir = checkpoint_dir
+        self._checkpoint_every = checkpoint_every
+        self._first_iteration = 0
+        aux.configure_sinks(result_backend, result_flush_every, result_fsync_every)
+        # Persistent randomness and thread budget of all the KG computations
+        self._runtime = runtime.RuntimeConfig(kg_num_threads)
         
         self._py_sgd_params_ps = py_optimization.GradientDescentParameters(
             max_num_steps=1000, max_num_restarts=3,
             num_steps_averaged=15, gamma=0.7, pre_mult=1.0,
             max_relative_change=0.02, tolerance=1.0e-10)
 
-        self._cpp_sgd_params_ps = cpp_optimization.GradientDescentParameters(
+        self._cpp_sgd_params_ps_kwargs = dict(
             num_multistarts=5, max_num_steps=6, max_num_restarts=3,
             num_steps_averaged=3, gamma=0.0, pre_mult=1.0,
             max_relative_change=0.2, tolerance=1.0e-10)
+        self._cpp_sgd_params_ps = cpp_optimization.GradientDescentParameters(**self._cpp_sgd_params_ps_kwargs)
 
         self._global_time=0
 
-        #initial_points_array = self._domain.generate_uniform_random_points_in_domain(n_initial_points)
-        initial_points_array= self._domain.sample_points_in_domain(n_initial_points)
+        if self._n_jobs > 1:
+            # Forked before the MCMC training starts the OpenMP threads of this process
+            self.multistart_pool
+
+        if resume_from is not None:
+            iteration, state, info = checkpoint.load(resume_from)
+            _log.info(f"Resuming the optimization from the checkpoint of iteration {iteration}")
+            self._first_iteration = iteration + 1
+            initial_data = data_containers.HistoricalData(dim=objective_func.dim)
+            initial_data.append_historical_data(state['points_sampled'], state['points_sampled_value'],
+                                                state['points_sampled_noise_variance'])
+            initial_points_array = state['points_sampled']
+            self._min_evaluated = info['min_evaluated']
+            self._global_time = info['global_time']
+            self._objective_func.add_evaluation_count(info['evaluation_count'] - self._objective_func.evaluation_count)
+            if 'sampled_mask' in state:
+                self._domain.set_sampled_mask(state['sampled_mask'])
+        else:
+            #initial_points_array = self._domain.generate_uniform_random_points_in_domain(n_initial_points)
+            initial_points_array= self._domain.sample_points_in_domain(n_initial_points)
 
-        initial_points_value, initial_points_index, initial_points_time = self.evaluate_next_points(initial_points_array)
+            initial_points_value, initial_points_index, initial_points_time = self.evaluate_next_points(initial_points_array)
 
-        initial_points = [data_containers.SamplePoint(pt,
-                                              initial_points_value[num])
-                  for num, pt in enumerate(initial_points_array)]
-        
-        initial_data = data_containers.HistoricalData(dim=objective_func.dim)
-        initial_data.append_sample_points(initial_points)
+            initial_points = [data_containers.SamplePoint(pt,
+                                                  initial_points_value[num])
+                      for num, pt in enumerate(initial_points_array)]
+
+            initial_data = data_containers.HistoricalData(dim=objective_func.dim)
+            initial_data.append_sample_points(initial_points)
 
-        self._min_evaluated = np.min(initial_points_value)
+            self._min_evaluated = np.min(initial_points_value)
 
         # Define the Machine Learning Model
         self._use_ml=False
@@ -89,8 +154,13 @@ class ParallelMaliboo:
             self._use_ml = True
             _log.info("You have selected an acquisition function with ML integrated")
             if dub is None: dub = ub
-            self._ml_model = ML_model(X_data=initial_points_array, 
-                        y_data=np.array([objective_func.evaluate_time(pt) for pt in initial_points_array]), 
+            if resume_from is not None:
+                X_data, y_data = state['ml_X_data'], state['ml_y_data']
+            else:
+                X_data = initial_points_array
+                y_data = np.array([objective_func.evaluate_time(pt) for pt in initial_points_array])
+            self._ml_model = ML_model(X_data=X_data, 
+                        y_data=y_data, 
                         X_ub=dub,
                         X_lb=lb) 
         else: 
@@ -105,28 +175,49 @@ class ParallelMaliboo:
             chain_length=1000,
             burnin_steps=2000,
             n_hypers=1,
-            noisy=True
+            noisy=True,
+            incremental_chain_length=incremental_chain_length,
+            max_incremental_points=max(batch_size, 1),
+            full_chain_every=full_chain_every,
+            adaptive_stop=adaptive_mcmc
         )
-        self._gp_loglikelihood.train()
+        if resume_from is not None:
+            # Continue the chains from the saved walkers, skipping the burn-in
+            self._gp_loglikelihood.set_state({name[len('mcmc_'):]: value for name, value in state.items()
+                                              if name.startswith('mcmc_')})
+        else:
+            self._gp_loglikelihood.train()
 
         
         if self._save:
-            if self._nm: word = 'NM'
-            else: word = 'NoNM'
-            self._result_folder = aux.create_result_folder(f'Query_async_{dub/1000}_{word}')
-            aux.csv_init(self._result_folder, initial_points_index, self._dat)
-            aux.csv_history(self._result_folder,-1,initial_points_index, self._dat)
+            if resume_from is not None and info.get('result_folder'):
+                # Keep appending to the results of the interrupted run
+                self._result_folder = info['result_folder']
+            else:
+                if self._nm: word = 'NM'
+                else: word = 'NoNM'
+                self._result_folder = aux.create_result_folder(f'Query_async_{dub/1000}_{word}')
+                if resume_from is None:
+                    aux.csv_init(self._result_folder, initial_points_index, self._dat)
+                    aux.csv_history(self._result_folder,-1,initial_points_index, self._dat)
     
     
-    def sync_optimization(self):
+    def sync_optimization(self, pipelined=False):
         '''
         Syncronous Knoledge Gradient optimization.
+
+        With pipelined, each batch is evaluated by the evaluation workers while the model is
+        updated with the previous batch (see pipelined_optimization).
         '''
         _log.info("PARALLEL SYNCRONOUS BAYESIAN OPTIMIZATION")
-        for s in range(self._n_iterations):
-            self.iteration_step(s)
-            if self._objective_func.evaluation_count>1000:
-                break
+        if pipelined:
+            self.pipelined_optimization()
+        else:
+            for s in range(self._first_iteration, self._n_iterations):
+                self.iteration_step(s)
+                self.checkpoint(s)
+                if self._objective_func.evaluation_count>1000:
+                    break
 
         _log.info("\nOptimization finished successfully")
 
@@ -136,10 +227,7 @@ class ParallelMaliboo:
         '''
         _log.info(f"{s}th iteration,  "f"q={self._q}")
         init_alg_time = time.time()
-        # Define acquisition function
-        kg = self.acquisition_function(self._q)
-        # Multistart optimization of the acquisition function
-        next_points = self.multistart_optimization(kg, self._q)
+        next_points = self.propose_next_points(self._q)
         # Evaluation objective function 
         next_points_value, next_points_index, next_points_time = self.evaluate_next_points(next_points)        # using sequential approach
         #next_points_value, next_points_index, next_points_time = self.evaluate_parallel_next_points(next_points) # using multiprocessorr
@@ -159,15 +247,78 @@ class ParallelMaliboo:
         
         self._global_time += max_time + alg_time
 
+        self.report_iteration(s, self._q, target, mape_value, suggested_minimum)
+
+    def pipelined_optimization(self):
+        '''
+        Pipelined syncronous optimization.
+
+        Batch s is evaluated by the evaluation workers while the main process proposes batch s+1
+        (with batch s as points being sampled) and then updates the model with batch s-1, so the
+        model update and the proposal overlap the evaluations. Each iteration takes the longest
+        of the two instead of their sum.
+        '''
+        if self._first_iteration >= self._n_iterations:
+            return
+        pool = self.evaluation_pool(self._q)
+        init_alg_time = time.time()
+        next_points = self.propose_next_points(self._q)
+        self._global_time += time.time() - init_alg_time
+        futures = pool.map_async(next_points)
+        init_alg_time = time.time()
+        for s in range(self._first_iteration, self._n_iterations):
+            _log.info(f"{s}th iteration,  "f"q={self._q}")
+            points = next_points
+            last = s == self._n_iterations - 1
+            if not last:
+                # Batch s is still being evaluated
+                next_points = self.propose_next_points(self._q, points)
+            alg_time = time.time() - init_alg_time
+            next_points_value, next_points_index, next_points_time = self.collect_next_points(futures)
+            last = last or self._objective_func.evaluation_count > 1000
+            init_alg_time = time.time()
+            if not last:
+                futures = pool.map_async(next_points)
+
+            max_time = max(next_points_time)
+            _log.info(f"Optimization algorithm takes {(alg_time)} seconds")
+            _log.info(f"Evaluate the objective function takes {(max_time)} seconds")
+            self._global_time += max(max_time, alg_time)
+
+            # Update the regression model and the gaussian process while batch s+1 is evaluated
+            target, mape_value = self.update_model(points, next_points_value, next_points_index, s)
+            suggested_minimum = self.find_suggested_minimum()
+            self.report_iteration(s, self._q, target, mape_value, suggested_minimum)
+            # Batch s+1 is still being evaluated: it is proposed again after a resume
+            self.checkpoint(s)
+            if last:
+                break
+        # The last update does not overlap any evaluation
+        self._global_time += time.time() - init_alg_time
+
+    def propose_next_points(self, q, points_being_sampled=None):
+        '''
+        Optimize the acquisition function to choose the next q points.
+        '''
+        # Define acquisition function
+        kg = self.acquisition_function(q, points_being_sampled)
+        # Multistart optimization of the acquisition function
+        with self._runtime.limit_threads():
+            return self.multistart_optimization(kg, q)
+
+    def report_iteration(self, s, q, target, mape_value, suggested_minimum):
+        '''
+        Log and save the results of a syncronous iteration.
+        '''
         # Compute unfeasible points
         if self._use_ml: unfeasible_points = self._ml_model.out_count(target)
         else: unfeasible_points = 0
 
-        self.log_iteration_result(suggested_minimum, s, self._q, unfeasible_points)
+        self.log_iteration_result(suggested_minimum, s, q, unfeasible_points, mape_value)
 
         if self._save:
-            aux.csv_info(s,self._q, self._min_evaluated, self._objective_func.evaluation_count,
-                         self._global_time, unfeasible_points, mape_value, self._result_folder)
+            aux.csv_info(s, q, self._objective_func.evaluation_count,
+                         self._global_time, unfeasible_points, mape_value, self._result_folder, self._error)
     
     def acquisition_function(self, q, points_being_sampled=None):
         '''
@@ -176,18 +327,26 @@ class ParallelMaliboo:
         cpp_gaussian_process = self._gp_loglikelihood.models[0]
         # Sampling of the domain discretization (by or not sampling from the global optima)
         discrete_pts_list = self.domain_sample(self._uniform_sample,cpp_gaussian_process)
-        ps_evaluator = knowledge_gradient.PosteriorMean(self._gp_loglikelihood.models[0], 0)
+        gaussian_process_mcmc = self._gp_loglikelihood._gaussian_process_mcmc
+        gaussian_process_list = self._gp_loglikelihood.models
+        if self._fantasize_pending and points_being_sampled is not None and len(points_being_sampled) > 0:
+            # The Monte Carlo of the KG only runs over the q new points, the real GPs are left untouched
+            gaussian_process_mcmc, gaussian_process_list = fantasy.fantasize(gaussian_process_mcmc, gaussian_process_list,
+                                                                             points_being_sampled)
+            points_being_sampled = None
+        ps_evaluator = knowledge_gradient.PosteriorMean(gaussian_process_list[0], 0)
         ps_sgd_optimizer = cpp_optimization.GradientDescentOptimizer(self._domain,ps_evaluator,self._cpp_sgd_params_ps)        
         
-        kg = KG.KnowledgeGradientMCMC(gaussian_process_mcmc=self._gp_loglikelihood._gaussian_process_mcmc,
-                                        gaussian_process_list=self._gp_loglikelihood.models,
+        kg = KG.KnowledgeGradientMCMC(gaussian_process_mcmc=gaussian_process_mcmc,
+                                        gaussian_process_list=gaussian_process_list,
                                         num_fidelity=0,
                                         inner_optimizer=ps_sgd_optimizer,
                                         discrete_pts_list=discrete_pts_list,
                                         num_to_sample=q,
                                         num_mc_iterations=2**7,
                                         points_being_sampled=points_being_sampled,
-                                        points_to_sample=None)
+                                        points_to_sample=None,
+                                        **self._runtime.acquisition_kwargs())
         return kg
 
     def multistart_optimization(self, kg, q):
@@ -197,8 +356,26 @@ class ParallelMaliboo:
         seeds = np.random.randint(0, 10000, size=self._n_restarts)
         report_point=[]
         kg_list = []
-        for i in range(self._n_restarts):
-            new_point, kg_value = self.optimize_point(seeds[i], kg, q)
+        if self._n_jobs > 1:
+            # Restarts run on the worker pool, results come back in the order of the seeds
+            self.update_error()
+            snapshot = multistart.take_snapshot(kg, self._ml_model if self._use_ml else None, self._nm,
+                                                self._ub is not None or self._lb is not None, self._error,
+                                                self._sa_population_size)
+            results = self.multistart_pool.optimize(snapshot, seeds)
+        elif self._lockstep_sga:
+            self.update_error()
+            results = multistart.optimize_points_lockstep(seeds, kg, self._domain, q,
+                                                          self._ml_model if self._use_ml else None, self._nm,
+                                                          self._ub is not None or self._lb is not None, self._error,
+                                                          self._sa_population_size)
+        else:
+            self.update_error()
+            results = multistart.optimize_points(seeds, kg, self._domain, q,
+                                                 self._ml_model if self._use_ml else None, self._nm,
+                                                 self._ub is not None or self._lb is not None, self._error,
+                                                 self._sa_population_size)
+        for new_point, kg_value in results:
             report_point.append(new_point)
             kg_list.append(kg_value)
         index = np.argmax(kg_list)
@@ -209,31 +386,99 @@ class ParallelMaliboo:
         '''
         Gradient Ascent + Machine Learning Optimization.
         ''' 
-        np.random.seed(seed)
-        init_point = np.array(self._domain.generate_uniform_random_points_in_domain(q))
-        # Stocastic Gradient Ascent
+        self.update_error()
+        multistart.seed_randomness(kg, seed)
+        return multistart.optimize_point(seed, kg, self._domain, q,
+                                         self._ml_model if self._use_ml else None, self._nm,
+                                         self._ub is not None or self._lb is not None, self._error,
+                                         self._sa_population_size)
+
+    def update_error(self):
+        '''
+        Update the error used in the exponential penalization of the ML model.
+        '''
         if self._objective_func.evaluation_count - self._n_initial_points > 50:
             self._error = 1.0
         else:
             self._error = 1.5 - 0.01*(self._objective_func.evaluation_count - self._n_initial_points)
             self._error = 1.0
+        return self._error
+
+    @property
+    def multistart_pool(self):
+        '''
+        Persistent pool of workers for the multistart optimization, created with the optimizer
+        (before any multithreaded C++ call) or on first use.
+        '''
+        if self._multistart_pool is None:
+            self._multistart_pool = multistart.MultistartPool(self._n_jobs, self._domain, self._cpp_sgd_params_ps_kwargs,
+                                                              self._runtime.max_num_threads)
+        return self._multistart_pool
 
+    def evaluation_pool(self, n_workers, time_proportion=None):
+        '''
+        Persistent pool of workers evaluating the objective function, created on first use
+        (and recreated when the number of workers or the time proportion change).
+        '''
+        n_workers = self._eval_workers or n_workers
+        pool = self._evaluation_pool
+        if pool is None or pool.n_workers != n_workers or pool.time_proportion != time_proportion:
+            if pool is not None:
+                pool.shutdown()
+            self._evaluation_pool = scheduler.EvaluationPool(self._objective_func, n_workers, self._eval_start_method,
+                                                             self._objective_func_name, time_proportion)
+        return self._evaluation_pool
+
+    def checkpoint(self, s):
+        '''
+        Save a checkpoint of the state after iteration s, every checkpoint_every iterations.
+
+        The evaluations still running are not part of the checkpoint.
+        '''
+        if self._checkpoint_dir is None or (s + 1) % self._checkpoint_every != 0:
+            return
+        historical_data = self._gp_loglikelihood.get_historical_data_copy()
+        state = {
+            'points_sampled': historical_data.points_sampled,
+            'points_sampled_value': historical_data.points_sampled_value,
+            'points_sampled_noise_variance': historical_data.points_sampled_noise_variance,
+        }
+        state.update({f'mcmc_{name}': value for name, value in self._gp_loglikelihood.get_state().items()})
         if self._use_ml:
-            new_point = SA.simulated_annealing_ML(self._domain, kg, self._ml_model, init_point, 40, 3, 0.1)
-            new_point = sga.stochastic_gradient_ml(kg, self._domain, init_point, self._ml_model)
-        else:
-            new_point = SA.simulated_annealing(self._domain, kg, init_point, 40, 2, 0.1)
-            new_point = sga.stochastic_gradient(kg, self._domain, init_point)
-            
-        kg.set_current_point(new_point)
-        # Machine Learning Penalization method
-        identity = 1
-        if self._nm:    
-            identity *= self._ml_model.nascent_minima(new_point)
-        if self._ub is not None or self._lb is not None:
-            identity*=self._ml_model.exponential_penality(new_point, 7, self._error)
-        kg_value = kg.compute_knowledge_gradient_mcmc()*identity 
-        return new_point, kg_value  
+            state['ml_X_data'] = self._ml_model.X_data
+            state['ml_y_data'] = self._ml_model.y_data
+        if hasattr(self._domain, 'get_sampled_mask'):
+            state['sampled_mask'] = self._domain.get_sampled_mask()
+        info = {
+            'min_evaluated': float(self._min_evaluated),
+            'global_time': float(self._global_time),
+            'evaluation_count': int(self._objective_func.evaluation_count),
+            'result_folder': self._result_folder if self._save else None,
+        }
+        if self._save:
+            # The results saved so far match the checkpoint
+            aux.flush_sinks()
+        checkpoint.save(self._checkpoint_dir, s, state, info)
+        _log.info(f"Checkpoint of iteration {s} saved in {self._checkpoint_dir}")
+
+    def close(self):
+        '''
+        Release the worker processes and write the buffered results.
+        '''
+        if self._multistart_pool is not None:
+            self._multistart_pool.close()
+            self._multistart_pool = None
+        if self._evaluation_pool is not None:
+            self._evaluation_pool.shutdown()
+            self._evaluation_pool = None
+        if self._save:
+            aux.flush_sinks()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
     def _evaluate_point(self, pt):
@@ -244,16 +489,6 @@ class ParallelMaliboo:
         else:
             return result, None, None
     
-    def _wrapper_func(self, pt, queue):
-        result = self._evaluate_point(pt)
-        '''
-        if result[2] is not None:
-            print(f'Waiting time : {result[2]/self._time_proportion}')
-            time.sleep(result[2]/self._time_proportion)
-        '''
-        queue.put(result)
-        return
-    
     def evaluate_next_points(self, next_points):
         '''
         Evaluate objective function at the next points in sequential order (just one process).
@@ -271,20 +506,16 @@ class ParallelMaliboo:
     
     def evaluate_parallel_next_points(self, next_points):
         '''
-        Evaluate objective function at the next points using process in parallel.
-        '''
-        results = []
-        queue = multiprocessing.Queue()
-        processes = []
-        for pt in next_points:
-            process = multiprocessing.Process(target=self._wrapper_func, args=(pt, queue))
-            processes.append(process)
-            process.start()
-        for process in processes:
-            process.join()
-        while not queue.empty():
-            results.append(queue.get())
-        self._objective_func.add_evaluation_count(self._q)
+        Evaluate objective function at the next points on the pool of evaluation workers.
+        '''
+        return self.collect_next_points(self.evaluation_pool(len(next_points)).map_async(next_points))
+
+    def collect_next_points(self, futures):
+        '''
+        Wait for the evaluations started on the evaluation workers, returns their values, indexes and times.
+        '''
+        results = [future.result() for future in futures]
+        self._objective_func.add_evaluation_count(len(results))
         next_points_value, next_points_index, next_points_time = zip(*results)
         return np.array(next_points_value), np.array(next_points_index), np.array(next_points_time)
     
@@ -387,85 +618,50 @@ class ParallelMaliboo:
         MAPE: {map_value}
         """)
 
-    # Definisci la tua funzione func_obj per valutare i punti (Inglobala con l'altra)
-    def func_obj(self, point, queue):
-        '''
-        Fake simulation of the objective function
-        '''
-        result = self._objective_func.evaluate(point)
-        if isinstance(result, tuple):
-            poi_v, poi_i, poi_t = result
-            fake_time = poi_t/self._time_proportion
-            time.sleep(fake_time)
-            queue.put((point, poi_v, poi_i))  
-        else: queue.put((point, poi_v, None))
-        return 
-    
-    def async_optimization(self, t_restart, n_process):
+    def async_optimization(self, t_restart=0, n_process=4):
         '''
         Asyncronous Optimization.
 
+        The evaluations are event-driven: the model is updated as soon as any evaluation
+        finishes and the freed slots immediately receive new points.
+
             Args.
-            t_restarts: waiting time before compute a new optimization (iter).
+            t_restart: not used anymore, the optimization no longer waits between two checks of the processes
+                (kept for compatibility).
             n_process: number of parallelism of the algorithm.
         '''
         _log.info("PARALLEL ASYNCRONOUS BAYESIAN OPTIMIZATION")
-        queue = multiprocessing.Queue() # Create a common queue to all process
-        active_process = []
-        results = []
-        assigned_points = {}
-        points_in_process = None
-        s = 0 # Number of iteration
+        s = self._first_iteration # Number of iteration
         
         #self._time_proportion = 40000 # Constant for proportional time #5 in Ligen
         #self._time_proportion = 5 # Constant for Ligen
         self._time_proportion = 50000
-        time0 = time.time()
         #self._time_proportion = 250 # COnstant for StereoMatch
-        while True:
-            
-            time1 = time.time()
-            # Avvio di nuovi processi se necessario
-            if len(active_process) < n_process:
-                q = n_process - len(active_process)
-                _log.info(f"q = {q}")
-                # Acquisition function optimization
-                kg = self.acquisition_function(q, points_in_process)
-                points_to_explore = self.multistart_optimization(kg, q)
-                
-                # Deliver points where compute the objective function to the processes
-                for point in points_to_explore:
-                    proc = multiprocessing.Process(target=self.func_obj, args=(point , queue))
-                    proc.start()
-                    active_process.append(proc)
-                    assigned_points[proc] = point
-            
-            # Simulate waiting time
-            if t_restart > 0:
-                for _ in tqdm(range(t_restart), desc="Wait", unit="second"):
-                    time.sleep(1)
-                #time.sleep(t_restart)
-          
-            for proc in active_process:
-                if not proc.is_alive(): # Check the terminated process
-                    res = queue.get()  # Save the result
-                    if res is not None:
-                        results.append(res)
-                    del assigned_points[proc]   # Delete the inactive processes 
-                    active_process.remove(proc) 
-            
-            # Get the points that are still in process
-            points_in_process = [assigned_points[proc] for proc in active_process]
-            
-            # Update the model with the computed results
-            if results:
-                next_points = [[*res[0]] for res in results]
-                next_points_value = []
-                next_points_index = []
-
-                for res in results:
-                    next_points_value.append(res[1])
-                    next_points_index.append(res[2])
+        # Fake simulation of the objective function: the workers wait the evaluation time divided by the time proportion
+        evaluations = scheduler.EvaluationScheduler(self.evaluation_pool(n_process, self._time_proportion), n_process)
+        # After a resume the optimizer time continues from the saved one
+        time0 = time.time() - self._global_time/self._time_proportion
+        try:
+            while True:
+                # Fill the free slots with new points
+                if evaluations.free_slots > 0:
+                    q = evaluations.free_slots
+                    _log.info(f"q = {q}")
+                    # Acquisition function optimization, conditioned on the points still in process
+                    points_in_process = evaluations.pending_points or None
+                    kg = self.acquisition_function(q, points_in_process)
+                    with self._runtime.limit_threads():
+                        points_to_explore = self.multistart_optimization(kg, q)
+                    for point in points_to_explore:
+                        evaluations.submit(point)
+
+                # Wake up as soon as at least one evaluation finishes
+                results = evaluations.wait()
+
+                # Update the model with the computed results, matched to their points by request id
+                next_points = [[*point] for _, point, _ in results]
+                next_points_value = [value for _, _, (value, _, _) in results]
+                next_points_index = [index for _, _, (_, index, _) in results]
 
                 dimension = len(next_points_value)
                 self._objective_func.add_evaluation_count(dimension) # Add evaluation count to the model
@@ -475,12 +671,7 @@ class ParallelMaliboo:
                 # Compute the minimum of the posterior distribution
                 suggested_minimum = self.find_suggested_minimum()
 
-                #self._global_time += time.time() - time1 + t_restart*(self._time_proportion-1) # real time
-                if t_restart > 0:
-                    self._global_time += 10 + t_restart*(self._time_proportion)
-                    #self._global_time += time.time() - time1 + t_restart*(self._time_proportion-1) # real time
-                else:
-                    self._global_time = (time.time() - time0)*self._time_proportion 
+                self._global_time = (time.time() - time0)*self._time_proportion
 
                 # Compute unfeasible points
                 if self._use_ml: unfeasible_points = self._ml_model.out_count(target)
@@ -493,13 +684,17 @@ class ParallelMaliboo:
                 if self._save:
                     aux.csv_info(s,dimension, self._objective_func.evaluation_count,
                                 self._global_time, unfeasible_points, mape_value, self._result_folder, self._error) # add mape
-                results = [] # Reset the results 
+                # The points still in process are proposed again after a resume
+                self.checkpoint(s)
                 s+=1  
                 
                 _log.info("Iteration finished succesfully")
-        
 
-            if self._global_time >= 5000000:
-                _log.info(f"Global time reached. Optimization finished succesfully!")
-                break
+                if self._global_time >= 5000000:
+                    _log.info(f"Global time reached. Optimization finished succesfully!")
+                    break
+        finally:
+            evaluations.close()
+            # Shut down with the scheduler
+            self._evaluation_pool = None
     
@@ -1,8 +1,10 @@
 """Precomputed functions
 
 The instances exposed here are utilities to manage
- the sample datasets as domains and target functions
+ the sample datasets as domains and target functions.
+ They are instantiated on first access.
 """
+import collections
 import logging
 
 import numpy as np
@@ -17,7 +19,15 @@ _log.setLevel(level=logging.DEBUG)
 
 class _PrecomputedFunction(finite_domain.CPPFiniteDomain, abstract_problem.AbstractProblem):
 
-    def __init__(self, dataset: datasets.Dataset):
+    def __init__(self, dataset: datasets.Dataset, cache_size: int = 4096, cache_decimals: int = 8):
+        """
+        Args:
+            dataset (datasets.Dataset): The dataset used as domain and target function.
+            cache_size (int, optional): Max number of snapped points kept in the projection cache,
+                0 disables the cache. Defaults to 4096.
+            cache_decimals (int, optional): Number of decimals the coordinates are rounded to
+                when used as cache keys. Defaults to 8.
+        """
         m = np.min(dataset.X, axis=0).astype(float)
         M = np.max(dataset.X, axis=0).astype(float)
         domain_bounds = np.vstack([m, M]).transpose()
@@ -28,6 +38,12 @@ class _PrecomputedFunction(finite_domain.CPPFiniteDomain, abstract_problem.Abstr
         self.lower_bounds = m
         self.upper_bounds = M
 
+        self._cache_size = cache_size
+        self._cache_decimals = cache_decimals
+        self._snap_cache = collections.OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     @property
     def lower_bound(self):
         return self.lower_bounds
@@ -39,75 +55,90 @@ class _PrecomputedFunction(finite_domain.CPPFiniteDomain, abstract_problem.Abstr
         ix = np.argmin(self._dataset.y)
         return self._dataset.X.loc[ix].values
 
-    def evaluate_true(self, x):
-        distances, indexes, points = self.find_distances_indexes_closest_points(x)
+    @property
+    def cache_hits(self):
+        return self._cache_hits
+
+    @property
+    def cache_misses(self):
+        return self._cache_misses
+
+    def clear_cache(self):
+        self._snap_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def snap_to_domain(self, x):
+        '''
+        Return the index of the dataset row the point is snapped to.
+
+        The result is memoized (LRU) on the point coordinates rounded to `cache_decimals`,
+        so evaluate_true and evaluate_time on the same point share a single lookup
+        (and the same row when several rows are at the same distance).
+        '''
+        if self._cache_size <= 0:
+            return self._closest_index(x)
+        key = tuple(np.round(np.ravel(x).astype(float), self._cache_decimals))
+        if key in self._snap_cache:
+            self._cache_hits += 1
+            self._snap_cache.move_to_end(key)
+            return self._snap_cache[key]
+        self._cache_misses += 1
+        index = self._closest_index(x)
+        self._snap_cache[key] = index
+        if len(self._snap_cache) > self._cache_size:
+            self._snap_cache.popitem(last=False)
+        return index
+
+    def _closest_index(self, x):
+        distances, indexes = self.find_distances_indexes_closest_points_batch(np.reshape(x, (1, self.dim)))
+        distances, indexes = distances[0], indexes[0]
         # if any(distances > 0.00001):
         #     _log.warning(f'POSSIBLE EVALUATION ERROR: The distance between the point in '
         #                  f'domain and the evaluated point is large')
         min_distance = np.min(distances)
-        
+
         #if min_distance == 0.0:
         #    _log.debug('There is at least one exact match')
-        
+
         mask = distances == min_distance
         if np.sum(mask) == 1:
             #_log.debug('Only one match, return it')
-            my_index = indexes[mask][0]
-            values = self._dataset.y[my_index]
-            realtime = self._dataset.real_time[my_index]
-        else:
-            #_log.debug('Multiple matches, random pick...')
-            indexes = indexes[mask]
-            my_index = np.random.choice(indexes)
-            values = self._dataset.y[my_index]
-            realtime = self._dataset.real_time[my_index]
-        
-        return np.array(values), my_index, realtime
-    
-    def evaluate_time(self, x):
-        distances, indexes, points = self.find_distances_indexes_closest_points(x)
-        min_distance = np.min(distances)
-        mask = distances == min_distance
-        
-        if np.sum(mask)==1:
-            my_index = indexes[mask][0]
-            values = self._dataset.time[my_index]
-            #values = self._dataset.time[indexes[mask]]
-
-        else:
-            indexes = indexes[mask]
-            my_index = np.random.choice(indexes)
-            values = self._dataset.time[my_index]
-
-        return values
-
-
+            return indexes[mask][0]
+        #_log.debug('Multiple matches, random pick...')
+        return np.random.choice(indexes[mask])
 
+    def evaluate_true(self, x):
+        my_index = self.snap_to_domain(x)
+        values = self._dataset.y[my_index]
+        realtime = self._dataset.real_time[my_index]
+        return np.array(values), my_index, realtime
 
-Query26 = _PrecomputedFunction(
-    dataset=datasets.Query26
-)
+    def evaluate_time(self, x):
+        my_index = self.snap_to_domain(x)
+        return self._dataset.time[my_index]
 
-ScaledQuery26 = _PrecomputedFunction(
-    dataset=datasets.ScaledQuery26
-)
 
-StereoMatch = _PrecomputedFunction(
-    dataset=datasets.StereoMatch
-)
+# The functions are built on first access (e.g. `from qaliboo.precomputed_functions import ScaledLiGenTot`
+# or `getattr(precomputed_functions, name)`), so a run only loads the dataset it uses
+_FUNCTION_NAMES = [
+    'Query26',
+    'ScaledQuery26',
+    'StereoMatch',
+    'ScaledStereoMatch',
+    'LiGenTot',
+    'ScaledLiGenTot',
+    'ScaledStereoMatch10',
+]
 
-ScaledStereoMatch = _PrecomputedFunction(
-    dataset=datasets.ScaledStereoMatch
-)
 
-LiGenTot = _PrecomputedFunction(
-    dataset=datasets.LiGenTot
-)
+def __getattr__(name):
+    if name not in _FUNCTION_NAMES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    function = _PrecomputedFunction(dataset=getattr(datasets, name))
+    globals()[name] = function
+    return function
 
-ScaledLiGenTot = _PrecomputedFunction(
-    dataset=datasets.ScaledLiGenTot
-)
 
-ScaledStereoMatch10 = _PrecomputedFunction(
-    dataset=datasets.ScaledStereoMatch10
-)
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(_FUNCTION_NAMES))
@@ -0,0 +1,77 @@
+"""Runtime
+
+Threads and randomness of the acquisition function computations.
+
+The KG and EI objects used to create (and seed from the clock) a new C++
+randomness container at every evaluate_at_point_list call and to run with the
+default number of threads. A RuntimeConfig owns one container, created once per
+optimization, and the thread budget of the acquisition function: the cores left
+are available to the workers evaluating the objective function.
+"""
+import contextlib
+
+import moe.build.GPP as C_GP
+from moe.optimal_learning.python.constant import DEFAULT_MAX_NUM_THREADS
+
+try:
+    import threadpoolctl
+except ImportError:
+    threadpoolctl_imported = False
+else:
+    threadpoolctl_imported = True
+
+
+def limit_threads(max_num_threads):
+    '''
+    Context limiting the OpenMP and BLAS thread pools to max_num_threads.
+    Does nothing if threadpoolctl is not installed.
+    '''
+    if not threadpoolctl_imported:
+        return contextlib.nullcontext()
+    return threadpoolctl.threadpool_limits(limits=max_num_threads)
+
+
+class RuntimeConfig:
+
+    def __init__(self, max_num_threads=None, seed=None):
+        """
+        Threads and randomness shared by all the KG and EI computations of an optimization.
+
+        Args:
+            max_num_threads (int, optional): Number of threads of the acquisition function computations
+                (C++ OpenMP loops and NumPy), None uses DEFAULT_MAX_NUM_THREADS. Defaults to None.
+            seed (int, optional): Seed of the randomness sources, None seeds them from the clock. Defaults to None.
+        """
+        if max_num_threads is None:
+            max_num_threads = DEFAULT_MAX_NUM_THREADS
+        if max_num_threads < 1:
+            raise ValueError(f'max_num_threads must be positive, got {max_num_threads}')
+        self._max_num_threads = max_num_threads
+        # One source per thread, kept for the whole optimization
+        self._randomness = C_GP.RandomnessSourceContainer(max_num_threads)
+        if seed is None:
+            self._randomness.SetRandomizedUniformGeneratorSeed(0)
+            self._randomness.SetRandomizedNormalRNGSeed(0)
+        else:
+            self._randomness.SetExplicitUniformGeneratorSeed(int(seed))
+            self._randomness.SetExplicitNormalRNGSeed(int(seed))
+
+    @property
+    def max_num_threads(self):
+        return self._max_num_threads
+
+    @property
+    def randomness(self):
+        return self._randomness
+
+    def acquisition_kwargs(self):
+        '''
+        Arguments of the KnowledgeGradientMCMC and ExpectedImprovement constructors.
+        '''
+        return dict(randomness=self._randomness, max_num_threads=self._max_num_threads)
+
+    def limit_threads(self):
+        '''
+        Context running the acquisition function optimization within the thread budget.
+        '''
+        return limit_threads(self._max_num_threads)
@@ -0,0 +1,190 @@
+"""Scheduler
+
+Event-driven scheduling of the objective function evaluations.
+
+The evaluations run on an EvaluationPool: a long-lived pool of worker
+processes, each loading the objective function once when it starts. Only the
+request id and the point travel to the workers, so the cost of dispatching an
+evaluation does not depend on the size of the models held by the optimizer.
+
+Every point submitted to an EvaluationScheduler gets a request id. The
+completion callbacks of the concurrent.futures.Future objects of the pool push
+the request id on a queue: waiting for results blocks on that queue, so the
+optimization wakes up as soon as any evaluation finishes instead of polling the
+workers at fixed intervals, and each result is matched to the point that
+produced it through its request id.
+"""
+import concurrent.futures
+import itertools
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+
+# Worker process state, set by _init_worker
+_worker_objective_func = None
+_worker_time_proportion = None
+
+
+def _init_worker(objective_func, objective_func_name, time_proportion):
+    global _worker_objective_func, _worker_time_proportion
+    if objective_func is None:
+        # Started without fork: load the precomputed function (and its dataset) once per worker
+        from qaliboo import precomputed_functions
+        objective_func = getattr(precomputed_functions, objective_func_name)
+    _worker_objective_func = objective_func
+    _worker_time_proportion = time_proportion
+
+
+def _evaluate(request_id, point):
+    '''
+    Evaluate the objective function at `point`, returns (value, index, time).
+    With a time proportion, the worker waits the evaluation time divided by it (fake simulation).
+    '''
+    try:
+        result = _worker_objective_func.evaluate(point)
+    except Exception as error:
+        raise RuntimeError(f'Evaluation {request_id} failed: {error!r}') from error
+    if not isinstance(result, tuple):
+        return result, None, None
+    poi_v, poi_i, poi_t = result
+    if _worker_time_proportion:
+        time.sleep(poi_t/_worker_time_proportion)
+    return poi_v, poi_i, np.array(poi_t)
+
+
+class EvaluationPool:
+
+    def __init__(self, objective_func, n_workers, start_method='fork', objective_func_name=None, time_proportion=None):
+        """
+        Persistent pool of processes evaluating the objective function.
+
+        Args:
+            objective_func: Objective function, inherited by the workers when they are forked.
+            n_workers (int): Number of worker processes.
+            start_method (str, optional): Start method of the workers ('fork', 'spawn' or 'forkserver').
+                Defaults to 'fork'.
+            objective_func_name (str, optional): Name of the precomputed function loaded by the workers,
+                required when they are not forked (the C++ domain cannot be pickled). Defaults to None.
+            time_proportion (float, optional): If given, every evaluation also waits its evaluation time
+                divided by time_proportion. Defaults to None.
+        """
+        if start_method != 'fork':
+            if objective_func_name is None:
+                raise ValueError(f'Workers started with {start_method} need objective_func_name to load the objective function')
+            objective_func = None
+        context = multiprocessing.get_context(start_method)
+        self._n_workers = n_workers
+        self._time_proportion = time_proportion
+        self._request_ids = itertools.count()
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=context, initializer=_init_worker,
+            initargs=(objective_func, objective_func_name, time_proportion))
+
+    @property
+    def n_workers(self):
+        return self._n_workers
+
+    @property
+    def time_proportion(self):
+        return self._time_proportion
+
+    def submit(self, request_id, point):
+        '''
+        Start the evaluation of `point`, returns the Future of its (value, index, time).
+        '''
+        return self._executor.submit(_evaluate, request_id, np.asarray(point))
+
+    def map_async(self, points):
+        '''
+        Start the evaluation of all the points, returns the list of their Futures in the order of the points.
+        '''
+        return [self.submit(next(self._request_ids), point) for point in points]
+
+    def shutdown(self):
+        # Evaluations not started yet are dropped, the running ones are waited for
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class EvaluationScheduler:
+
+    def __init__(self, executor, n_slots):
+        """
+        Keeps up to n_slots evaluations running and returns their results as soon as they are available.
+
+        Args:
+            executor: Object with submit(request_id, point) returning a concurrent.futures.Future
+                and shutdown(), e.g. an EvaluationPool.
+            n_slots (int): Max number of evaluations running at the same time.
+        """
+        self._executor = executor
+        self._n_slots = n_slots
+        self._request_ids = itertools.count()
+        self._pending = {}  # request id -> point
+        self._futures = {}  # request id -> future
+        self._completed = queue.SimpleQueue()
+
+    @property
+    def n_slots(self):
+        return self._n_slots
+
+    @property
+    def free_slots(self):
+        return self._n_slots - len(self._pending)
+
+    @property
+    def pending_points(self):
+        '''
+        Points whose evaluation is running, in the order they were submitted.
+        '''
+        return list(self._pending.values())
+
+    def submit(self, point):
+        '''
+        Start the evaluation of `point`, returns its request id.
+        '''
+        if self.free_slots <= 0:
+            raise RuntimeError(f'All the {self._n_slots} evaluation slots are busy')
+        request_id = next(self._request_ids)
+        self._pending[request_id] = point
+        future = self._executor.submit(request_id, point)
+        self._futures[request_id] = future
+        future.add_done_callback(lambda future: self._completed.put((request_id, future)))
+        return request_id
+
+    def wait(self, timeout=None):
+        '''
+        Block until at least one evaluation finishes (or `timeout` seconds elapse), then collect
+        all the evaluations finished so far.
+
+        Returns the list of (request_id, point, result) in order of completion.
+        '''
+        if not self._pending:
+            return []
+        completed = []
+        try:
+            completed.append(self._completed.get(timeout=timeout))
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                completed.append(self._completed.get_nowait())
+            except queue.Empty:
+                break
+        for request_id, _ in completed:
+            del self._futures[request_id]
+        completed = [(request_id, self._pending.pop(request_id), future) for request_id, future in completed]
+        # Raises the exception of a failed evaluation
+        return [(request_id, point, future.result()) for request_id, point, future in completed]
+
+    def close(self):
+        '''
+        Cancel the evaluations not started yet, forget the pending ones and shut the executor down.
+        '''
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._pending.clear()
+        self._executor.shutdown()
@@ -19,16 +19,12 @@ def generate_neighbor_point(domain, current_point, step):
 
     num_samples, num_features = current_point.shape
     
-    new_points = current_point.copy()
-    
     
     # TODO set this random vector proportional to the problem that I'm solving (ex: LiGen last feature)
     #random_vectors = np.random.uniform(-max_relative_change, max_relative_change, size=(num_samples, num_features))
     random_vectors = np.random.normal(loc=0, scale=1, size=(num_samples, num_features))
     random_vectors = random_vectors*step
-    for k in range(num_samples):
-            new_point_update = domain.compute_update_restricted_to_domain(1, new_points[k], random_vectors[k])
-            new_points[k] = new_points[k] + new_point_update
+    new_points = current_point + domain.compute_update_restricted_to_domain(1, current_point, random_vectors)
 
 
     return new_points
@@ -97,6 +93,65 @@ def simulated_annealing_ML(domain, kg, ml_model, initial_point, num_iterations,
 
     return current_point
 
+####################################
+#####  POPULATION ANNEALING  #######
+####################################
+# Parallel tempering: population_size chains run at the temperatures
+#   temperature(iteration) * ladder_ratio**r,   r = 0, ..., population_size - 1
+# At each step all the neighbours are scored with a single evaluate_at_point_list
+# call (C++ loop, multithreaded, with the randomness and the threads of kg unless
+# max_num_threads is given), the Metropolis acceptance and the swaps between
+# chains at adjacent temperatures are vectorized.
+# NB: the KG is maximized, so improvements are always accepted.
+
+def simulated_annealing_population(domain, kg, initial_point, num_iterations, initial_temperature,
+                                   step, population_size=8, typeT='log', alpha=1, ladder_ratio=2.0,
+                                   ml_model=None, max_num_threads=None):
+
+    num_samples, num_features = initial_point.shape
+    ladder = ladder_ratio**np.arange(population_size)
+
+    def evaluate(points):
+        values = np.array(kg.evaluate_at_point_list(points, max_num_threads=max_num_threads))
+        if ml_model is not None:
+            values *= np.array([ml_model.nascent_minima(pt)*ml_model.exponential_penality(pt) for pt in points])
+        return values
+
+    current_points = np.repeat(initial_point[np.newaxis, :, :], population_size, axis=0)
+    current_values = evaluate(current_points)
+    best_point = initial_point.copy()
+    best_value = current_values[0]
+
+    for iteration in range(num_iterations):
+
+        new_points = generate_neighbor_point(domain,
+                                             current_points.reshape(population_size*num_samples, num_features),
+                                             step).reshape(population_size, num_samples, num_features)
+        new_values = evaluate(new_points)
+
+        # Metropolis acceptance for every chain
+        temperatures = temperature(iteration, initial_temperature, typeT, alpha)*ladder
+        delta = new_values - current_values
+        accept = np.random.uniform(0, 1, population_size) < np.exp(np.minimum(delta, 0) / temperatures)
+        current_points[accept] = new_points[accept]
+        current_values[accept] = new_values[accept]
+
+        ix = np.argmax(current_values)
+        if current_values[ix] > best_value:
+            best_value = current_values[ix]
+            best_point = current_points[ix].copy()
+
+        # Swap the states of adjacent chains (even pairs on even iterations, odd pairs otherwise)
+        low = np.arange(iteration % 2, population_size - 1, 2)
+        high = low + 1
+        log_ratio = (current_values[high] - current_values[low])*(1/temperatures[low] - 1/temperatures[high])
+        swap = np.log(np.random.uniform(0, 1, len(low))) < log_ratio
+        low, high = low[swap], high[swap]
+        current_points[low], current_points[high] = current_points[high].copy(), current_points[low].copy()
+        current_values[low], current_values[high] = current_values[high].copy(), current_values[low].copy()
+
+    return best_point
+
 
 def pso_multi_point(cost_func, num_points=4, dim=8, num_particles=30, max_iter=100, w=0.5, c1=1, c2=2):
     # Initialize particles and velocities for multiple points